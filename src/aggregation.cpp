@@ -0,0 +1,254 @@
+#include "aggregation.hpp"
+
+#include <algorithm>
+#include <cctype>
+#include <cmath>
+#include <cstring>
+#include <limits>
+#include <numeric>
+#include <unordered_map>
+
+#include "internal_access.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+int compare_text_nocase(const std::string& a, const std::string& b) {
+    const size_t n = std::min(a.size(), b.size());
+    for (size_t i = 0; i < n; ++i) {
+        const int ca = std::tolower(static_cast<unsigned char>(a[i]));
+        const int cb = std::tolower(static_cast<unsigned char>(b[i]));
+        if (ca != cb) return ca < cb ? -1 : 1;
+    }
+    if (a.size() != b.size()) return a.size() < b.size() ? -1 : 1;
+    return 0;
+}
+
+bool matches(const AggValue& value, const GroupFilter& filter) {
+    const bool equal = value.key() == filter.value.key();
+    if (filter.op == "==") return equal;
+    if (filter.op == "!=") return !equal;
+    if (value.kind != filter.value.kind || value.kind == AggValue::Kind::Blank) return false;
+    if (filter.op == "<") return agg_value_less(value, filter.value);
+    if (filter.op == "<=") return equal || agg_value_less(value, filter.value);
+    if (filter.op == ">") return agg_value_less(filter.value, value);
+    return equal || agg_value_less(filter.value, value);  // ">="
+}
+
+}  // namespace
+
+AggValue AggValue::from(const XLCellValue& value) {
+    AggValue result;
+    switch (value.type()) {
+        case XLValueType::Integer:
+            result.kind = Kind::Number;
+            result.integer = true;
+            result.number = static_cast<double>(value.get<int64_t>());
+            break;
+        case XLValueType::Float:
+            result.kind = Kind::Number;
+            result.number = value.get<double>();
+            break;
+        case XLValueType::Boolean:
+            result.kind = Kind::Boolean;
+            result.number = value.get<bool>() ? 1.0 : 0.0;
+            break;
+        case XLValueType::String:
+            result.kind = Kind::String;
+            result.text = value.get<std::string>();
+            break;
+        case XLValueType::RichText:
+            result.kind = Kind::String;
+            result.text = value.get<XLRichText>().plainText();
+            break;
+        default:
+            break;
+    }
+    return result;
+}
+
+AggValue AggValue::of_text(std::string text) {
+    AggValue value;
+    value.kind = Kind::String;
+    value.text = std::move(text);
+    return value;
+}
+
+AggValue AggValue::of_number(double number) {
+    AggValue value;
+    value.kind = Kind::Number;
+    value.number = number;
+    return value;
+}
+
+std::string AggValue::key() const {
+    std::string key(1, static_cast<char>(kind));
+    if (kind == Kind::String) {
+        key += text;
+    } else if (kind != Kind::Blank) {
+        // -0.0 and 0.0 are the same item
+        const double normalized = number == 0.0 ? 0.0 : number;
+        key.append(reinterpret_cast<const char*>(&normalized), sizeof(normalized));
+    }
+    return key;
+}
+
+bool agg_value_less(const AggValue& a, const AggValue& b) {
+    if (a.kind != b.kind) return a.kind < b.kind;
+    if (a.kind == AggValue::Kind::String) {
+        const int order = compare_text_nocase(a.text, b.text);
+        return order != 0 ? order < 0 : a.text < b.text;
+    }
+    return a.number < b.number;
+}
+
+AggFunc parse_agg_func(const std::string& name) {
+    static const std::pair<const char*, AggFunc> names[] = {
+        {"sum", AggFunc::Sum},          {"count", AggFunc::Count}, {"mean", AggFunc::Mean},
+        {"min", AggFunc::Min},          {"max", AggFunc::Max},     {"product", AggFunc::Product},
+        {"distinct", AggFunc::Distinct}};
+    for (const auto& [text, func] : names) {
+        if (name == text) return func;
+    }
+    throw py::value_error(("unknown aggregation: " + name).c_str());
+}
+
+void Accumulator::add(const AggValue& value, bool trackDistinct) {
+    if (value.kind == AggValue::Kind::Blank) return;
+    ++values;
+    if (trackDistinct) distinct.insert(value.key());
+    if (value.kind != AggValue::Kind::Number) return;
+    min = numbers == 0 ? value.number : std::min(min, value.number);
+    max = numbers == 0 ? value.number : std::max(max, value.number);
+    ++numbers;
+    sum += value.number;
+    product *= value.number;
+}
+
+std::optional<double> Accumulator::result(AggFunc func) const {
+    switch (func) {
+        case AggFunc::Count:
+            return static_cast<double>(values);
+        case AggFunc::Distinct:
+            return static_cast<double>(distinct.size());
+        case AggFunc::Sum:
+            if (values == 0) return std::nullopt;
+            return sum;
+        default:
+            break;
+    }
+    if (numbers == 0) return std::nullopt;
+    switch (func) {
+        case AggFunc::Mean:
+            return sum / static_cast<double>(numbers);
+        case AggFunc::Min:
+            return min;
+        case AggFunc::Max:
+            return max;
+        default:
+            return product;
+    }
+}
+
+std::vector<AggValue> read_block(XLWorksheet& ws, uint32_t firstRow, uint16_t firstCol,
+                                 uint32_t lastRow, uint16_t lastCol) {
+    const size_t width = static_cast<size_t>(lastCol - firstCol) + 1;
+    std::vector<AggValue> block(static_cast<size_t>(lastRow - firstRow + 1) * width);
+    const XLSharedStrings& sharedStrings = get_parent_doc(ws).sharedStrings();
+    // Walk <sheetData> once; looking each row up by number would be quadratic
+    XMLNode sheetData = sheet_data_node(ws);
+    for (XMLNode rowNode = sheetData.first_child_of_type(pugi::node_element); !rowNode.empty();
+         rowNode = rowNode.next_sibling_of_type(pugi::node_element)) {
+        const uint32_t row = rowNode.attribute("r").as_uint();
+        if (row < firstRow) continue;
+        if (row > lastRow) break;
+        const std::vector<XLCellValue> values = XLRow(rowNode, sharedStrings).values();
+        const size_t base = static_cast<size_t>(row - firstRow) * width;
+        for (size_t c = 0; c < width; ++c) {
+            const size_t col = firstCol - 1 + c;
+            if (col < values.size()) block[base + c] = AggValue::from(values[col]);
+        }
+    }
+    return block;
+}
+
+GroupedBlock group_by_block(XLWorksheet& ws, uint32_t firstRow, uint16_t firstCol, uint32_t lastRow,
+                            uint16_t lastCol, const std::vector<uint16_t>& keyCols,
+                            const std::vector<uint16_t>& valueCols,
+                            const std::vector<AggFunc>& funcs,
+                            const std::vector<GroupFilter>& filters, bool sort) {
+    Expects(valueCols.size() == funcs.size());
+    const auto inside = [&](uint16_t col) { return col >= firstCol && col <= lastCol; };
+    Expects(std::all_of(keyCols.begin(), keyCols.end(), inside));
+    Expects(std::all_of(valueCols.begin(), valueCols.end(), inside));
+    Expects(std::all_of(filters.begin(), filters.end(),
+                        [&](const GroupFilter& f) { return inside(f.col); }));
+
+    const std::vector<AggValue> block = read_block(ws, firstRow, firstCol, lastRow, lastCol);
+    const size_t width = static_cast<size_t>(lastCol - firstCol) + 1;
+    const size_t rows = static_cast<size_t>(lastRow - firstRow) + 1;
+    const size_t keyCount = keyCols.size();
+    const size_t funcCount = funcs.size();
+    const bool trackDistinct =
+        std::find(funcs.begin(), funcs.end(), AggFunc::Distinct) != funcs.end();
+
+    std::unordered_map<std::string, size_t> groupIds;
+    std::vector<AggValue> keys;
+    std::vector<Accumulator> accumulators;
+    std::string packed;
+    for (size_t r = 0; r < rows; ++r) {
+        const AggValue* row = &block[r * width];
+        if (std::all_of(row, row + width,
+                        [](const AggValue& v) { return v.kind == AggValue::Kind::Blank; })) {
+            continue;
+        }
+        const bool keep = std::all_of(filters.begin(), filters.end(), [&](const GroupFilter& f) {
+            return matches(row[f.col - firstCol], f);
+        });
+        if (!keep) continue;
+
+        // Length-prefixed value keys, so adjacent keys can't run into each other
+        packed.clear();
+        for (uint16_t col : keyCols) {
+            const std::string key = row[col - firstCol].key();
+            const auto size = static_cast<uint32_t>(key.size());
+            packed.append(reinterpret_cast<const char*>(&size), sizeof(size));
+            packed += key;
+        }
+        auto [it, inserted] = groupIds.try_emplace(packed, groupIds.size());
+        if (inserted) {
+            for (uint16_t col : keyCols) keys.push_back(row[col - firstCol]);
+            accumulators.resize(accumulators.size() + funcCount);
+        }
+        Accumulator* group = &accumulators[it->second * funcCount];
+        for (size_t i = 0; i < funcCount; ++i) {
+            group[i].add(row[valueCols[i] - firstCol],
+                         trackDistinct && funcs[i] == AggFunc::Distinct);
+        }
+    }
+
+    const size_t groupCount = groupIds.size();
+    std::vector<size_t> order(groupCount);
+    std::iota(order.begin(), order.end(), size_t{0});
+    if (sort && keyCount > 0) {
+        std::stable_sort(order.begin(), order.end(), [&](size_t a, size_t b) {
+            return std::lexicographical_compare(
+                keys.begin() + a * keyCount, keys.begin() + (a + 1) * keyCount,
+                keys.begin() + b * keyCount, keys.begin() + (b + 1) * keyCount, agg_value_less);
+        });
+    }
+
+    GroupedBlock result;
+    result.groups = groupCount;
+    result.keys.reserve(groupCount * keyCount);
+    result.values.reserve(groupCount * funcCount);
+    for (size_t g : order) {
+        for (size_t k = 0; k < keyCount; ++k)
+            result.keys.push_back(std::move(keys[g * keyCount + k]));
+        for (size_t i = 0; i < funcCount; ++i) {
+            result.values.push_back(accumulators[g * funcCount + i].result(funcs[i]).value_or(
+                std::numeric_limits<double>::quiet_NaN()));
+        }
+    }
+    return result;
+}
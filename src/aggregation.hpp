@@ -0,0 +1,85 @@
+#ifndef PYOPENXLSX_AGGREGATION_HPP
+#define PYOPENXLSX_AGGREGATION_HPP
+
+#include <cstdint>
+#include <optional>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include "bindings.hpp"
+
+// A cell value as the aggregation engine sees it. Integers and floats are both numbers, so
+// 2 and 2.0 fall in the same group; `integer` remembers how the first one was stored.
+struct AggValue {
+    enum class Kind : uint8_t { Number, String, Boolean, Blank };
+    Kind kind = Kind::Blank;
+    bool integer = false;
+    double number = 0.0;  // also 0/1 for booleans
+    std::string text;
+
+    static AggValue from(const XLCellValue& value);
+    static AggValue of_text(std::string text);
+    static AggValue of_number(double number);
+
+    // Equal for values that group together
+    std::string key() const;
+};
+
+// Excel's sort order: numbers, then text (case-insensitive), then logicals, then blanks
+bool agg_value_less(const AggValue& a, const AggValue& b);
+
+enum class AggFunc : uint8_t { Sum, Count, Mean, Min, Max, Product, Distinct };
+
+// "sum", "count", "mean", "min", "max", "product" or "distinct"; raises ValueError otherwise
+AggFunc parse_agg_func(const std::string& name);
+
+// Running state of one aggregation. Count and distinct see every non-blank value; the
+// numeric functions only see numbers.
+struct Accumulator {
+    double sum = 0.0;
+    double product = 1.0;
+    double min = 0.0;
+    double max = 0.0;
+    uint64_t numbers = 0;
+    uint64_t values = 0;
+    std::unordered_set<std::string> distinct;
+
+    void add(const AggValue& value, bool trackDistinct = false);
+    // Empty when the function has nothing to work on (e.g. the mean of no numbers)
+    std::optional<double> result(AggFunc func) const;
+};
+
+// Values of the block [firstRow, lastRow] x [firstCol, lastCol] in row-major order, read in
+// one pass over <sheetData>. Safe to call without the GIL.
+std::vector<AggValue> read_block(XLWorksheet& ws, uint32_t firstRow, uint16_t firstCol,
+                                 uint32_t lastRow, uint16_t lastCol);
+
+// Keeps the rows whose `col` value compares to `value` with `op` (==, !=, <, <=, >, >=).
+// Ordering comparisons only match values of the same kind.
+struct GroupFilter {
+    uint16_t col;
+    std::string op;
+    AggValue value;
+};
+
+struct GroupedBlock {
+    size_t groups = 0;
+    std::vector<AggValue> keys;  // one value per key column for each group
+    std::vector<double> values;  // one result per function for each group, NaN when empty
+};
+
+/**
+ * Group the rows of [firstRow, lastRow] x [firstCol, lastCol] by the `keyCols` values and
+ * aggregate `valueCols[i]` with `funcs[i]`, in a single hash pass. Columns are absolute
+ * sheet columns inside the block. Groups come out in first-seen order, or in Excel's sort
+ * order of their keys when `sort` is set. Without key columns every matching row forms one
+ * group. Entirely blank rows are skipped. Safe to call without the GIL.
+ */
+GroupedBlock group_by_block(XLWorksheet& ws, uint32_t firstRow, uint16_t firstCol, uint32_t lastRow,
+                            uint16_t lastCol, const std::vector<uint16_t>& keyCols,
+                            const std::vector<uint16_t>& valueCols,
+                            const std::vector<AggFunc>& funcs,
+                            const std::vector<GroupFilter>& filters, bool sort);
+
+#endif  // PYOPENXLSX_AGGREGATION_HPP
@@ -0,0 +1,178 @@
+#include "archive_io.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <cstring>
+#include <exception>
+#include <filesystem>
+#include <fstream>
+#include <functional>
+#include <map>
+#include <mutex>
+#include <string_view>
+#include <thread>
+#include <utility>
+
+#include "internal_access.hpp"
+
+EntryStream::EntryStream(XLDocument& doc, const std::string& path, int64_t chunkSize, bool fromFile,
+                         const XLMemoryArchive* memory)
+    : m_stream(nullptr), m_name(path), m_chunkSize(chunkSize) {
+    if (chunkSize <= 0) throw py::value_error("chunk_size must be positive");
+    IZipArchive& shared = get_archive(doc);
+    if (!shared.hasEntry(path)) {
+        throw std::runtime_error("Entry not found in archive: " + path);
+    }
+    if (fromFile && !doc.path().empty() &&
+        std::filesystem::is_regular_file(std::filesystem::u8path(doc.path()))) {
+        try {
+            m_own.open(doc.path());
+            if (m_own.hasEntry(path)) m_stream = m_own.openEntryStream(path);
+        } catch (const std::exception&) {
+            // Encrypted or unreadable: fall back to the document's archive
+        }
+    }
+    if (m_stream == nullptr) {
+        m_own = XLZipArchive();
+        if (fromFile && memory != nullptr) m_committed = memory->openCommittedEntry(path);
+        if (m_committed == nullptr) m_buffer = shared.getEntry(path);
+    }
+}
+
+EntryStream::~EntryStream() { close(); }
+
+std::string EntryStream::read(int64_t size) {
+    if (m_closed) throw py::value_error("I/O operation on closed archive entry");
+
+    constexpr int64_t kBlock = 1 << 16;
+    std::string data;
+    while (size < 0 || static_cast<int64_t>(data.size()) < size) {
+        const int64_t want = size < 0 ? kBlock : size - static_cast<int64_t>(data.size());
+        const size_t offset = data.size();
+        data.resize(offset + static_cast<size_t>(want));
+        const uint64_t got = readInto(data.data() + offset, static_cast<uint64_t>(want));
+        data.resize(offset + static_cast<size_t>(got));
+        if (got == 0) break;
+    }
+    return data;
+}
+
+uint64_t EntryStream::readInto(char* out, uint64_t size) {
+    if (m_closed) throw py::value_error("I/O operation on closed archive entry");
+
+    if (m_stream == nullptr && m_committed == nullptr) {
+        const uint64_t left = m_buffer.size() - m_position;
+        const uint64_t count = std::min(size, left);
+        std::memcpy(out, m_buffer.data() + m_position, count);
+        m_position += count;
+        return count;
+    }
+    uint64_t total = 0;
+    while (total < size) {
+        const int64_t got = m_committed != nullptr
+                                ? m_committed->read(out + total, size - total)
+                                : m_own.readEntryStream(m_stream, out + total, size - total);
+        if (got < 0) throw std::runtime_error("Failed to read archive entry: " + m_name);
+        if (got == 0) break;
+        total += static_cast<uint64_t>(got);
+    }
+    m_position += total;
+    return total;
+}
+
+void EntryStream::close() {
+    if (m_stream != nullptr) {
+        m_own.closeEntryStream(m_stream);
+        m_stream = nullptr;
+    }
+    m_committed.reset();
+    m_own = XLZipArchive();
+    m_buffer = std::string();
+    m_closed = true;
+}
+
+std::vector<std::string> extract_entries(XLDocument& doc,
+                                         const std::vector<EntryExtraction>& entries,
+                                         size_t workers, bool dedup,
+                                         const std::unordered_set<std::string>& inMemory) {
+    std::vector<std::string> written(entries.size());
+    if (entries.empty()) return written;
+
+    IZipArchive& shared = get_archive(doc);
+    std::mutex sharedMutex;
+    // Content key (hash, size) of every entry and, per key, the first entry that has it.
+    // Entries finish out of order, so an earlier duplicate can take over from a later one
+    // that was already written; the later file is removed once all threads are done.
+    using Key = std::pair<size_t, size_t>;
+    std::vector<Key> keys(entries.size());
+    std::vector<char> wrote(entries.size(), 0);
+    std::map<Key, size_t> owner;
+    std::mutex dedupMutex;
+    std::atomic<size_t> next{0};
+    std::exception_ptr error;
+    std::mutex errorMutex;
+    const std::string filePath = doc.path();
+
+    auto work = [&]() {
+        try {
+            XLZipArchive own;
+            try {
+                own.open(filePath);
+            } catch (const std::exception&) {
+                // Encrypted or not yet written: read everything from the shared archive
+            }
+
+            for (size_t i = next++; i < entries.size(); i = next++) {
+                const EntryExtraction& item = entries[i];
+                std::string data;
+                if (own.isOpen() && !inMemory.count(item.entry) && own.hasEntry(item.entry)) {
+                    data = own.getEntry(item.entry);
+                } else {
+                    std::lock_guard<std::mutex> lock(sharedMutex);
+                    if (!shared.hasEntry(item.entry)) {
+                        throw std::runtime_error("Entry not found in archive: " + item.entry);
+                    }
+                    data = shared.getEntry(item.entry);
+                }
+
+                if (dedup) {
+                    keys[i] = {std::hash<std::string_view>{}(data), data.size()};
+                    std::lock_guard<std::mutex> lock(dedupMutex);
+                    auto [it, inserted] = owner.emplace(keys[i], i);
+                    if (!inserted) {
+                        if (it->second < i) continue;
+                        it->second = i;
+                    }
+                }
+
+                std::ofstream out(std::filesystem::u8path(item.target),
+                                  std::ios::binary | std::ios::trunc);
+                out.write(data.data(), static_cast<std::streamsize>(data.size()));
+                if (!out) throw std::runtime_error("Cannot write file: " + item.target);
+                wrote[i] = 1;
+            }
+        } catch (...) {
+            std::lock_guard<std::mutex> lock(errorMutex);
+            if (!error) error = std::current_exception();
+            next = entries.size();  // stop the other workers
+        }
+    };
+
+    workers = std::max<size_t>(1, std::min(workers, entries.size()));
+    std::vector<std::thread> threads;
+    threads.reserve(workers - 1);
+    for (size_t t = 1; t < workers; ++t) threads.emplace_back(work);
+    work();
+    for (auto& thread : threads) thread.join();
+
+    if (error) std::rethrow_exception(error);
+    for (size_t i = 0; i < entries.size(); ++i) {
+        const size_t first = dedup ? owner.at(keys[i]) : i;
+        written[i] = entries[first].target;
+        if (wrote[i] && first != i && entries[i].target != written[i]) {
+            std::error_code ec;
+            std::filesystem::remove(std::filesystem::u8path(entries[i].target), ec);
+        }
+    }
+    return written;
+}
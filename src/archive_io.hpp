@@ -0,0 +1,80 @@
+#ifndef PYOPENXLSX_ARCHIVE_IO_HPP
+#define PYOPENXLSX_ARCHIVE_IO_HPP
+
+/**
+ * @file archive_io.hpp
+ * @brief Chunked and parallel access to the parts of the underlying zip archive.
+ *
+ * get_archive_entry() inflates a whole part into one Python bytes object.
+ * EntryStream reads a part in chunks instead (or straight into a caller's
+ * buffer). An open libzip file on the document's own archive would keep the
+ * archive from being saved, so a stream reads from its own read-only handle
+ * on the workbook file, or for in-memory workbooks on the committed package
+ * (see XLMemoryArchive::openCommittedEntry); only parts changed since they
+ * were last written are inflated into a buffer when the stream is opened. extract_entries() writes
+ * parts straight to disk from several threads. libzip handles are not
+ * thread-safe, so every extraction thread opens its own read-only handle on
+ * the workbook file and only falls back to the document's (shared, locked)
+ * archive for parts that exist in memory only.
+ */
+
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include "bindings.hpp"
+#include "memory_archive.hpp"
+
+class EntryStream {
+   public:
+    // `fromFile` is false for parts that were rewritten since the workbook file was written;
+    // `memory` is the archive of a workbook that is not backed by a file
+    EntryStream(XLDocument& doc, const std::string& path, int64_t chunkSize = 1 << 16,
+                bool fromFile = true, const XLMemoryArchive* memory = nullptr);
+    ~EntryStream();
+    EntryStream(const EntryStream&) = delete;
+    EntryStream& operator=(const EntryStream&) = delete;
+
+    // Up to `size` bytes (everything that is left when size < 0); empty at the end
+    std::string read(int64_t size = -1);
+    // Fill `out` with up to `size` bytes and return how many were read; 0 at the end
+    uint64_t readInto(char* out, uint64_t size);
+    void close();
+    bool closed() const { return m_closed; }
+    const std::string& name() const { return m_name; }
+    // Bytes read so far
+    uint64_t position() const { return m_position; }
+    // Size of the chunks the entry is iterated in
+    int64_t chunkSize() const { return m_chunkSize; }
+
+   private:
+    XLZipArchive m_own;  // read-only handle on the workbook file
+    void* m_stream;      // open entry of m_own
+    std::unique_ptr<XLMemoryArchive::CommittedEntry> m_committed;  // or of the committed package
+    std::string m_buffer;  // the inflated part, when neither is open
+    bool m_closed = false;
+    std::string m_name;
+    uint64_t m_position = 0;
+    int64_t m_chunkSize;
+};
+
+struct EntryExtraction {
+    std::string entry;   // archive path, e.g. "xl/media/image1.png"
+    std::string target;  // output file
+};
+
+/**
+ * Write every `entries[i].entry` to `entries[i].target` using up to `workers`
+ * threads and return the file each entry ended up in. With `dedup`, parts
+ * whose content is identical to an earlier one are not written again and map
+ * to the earlier file instead. Parts listed in `inMemory` are always read from
+ * the open archive, never from the file on disk. Safe to call without the GIL.
+ */
+std::vector<std::string> extract_entries(XLDocument& doc,
+                                         const std::vector<EntryExtraction>& entries,
+                                         size_t workers, bool dedup,
+                                         const std::unordered_set<std::string>& inMemory = {});
+
+#endif  // PYOPENXLSX_ARCHIVE_IO_HPP
@@ -22,4 +22,5 @@ NB_MODULE(_openxlsx, m) {
     init_streams(m);
     init_conditional_formatting(m);
     init_formula_engine(m);
+    init_workbook_template(m);
 }
@@ -1,4 +1,7 @@
+#include <nanobind/stl/optional.h>
+
 #include "internal_access.hpp"
+#include "merge_index.hpp"
 
 void init_cell(py::module_& m) {
     // Bind XLMergeCells
@@ -13,6 +16,16 @@ void init_cell(py::module_& m) {
             return self.merge(index);
         });
 
+    py::class_<MergeIndex>(m, "XLMergeIndex")
+        .def(py::init<const XLMergeCells&>(), py::arg("merges"))
+        .def("__len__", &MergeIndex::size)
+        .def("add", &MergeIndex::add, py::arg("reference"))
+        .def("add_many", &MergeIndex::add_many, py::arg("references"))
+        .def("remove", &MergeIndex::remove, py::arg("reference"))
+        .def("covering", &MergeIndex::covering, py::arg("row"), py::arg("column"))
+        .def("intersecting", &MergeIndex::intersecting, py::arg("first_row"),
+             py::arg("first_column"), py::arg("last_row"), py::arg("last_column"));
+
     // Bind XLCellReference
     py::class_<XLCellReference>(m, "XLCellReference")
         .def(py::init<const std::string&>())
@@ -26,6 +39,8 @@ void init_cell(py::module_& m) {
         .def("address", &XLCellRange::address)
         .def("num_rows", &XLCellRange::numRows)
         .def("num_columns", &XLCellRange::numColumns)
+        .def("top_left", &XLCellRange::topLeft)
+        .def("bottom_right", &XLCellRange::bottomRight)
         .def("clear", &XLCellRange::clear)
         .def(
             "__iter__",
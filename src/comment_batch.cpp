@@ -0,0 +1,282 @@
+#include "comment_batch.hpp"
+
+#include <algorithm>
+#include <cctype>
+#include <cstdlib>
+#include <unordered_map>
+
+#include "internal_access.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+constexpr const char* kDefaultAuthor = "pyopenxlsx";
+constexpr const char* kSharedShapeTypeId = "pyopenxlsx_note";
+
+// The note XLComments::set produces, minus the whitespace nodes
+constexpr const char* kNoteShape =
+    R"(<v:shape id="" type="" fillcolor="#ffffc0" stroked="t" o:allowincell="f" style="" )"
+    R"(o:insetmode="auto"><v:textbox style="mso-direction-alt:auto"><div style="text-align:left"/>)"
+    R"(</v:textbox><x:ClientData ObjectType="Note"><x:MoveWithCells/><x:SizeWithCells/><x:Anchor/>)"
+    R"(<x:AutoFill>True</x:AutoFill><x:TextVAlign>Top</x:TextVAlign><x:TextHAlign>Left</x:TextHAlign>)"
+    R"(<x:Row/><x:Column/></x:ClientData><v:path o:connecttype="rect"/></v:shape>)";
+
+// With a shared shape type, a note only carries what differs between notes
+constexpr const char* kSharedNoteShape =
+    R"(<v:shape id="" type="" style=""><x:ClientData ObjectType="Note"><x:MoveWithCells/>)"
+    R"(<x:SizeWithCells/><x:Anchor/><x:AutoFill>True</x:AutoFill><x:TextVAlign>Top</x:TextVAlign>)"
+    R"(<x:TextHAlign>Left</x:TextHAlign><x:Row/><x:Column/></x:ClientData></v:shape>)";
+
+constexpr const char* kSharedShapeType =
+    R"(<v:shapetype id="pyopenxlsx_note" coordsize="21600,21600" o:spt="202" )"
+    R"(path="m,l,21600l21600,21600l21600,xe" fillcolor="#ffffc0" stroked="t" o:allowincell="f" )"
+    R"(o:insetmode="auto"><v:stroke joinstyle="miter"/><v:path gradientshapeok="t" )"
+    R"(o:connecttype="rect"/><v:textbox style="mso-direction-alt:auto">)"
+    R"(<div style="text-align:left"/></v:textbox></v:shapetype>)";
+
+struct Entry {
+    uint64_t key;  // row << 16 | column, so keys sort in sheet order
+    uint32_t row;
+    uint16_t col;
+    const CommentItem* item;
+};
+
+uint64_t cell_key(uint32_t row, uint16_t col) { return (static_cast<uint64_t>(row) << 16) | col; }
+
+// Key of a node's "ref" attribute; 0 (before every cell) when it is malformed
+uint64_t ref_key(const char* ref) {
+    uint32_t row = 0;
+    uint16_t col = 0;
+    return parse_cell_ref(ref, row, col) ? cell_key(row, col) : 0;
+}
+
+// Trailing number of a VML shape id such as "shape_12" or "_x0000_s1025"
+uint32_t shape_number(const char* id) {
+    const char* end = id + std::char_traits<char>::length(id);
+    const char* digits = end;
+    while (digits > id && std::isdigit(static_cast<unsigned char>(digits[-1]))) --digits;
+    return digits == end ? 0 : static_cast<uint32_t>(std::strtoul(digits, nullptr, 10));
+}
+
+// Remove a node together with the indentation in front of it
+void remove_node(XMLNode node) {
+    XMLNode parent = node.parent();
+    while (node.previous_sibling().type() == pugi::node_pcdata) {
+        parent.remove_child(node.previous_sibling());
+    }
+    parent.remove_child(node);
+}
+
+uint16_t sheet_xml_number(const XLWorksheet& ws) {
+    const std::string sheetPath = get_xml_path(ws);
+    const std::string fileName = sheetPath.substr(sheetPath.find_last_of('/') + 1);
+    return static_cast<uint16_t>(std::strtoul(fileName.c_str() + 5, nullptr, 10));
+}
+
+// Author index by name, appending names the sheet does not know yet
+class AuthorTable {
+   public:
+    explicit AuthorTable(XMLNode authors) : m_authors(authors) {
+        for (XMLNode author = authors.first_child_of_type(pugi::node_element); !author.empty();
+             author = author.next_sibling_of_type(pugi::node_element)) {
+            m_ids.emplace(author.text().get(), m_count++);
+        }
+    }
+
+    uint16_t id(const std::string& name) {
+        if (name.empty()) return m_count == 0 ? id(kDefaultAuthor) : 0;
+        auto [it, inserted] = m_ids.emplace(name, m_count);
+        if (inserted) {
+            m_authors.append_child("author").text().set(name.c_str());
+            ++m_count;
+        }
+        return it->second;
+    }
+
+   private:
+    XMLNode m_authors;
+    std::unordered_map<std::string, uint16_t> m_ids;
+    uint16_t m_count = 0;
+};
+
+void write_comment(XMLNode comment, uint16_t authorId, const std::string& text) {
+    XMLAttribute author = comment.attribute("authorId");
+    if (author.empty()) author = comment.append_attribute("authorId");
+    author.set_value(authorId);
+    XMLNode t = comment.append_child("text").append_child("t");
+    t.append_attribute("xml:space").set_value("preserve");
+    t.text().set(text.c_str());
+}
+
+// The x:Anchor of a note next to (row, col), as in XLComments::set: one column to the
+// right and one row down, or to the left/above when the box would leave the sheet
+std::string note_anchor(uint32_t row, uint16_t col, uint16_t widthCols, uint16_t heightRows) {
+    uint32_t left, right, top, bottom;
+    if (kExcelMaxCols - col > 1 + widthCols) {
+        left = col;
+        right = col + widthCols;
+    } else {
+        left = col - 2u - widthCols;
+        right = col - 2u;
+    }
+    if (kExcelMaxRows - row > 1u + heightRows) {
+        top = row;
+        bottom = row + heightRows;
+    } else {
+        top = row - 2u - heightRows;
+        bottom = row - 2u;
+    }
+    return std::to_string(left) + ",10," + std::to_string(top) + ",5," + std::to_string(right) +
+           ",10," + std::to_string(bottom) + ",5";
+}
+
+}  // namespace
+
+std::pair<uint16_t, uint16_t> comment_box_size(const std::string& text) {
+    size_t lines = 1;
+    size_t width = 0;
+    size_t maxWidth = 0;
+    for (unsigned char c : text) {
+        if (c == '\n') {
+            ++lines;
+            width = 0;
+        } else if ((c & 0xC0) != 0x80) {  // count code points, not UTF-8 continuation bytes
+            width += c > 127 ? 2 : 1;
+            maxWidth = std::max(maxWidth, width);
+        }
+    }
+    const size_t cols = std::clamp<size_t>(maxWidth / 10 + 1, 3, 12);
+    const size_t rows = std::clamp<size_t>(lines + 1, 3, 1000);
+    return {static_cast<uint16_t>(cols), static_cast<uint16_t>(rows)};
+}
+
+size_t add_comments(XLWorksheet& ws, const std::vector<CommentItem>& items, bool sharedShape) {
+    std::vector<Entry> entries;
+    entries.reserve(items.size());
+    for (const CommentItem& item : items) {
+        Entry entry{0, 0, 0, &item};
+        if (!parse_cell_ref(item.ref.c_str(), entry.row, entry.col)) {
+            throw py::value_error(("Invalid cell reference: " + item.ref).c_str());
+        }
+        entry.key = cell_key(entry.row, entry.col);
+        entries.push_back(entry);
+    }
+    // Sheet order; of a cell listed twice only the last comment is kept
+    std::stable_sort(entries.begin(), entries.end(),
+                     [](const Entry& a, const Entry& b) { return a.key < b.key; });
+    size_t kept = 0;
+    for (size_t i = 0; i < entries.size(); ++i) {
+        if (i + 1 < entries.size() && entries[i + 1].key == entries[i].key) continue;
+        entries[kept++] = entries[i];
+    }
+    entries.resize(kept);
+    if (entries.empty()) return 0;
+
+    // Creates the comments and VML parts with their relationships when missing
+    XLComments& comments = ws.comments();
+    XLVmlDrawing& vml = ws.vmlDrawing();
+
+    // ===== Comments: merge the sorted batch into the (sorted) comment list
+    XMLNode root = get_xml_doc(comments).document_element();
+    XMLNode commentList = root.child("commentList");
+    AuthorTable authors(root.child("authors"));
+
+    std::unordered_map<uint64_t, XMLNode> existing;
+    for (XMLNode node = commentList.child("comment"); !node.empty();
+         node = node.next_sibling("comment")) {
+        existing.emplace(ref_key(node.attribute("ref").value()), node);
+    }
+    XMLNode next = commentList.child("comment");
+    uint64_t nextKey = next.empty() ? 0 : ref_key(next.attribute("ref").value());
+    for (const Entry& entry : entries) {
+        XMLNode comment;
+        auto found = existing.find(entry.key);
+        if (found != existing.end()) {
+            comment = found->second;
+            comment.remove_children();
+        } else {
+            while (!next.empty() && nextKey < entry.key) {
+                next = next.next_sibling("comment");
+                if (!next.empty()) nextKey = ref_key(next.attribute("ref").value());
+            }
+            comment = next.empty() ? commentList.append_child("comment")
+                                   : commentList.insert_child_before("comment", next);
+            comment.append_attribute("ref").set_value(make_cell_ref(entry.row, entry.col).c_str());
+        }
+        write_comment(comment, authors.id(entry.item->author), entry.item->text);
+    }
+
+    // ===== VML: drop the notes being replaced, then clone one new shape per comment
+    XMLNode vmlRoot = get_xml_doc(vml).document_element();
+    std::string shapeType;
+    XMLNode lastShapeType;
+    bool hasSharedType = false;
+    uint32_t shapeId = 0;
+    bool anyShape = false;
+    std::unordered_map<uint64_t, XMLNode> notes;
+    for (XMLNode node = vmlRoot.first_child_of_type(pugi::node_element); !node.empty();
+         node = node.next_sibling_of_type(pugi::node_element)) {
+        const std::string_view name = node.name();
+        if (name == "v:shapetype") {
+            if (shapeType.empty()) shapeType = node.attribute("id").value();
+            hasSharedType |= std::string_view(node.attribute("id").value()) == kSharedShapeTypeId;
+            lastShapeType = node;
+        } else if (name == "v:shape") {
+            shapeId = std::max(shapeId, shape_number(node.attribute("id").value()));
+            anyShape = true;
+            XMLNode clientData = node.child("x:ClientData");
+            if (std::string_view(clientData.attribute("ObjectType").value()) == "Note") {
+                notes.emplace(cell_key(clientData.child("x:Row").text().as_uint() + 1,
+                                       static_cast<uint16_t>(
+                                           clientData.child("x:Column").text().as_uint() + 1)),
+                              node);
+            }
+        }
+    }
+    if (anyShape) ++shapeId;
+
+    if (sharedShape) {
+        if (!hasSharedType) {
+            pugi::xml_document typeDoc;
+            typeDoc.load_string(kSharedShapeType);
+            if (lastShapeType.empty()) {
+                vmlRoot.prepend_copy(typeDoc.document_element());
+            } else {
+                vmlRoot.insert_copy_after(typeDoc.document_element(), lastShapeType);
+            }
+        }
+        shapeType = kSharedShapeTypeId;
+    }
+    const std::string typeRef = "#" + shapeType;
+    const std::string style = XLShapeStyle().raw();
+
+    pugi::xml_document shapeDoc;
+    shapeDoc.load_string(sharedShape ? kSharedNoteShape : kNoteShape);
+    XMLNode shapeTemplate = shapeDoc.document_element();
+    shapeTemplate.attribute("type").set_value(typeRef.c_str());
+    shapeTemplate.attribute("style").set_value(style.c_str());
+
+    for (const Entry& entry : entries) {
+        auto note = notes.find(entry.key);
+        if (note != notes.end()) remove_node(note->second);
+
+        XMLNode shape = vmlRoot.append_copy(shapeTemplate);
+        shape.attribute("id").set_value(("shape_" + std::to_string(shapeId++)).c_str());
+        XMLNode clientData = shape.child("x:ClientData");
+        const auto [widthCols, heightRows] = comment_box_size(entry.item->text);
+        clientData.child("x:Anchor")
+            .text()
+            .set(note_anchor(entry.row, entry.col, widthCols, heightRows).c_str());
+        clientData.child("x:Row").text().set(entry.row - 1);
+        clientData.child("x:Column").text().set(entry.col - 1);
+    }
+
+    // XLComments caches comment nodes by reference and XLVmlDrawing counts its shapes;
+    // reload both over the edited XML so later single-comment calls see the batch
+    XLDocument& doc = get_parent_doc(ws);
+    const uint16_t sheetNo = sheet_xml_number(ws);
+    vml = doc.sheetVmlDrawing(sheetNo);
+    comments = doc.sheetComments(sheetNo);
+    comments.setVmlDrawing(vml);
+    return entries.size();
+}
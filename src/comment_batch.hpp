@@ -0,0 +1,41 @@
+#ifndef PYOPENXLSX_COMMENT_BATCH_HPP
+#define PYOPENXLSX_COMMENT_BATCH_HPP
+
+/**
+ * @file comment_batch.hpp
+ * @brief Batch insertion of legacy (note) comments.
+ *
+ * XLComments::set looks up its author, walks the comment list to find the
+ * insertion point and builds the VML shape of the note attribute by attribute,
+ * so annotating many cells is quadratic. add_comments() sorts the batch once,
+ * interns authors in a hash table, merges the new comments into the comment
+ * list in a single pass and clones every VML shape from one prebuilt template.
+ */
+
+#include <cstdint>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "bindings.hpp"
+
+struct CommentItem {
+    std::string ref;  // "B2"
+    std::string text;
+    std::string author;  // empty for the first author of the sheet ("pyopenxlsx" if none)
+};
+
+// Size of the note box in (columns, rows), estimated from the text: wider for longer
+// lines (non-ASCII characters count double), one row per line plus one.
+std::pair<uint16_t, uint16_t> comment_box_size(const std::string& text);
+
+/**
+ * Add or replace the comments of `items` on `ws` and return how many were
+ * written (a cell listed twice keeps its last comment). Raises ValueError for
+ * malformed cell references. With `sharedShape`, the fill, border and text box
+ * settings of the notes live in one VML shape type that every note refers to,
+ * instead of being repeated on every shape. Safe to call without the GIL.
+ */
+size_t add_comments(XLWorksheet& ws, const std::vector<CommentItem>& items, bool sharedShape);
+
+#endif  // PYOPENXLSX_COMMENT_BATCH_HPP
@@ -1,6 +1,10 @@
 #include "bindings.hpp"
+#include "comment_batch.hpp"
 
 void init_comments(py::module_& m) {
+    m.def("comment_box_size", &comment_box_size, py::arg("text"),
+          "Estimated (columns, rows) of a note box for the given comment text");
+
     py::class_<XLThreadedComment>(m, "XLThreadedComment")
         .def(py::init<>())
         .def_prop_ro("valid", &XLThreadedComment::valid)
@@ -1,4 +1,353 @@
-#include "bindings.hpp"
+#include "conditional_formatting.hpp"
+
+#include <algorithm>
+#include <cstring>
+#include <tuple>
+#include <unordered_map>
+
+#include "internal_access.hpp"
+#include "ref_shift.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+struct StringWriter : pugi::xml_writer {
+    std::string out;
+    void write(const void* data, size_t size) override {
+        out.append(static_cast<const char*>(data), size);
+    }
+};
+
+std::string serialize(const XMLNode& node) {
+    StringWriter writer;
+    node.print(writer, "", pugi::format_raw);
+    return std::move(writer.out);
+}
+
+// Rules that evaluate each cell on its own, so applying one to several ranges at once
+// gives the same result as applying it to each range separately
+bool is_cell_local(XLCfType type) {
+    switch (type) {
+        case XLCfType::Expression:
+        case XLCfType::CellIs:
+        case XLCfType::ContainsText:
+        case XLCfType::NotContainsText:
+        case XLCfType::BeginsWith:
+        case XLCfType::EndsWith:
+        case XLCfType::ContainsBlanks:
+        case XLCfType::NotContainsBlanks:
+        case XLCfType::ContainsErrors:
+        case XLCfType::NotContainsErrors:
+        case XLCfType::TimePeriod:
+            return true;
+        default:
+            return false;
+    }
+}
+
+void write_anchored(std::string& out, const ref_shift_detail::RefPart& part, uint32_t anchorRow,
+                    uint16_t anchorCol) {
+    if (part.col != 0) {
+        out += part.colAbs ? "C" + std::to_string(part.col)
+                           : "C[" + std::to_string(int64_t{part.col} - anchorCol) + "]";
+    }
+    if (part.row != 0) {
+        out += part.rowAbs ? "R" + std::to_string(part.row)
+                           : "R[" + std::to_string(int64_t{part.row} - anchorRow) + "]";
+    }
+}
+
+// Copy a quoted run ("text", 'Sheet name', [Column]) starting at f[i] verbatim
+size_t copy_quoted(std::string_view f, size_t i, std::string& out) {
+    const char open = f[i];
+    const char close = open == '[' ? ']' : open;
+    size_t j = i + 1;
+    while (j < f.size()) {
+        if (f[j] == close) {
+            if (close != ']' && j + 1 < f.size() && f[j + 1] == close) {
+                j += 2;
+                continue;
+            }
+            break;
+        }
+        ++j;
+    }
+    j = std::min(j + 1, f.size());
+    out.append(f.substr(i, j - i));
+    return j;
+}
+
+// A formula with its relative references rewritten as offsets from (anchorRow, anchorCol),
+// so the same rule written for different ranges compares equal
+std::string anchor_relative_formula(std::string_view f, uint32_t anchorRow, uint16_t anchorCol) {
+    using namespace ref_shift_detail;
+    std::string out;
+    out.reserve(f.size() + 16);
+    size_t i = 0;
+    while (i < f.size()) {
+        const char ch = f[i];
+        if (ch == '"' || ch == '\'' || ch == '[') {
+            i = copy_quoted(f, i, out);
+            continue;
+        }
+        size_t end = 0;
+        RefPart a;
+        RefPart b;
+        bool isArea = false;
+        if ((i == 0 || !is_ident_char(f[i - 1])) && parse_ref(f, i, end, a, b, isArea)) {
+            write_anchored(out, a, anchorRow, anchorCol);
+            if (isArea) {
+                out += ':';
+                write_anchored(out, b, anchorRow, anchorCol);
+            }
+            i = end;
+            continue;
+        }
+        out += ch;
+        ++i;
+    }
+    return out;
+}
+
+struct Block {
+    uint32_t firstRow = 0;
+    uint32_t lastRow = 0;
+    uint16_t firstCol = 0;
+    uint16_t lastCol = 0;
+};
+
+// Append the ranges of a space-separated sqref to `blocks`; false if one can't be parsed
+bool parse_sqref(const std::string& sqref, std::vector<Block>& blocks) {
+    const size_t count = blocks.size();
+    size_t pos = 0;
+    while (pos < sqref.size()) {
+        size_t end = sqref.find(' ', pos);
+        if (end == std::string::npos) end = sqref.size();
+        if (end > pos) {
+            Block b;
+            if (!parse_range_ref(sqref.substr(pos, end - pos), b.firstRow, b.firstCol, b.lastRow,
+                                 b.lastCol)) {
+                blocks.resize(count);
+                return false;
+            }
+            blocks.push_back(b);
+        }
+        pos = end + 1;
+    }
+    return blocks.size() > count;
+}
+
+// Top-left cell of the area spanned by `blocks`, which relative formula references are
+// relative to
+std::pair<uint32_t, uint16_t> top_left(const std::vector<Block>& blocks) {
+    uint32_t row = kExcelMaxRows;
+    uint16_t col = kExcelMaxCols;
+    for (const Block& b : blocks) {
+        row = std::min(row, b.firstRow);
+        col = std::min(col, b.firstCol);
+    }
+    return {row, col};
+}
+
+// Identity of a cell-local rule placed at `sqref`, or "" when it can't be merged
+std::string merge_key(const XLCfRule& rule, const std::string& sqref) {
+    std::vector<Block> blocks;
+    if (!is_cell_local(rule.type()) || !parse_sqref(sqref, blocks)) return {};
+    const auto [anchorRow, anchorCol] = top_left(blocks);
+    // Serialise with anchored formulas, then put the originals back
+    std::vector<std::pair<XMLNode, std::string>> formulas;
+    for (XMLNode f = rule.node().child("formula"); !f.empty(); f = f.next_sibling("formula")) {
+        formulas.emplace_back(f, f.text().get());
+        f.text().set(anchor_relative_formula(formulas.back().second, anchorRow, anchorCol).c_str());
+    }
+    std::string key = serialize(rule.node());
+    for (auto& [node, text] : formulas) node.text().set(text.c_str());
+    return key;
+}
+
+// A copy of `rule` that owns its XML. Copying an XLCfRule only copies the XML when the rule
+// owns it; one backed by a sheet's node would share it, and the batch edits its copy.
+XLCfRule detached_rule(const XLCfRule& rule) {
+    XLCfRule copy;
+    XMLNode node = copy.node();
+    for (auto attr = rule.node().first_attribute(); attr; attr = attr.next_attribute()) {
+        node.append_attribute(attr.name()).set_value(attr.value());
+    }
+    for (XMLNode child = rule.node().first_child(); !child.empty(); child = child.next_sibling()) {
+        node.append_copy(child);
+    }
+    return copy;
+}
+
+struct RuleGroup {
+    XLCfRule rule;
+    std::string sqref;          // as given while the group holds a single sqref
+    std::vector<Block> blocks;  // of every sqref added
+    size_t added = 0;
+    uint32_t anchorRow = 0;  // top-left cell of the first sqref, which the formulas are for
+    uint16_t anchorCol = 0;
+
+    void add(const std::string& ref) {
+        if (added++ == 0) {
+            sqref = ref;
+            if (parse_sqref(ref, blocks)) std::tie(anchorRow, anchorCol) = top_left(blocks);
+            return;
+        }
+        parse_sqref(ref, blocks);  // merged rules only ever have parseable sqrefs
+    }
+
+    // For a merged group: the sqref becomes its blocks in reading order, with repeats dropped
+    // and touching blocks of the same columns or rows joined ("B3 B1 B2" -> "B1:B3"), and the
+    // relative references of the formulas move with the new top-left cell
+    void finish() {
+        if (added < 2) return;
+
+        auto join = [this](bool down) {
+            std::sort(blocks.begin(), blocks.end(), [down](const Block& a, const Block& b) {
+                return down ? std::tie(a.firstCol, a.lastCol, a.firstRow) <
+                                  std::tie(b.firstCol, b.lastCol, b.firstRow)
+                            : std::tie(a.firstRow, a.lastRow, a.firstCol) <
+                                  std::tie(b.firstRow, b.lastRow, b.firstCol);
+            });
+            std::vector<Block> joined;
+            for (const Block& b : blocks) {
+                if (!joined.empty()) {
+                    Block& prev = joined.back();
+                    if (down && b.firstCol == prev.firstCol && b.lastCol == prev.lastCol &&
+                        b.firstRow <= prev.lastRow + 1) {
+                        prev.lastRow = std::max(prev.lastRow, b.lastRow);
+                        continue;
+                    }
+                    if (!down && b.firstRow == prev.firstRow && b.lastRow == prev.lastRow &&
+                        b.firstCol <= prev.lastCol + 1) {
+                        prev.lastCol = std::max(prev.lastCol, b.lastCol);
+                        continue;
+                    }
+                }
+                joined.push_back(b);
+            }
+            blocks.swap(joined);
+        };
+        join(true);
+        join(false);
+        std::sort(blocks.begin(), blocks.end(), [](const Block& a, const Block& b) {
+            return std::tie(a.firstRow, a.firstCol) < std::tie(b.firstRow, b.firstCol);
+        });
+
+        sqref.clear();
+        for (const Block& b : blocks) {
+            if (!sqref.empty()) sqref += ' ';
+            sqref += make_cell_ref(b.firstRow, b.firstCol);
+            if (b.lastRow != b.firstRow || b.lastCol != b.firstCol) {
+                sqref += ':' + make_cell_ref(b.lastRow, b.lastCol);
+            }
+        }
+
+        const auto [newRow, newCol] = top_left(blocks);
+        if (newRow == anchorRow && newCol == anchorCol) return;
+        for (XMLNode f = rule.node().child("formula"); !f.empty(); f = f.next_sibling("formula")) {
+            f.text().set(translate_formula_refs(f.text().get(), int64_t{newRow} - anchorRow,
+                                                int64_t{newCol} - anchorCol, kExcelMaxRows,
+                                                kExcelMaxCols)
+                             .c_str());
+        }
+    }
+};
+
+}  // namespace
+
+size_t add_conditional_formats(XLWorksheet& ws, const std::vector<std::string>& sqrefs,
+                               const std::vector<const XLCfRule*>& rules,
+                               const std::vector<std::optional<XLDxf>>& dxfs) {
+    Expects(rules.size() == sqrefs.size() && dxfs.size() == sqrefs.size());
+
+    XLStyles& styles = get_parent_doc(ws).styles();
+    std::unordered_map<std::string, XLStyleIndex> dxfIds;
+    bool existingDxfsIndexed = false;
+
+    std::vector<RuleGroup> groups;
+    std::unordered_map<std::string, size_t> groupByKey;
+    for (size_t i = 0; i < sqrefs.size(); ++i) {
+        if (rules[i] == nullptr) throw py::value_error("rule must not be None");
+        const std::string& sqref = sqrefs[i];
+        XLCfRule rule = detached_rule(*rules[i]);
+        rule.node().remove_attribute("priority");
+
+        const std::optional<XLDxf>& dxf = dxfs[i];
+        if (dxf && !dxf->node().first_child().empty()) {
+            if (!existingDxfsIndexed) {
+                XLDxfs& pool = styles.dxfs();
+                XMLNode node = pool.count() > 0 ? pool[0].node() : XMLNode();
+                for (XLStyleIndex k = 0; !node.empty(); node = node.next_sibling("dxf"), ++k) {
+                    dxfIds.emplace(serialize(node), k);
+                }
+                existingDxfsIndexed = true;
+            }
+            auto [it, inserted] = dxfIds.try_emplace(serialize(dxf->node()), 0);
+            if (inserted) it->second = styles.addDxf(*dxf);
+            rule.setDxfId(it->second);
+        }
+
+        std::string key = merge_key(rule, sqref);
+        if (!key.empty()) {
+            auto found = groupByKey.find(key);
+            if (found != groupByKey.end()) {
+                groups[found->second].add(sqref);
+                continue;
+            }
+            groupByKey.emplace(std::move(key), groups.size());
+        }
+        groups.push_back({std::move(rule)});
+        groups.back().add(sqref);
+    }
+
+    // New rules rank below every existing one (a higher number is a lower priority)
+    XMLNode sheetNode = get_xml_doc(ws).document_element();
+    uint32_t priority = 0;
+    for (XMLNode cf = sheetNode.child("conditionalFormatting"); !cf.empty();
+         cf = cf.next_sibling("conditionalFormatting")) {
+        for (XMLNode r = cf.child("cfRule"); !r.empty(); r = r.next_sibling("cfRule")) {
+            priority = std::max(priority, r.attribute("priority").as_uint());
+        }
+    }
+
+    XMLNode last;  // most recently written <conditionalFormatting>
+    for (RuleGroup& group : groups) {
+        ++priority;
+        group.finish();
+        if (group.rule.type() == XLCfType::DataBar) {
+            // OpenXLSX moves the data bar's x14 extension into the worksheet <extLst>
+            ws.addConditionalFormatting(group.sqref, group.rule);
+            last = XMLNode();
+            continue;
+        }
+
+        XMLNode cf;
+        if (last.empty()) {
+            // The first block is placed by OpenXLSX according to the worksheet node order
+            ws.conditionalFormats().create();
+            cf = sheetNode.last_child();
+            while (!cf.empty() && std::strcmp(cf.name(), "conditionalFormatting") != 0) {
+                cf = cf.previous_sibling();
+            }
+        } else {
+            cf = sheetNode.insert_child_after("conditionalFormatting", last);
+        }
+        cf.append_attribute("sqref").set_value(group.sqref.c_str());
+
+        XMLNode ruleNode = cf.append_child("cfRule");
+        for (auto attr = group.rule.node().first_attribute(); attr; attr = attr.next_attribute()) {
+            ruleNode.append_attribute(attr.name()).set_value(attr.value());
+        }
+        ruleNode.append_attribute("priority").set_value(priority);
+        for (XMLNode child = group.rule.node().first_child(); !child.empty();
+             child = child.next_sibling()) {
+            ruleNode.append_copy(child);
+        }
+        last = cf;
+    }
+    return groups.size();
+}
 
 void init_conditional_formatting(py::module_& m) {
     py::enum_<XLCfOperator>(m, "XLCfOperator")
@@ -0,0 +1,26 @@
+#ifndef PYOPENXLSX_CONDITIONAL_FORMATTING_HPP
+#define PYOPENXLSX_CONDITIONAL_FORMATTING_HPP
+
+#include <optional>
+#include <string>
+#include <vector>
+
+#include "bindings.hpp"
+
+/**
+ * Add many conditional formatting rules in one pass. `sqrefs`, `rules` and `dxfs` are
+ * parallel; a missing (or childless) dxf leaves the rule without differential formatting.
+ *
+ * Identical dxfs share one <dxf> entry, reusing an existing identical one in styles.xml.
+ * Identical cell-local rules (cellIs, expression, text, blanks, errors, time period) are
+ * merged into a single <conditionalFormatting> whose sqref lists every range; formulas
+ * match when their relative references point at the same offsets from each range's
+ * top-left cell. Range-aggregate rules (color scales, data bars, icon sets, top/bottom,
+ * average, duplicates) keep one block per entry, since merging would change what they
+ * compare against. Returns the number of rules written after merging.
+ */
+size_t add_conditional_formats(XLWorksheet& ws, const std::vector<std::string>& sqrefs,
+                               const std::vector<const XLCfRule*>& rules,
+                               const std::vector<std::optional<XLDxf>>& dxfs);
+
+#endif  // PYOPENXLSX_CONDITIONAL_FORMATTING_HPP
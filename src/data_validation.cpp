@@ -1,4 +1,155 @@
-#include "bindings.hpp"
+#include "data_validation.hpp"
+
+#include <algorithm>
+#include <tuple>
+#include <unordered_map>
+#include <unordered_set>
+
+#include "internal_access.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+struct Block {
+    uint32_t firstRow;
+    uint32_t lastRow;
+    uint16_t firstCol;
+    uint16_t lastCol;
+};
+
+// Merge overlapping or adjacent blocks that share their columns (vertical) or their
+// rows (horizontal). Each pass is a sort and a linear sweep.
+void coalesce(std::vector<Block>& blocks) {
+    auto sweep = [&blocks](auto sameSpan, auto start, auto end, auto setEnd) {
+        std::vector<Block> merged;
+        merged.reserve(blocks.size());
+        for (const Block& b : blocks) {
+            if (!merged.empty() && sameSpan(merged.back(), b) &&
+                start(b) <= end(merged.back()) + 1) {
+                setEnd(merged.back(), std::max(end(merged.back()), end(b)));
+            } else {
+                merged.push_back(b);
+            }
+        }
+        blocks.swap(merged);
+    };
+
+    std::sort(blocks.begin(), blocks.end(), [](const Block& a, const Block& b) {
+        return std::tie(a.firstCol, a.lastCol, a.firstRow) <
+               std::tie(b.firstCol, b.lastCol, b.firstRow);
+    });
+    sweep([](const Block& a,
+             const Block& b) { return a.firstCol == b.firstCol && a.lastCol == b.lastCol; },
+          [](const Block& b) { return b.firstRow; }, [](const Block& b) { return b.lastRow; },
+          [](Block& b, uint32_t v) { b.lastRow = v; });
+
+    std::sort(blocks.begin(), blocks.end(), [](const Block& a, const Block& b) {
+        return std::tie(a.firstRow, a.lastRow, a.firstCol) <
+               std::tie(b.firstRow, b.lastRow, b.firstCol);
+    });
+    sweep([](const Block& a,
+             const Block& b) { return a.firstRow == b.firstRow && a.lastRow == b.lastRow; },
+          [](const Block& b) { return uint32_t{b.firstCol}; },
+          [](const Block& b) { return uint32_t{b.lastCol}; },
+          [](Block& b, uint32_t v) { b.lastCol = static_cast<uint16_t>(v); });
+
+    std::sort(blocks.begin(), blocks.end(), [](const Block& a, const Block& b) {
+        return std::tie(a.firstRow, a.firstCol) < std::tie(b.firstRow, b.firstCol);
+    });
+}
+
+std::string config_key(const XLDataValidationConfig& c) {
+    std::string key;
+    key += static_cast<char>(c.type);
+    key += static_cast<char>(c.operator_);
+    key += static_cast<char>(c.imeMode);
+    key += static_cast<char>(c.errorStyle);
+    key += static_cast<char>(c.allowBlank | c.showDropDown << 1 | c.showInputMessage << 2 |
+                             c.showErrorMessage << 3);
+    for (const std::string* field :
+         {&c.promptTitle, &c.prompt, &c.errorTitle, &c.error, &c.formula1, &c.formula2}) {
+        key += std::to_string(field->size());
+        key += ':';
+        key += *field;
+    }
+    return key;
+}
+
+struct ValidationGroup {
+    const XLDataValidationConfig* config;
+    std::vector<Block> blocks;
+    std::vector<std::string> other;  // references that are not plain blocks
+    std::unordered_set<std::string> otherSeen;
+
+    void add(const std::string& sqref) {
+        size_t pos = 0;
+        while (pos < sqref.size()) {
+            size_t end = sqref.find(' ', pos);
+            if (end == std::string::npos) end = sqref.size();
+            if (end > pos) {
+                const std::string ref = sqref.substr(pos, end - pos);
+                Block b{};
+                if (parse_range_ref(ref, b.firstRow, b.firstCol, b.lastRow, b.lastCol)) {
+                    blocks.push_back(b);
+                } else if (otherSeen.insert(ref).second) {
+                    other.push_back(ref);
+                }
+            }
+            pos = end + 1;
+        }
+    }
+
+    std::string sqref() {
+        coalesce(blocks);
+        std::string out;
+        for (const Block& b : blocks) {
+            if (!out.empty()) out += ' ';
+            out += make_cell_ref(b.firstRow, b.firstCol);
+            if (b.lastRow != b.firstRow || b.lastCol != b.firstCol) {
+                out += ':' + make_cell_ref(b.lastRow, b.lastCol);
+            }
+        }
+        for (const std::string& ref : other) {
+            if (!out.empty()) out += ' ';
+            out += ref;
+        }
+        return out;
+    }
+};
+
+}  // namespace
+
+size_t add_data_validations(XLWorksheet& ws, const std::vector<std::string>& sqrefs,
+                            const std::vector<XLDataValidationConfig>& configs) {
+    Expects(configs.size() == sqrefs.size());
+
+    std::vector<ValidationGroup> groups;
+    std::unordered_map<std::string, size_t> groupByKey;
+    for (size_t i = 0; i < sqrefs.size(); ++i) {
+        auto [it, inserted] = groupByKey.try_emplace(config_key(configs[i]), groups.size());
+        if (inserted) groups.push_back({&configs[i]});
+        groups[it->second].add(sqrefs[i]);
+    }
+    if (groups.empty()) return 0;
+
+    // XLDataValidations::append recounts every <dataValidation> per call, so it is only
+    // used to create the first element (and the container, in schema order)
+    XLDataValidation dv = ws.dataValidations().append();
+    XMLNode container = get_xml_doc(ws).document_element().child("dataValidations");
+    for (size_t g = 0; g < groups.size(); ++g) {
+        if (g > 0) dv = XLDataValidation(container.append_child("dataValidation"));
+        dv.setSqref(groups[g].sqref());
+        dv.applyConfig(*groups[g].config);
+    }
+
+    size_t count = 0;
+    for (XMLNode n = container.child("dataValidation"); !n.empty();
+         n = n.next_sibling("dataValidation")) {
+        ++count;
+    }
+    container.attribute("count").set_value(count);
+    return groups.size();
+}
 
 void init_data_validation(py::module_& m) {
     // Bind XLDataValidationConfig
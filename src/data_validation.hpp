@@ -0,0 +1,22 @@
+#ifndef PYOPENXLSX_DATA_VALIDATION_HPP
+#define PYOPENXLSX_DATA_VALIDATION_HPP
+
+#include <string>
+#include <vector>
+
+#include "bindings.hpp"
+
+/**
+ * Add many data validations in one pass. `sqrefs` and `configs` are parallel.
+ *
+ * Entries with identical configs share one <dataValidation>. Its sqref is the union of
+ * their ranges, coalesced in O(n log n): overlapping or adjacent blocks with the same
+ * columns merge vertically, then blocks with the same rows merge horizontally, and the
+ * result is listed in row-major order ("A1 A2 B1 B2" -> "A1:B2"). References that are
+ * not plain cell blocks (e.g. whole columns) are kept verbatim.
+ * Returns the number of <dataValidation> elements written.
+ */
+size_t add_data_validations(XLWorksheet& ws, const std::vector<std::string>& sqrefs,
+                            const std::vector<XLDataValidationConfig>& configs);
+
+#endif  // PYOPENXLSX_DATA_VALIDATION_HPP
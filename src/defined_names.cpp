@@ -1,6 +1,7 @@
 #include <nanobind/stl/optional.h>
 
 #include "bindings.hpp"
+#include "named_ranges.hpp"
 
 namespace {
 struct XLDefinedNameIterator {
@@ -46,6 +47,18 @@ void init_defined_names(py::module_& m) {
         .def("set_comment", &XLDefinedName::setComment)
         .def("valid", &XLDefinedName::valid);
 
+    py::class_<DefinedNameIndex>(m, "XLDefinedNameIndex")
+        .def(py::init<XLWorkbook&>(), py::arg("workbook"), py::keep_alive<1, 2>())
+        .def("__len__", &DefinedNameIndex::size)
+        .def("get", &DefinedNameIndex::get, py::arg("name"), py::arg("local_sheet_id") = py::none())
+        .def("resolve", &DefinedNameIndex::resolve, py::arg("name"),
+             py::arg("local_sheet_id") = py::none(),
+             "The name local to sheet `local_sheet_id` if there is one, else the global name")
+        .def("append", &DefinedNameIndex::append, py::arg("name"), py::arg("formula"),
+             py::arg("local_sheet_id") = py::none())
+        .def("remove", &DefinedNameIndex::remove, py::arg("name"),
+             py::arg("local_sheet_id") = py::none());
+
     // Bind XLDefinedNames
     py::class_<XLDefinedNames>(m, "XLDefinedNames")
         .def(
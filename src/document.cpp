@@ -1,5 +1,15 @@
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/optional.h>
 
+#include <XLCrypto.hpp>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+
+#include "archive_io.hpp"
 #include "internal_access.hpp"
+#include "memory_archive.hpp"
+#include "package_crypto.hpp"
 
 // Structure to hold image info
 struct ImageInfo {
@@ -72,7 +82,235 @@ py::bytes get_image_data(XLDocument& doc, const std::string& imagePath) {
     return py::bytes(data.data(), data.size());
 }
 
+// Extract the embedded images to `outputDir`, one file per image (or per distinct image)
+std::vector<std::string> extract_images(XLDocument& doc, const std::string& outputDir,
+                                        size_t workers, bool dedup) {
+    py::gil_scoped_release release;
+    std::vector<EntryExtraction> entries;
+    for (const ImageInfo& image : get_embedded_images(doc)) {
+        entries.push_back(
+            {image.path, (std::filesystem::u8path(outputDir) / image.name).u8string()});
+    }
+    return extract_entries(doc, entries, workers, dedup);
+}
+
+// An encrypted workbook file decrypted into memory
+XLMemoryArchive decrypted_archive(gsl::span<const uint8_t> data, const std::string& password) {
+    if (password.empty()) throw py::value_error("The workbook is encrypted; a password is needed");
+    std::vector<uint8_t> plain;
+    try {
+        plain = decrypt_package(data, password);
+    } catch (const OpenXLSX::XLInternalError& e) {
+        throw py::value_error((std::string("Could not decrypt the workbook: ") + e.what()).c_str());
+    }
+    if (plain.empty()) throw py::value_error("Could not decrypt the workbook");
+    return XLMemoryArchive(
+        std::string_view(reinterpret_cast<const char*>(plain.data()), plain.size()));
+}
+
+// Package bytes of a bytes-like object, decrypted when it is an encrypted workbook
+XLMemoryArchive memory_archive(py::handle data, const std::string& password) {
+    Py_buffer view;
+    if (PyObject_GetBuffer(data.ptr(), &view, PyBUF_SIMPLE) != 0) throw py::python_error();
+    std::unique_ptr<Py_buffer, decltype(&PyBuffer_Release)> release(&view, &PyBuffer_Release);
+    const auto* bytes = static_cast<const uint8_t*>(view.buf);
+    const gsl::span<const uint8_t> package(bytes, static_cast<size_t>(view.len));
+
+    py::gil_scoped_release nogil;
+    if (OpenXLSX::isEncryptedDocument(package)) return decrypted_archive(package, password);
+    try {
+        return XLMemoryArchive(
+            std::string_view(reinterpret_cast<const char*>(bytes), package.size()));
+    } catch (const OpenXLSX::XLInternalError& e) {
+        throw py::value_error((std::string("Not a valid workbook package: ") + e.what()).c_str());
+    }
+}
+
+// A workbook file in memory: mapped (`map`) or read, and decrypted when it is encrypted
+XLMemoryArchive file_archive(const std::string& path, const std::string& password, bool map) {
+    py::gil_scoped_release nogil;
+    std::ifstream file(std::filesystem::u8path(path), std::ios::binary | std::ios::ate);
+    if (!file) throw std::runtime_error("Cannot open file: " + path);
+    const auto size = static_cast<size_t>(file.tellg());
+    file.seekg(0);
+    // Encrypted workbooks are compound (OLE) files rather than zip packages
+    static const uint8_t kCompoundMagic[] = {0xD0, 0xCF, 0x11, 0xE0, 0xA1, 0xB1, 0x1A, 0xE1};
+    uint8_t head[sizeof(kCompoundMagic)] = {};
+    file.read(reinterpret_cast<char*>(head), std::min(size, sizeof(head)));
+    const bool encrypted = size >= 512 && std::memcmp(head, kCompoundMagic, sizeof(head)) == 0;
+    try {
+        if (!encrypted && map) return XLMemoryArchive::map(path);
+        std::vector<char> data(size);
+        file.seekg(0);
+        file.read(data.data(), static_cast<std::streamsize>(size));
+        if (!file) throw std::runtime_error("Cannot read file: " + path);
+        if (!encrypted) return XLMemoryArchive(std::string_view(data.data(), data.size()));
+        return decrypted_archive(
+            gsl::span<const uint8_t>(reinterpret_cast<const uint8_t*>(data.data()), data.size()),
+            password);
+    } catch (const OpenXLSX::XLInternalError& e) {
+        throw py::value_error((std::string("Not a valid workbook package: ") + e.what()).c_str());
+    }
+}
+
+// Committed package of `archive`, encrypted with `password`
+std::vector<uint8_t> encrypted_package(const XLMemoryArchive& archive,
+                                       const std::string& password) {
+    std::vector<uint8_t> package(archive.size());
+    archive.read(reinterpret_cast<char*>(package.data()), package.size());
+    return encrypt_package(package, password);
+}
+
 void init_document(py::module_& m) {
+    py::class_<EntryStream>(m, "XLArchiveEntryStream")
+        .def_prop_ro("name", &EntryStream::name)
+        .def_prop_ro("closed", &EntryStream::closed)
+        .def(
+            "read",
+            [](EntryStream& self, int64_t size) {
+                std::string data;
+                {
+                    py::gil_scoped_release release;
+                    data = self.read(size);
+                }
+                return py::bytes(data.data(), data.size());
+            },
+            py::arg("size") = -1,
+            "Read up to `size` bytes (the rest of the entry when negative). Returns b'' at the "
+            "end.")
+        .def(
+            "readinto",
+            [](EntryStream& self, py::handle buffer) {
+                Py_buffer view;
+                if (PyObject_GetBuffer(buffer.ptr(), &view, PyBUF_WRITABLE) != 0)
+                    throw py::python_error();
+                std::unique_ptr<Py_buffer, decltype(&PyBuffer_Release)> release(&view,
+                                                                                &PyBuffer_Release);
+                py::gil_scoped_release nogil;
+                return self.readInto(static_cast<char*>(view.buf), static_cast<uint64_t>(view.len));
+            },
+            py::arg("buffer"),
+            "Read into a writable bytes-like object and return the number of bytes read (0 at "
+            "the end).")
+        .def("tell", &EntryStream::position)
+        .def("readable",
+             [](const EntryStream& self) {
+                 if (self.closed()) throw py::value_error("I/O operation on closed archive entry");
+                 return true;
+             })
+        .def("seekable", [](const EntryStream&) { return false; })
+        .def("writable", [](const EntryStream&) { return false; })
+        .def("__iter__", [](py::handle self) -> py::object { return py::borrow(self); })
+        .def("__next__",
+             [](EntryStream& self) {
+                 std::string data;
+                 {
+                     py::gil_scoped_release release;
+                     data = self.read(self.chunkSize());
+                 }
+                 if (data.empty()) throw py::stop_iteration();
+                 return py::bytes(data.data(), data.size());
+             })
+        .def("close", &EntryStream::close)
+        .def("__enter__", [](py::handle self) -> py::object { return py::borrow(self); })
+        .def(
+            "__exit__", [](EntryStream& self, py::object, py::object, py::object) { self.close(); },
+            py::arg("exc_type") = py::none(), py::arg("exc_value") = py::none(),
+            py::arg("traceback") = py::none());
+
+    py::class_<XLMemoryArchive>(m, "XLMemoryArchive")
+        .def(py::init<>())
+        .def(
+            "__init__",
+            [](XLMemoryArchive* self, py::handle data, const std::string& password) {
+                new (self) XLMemoryArchive(memory_archive(data, password));
+            },
+            py::arg("data"), py::arg("password") = "",
+            "Load a zip package from a bytes-like object, decrypting it with `password` when "
+            "it is an encrypted workbook.")
+        .def_static(
+            "load",
+            [](const std::string& path, const std::string& password) {
+                return file_archive(path, password, false);
+            },
+            py::arg("path"), py::arg("password") = "",
+            "Read the zip package of a workbook file into memory, decrypting it with `password` "
+            "when it is encrypted.")
+        .def_static(
+            "map",
+            [](const std::string& path, const std::string& password) {
+                return file_archive(path, password, true);
+            },
+            py::arg("path"), py::arg("password") = "",
+            "Load the zip package of a workbook file through a read-only memory mapping instead "
+            "of a copy (an encrypted workbook is decrypted into memory).")
+        .def_prop_ro("name", &XLMemoryArchive::name,
+                     "Virtual path to open and save the document under.")
+        .def_prop_ro("size", &XLMemoryArchive::size)
+        .def(
+            "to_bytes",
+            [](const XLMemoryArchive& self, const std::string& password) {
+                if (!password.empty()) {
+                    std::vector<uint8_t> data;
+                    {
+                        py::gil_scoped_release release;
+                        data = encrypted_package(self, password);
+                    }
+                    return py::bytes(reinterpret_cast<const char*>(data.data()), data.size());
+                }
+                const uint64_t size = self.size();
+                PyObject* data = PyBytes_FromStringAndSize(nullptr, static_cast<Py_ssize_t>(size));
+                if (data == nullptr) throw py::python_error();
+                py::bytes result = py::steal<py::bytes>(data);
+                {
+                    py::gil_scoped_release release;
+                    self.read(PyBytes_AS_STRING(data), size);
+                }
+                return result;
+            },
+            py::arg("password") = "",
+            "The package as last committed, read straight into a bytes object (encrypted with "
+            "`password` when one is given).")
+        .def(
+            "write",
+            [](const XLMemoryArchive& self, const std::string& path, bool forceOverwrite,
+               const std::string& password) {
+                py::gil_scoped_release release;
+                if (!forceOverwrite && std::filesystem::exists(std::filesystem::u8path(path))) {
+                    throw std::runtime_error("refusing to overwrite existing file " + path);
+                }
+                if (password.empty()) {
+                    self.write(path);
+                    return;
+                }
+                const std::vector<uint8_t> data = encrypted_package(self, password);
+                std::ofstream out(std::filesystem::u8path(path),
+                                  std::ios::binary | std::ios::trunc);
+                out.write(reinterpret_cast<const char*>(data.data()),
+                          static_cast<std::streamsize>(data.size()));
+                if (!out) throw std::runtime_error("Failed to write file: " + path);
+            },
+            py::arg("path"), py::arg("force_overwrite") = true, py::arg("password") = "",
+            "Write the package as last committed to a file.")
+        .def(
+            "stored_entry",
+            [](const XLMemoryArchive& self,
+               const std::string& path) -> std::optional<py::ndarray<py::memview, const uint8_t>> {
+                std::optional<XLMemoryArchive::MappedView> view = self.mappedEntry(path);
+                if (!view) return std::nullopt;
+                auto* owner = new std::shared_ptr<const void>(std::move(view->owner));
+                py::capsule capsule(owner, [](void* p) noexcept {
+                    delete static_cast<std::shared_ptr<const void>*>(p);
+                });
+                size_t shape[1] = {view->data.size()};
+                return py::ndarray<py::memview, const uint8_t>(view->data.data(), 1, shape,
+                                                               capsule);
+            },
+            py::arg("path"),
+            "A read-only memoryview of a stored (uncompressed) entry, straight from the mapped "
+            "file, or None when the package is not mapped or the entry is compressed or "
+            "modified.");
+
     // Bind ImageInfo struct
     py::class_<ImageInfo>(m, "ImageInfo")
         .def_ro("name", &ImageInfo::name, "Image filename (e.g., 'image1.png')")
@@ -177,6 +415,12 @@ void init_document(py::module_& m) {
     py::class_<XLDocument>(m, "XLDocument")
         .def(py::init<>())
         .def(py::init<const std::string&>())
+        .def(
+            "__init__",
+            [](XLDocument* self, const XLMemoryArchive& archive) {
+                new (self) XLDocument(IZipArchive(archive));
+            },
+            py::arg("archive"), "A document backed by an in-memory archive.")
         .def(
             "open",
             [](XLDocument& self, const std::string& path) {
@@ -295,6 +539,31 @@ void init_document(py::module_& m) {
         .def("get_image_data", &get_image_data, py::arg("image_path"),
              "Get image data as bytes. image_path can be full path (e.g., 'xl/media/image1.png') "
              "or just filename (e.g., 'image1.png').")
+        .def("extract_images", &extract_images, py::arg("output_dir"), py::arg("workers") = 1,
+             py::arg("dedup") = false,
+             "Write the embedded images to output_dir using up to `workers` threads and return "
+             "the file of every image, in get_embedded_images() order. With dedup, images with "
+             "identical content are written once and share a file.")
+        .def(
+            "open_entry_stream",
+            [](XLDocument& self, const std::string& path, int64_t chunkSize, bool fromFile,
+               const XLMemoryArchive* archive) {
+                return new EntryStream(self, path, chunkSize, fromFile, archive);
+            },
+            py::arg("path"), py::arg("chunk_size") = 1 << 16, py::arg("from_file") = true,
+            py::arg("archive") = py::none(), py::keep_alive<0, 1>(),
+            "Open an entry of the underlying zip archive for chunked reading; iterating the "
+            "stream yields chunks of at most `chunk_size` bytes. The entry is read from the "
+            "workbook file, or from the committed package of `archive` (the in-memory archive "
+            "of the document), unless `from_file` is False or it only exists in memory.")
+        .def(
+            "add_archive_entry_from_file",
+            [](XLDocument& self, const std::string& path, const std::string& filePath) {
+                get_archive(self).addEntryFromFile(path, filePath);
+            },
+            py::arg("path"), py::arg("file_path"),
+            "Add (or replace) an entry of the underlying zip archive with the content of a file. "
+            "The file is read when the document is saved and must exist until then.")
         .def(
             "get_archive_entries",
             [](XLDocument& self) {
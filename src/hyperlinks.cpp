@@ -0,0 +1,201 @@
+#include "hyperlinks.hpp"
+
+#include <algorithm>
+#include <charconv>
+#include <cstdlib>
+#include <headers/XLUtilities.hpp>
+#include <unordered_set>
+
+#include "internal_access.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+constexpr const char* kHyperlinkType =
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink";
+
+XLRelationships sheet_relationships(XLWorksheet& ws) {
+    const std::string sheetPath = get_xml_path(ws);
+    const std::string fileName = sheetPath.substr(sheetPath.find_last_of('/') + 1);
+    const auto sheetNo = static_cast<uint16_t>(std::strtoul(fileName.c_str() + 5, nullptr, 10));
+    return get_parent_doc(ws).sheetRelationships(sheetNo);
+}
+
+// XLRelationshipItem::type() does not recognise hyperlink relationships; match the
+// type's path so the strict (ISO) namespace is accepted as well
+bool is_hyperlink(std::string_view type) {
+    constexpr std::string_view kPath = "/relationships/hyperlink";
+    return type.size() >= kPath.size() && type.substr(type.size() - kPath.size()) == kPath;
+}
+
+bool valid_ref(const std::string& ref) {
+    uint32_t firstRow, lastRow;
+    uint16_t firstCol, lastCol;
+    return parse_range_ref(ref, firstRow, firstCol, lastRow, lastCol);
+}
+
+void set_attribute(XMLNode node, const char* name, const std::string& value) {
+    XMLAttribute attr = node.attribute(name);
+    if (attr.empty()) attr = node.append_attribute(name);
+    attr.set_value(value.c_str());
+}
+
+// External hyperlink relationships of a sheet by URL, handing out fresh ids for new URLs
+class LinkTargets {
+   public:
+    explicit LinkTargets(XLWorksheet& ws) : m_ws(ws) {}
+
+    std::string id(const std::string& url) {
+        if (!m_loaded) load();
+        auto [it, inserted] = m_ids.emplace(url, std::string());
+        if (inserted) {
+            it->second = "rId" + std::to_string(m_nextId++);
+            XMLNode rel = m_root.append_child("Relationship");
+            rel.append_attribute("Id").set_value(it->second.c_str());
+            rel.append_attribute("Type").set_value(kHyperlinkType);
+            rel.append_attribute("Target").set_value(url.c_str());
+            rel.append_attribute("TargetMode").set_value("External");
+        }
+        return it->second;
+    }
+
+   private:
+    void load() {
+        m_loaded = true;
+        m_rels = sheet_relationships(m_ws);
+        m_root = get_xml_doc(m_rels).document_element();
+        for (XMLNode rel = m_root.first_child_of_type(pugi::node_element); !rel.empty();
+             rel = rel.next_sibling_of_type(pugi::node_element)) {
+            // Same numbering as XLRelationships::addRelationship: one past the largest "rId<n>"
+            const std::string_view id = rel.attribute("Id").value();
+            uint64_t number = 0;
+            if (id.size() > 3 &&
+                std::from_chars(id.data() + 3, id.data() + id.size(), number).ec == std::errc()) {
+                m_nextId = std::max(m_nextId, number + 1);
+            }
+            if (is_hyperlink(rel.attribute("Type").value()) &&
+                std::string_view(rel.attribute("TargetMode").value()) == "External") {
+                m_ids.emplace(rel.attribute("Target").value(), id);
+            }
+        }
+    }
+
+    XLWorksheet& m_ws;
+    bool m_loaded = false;
+    XLRelationships m_rels;
+    XMLNode m_root;
+    std::unordered_map<std::string, std::string> m_ids;
+    uint64_t m_nextId = 1;
+};
+
+}  // namespace
+
+HyperlinkIndex::HyperlinkIndex(XLWorksheet& ws) {
+    XMLNode hyperlinks = get_xml_doc(ws).document_element().child("hyperlinks");
+    if (hyperlinks.empty()) return;
+
+    std::unordered_map<std::string, std::string> relTargets;
+    bool relsLoaded = false;
+    for (XMLNode link = hyperlinks.child("hyperlink"); !link.empty();
+         link = link.next_sibling("hyperlink")) {
+        std::string target;
+        if (XMLAttribute location = link.attribute("location"); !location.empty()) {
+            target = location.value();
+        } else if (XMLAttribute id = link.attribute("r:id"); !id.empty()) {
+            if (!relsLoaded) {
+                relsLoaded = true;
+                XLRelationships rels = sheet_relationships(ws);
+                XMLNode root = get_xml_doc(rels).document_element();
+                for (XMLNode rel = root.first_child_of_type(pugi::node_element); !rel.empty();
+                     rel = rel.next_sibling_of_type(pugi::node_element)) {
+                    relTargets.emplace(rel.attribute("Id").value(),
+                                       rel.attribute("Target").value());
+                }
+            }
+            auto it = relTargets.find(id.value());
+            if (it != relTargets.end()) target = it->second;
+        }
+        // First link wins for a repeated ref, as in XLWorksheet::getHyperlink
+        m_targets.emplace(link.attribute("ref").value(), std::move(target));
+    }
+}
+
+std::string HyperlinkIndex::get(const std::string& ref) const {
+    auto it = m_targets.find(ref);
+    return it == m_targets.end() ? std::string() : it->second;
+}
+
+void HyperlinkIndex::update(const std::vector<HyperlinkItem>& items) {
+    for (const HyperlinkItem& item : items) m_targets[item.ref] = item.target;
+}
+
+size_t add_hyperlinks(XLWorksheet& ws, const std::vector<HyperlinkItem>& items) {
+    // Of a cell listed twice only the last link is kept
+    std::unordered_map<std::string, size_t> last;
+    for (size_t i = 0; i < items.size(); ++i) {
+        if (!valid_ref(items[i].ref)) {
+            throw py::value_error(("Invalid cell reference: " + items[i].ref).c_str());
+        }
+        last[items[i].ref] = i;
+    }
+    if (items.empty()) return 0;
+
+    XMLNode root = get_xml_doc(ws).document_element();
+    XMLNode hyperlinks = appendAndGetNode(root, "hyperlinks", XLWorksheetNodeOrder);
+    std::unordered_map<std::string, XMLNode> existing;
+    for (XMLNode link = hyperlinks.child("hyperlink"); !link.empty();
+         link = link.next_sibling("hyperlink")) {
+        existing.emplace(link.attribute("ref").value(), link);
+    }
+
+    LinkTargets targets(ws);
+    size_t written = 0;
+    for (size_t i = 0; i < items.size(); ++i) {
+        const HyperlinkItem& item = items[i];
+        if (last[item.ref] != i) continue;
+
+        XMLNode link;
+        auto found = existing.find(item.ref);
+        if (found != existing.end()) {
+            link = found->second;
+            link.remove_attribute("r:id");
+            link.remove_attribute("location");
+            link.remove_attribute("display");
+            link.remove_attribute("tooltip");
+        } else {
+            link = hyperlinks.append_child("hyperlink");
+            link.append_attribute("ref").set_value(item.ref.c_str());
+        }
+        if (item.internal) {
+            set_attribute(link, "location", item.target);
+            set_attribute(link, "display", item.target);
+        } else {
+            set_attribute(link, "r:id", targets.id(item.target));
+        }
+        if (!item.tooltip.empty()) set_attribute(link, "tooltip", item.tooltip);
+        ++written;
+    }
+    return written;
+}
+
+void remove_hyperlink_relationships(XLWorksheet& ws, const std::vector<std::string>& ids) {
+    if (ids.empty()) return;
+    std::unordered_set<std::string> unused(ids.begin(), ids.end());
+    XMLNode hyperlinks = get_xml_doc(ws).document_element().child("hyperlinks");
+    for (XMLNode link = hyperlinks.child("hyperlink"); !link.empty();
+         link = link.next_sibling("hyperlink")) {
+        unused.erase(link.attribute("r:id").value());
+    }
+    if (unused.empty()) return;
+
+    XLRelationships rels = sheet_relationships(ws);
+    XMLNode root = get_xml_doc(rels).document_element();
+    for (XMLNode rel = root.first_child_of_type(pugi::node_element); !rel.empty();) {
+        XMLNode next = rel.next_sibling_of_type(pugi::node_element);
+        if (unused.count(rel.attribute("Id").value()) != 0 &&
+            is_hyperlink(rel.attribute("Type").value())) {
+            root.remove_child(rel);
+        }
+        rel = next;
+    }
+}
@@ -0,0 +1,62 @@
+#ifndef PYOPENXLSX_HYPERLINKS_HPP
+#define PYOPENXLSX_HYPERLINKS_HPP
+
+/**
+ * @file hyperlinks.hpp
+ * @brief Batch hyperlink insertion and a lookup index for worksheet hyperlinks.
+ *
+ * XLWorksheet::addHyperlink scans the <hyperlinks> element for the cell and
+ * the sheet relationships for a free id on every call, and hasHyperlink /
+ * getHyperlink scan the element again, so a link per row is quadratic.
+ * add_hyperlinks() writes a batch in one pass over both parts, and external
+ * links to the same URL share one relationship. HyperlinkIndex answers
+ * lookups from a hash table keyed by cell reference.
+ */
+
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "bindings.hpp"
+
+struct HyperlinkItem {
+    std::string ref;     // "B2"
+    std::string target;  // external URL, or a location such as "Sheet2!A1" when `internal`
+    std::string tooltip;
+    bool internal = false;
+};
+
+class HyperlinkIndex {
+   public:
+    explicit HyperlinkIndex(XLWorksheet& ws);
+
+    size_t size() const { return m_targets.size(); }
+
+    bool contains(const std::string& ref) const { return m_targets.count(ref) != 0; }
+    // The URL or location of the link on `ref`, or an empty string (as XLWorksheet::getHyperlink)
+    std::string get(const std::string& ref) const;
+
+    void set(const std::string& ref, const std::string& target) { m_targets[ref] = target; }
+    void update(const std::vector<HyperlinkItem>& items);
+    bool remove(const std::string& ref) { return m_targets.erase(ref) != 0; }
+
+   private:
+    std::unordered_map<std::string, std::string> m_targets;
+};
+
+/**
+ * Add or replace the hyperlinks of `items` on `ws` and return how many were
+ * written (a cell listed twice keeps its last link). External links to the
+ * same URL, including ones already on the sheet, share one relationship.
+ * Raises ValueError for malformed cell references. Safe to call without the GIL.
+ */
+size_t add_hyperlinks(XLWorksheet& ws, const std::vector<HyperlinkItem>& items);
+
+/**
+ * Remove the hyperlink relationships `ids` of links that were taken off `ws`,
+ * except the ones a remaining <hyperlink> still uses (links to the same URL
+ * share one relationship).
+ */
+void remove_hyperlink_relationships(XLWorksheet& ws, const std::vector<std::string>& ids);
+
+#endif  // PYOPENXLSX_HYPERLINKS_HPP
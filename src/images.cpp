@@ -0,0 +1,172 @@
+#include "images.hpp"
+
+#include <algorithm>
+#include <fstream>
+#include <functional>
+#include <iterator>
+#include <unordered_map>
+#include <utility>
+
+#include "internal_access.hpp"
+
+namespace {
+
+uint32_t read_be16(std::string_view data, size_t pos) {
+    return (static_cast<uint8_t>(data[pos]) << 8) | static_cast<uint8_t>(data[pos + 1]);
+}
+
+uint32_t read_be32(std::string_view data, size_t pos) {
+    return (read_be16(data, pos) << 16) | read_be16(data, pos + 2);
+}
+
+uint32_t read_le16(std::string_view data, size_t pos) {
+    return static_cast<uint8_t>(data[pos]) | (static_cast<uint8_t>(data[pos + 1]) << 8);
+}
+
+std::string read_file(const std::string& path) {
+    std::ifstream file(path, std::ios::binary);
+    if (!file) throw py::value_error(("Cannot read image file: " + path).c_str());
+    return std::string(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+}
+
+const char* content_type(const std::string& extension) {
+    if (extension == "png") return "image/png";
+    if (extension == "gif") return "image/gif";
+    return "image/jpeg";
+}
+
+// Highest N of the existing xl/media/imageN.* entries, in one pass over the archive
+uint32_t last_media_number(XLDocument& doc) {
+    static const std::string prefix = "xl/media/image";
+    uint32_t last = 0;
+    for (const std::string& entry : get_archive(doc).entryNames()) {
+        if (entry.compare(0, prefix.size(), prefix) != 0) continue;
+        uint32_t number = 0;
+        size_t pos = prefix.size();
+        for (; pos < entry.size() && entry[pos] >= '0' && entry[pos] <= '9'; ++pos) {
+            number = number * 10 + static_cast<uint32_t>(entry[pos] - '0');
+        }
+        if (pos < entry.size() && entry[pos] == '.') last = std::max(last, number);
+    }
+    return last;
+}
+
+}  // namespace
+
+std::string image_extension(std::string_view data) {
+    if (data.size() >= 8 && data.substr(0, 8) == std::string_view("\x89PNG\r\n\x1a\n", 8)) {
+        return "png";
+    }
+    if (data.size() >= 3 && data.substr(0, 3) == "\xFF\xD8\xFF") return "jpg";
+    if (data.size() >= 6 && (data.substr(0, 6) == "GIF87a" || data.substr(0, 6) == "GIF89a")) {
+        return "gif";
+    }
+    return "";
+}
+
+std::pair<uint32_t, uint32_t> image_dimensions(std::string_view data) {
+    const std::string extension = image_extension(data);
+    if (extension == "png" && data.size() >= 24) {
+        return {read_be32(data, 16), read_be32(data, 20)};
+    }
+    if (extension == "gif" && data.size() >= 10) {
+        return {read_le16(data, 6), read_le16(data, 8)};
+    }
+    if (extension == "jpg") {
+        // Walk the marker segments up to the first start-of-frame
+        size_t pos = 2;
+        while (pos + 9 < data.size() && static_cast<uint8_t>(data[pos]) == 0xFF) {
+            const uint8_t marker = static_cast<uint8_t>(data[pos + 1]);
+            if (marker == 0xFF) {
+                ++pos;
+                continue;
+            }
+            if (marker >= 0xC0 && marker <= 0xCF && marker != 0xC4 && marker != 0xC8 &&
+                marker != 0xCC) {
+                return {read_be16(data, pos + 7), read_be16(data, pos + 5)};
+            }
+            pos += 2 + read_be16(data, pos + 2);
+        }
+    }
+    return {0, 0};
+}
+
+std::vector<std::string> add_images(XLWorksheet& ws, const std::vector<ImageSource>& images) {
+    // Load and check everything first so that a bad entry leaves the workbook untouched
+    std::vector<std::string> fileData(images.size());
+    std::vector<std::string_view> data(images.size());
+    std::vector<std::pair<uint32_t, uint32_t>> sizes(images.size());
+    for (size_t i = 0; i < images.size(); ++i) {
+        if (!images[i].path.empty()) {
+            fileData[i] = read_file(images[i].path);
+            data[i] = fileData[i];
+        } else {
+            data[i] = images[i].data;
+        }
+        if (image_extension(data[i]).empty()) {
+            throw py::value_error(
+                ("Unsupported image format for image " + std::to_string(i + 1)).c_str());
+        }
+
+        uint32_t width = images[i].width;
+        uint32_t height = images[i].height;
+        if (width == 0 || height == 0) {
+            const auto [w, h] = image_dimensions(data[i]);
+            if (w == 0 || h == 0) {
+                throw py::value_error(("Cannot determine the size of image " +
+                                       std::to_string(i + 1) + "; pass width and height")
+                                          .c_str());
+            }
+            if (width == 0 && height == 0) {
+                width = w;
+                height = h;
+            } else if (height == 0) {
+                height = static_cast<uint32_t>(static_cast<uint64_t>(h) * width / w);
+            } else {
+                width = static_cast<uint32_t>(static_cast<uint64_t>(w) * height / h);
+            }
+        }
+        sizes[i] = {width, height};
+    }
+
+    XLDocument& doc = get_parent_doc(ws);
+    XLDrawing& drawing = ws.drawing();
+    XLRelationships& rels = drawing.relationships();
+    uint32_t mediaNumber = last_media_number(doc);
+
+    struct Media {
+        std::string_view data;
+        std::string name;
+        std::string relId;
+    };
+    std::vector<Media> media;
+    std::unordered_multimap<size_t, size_t> byHash;  // content hash -> media index
+    std::vector<std::string> paths;
+    paths.reserve(images.size());
+    for (size_t i = 0; i < images.size(); ++i) {
+        const size_t hash = std::hash<std::string_view>{}(data[i]);
+        const Media* shared = nullptr;
+        for (auto [it, end] = byHash.equal_range(hash); it != end; ++it) {
+            if (media[it->second].data == data[i]) {
+                shared = &media[it->second];
+                break;
+            }
+        }
+        if (shared == nullptr) {
+            const std::string extension = image_extension(data[i]);
+            std::string name = "image" + std::to_string(++mediaNumber) + "." + extension;
+            doc.addImage(name, data[i]);
+            doc.contentTypes().addDefault(extension, content_type(extension));
+            std::string relId =
+                rels.addRelationship(XLRelationshipType::Image, "../media/" + name).id();
+            byHash.emplace(hash, media.size());
+            media.push_back({data[i], std::move(name), std::move(relId)});
+            shared = &media.back();
+        }
+
+        drawing.addImage(shared->relId, shared->name, "Image", images[i].row - 1, images[i].col - 1,
+                         sizes[i].first, sizes[i].second);
+        paths.push_back("xl/media/" + shared->name);
+    }
+    return paths;
+}
@@ -0,0 +1,46 @@
+#ifndef PYOPENXLSX_IMAGES_HPP
+#define PYOPENXLSX_IMAGES_HPP
+
+/**
+ * @file images.hpp
+ * @brief Batch image insertion.
+ *
+ * Inserting images one at a time probes the archive for a free media name on
+ * every call and copies each payload through Python. add_images() instead
+ * keeps a media-name counter, reads files natively, stores identical images
+ * once (keyed by a content hash) and adds one drawing relationship per
+ * distinct image.
+ */
+
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <utility>
+#include <vector>
+
+#include "bindings.hpp"
+
+struct ImageSource {
+    std::string_view data;  // image bytes; empty when `path` is set
+    std::string path;       // file to read natively
+    uint32_t row = 1;       // 1-based top-left anchor
+    uint16_t col = 1;
+    uint32_t width = 0;  // pixels; 0 = take it from the image header
+    uint32_t height = 0;
+};
+
+// "png", "jpg" or "gif" from the signature of `data`, or an empty string
+std::string image_extension(std::string_view data);
+
+// Pixel size read from the PNG/GIF/JPEG header, or {0, 0} when it can't be determined
+std::pair<uint32_t, uint32_t> image_dimensions(std::string_view data);
+
+/**
+ * Add every image of `images` to the drawing of `ws` and return the archive
+ * path of the media part each image uses. Images with identical bytes share
+ * one media part and one relationship. Raises ValueError for
+ * unreadable files and unsupported formats. Safe to call without the GIL.
+ */
+std::vector<std::string> add_images(XLWorksheet& ws, const std::vector<ImageSource>& images);
+
+#endif  // PYOPENXLSX_IMAGES_HPP
@@ -0,0 +1,576 @@
+#include "memory_archive.hpp"
+
+#include <zip.h>
+
+#include <XLException.hpp>
+#include <cctype>
+#include <cstdlib>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <iterator>
+#include <unordered_map>
+
+#ifdef _WIN32
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#ifndef WIN32_LEAN_AND_MEAN
+#define WIN32_LEAN_AND_MEAN
+#endif
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+using OpenXLSX::XLInternalError;
+
+namespace {
+
+constexpr const char* kMemoryName = "memory://workbook.xlsx";
+constexpr const char* kMemoryMacroName = "memory://workbook.xlsm";
+
+// A zip source over `data`, which the caller keeps alive and unchanged
+zip_source_t* buffer_source(std::string_view data) {
+    zip_error_t error;
+    zip_error_init(&error);
+    zip_source_t* source =
+        zip_source_buffer_create(data.empty() ? nullptr : data.data(), data.size(), 0, &error);
+    if (source == nullptr) {
+        std::string message = zip_error_strerror(&error);
+        zip_error_fini(&error);
+        throw XLInternalError("Failed to create zip source: " + message);
+    }
+    zip_error_fini(&error);
+    return source;
+}
+
+bool same_content(const zip_stat_t& a, const zip_stat_t& b) {
+    constexpr zip_uint64_t kValid = ZIP_STAT_SIZE | ZIP_STAT_CRC;
+    return (a.valid & kValid) == kValid && (b.valid & kValid) == kValid && a.size == b.size &&
+           a.crc == b.crc;
+}
+
+// Read-only, shared mapping of a whole file
+class MappedFile {
+   public:
+    explicit MappedFile(const std::string& path) {
+#ifdef _WIN32
+        HANDLE file = CreateFileW(std::filesystem::u8path(path).wstring().c_str(), GENERIC_READ,
+                                  FILE_SHARE_READ | FILE_SHARE_DELETE, nullptr, OPEN_EXISTING,
+                                  FILE_ATTRIBUTE_NORMAL, nullptr);
+        if (file == INVALID_HANDLE_VALUE) throw XLInternalError("Failed to open file: " + path);
+        LARGE_INTEGER size;
+        if (!GetFileSizeEx(file, &size) || size.QuadPart == 0) {
+            CloseHandle(file);
+            throw XLInternalError("Failed to map file: " + path);
+        }
+        m_mapping = CreateFileMappingW(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+        CloseHandle(file);
+        if (m_mapping == nullptr) throw XLInternalError("Failed to map file: " + path);
+        m_data = MapViewOfFile(m_mapping, FILE_MAP_READ, 0, 0, 0);
+        if (m_data == nullptr) {
+            CloseHandle(m_mapping);
+            throw XLInternalError("Failed to map file: " + path);
+        }
+        m_size = static_cast<size_t>(size.QuadPart);
+#else
+        const int fd = ::open(path.c_str(), O_RDONLY);
+        if (fd < 0) throw XLInternalError("Failed to open file: " + path);
+        struct stat st;
+        if (fstat(fd, &st) != 0 || st.st_size == 0) {
+            ::close(fd);
+            throw XLInternalError("Failed to map file: " + path);
+        }
+        m_size = static_cast<size_t>(st.st_size);
+        m_data = mmap(nullptr, m_size, PROT_READ, MAP_SHARED, fd, 0);
+        ::close(fd);  // the mapping keeps the file referenced
+        if (m_data == MAP_FAILED) throw XLInternalError("Failed to map file: " + path);
+#endif
+    }
+
+    ~MappedFile() {
+#ifdef _WIN32
+        UnmapViewOfFile(m_data);
+        CloseHandle(m_mapping);
+#else
+        munmap(m_data, m_size);
+#endif
+    }
+
+    MappedFile(const MappedFile&) = delete;
+    MappedFile& operator=(const MappedFile&) = delete;
+
+    std::string_view data() const { return {static_cast<const char*>(m_data), m_size}; }
+
+   private:
+    void* m_data = nullptr;
+    size_t m_size = 0;
+#ifdef _WIN32
+    HANDLE m_mapping = nullptr;
+#endif
+};
+
+struct StoredEntry {
+    std::string_view data;
+    uint32_t crc;
+};
+
+uint32_t le16(std::string_view data, size_t pos) {
+    return static_cast<uint8_t>(data[pos]) | (static_cast<uint8_t>(data[pos + 1]) << 8);
+}
+
+uint32_t le32(std::string_view data, size_t pos) {
+    return le16(data, pos) | (le16(data, pos + 2) << 16);
+}
+
+// Stored (uncompressed, unencrypted) entries of a zip package, located through its central
+// directory. ZIP64 packages are not indexed.
+std::unordered_map<std::string, StoredEntry> index_stored_entries(std::string_view zip) {
+    std::unordered_map<std::string, StoredEntry> entries;
+    if (zip.size() < 22) return entries;
+    size_t eocd = zip.size() - 22;
+    const size_t lowest = zip.size() > 22 + 0xFFFF ? zip.size() - 22 - 0xFFFF : 0;
+    while (le32(zip, eocd) != 0x06054b50) {
+        if (eocd == lowest) return entries;
+        --eocd;
+    }
+    const uint32_t count = le16(zip, eocd + 10);
+    const uint32_t cdOffset = le32(zip, eocd + 16);
+    if (count == 0xFFFF || cdOffset == 0xFFFFFFFF) return entries;
+
+    size_t pos = cdOffset;
+    for (uint32_t i = 0; i < count; ++i) {
+        if (pos + 46 > zip.size() || le32(zip, pos) != 0x02014b50) break;
+        const uint32_t flags = le16(zip, pos + 8);
+        const uint32_t method = le16(zip, pos + 10);
+        const uint32_t crc = le32(zip, pos + 16);
+        const uint32_t compressed = le32(zip, pos + 20);
+        const uint32_t size = le32(zip, pos + 24);
+        const size_t nameLength = le16(zip, pos + 28);
+        const size_t next = pos + 46 + nameLength + le16(zip, pos + 30) + le16(zip, pos + 32);
+        const uint32_t local = le32(zip, pos + 42);
+        if (next > zip.size()) break;
+        if (method == 0 && (flags & 1) == 0 && compressed == size && size != 0xFFFFFFFF &&
+            static_cast<size_t>(local) + 30 <= zip.size() && le32(zip, local) == 0x04034b50) {
+            const size_t start = local + 30 + le16(zip, local + 26) + le16(zip, local + 28);
+            if (start + size <= zip.size()) {
+                entries.emplace(std::string(zip.substr(pos + 46, nameLength)),
+                                StoredEntry{zip.substr(start, size), crc});
+            }
+        }
+        pos = next;
+    }
+    return entries;
+}
+
+// Media that is compressed already gains nothing from deflate; stored, it can be read in place
+void store_if_compressed(zip_t* archive, zip_int64_t index, std::string_view name) {
+    static const std::string_view kStored[] = {".png", ".jpg", ".jpeg", ".gif"};
+    if (name.substr(0, 9) != "xl/media/") return;
+    const size_t dot = name.rfind('.');
+    if (dot == std::string_view::npos) return;
+    std::string ext(name.substr(dot));
+    for (auto& ch : ext) ch = static_cast<char>(std::tolower(static_cast<unsigned char>(ch)));
+    for (const std::string_view stored : kStored) {
+        if (ext == stored) {
+            zip_set_file_compression(archive, static_cast<zip_uint64_t>(index), ZIP_CM_STORE, 0);
+            return;
+        }
+    }
+}
+
+}  // namespace
+
+struct XLMemoryArchive::State {
+    zip_source_t* source = nullptr;  // one reference owned here, one per open archive
+    zip_t* archive = nullptr;        // reopened lazily after every commit
+    std::string name = kMemoryName;
+    bool opened = false;
+    bool modified = false;
+
+    // The committed package `source` reads from. `owner` keeps it alive, also for the readers
+    // of openCommittedEntry() after later commits have moved on to a new package.
+    std::string_view package;
+    std::shared_ptr<const void> owner;
+
+    // Set when the package was mapped from a file rather than copied
+    std::shared_ptr<const MappedFile> mapping;
+    std::string mappedPath;
+    std::unordered_map<std::string, StoredEntry> stored;
+
+    ~State() {
+        if (archive != nullptr) zip_discard(archive);
+        if (source != nullptr) zip_source_free(source);
+    }
+
+    void reset(std::string_view data) {
+        if (archive != nullptr) {
+            zip_discard(archive);
+            archive = nullptr;
+        }
+        adopt(std::make_shared<const std::string>(data));
+        modified = false;
+        mapping.reset();
+        mappedPath.clear();
+        stored.clear();
+    }
+
+    // Read from `bytes` from now on
+    void adopt(std::shared_ptr<const std::string> bytes) {
+        zip_source_t* fresh = buffer_source(*bytes);
+        if (source != nullptr) zip_source_free(source);
+        source = fresh;
+        package = *bytes;
+        owner = std::move(bytes);
+    }
+
+    zip_t* get() {
+        if (!opened) throw XLInternalError("Archive not open");
+        if (archive != nullptr) return archive;
+        zip_error_t error;
+        zip_error_init(&error);
+        zip_source_keep(source);
+        archive = zip_open_from_source(source, ZIP_CREATE, &error);
+        if (archive == nullptr) {
+            zip_source_free(source);
+            std::string message = zip_error_strerror(&error);
+            zip_error_fini(&error);
+            throw XLInternalError("Failed to open zip archive: " + message);
+        }
+        zip_error_fini(&error);
+        return archive;
+    }
+
+    // Write the pending changes into the buffer; the archive is reopened on next use
+    void commit() {
+        if (archive == nullptr) return;
+        zip_t* ptr = archive;
+        const bool changed = modified;
+        archive = nullptr;
+        modified = false;
+        if (zip_close(ptr) < 0) {
+            std::string message = zip_strerror(ptr);
+            zip_discard(ptr);
+            throw XLInternalError("Failed to write zip archive: " + message);
+        }
+        // zip_close() wrote the package into buffers of the source; move it into bytes of
+        // our own, leaving the previous package to the readers that still use it
+        if (changed) adopt(std::make_shared<const std::string>(copy_source()));
+    }
+
+    // The bytes of the source; no archive may have it open
+    std::string copy_source() const {
+        zip_stat_t st;
+        zip_stat_init(&st);
+        if (zip_source_stat(source, &st) < 0 || (st.valid & ZIP_STAT_SIZE) == 0) {
+            throw XLInternalError("Failed to stat zip buffer");
+        }
+        std::string data(st.size, '\0');
+        if (st.size == 0) return data;
+        if (zip_source_open(source) < 0) throw XLInternalError("Failed to open zip buffer");
+        uint64_t done = 0;
+        while (done < st.size) {
+            const zip_int64_t got = zip_source_read(source, data.data() + done, st.size - done);
+            if (got <= 0) break;
+            done += static_cast<uint64_t>(got);
+        }
+        zip_source_close(source);
+        if (done != st.size) throw XLInternalError("Failed to read zip buffer");
+        return data;
+    }
+
+    void discard() {
+        if (archive == nullptr) return;
+        zip_discard(archive);
+        archive = nullptr;
+        modified = false;
+    }
+
+    // The buffer source can only be read directly while no archive has it open
+    void settle() {
+        if (modified) {
+            commit();
+        } else {
+            discard();
+        }
+    }
+};
+
+XLMemoryArchive::XLMemoryArchive() : XLMemoryArchive(std::string_view()) {}
+
+XLMemoryArchive::XLMemoryArchive(std::string_view data) : m_state(std::make_shared<State>()) {
+    m_state->reset(data);
+    if (!data.empty()) probe();
+}
+
+XLMemoryArchive XLMemoryArchive::map(const std::string& path) {
+    auto mapping = std::make_shared<const MappedFile>(path);
+    XLMemoryArchive archive;
+    State& state = *archive.m_state;
+    zip_source_free(state.source);
+    state.source = nullptr;  // keep the state consistent should buffer_source() throw
+    state.source = buffer_source(mapping->data());
+    state.package = mapping->data();
+    state.owner = mapping;
+    state.stored = index_stored_entries(mapping->data());
+    state.mapping = std::move(mapping);
+    state.mappedPath = path;
+    archive.probe();
+    return archive;
+}
+
+void XLMemoryArchive::probe() {
+    // Open the package once to validate it and pick the virtual name
+    m_state->opened = true;
+    try {
+        const bool macros = zip_name_locate(m_state->get(), "xl/vbaProject.bin", 0) >= 0;
+        m_state->discard();
+        m_state->opened = false;
+        if (macros) m_state->name = kMemoryMacroName;
+    } catch (...) {
+        m_state->opened = false;
+        throw;
+    }
+}
+
+bool XLMemoryArchive::isOpen() const { return m_state && m_state->opened; }
+
+void XLMemoryArchive::open(std::string_view fileName) {
+    if (isOpen()) close();
+    if (fileName != m_state->name) {
+        // A real file: load a copy of it (or start empty, like ZIP_CREATE)
+        std::string data;
+        std::ifstream file(std::filesystem::u8path(fileName), std::ios::binary);
+        if (file) {
+            data.assign(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+        }
+        m_state->reset(data);
+        m_state->name = std::string(fileName);
+    }
+    m_state->opened = true;
+    m_state->get();
+}
+
+void XLMemoryArchive::close() {
+    if (!isOpen()) return;
+    m_state->settle();
+    m_state->opened = false;
+}
+
+void XLMemoryArchive::save(std::string_view path) {
+    if (!isOpen()) return;
+    m_state->commit();
+    if (!path.empty() && path != m_state->name) write(std::string(path));
+}
+
+void XLMemoryArchive::addEntry(std::string_view name, std::string_view data) {
+    zip_t* archive = m_state->get();
+    m_state->modified = true;
+    void* buffer = std::malloc(data.size());
+    if (buffer == nullptr && !data.empty()) throw std::bad_alloc();
+    if (!data.empty()) std::memcpy(buffer, data.data(), data.size());
+    zip_source_t* source = zip_source_buffer(archive, buffer, data.size(), 1);
+    if (source == nullptr) {
+        std::free(buffer);
+        throw XLInternalError("Failed to create zip source");
+    }
+    const zip_int64_t index = zip_file_add(archive, std::string(name).c_str(), source,
+                                           ZIP_FL_OVERWRITE | ZIP_FL_ENC_UTF_8);
+    if (index < 0) {
+        zip_source_free(source);
+        throw XLInternalError(std::string("Failed to add entry: ") + zip_strerror(archive));
+    }
+    store_if_compressed(archive, index, name);
+}
+
+void XLMemoryArchive::addEntryFromFile(std::string_view name, std::string_view filePath) {
+    zip_t* archive = m_state->get();
+    m_state->modified = true;
+    zip_source_t* source = zip_source_file(archive, std::string(filePath).c_str(), 0, 0);
+    if (source == nullptr) {
+        throw XLInternalError("Failed to create zip source from file: " + std::string(filePath));
+    }
+    const zip_int64_t index =
+        zip_file_add(archive, std::string(name).c_str(), source, ZIP_FL_OVERWRITE);
+    if (index < 0) {
+        zip_source_free(source);
+        throw XLInternalError("Failed to add file entry to archive");
+    }
+    store_if_compressed(archive, index, name);
+}
+
+void XLMemoryArchive::deleteEntry(std::string_view entryName) {
+    if (!isOpen()) return;
+    zip_t* archive = m_state->get();
+    m_state->modified = true;
+    const zip_int64_t index = zip_name_locate(archive, std::string(entryName).c_str(), 0);
+    if (index >= 0 && zip_delete(archive, static_cast<zip_uint64_t>(index)) < 0) {
+        throw XLInternalError(std::string("Failed to delete entry: ") + zip_strerror(archive));
+    }
+}
+
+std::string XLMemoryArchive::getEntry(std::string_view name) const {
+    zip_t* archive = m_state->get();
+    const std::string entry(name);
+    zip_stat_t st;
+    zip_stat_init(&st);
+    if (zip_stat(archive, entry.c_str(), 0, &st) < 0) {
+        throw XLInternalError("Entry not found: " + entry);
+    }
+    zip_file_t* file = zip_fopen(archive, entry.c_str(), 0);
+    if (file == nullptr) throw XLInternalError("Failed to open entry: " + entry);
+    std::string data(st.size, '\0');
+    const zip_int64_t got = zip_fread(file, data.data(), st.size);
+    zip_fclose(file);
+    if (got < 0) throw XLInternalError("Failed to read entry: " + entry);
+    data.resize(static_cast<size_t>(got));
+    return data;
+}
+
+void* XLMemoryArchive::openEntryStream(std::string_view name) const {
+    zip_file_t* file = zip_fopen(m_state->get(), std::string(name).c_str(), 0);
+    if (file == nullptr) throw XLInternalError("Failed to open entry stream: " + std::string(name));
+    return file;
+}
+
+int64_t XLMemoryArchive::readEntryStream(void* stream, char* buffer, uint64_t size) const {
+    if (stream == nullptr) return -1;
+    return zip_fread(static_cast<zip_file_t*>(stream), buffer, size);
+}
+
+void XLMemoryArchive::closeEntryStream(void* stream) const {
+    if (stream != nullptr) zip_fclose(static_cast<zip_file_t*>(stream));
+}
+
+XLMemoryArchive::CommittedEntry::~CommittedEntry() {
+    if (m_file != nullptr) zip_fclose(static_cast<zip_file_t*>(m_file));
+    if (m_archive != nullptr) zip_discard(static_cast<zip_t*>(m_archive));
+}
+
+int64_t XLMemoryArchive::CommittedEntry::read(char* buffer, uint64_t size) {
+    return zip_fread(static_cast<zip_file_t*>(m_file), buffer, size);
+}
+
+std::unique_ptr<XLMemoryArchive::CommittedEntry> XLMemoryArchive::openCommittedEntry(
+    std::string_view name) const {
+    if (!isOpen() || m_state->package.empty()) return nullptr;
+    const std::string entry(name);
+    zip_stat_t current;
+    zip_stat_init(&current);
+    if (zip_stat(m_state->get(), entry.c_str(), 0, &current) < 0) return nullptr;
+
+    std::unique_ptr<CommittedEntry> reader(new CommittedEntry());
+    reader->m_owner = m_state->owner;
+    zip_source_t* source = buffer_source(m_state->package);
+    zip_error_t error;
+    zip_error_init(&error);
+    zip_t* archive = zip_open_from_source(source, ZIP_RDONLY, &error);
+    zip_error_fini(&error);
+    if (archive == nullptr) {
+        zip_source_free(source);
+        return nullptr;
+    }
+    reader->m_archive = archive;
+
+    // Only while the entry has the content it has in the committed package
+    zip_stat_t committed;
+    zip_stat_init(&committed);
+    if (zip_stat(archive, entry.c_str(), 0, &committed) < 0 || !same_content(current, committed)) {
+        return nullptr;
+    }
+    reader->m_file = zip_fopen(archive, entry.c_str(), 0);
+    if (reader->m_file == nullptr) return nullptr;
+    return reader;
+}
+
+bool XLMemoryArchive::hasEntry(std::string_view entryName) const {
+    if (!isOpen()) return false;
+    return zip_name_locate(m_state->get(), std::string(entryName).c_str(), 0) >= 0;
+}
+
+std::vector<std::string> XLMemoryArchive::entryNames() const {
+    if (!isOpen()) return {};
+    zip_t* archive = m_state->get();
+    const zip_int64_t count = zip_get_num_entries(archive, 0);
+    std::vector<std::string> names;
+    for (zip_int64_t i = 0; i < count; ++i) {
+        // nullptr for entries pending deletion
+        const char* name = zip_get_name(archive, static_cast<zip_uint64_t>(i), 0);
+        if (name != nullptr) names.emplace_back(name);
+    }
+    return names;
+}
+
+const std::string& XLMemoryArchive::name() const { return m_state->name; }
+
+std::optional<XLMemoryArchive::MappedView> XLMemoryArchive::mappedEntry(
+    std::string_view name) const {
+    if (!m_state->mapping || !isOpen()) return std::nullopt;
+    const auto it = m_state->stored.find(std::string(name));
+    if (it == m_state->stored.end()) return std::nullopt;
+
+    // Only while the entry still has the content it has in the file
+    zip_stat_t st;
+    zip_stat_init(&st);
+    if (zip_stat(m_state->get(), it->first.c_str(), 0, &st) < 0 ||
+        (st.valid & (ZIP_STAT_SIZE | ZIP_STAT_CRC)) != (ZIP_STAT_SIZE | ZIP_STAT_CRC) ||
+        st.size != it->second.data.size() || st.crc != it->second.crc) {
+        return std::nullopt;
+    }
+    return MappedView{it->second.data, m_state->mapping};
+}
+
+uint64_t XLMemoryArchive::size() const {
+    m_state->settle();
+    zip_stat_t st;
+    zip_stat_init(&st);
+    if (zip_source_stat(m_state->source, &st) < 0 || (st.valid & ZIP_STAT_SIZE) == 0) {
+        throw XLInternalError("Failed to stat zip buffer");
+    }
+    return st.size;
+}
+
+void XLMemoryArchive::read(char* out, uint64_t size) const {
+    m_state->settle();
+    zip_source_t* source = m_state->source;
+    if (zip_source_open(source) < 0) throw XLInternalError("Failed to open zip buffer");
+    uint64_t done = 0;
+    while (done < size) {
+        const zip_int64_t got = zip_source_read(source, out + done, size - done);
+        if (got <= 0) break;
+        done += static_cast<uint64_t>(got);
+    }
+    zip_source_close(source);
+    if (done != size) throw XLInternalError("Failed to read zip buffer");
+}
+
+void XLMemoryArchive::write(const std::string& path) const {
+    m_state->settle();
+    // The mapped file is replaced rather than overwritten: the package (and any view handed
+    // out by mappedEntry()) may still read from its pages
+    std::error_code ec;
+    const bool replace = m_state->mapping && std::filesystem::equivalent(
+                                                 std::filesystem::u8path(path),
+                                                 std::filesystem::u8path(m_state->mappedPath), ec);
+    const std::string target = replace ? path + ".pyopenxlsx-tmp" : path;
+
+    std::ofstream file(std::filesystem::u8path(target), std::ios::binary | std::ios::trunc);
+    if (!file) throw XLInternalError("Failed to write file: " + path);
+    zip_source_t* source = m_state->source;
+    if (zip_source_open(source) < 0) throw XLInternalError("Failed to open zip buffer");
+    std::vector<char> block(1 << 20);
+    zip_int64_t got = 0;
+    while ((got = zip_source_read(source, block.data(), block.size())) > 0) {
+        file.write(block.data(), got);
+    }
+    zip_source_close(source);
+    file.close();
+    if (got < 0 || !file) throw XLInternalError("Failed to write file: " + path);
+    if (replace) {
+        std::filesystem::rename(std::filesystem::u8path(target), std::filesystem::u8path(path));
+    }
+}
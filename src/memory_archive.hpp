@@ -0,0 +1,97 @@
+#ifndef PYOPENXLSX_MEMORY_ARCHIVE_HPP
+#define PYOPENXLSX_MEMORY_ARCHIVE_HPP
+
+/**
+ * @file memory_archive.hpp
+ * @brief A zip archive kept entirely in memory.
+ *
+ * XLMemoryArchive implements the interface IZipArchive expects (the same one
+ * XLZipArchive provides) on top of a libzip buffer source, so an XLDocument
+ * can be created, loaded and saved without touching the file system.
+ *
+ * The document is opened under a virtual name (name()); saving the document
+ * to that name commits the pending changes into the buffer, from where
+ * read() / write() copy the package out. Copies of an XLMemoryArchive share
+ * one buffer, which is how the Python side gets at the package of the archive
+ * that the document holds.
+ */
+
+#include <cstdint>
+#include <memory>
+#include <optional>
+#include <string>
+#include <string_view>
+#include <vector>
+
+class XLMemoryArchive {
+   public:
+    // An empty package
+    XLMemoryArchive();
+    // A copy of the zip package in `data`
+    explicit XLMemoryArchive(std::string_view data);
+    // The zip package of a file, read through a read-only shared memory mapping
+    static XLMemoryArchive map(const std::string& path);
+
+    bool isValid() const { return m_state != nullptr; }
+    bool isOpen() const;
+    void open(std::string_view fileName);
+    void close();
+    void save(std::string_view path = "");
+
+    void addEntry(std::string_view name, std::string_view data);
+    void addEntryFromFile(std::string_view name, std::string_view filePath);
+    void deleteEntry(std::string_view entryName);
+    std::string getEntry(std::string_view name) const;
+
+    void* openEntryStream(std::string_view name) const;
+    int64_t readEntryStream(void* stream, char* buffer, uint64_t size) const;
+    void closeEntryStream(void* stream) const;
+
+    bool hasEntry(std::string_view entryName) const;
+    std::vector<std::string> entryNames() const;
+
+    // Virtual path to open and save the document under (".xlsm" when the package has macros)
+    const std::string& name() const;
+    // Size of the package as last committed by save()
+    uint64_t size() const;
+    // Copy the committed package to `out`, which must hold size() bytes
+    void read(char* out, uint64_t size) const;
+    // Write the committed package to a file
+    void write(const std::string& path) const;
+
+    // A reader of one entry of the committed package, on an archive handle of its own. It
+    // holds on to the committed bytes, so later changes and commits do not affect it.
+    class CommittedEntry {
+       public:
+        ~CommittedEntry();
+        CommittedEntry(const CommittedEntry&) = delete;
+        CommittedEntry& operator=(const CommittedEntry&) = delete;
+        // Up to `size` bytes into `buffer`; 0 at the end, -1 on error
+        int64_t read(char* buffer, uint64_t size);
+
+       private:
+        friend class XLMemoryArchive;
+        CommittedEntry() = default;
+        std::shared_ptr<const void> m_owner;
+        void* m_archive = nullptr;
+        void* m_file = nullptr;
+    };
+    // Null when the entry is not in the committed package or was changed since
+    std::unique_ptr<CommittedEntry> openCommittedEntry(std::string_view name) const;
+
+    struct MappedView {
+        std::string_view data;
+        std::shared_ptr<const void> owner;  // keeps the mapping alive
+    };
+    // For mapped packages: the bytes of a stored (uncompressed) entry, straight from the
+    // mapping, as long as the entry is unchanged. std::nullopt otherwise.
+    std::optional<MappedView> mappedEntry(std::string_view name) const;
+
+   private:
+    void probe();
+
+    struct State;
+    std::shared_ptr<State> m_state;
+};
+
+#endif  // PYOPENXLSX_MEMORY_ARCHIVE_HPP
@@ -0,0 +1,211 @@
+#include "merge_index.hpp"
+
+#include <algorithm>
+#include <functional>
+#include <map>
+#include <queue>
+
+#include "internal_access.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+bool top_left_order(const MergeRect& a, const MergeRect& b) {
+    return a.top != b.top ? a.top < b.top : a.left < b.left;
+}
+
+}  // namespace
+
+MergeRect parse_merge_ref(const std::string& ref) {
+    MergeRect rect;
+    rect.ref = ref;
+    if (ref.find(':') == std::string::npos ||
+        !parse_range_ref(ref, rect.top, rect.left, rect.bottom, rect.right) ||
+        (rect.top == rect.bottom && rect.left == rect.right)) {
+        throw py::value_error(("Not a valid merge reference: \"" + ref + "\"").c_str());
+    }
+    return rect;
+}
+
+MergeIndex::MergeIndex(const XLMergeCells& merges) {
+    const auto count = static_cast<int32_t>(merges.count());
+    m_tail.reserve(static_cast<size_t>(count));
+    for (int32_t i = 0; i < count; ++i) {
+        // XLMergeCells has already validated every entry it keeps
+        MergeRect rect;
+        rect.ref = merges.merge(i);
+        if (parse_range_ref(rect.ref, rect.top, rect.left, rect.bottom, rect.right)) {
+            m_tail.push_back(std::move(rect));
+        }
+    }
+    rebuild();
+}
+
+uint32_t MergeIndex::build(size_t lo, size_t hi) {
+    if (lo >= hi) return 0;
+    const size_t mid = lo + (hi - lo) / 2;
+    uint32_t maxBottom = m_tree[mid].bottom;
+    maxBottom = std::max(maxBottom, build(lo, mid));
+    maxBottom = std::max(maxBottom, build(mid + 1, hi));
+    m_maxBottom[mid] = maxBottom;
+    return maxBottom;
+}
+
+void MergeIndex::rebuild() {
+    std::vector<MergeRect> live;
+    live.reserve(size());
+    for (size_t i = 0; i < m_tree.size(); ++i) {
+        if (!m_dead[i]) live.push_back(std::move(m_tree[i]));
+    }
+    for (auto& rect : m_tail) live.push_back(std::move(rect));
+    m_tail.clear();
+    std::sort(live.begin(), live.end(), top_left_order);
+
+    m_tree = std::move(live);
+    m_maxBottom.assign(m_tree.size(), 0);
+    m_dead.assign(m_tree.size(), false);
+    m_deadCount = 0;
+    m_positions.clear();
+    m_positions.reserve(m_tree.size());
+    for (size_t i = 0; i < m_tree.size(); ++i) m_positions.emplace(m_tree[i].ref, i);
+    build(0, m_tree.size());
+}
+
+void MergeIndex::maybe_rebuild() {
+    const size_t live = m_tree.size() - m_deadCount;
+    if (m_tail.size() > 16 + live / 8 || m_deadCount > live) rebuild();
+}
+
+void MergeIndex::add(const std::string& ref) {
+    m_tail.push_back(parse_merge_ref(ref));
+    maybe_rebuild();
+}
+
+void MergeIndex::add_many(const std::vector<std::string>& refs) {
+    m_tail.reserve(m_tail.size() + refs.size());
+    for (const auto& ref : refs) m_tail.push_back(parse_merge_ref(ref));
+    maybe_rebuild();
+}
+
+bool MergeIndex::remove(const std::string& ref) {
+    auto it = m_positions.find(ref);
+    if (it != m_positions.end()) {
+        m_dead[it->second] = true;
+        ++m_deadCount;
+        m_positions.erase(it);
+        maybe_rebuild();
+        return true;
+    }
+    auto tail = std::find_if(m_tail.begin(), m_tail.end(),
+                             [&ref](const MergeRect& rect) { return rect.ref == ref; });
+    if (tail == m_tail.end()) return false;
+    m_tail.erase(tail);
+    return true;
+}
+
+std::optional<std::string> MergeIndex::covering(uint32_t row, uint16_t col) const {
+    std::optional<std::string> found;
+    for_each_in_rows(row, row, [&](const MergeRect& rect) {
+        if (rect.left <= col && rect.right >= col) {
+            found = rect.ref;
+            return false;
+        }
+        return true;
+    });
+    return found;
+}
+
+std::vector<std::string> MergeIndex::intersecting(uint32_t firstRow, uint16_t firstCol,
+                                                  uint32_t lastRow, uint16_t lastCol) const {
+    std::vector<const MergeRect*> hits;
+    for_each_in_rows(firstRow, lastRow, [&](const MergeRect& rect) {
+        if (rect.left <= lastCol && rect.right >= firstCol) hits.push_back(&rect);
+        return true;
+    });
+    if (!m_tail.empty()) {
+        std::sort(hits.begin(), hits.end(),
+                  [](const MergeRect* a, const MergeRect* b) { return top_left_order(*a, *b); });
+    }
+    std::vector<std::string> refs;
+    refs.reserve(hits.size());
+    for (const auto* rect : hits) refs.push_back(rect->ref);
+    return refs;
+}
+
+const MergeRect* MergeIndex::find_intersecting(const MergeRect& rect) const {
+    const MergeRect* found = nullptr;
+    for_each_in_rows(rect.top, rect.bottom, [&](const MergeRect& other) {
+        if (other.intersects(rect)) {
+            found = &other;
+            return false;
+        }
+        return true;
+    });
+    return found;
+}
+
+void append_merges(XLWorksheet& ws, const std::vector<std::string>& refs) {
+    if (refs.empty()) return;
+
+    std::vector<MergeRect> rects;
+    rects.reserve(refs.size());
+    for (const auto& ref : refs) rects.push_back(parse_merge_ref(ref));
+
+    XLMergeCells& merges = ws.merges();
+    if (merges.count() + rects.size() > XLMaxMergeCells) {
+        throw py::value_error("Too many merged ranges for one worksheet");
+    }
+
+    py::gil_scoped_release release;
+
+    // Against the existing merges: one index build, then a logarithmic query per range
+    const MergeIndex existing(merges);
+    for (const auto& rect : rects) {
+        if (const MergeRect* other = existing.find_intersecting(rect)) {
+            throw py::value_error(("Merge reference \"" + rect.ref +
+                                   "\" overlaps with existing reference \"" + other->ref + "\"")
+                                      .c_str());
+        }
+    }
+
+    // Among the new ranges: sweep by top row. The active ranges all contain the current row,
+    // so their column spans are disjoint and only the nearest one to the left can overlap.
+    std::vector<size_t> order(rects.size());
+    for (size_t i = 0; i < order.size(); ++i) order[i] = i;
+    std::sort(order.begin(), order.end(),
+              [&rects](size_t a, size_t b) { return top_left_order(rects[a], rects[b]); });
+    std::map<uint16_t, size_t> active;             // left column -> rect
+    using Expiry = std::pair<uint32_t, uint16_t>;  // (bottom row, left column)
+    std::priority_queue<Expiry, std::vector<Expiry>, std::greater<>> expiry;
+    for (size_t i : order) {
+        const MergeRect& rect = rects[i];
+        while (!expiry.empty() && expiry.top().first < rect.top) {
+            active.erase(expiry.top().second);
+            expiry.pop();
+        }
+        auto it = active.upper_bound(rect.right);
+        if (it != active.begin()) {
+            const MergeRect& other = rects[std::prev(it)->second];
+            if (other.right >= rect.left) {
+                throw py::value_error(
+                    ("Merge reference \"" + rect.ref + "\" overlaps with \"" + other.ref + "\"")
+                        .c_str());
+            }
+        }
+        active.emplace(rect.left, i);
+        expiry.emplace(rect.bottom, rect.left);
+    }
+
+    // Let XLMergeCells create <mergeCells> in its schema position, then append the rest
+    // directly and re-read the node once to rebuild its cache.
+    merges.appendMerge(rects.front().ref);
+    if (rects.size() == 1) return;
+    XMLNode root = get_xml_doc(ws).document_element();
+    XMLNode mergeCellsNode = root.child("mergeCells");
+    for (size_t i = 1; i < rects.size(); ++i) {
+        mergeCellsNode.append_child("mergeCell")
+            .append_attribute("ref")
+            .set_value(rects[i].ref.c_str());
+    }
+    merges = XLMergeCells(root, XLWorksheetNodeOrder);
+}
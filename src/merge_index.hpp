@@ -0,0 +1,104 @@
+#ifndef PYOPENXLSX_MERGE_INDEX_HPP
+#define PYOPENXLSX_MERGE_INDEX_HPP
+
+/**
+ * @file merge_index.hpp
+ * @brief Spatial index over the merged ranges of a worksheet.
+ *
+ * XLMergeCells keeps its ranges in a flat list, so "which merge covers this
+ * cell" and every overlap check on append are linear scans. MergeIndex is a
+ * static interval tree: ranges sorted by top row, each subtree augmented with
+ * its largest bottom row so that branches ending above the queried rows are
+ * pruned. Queries cost O(log n + k).
+ *
+ * Single appends go to a small unsorted tail that is folded into the tree once
+ * it grows past a fraction of the tree size; deletions are tombstoned. Both
+ * keep the amortised cost per update logarithmic.
+ */
+
+#include <cstdint>
+#include <optional>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "bindings.hpp"
+
+struct MergeRect {
+    uint32_t top = 0;
+    uint16_t left = 0;
+    uint32_t bottom = 0;
+    uint16_t right = 0;
+    std::string ref;
+
+    bool intersects(uint32_t firstRow, uint16_t firstCol, uint32_t lastRow,
+                    uint16_t lastCol) const {
+        return top <= lastRow && bottom >= firstRow && left <= lastCol && right >= firstCol;
+    }
+    bool intersects(const MergeRect& other) const {
+        return intersects(other.top, other.left, other.bottom, other.right);
+    }
+};
+
+// Parse a merge reference ("A1:B2"); throws ValueError for malformed or single-cell ranges
+MergeRect parse_merge_ref(const std::string& ref);
+
+class MergeIndex {
+   public:
+    MergeIndex() = default;
+    explicit MergeIndex(const XLMergeCells& merges);
+
+    size_t size() const { return m_tree.size() - m_deadCount + m_tail.size(); }
+
+    void add(const std::string& ref);
+    void add_many(const std::vector<std::string>& refs);
+    bool remove(const std::string& ref);
+
+    // The merged range containing (row, col), if any
+    std::optional<std::string> covering(uint32_t row, uint16_t col) const;
+    // All merged ranges intersecting the block, ordered by (top, left)
+    std::vector<std::string> intersecting(uint32_t firstRow, uint16_t firstCol, uint32_t lastRow,
+                                          uint16_t lastCol) const;
+    // First merged range intersecting `rect`, or nullptr
+    const MergeRect* find_intersecting(const MergeRect& rect) const;
+
+   private:
+    void rebuild();
+    void maybe_rebuild();
+    uint32_t build(size_t lo, size_t hi);
+
+    // Visit live entries whose rows intersect [firstRow, lastRow]; stops when fn returns false
+    template <typename Fn>
+    bool visit(size_t lo, size_t hi, uint32_t firstRow, uint32_t lastRow, Fn& fn) const {
+        if (lo >= hi) return true;
+        const size_t mid = lo + (hi - lo) / 2;
+        if (m_maxBottom[mid] < firstRow) return true;
+        if (!visit(lo, mid, firstRow, lastRow, fn)) return false;
+        const MergeRect& rect = m_tree[mid];
+        if (rect.top > lastRow) return true;
+        if (!m_dead[mid] && rect.bottom >= firstRow && !fn(rect)) return false;
+        return visit(mid + 1, hi, firstRow, lastRow, fn);
+    }
+
+    template <typename Fn>
+    void for_each_in_rows(uint32_t firstRow, uint32_t lastRow, Fn&& fn) const {
+        if (!visit(0, m_tree.size(), firstRow, lastRow, fn)) return;
+        for (const auto& rect : m_tail) {
+            if (rect.top <= lastRow && rect.bottom >= firstRow && !fn(rect)) return;
+        }
+    }
+
+    std::vector<MergeRect> m_tree;
+    std::vector<uint32_t> m_maxBottom;
+    std::vector<bool> m_dead;
+    size_t m_deadCount = 0;
+    std::unordered_map<std::string, size_t> m_positions;
+    std::vector<MergeRect> m_tail;
+};
+
+// Append many merged ranges at once. Overlaps against the existing merges and among
+// the new ranges are checked in O(n log n) before anything is written, and the
+// XLMergeCells cache is rebuilt once instead of scanned on every append.
+void append_merges(XLWorksheet& ws, const std::vector<std::string>& refs);
+
+#endif  // PYOPENXLSX_MERGE_INDEX_HPP
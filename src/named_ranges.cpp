@@ -0,0 +1,222 @@
+#include "named_ranges.hpp"
+
+#include <algorithm>
+#include <map>
+
+#include "sheet_xml.hpp"
+
+namespace {
+
+std::string lower(std::string_view text) {
+    std::string key(text);
+    for (char& ch : key) {
+        if (ch >= 'A' && ch <= 'Z') ch = static_cast<char>(ch - 'A' + 'a');
+    }
+    return key;
+}
+
+std::optional<uint32_t> scope_of(const XMLNode& node) {
+    XMLAttribute attr = node.attribute("localSheetId");
+    if (attr.empty()) return std::nullopt;
+    return attr.as_uint();
+}
+
+// Position of the '!' that ends the sheet part of `ref`, skipping quoted sheet names
+size_t sheet_separator(std::string_view ref) {
+    bool quoted = false;
+    size_t found = std::string_view::npos;
+    for (size_t i = 0; i < ref.size(); ++i) {
+        if (ref[i] == '\'') {
+            quoted = !quoted;
+        } else if (!quoted) {
+            if (ref[i] == '!') found = i;
+            if (ref[i] == ',') return std::string_view::npos - 1;  // several areas
+        }
+    }
+    return found;
+}
+
+// "'It''s'" -> "It's"; unquoted names are returned as they are
+std::string unquote_sheet(std::string_view sheet) {
+    if (sheet.size() < 2 || sheet.front() != '\'' || sheet.back() != '\'') {
+        return std::string(sheet);
+    }
+    std::string name;
+    for (size_t i = 1; i + 1 < sheet.size(); ++i) {
+        name += sheet[i];
+        if (sheet[i] == '\'' && sheet[i + 1] == '\'') ++i;
+    }
+    return name;
+}
+
+struct Target {
+    std::string sheet;
+    uint32_t firstRow = 0;
+    uint16_t firstCol = 0;
+    uint32_t lastRow = 0;
+    uint16_t lastCol = 0;
+};
+
+// The sheet and block of a formula such as "'My Sheet'!$A$1:$C$3"
+Target parse_target(const std::string& name, std::string_view formula) {
+    if (!formula.empty() && formula.front() == '=') formula.remove_prefix(1);
+    const size_t bang = sheet_separator(formula);
+    Target target;
+    bool ok = bang < formula.size() && formula.find('[') == std::string_view::npos;
+    if (ok) {
+        target.sheet = unquote_sheet(formula.substr(0, bang));
+        std::string ref;
+        for (char ch : formula.substr(bang + 1)) {
+            if (ch == '$') continue;
+            ref += (ch >= 'a' && ch <= 'z') ? static_cast<char>(ch - 'a' + 'A') : ch;
+        }
+        ok = !target.sheet.empty() &&
+             parse_range_ref(ref, target.firstRow, target.firstCol, target.lastRow, target.lastCol);
+    }
+    if (!ok) {
+        throw py::value_error(
+            ("Defined name '" + name + "' does not refer to a cell range: " + std::string(formula))
+                .c_str());
+    }
+    return target;
+}
+
+}  // namespace
+
+DefinedNameIndex::DefinedNameIndex(XLWorkbook& wb)
+    : m_names(wb.definedNames()), m_root(get_xml_doc(wb).document_element().child("definedNames")) {
+    for (XMLNode node = m_root.child("definedName"); !node.empty();
+         node = node.next_sibling("definedName")) {
+        insert(node);
+    }
+}
+
+void DefinedNameIndex::insert(const XMLNode& node) {
+    m_nodes[lower(node.attribute("name").value())].push_back(node);
+    ++m_size;
+}
+
+XMLNode DefinedNameIndex::find(const std::string& name,
+                               std::optional<uint32_t> localSheetId) const {
+    auto it = m_nodes.find(lower(name));
+    if (it == m_nodes.end()) return {};
+    // Scopes are read from the nodes, so reordering sheets (which renumbers them) is seen
+    for (const XMLNode& node : it->second) {
+        if (scope_of(node) == localSheetId) return node;
+    }
+    return {};
+}
+
+XLDefinedName DefinedNameIndex::get(const std::string& name,
+                                    std::optional<uint32_t> localSheetId) const {
+    return XLDefinedName(find(name, localSheetId));
+}
+
+XLDefinedName DefinedNameIndex::resolve(const std::string& name,
+                                        std::optional<uint32_t> localSheetId) const {
+    XMLNode node = localSheetId ? find(name, localSheetId) : XMLNode();
+    if (node.empty()) node = find(name, std::nullopt);
+    return XLDefinedName(node);
+}
+
+XLDefinedName DefinedNameIndex::append(const std::string& name, const std::string& formula,
+                                       std::optional<uint32_t> localSheetId) {
+    XLDefinedName definedName = m_names.append(name, formula, localSheetId);
+    // XLDefinedNames::append adds the name as the last child
+    insert(m_root.last_child());
+    return definedName;
+}
+
+bool DefinedNameIndex::remove(const std::string& name, std::optional<uint32_t> localSheetId) {
+    auto it = m_nodes.find(lower(name));
+    if (it == m_nodes.end()) return false;
+    auto& nodes = it->second;
+    auto pos = std::find_if(nodes.begin(), nodes.end(),
+                            [&](const XMLNode& node) { return scope_of(node) == localSheetId; });
+    if (pos == nodes.end()) return false;
+    m_root.remove_child(*pos);
+    nodes.erase(pos);
+    if (nodes.empty()) m_nodes.erase(it);
+    --m_size;
+    return true;
+}
+
+std::vector<NamedBlock> read_named_ranges(XLWorkbook& wb, const DefinedNameIndex& index,
+                                          const std::vector<std::string>& names) {
+    // Resolve every name before reading anything, so a bad name fails the whole batch
+    std::vector<Target> targets;
+    targets.reserve(names.size());
+    std::map<std::string, std::vector<size_t>> bySheet;
+    for (const std::string& qualified : names) {
+        std::string name = qualified;
+        std::optional<uint32_t> scope;
+        const size_t bang = sheet_separator(qualified);
+        if (bang < qualified.size()) {
+            const std::string sheet = unquote_sheet(std::string_view(qualified).substr(0, bang));
+            if (!wb.sheetExists(sheet)) {
+                throw py::key_error(("Worksheet '" + sheet + "' does not exist").c_str());
+            }
+            scope = wb.indexOfSheet(sheet) - 1;
+            name = qualified.substr(bang + 1);
+        }
+        XLDefinedName definedName = index.resolve(name, scope);
+        if (!definedName.valid()) {
+            throw py::key_error(("Defined name '" + qualified + "' not found").c_str());
+        }
+        targets.push_back(parse_target(qualified, definedName.refersTo()));
+        if (!wb.worksheetExists(targets.back().sheet)) {
+            throw py::key_error(("Defined name '" + qualified + "' refers to missing worksheet '" +
+                                 targets.back().sheet + "'")
+                                    .c_str());
+        }
+        bySheet[targets.back().sheet].push_back(targets.size() - 1);
+    }
+
+    std::vector<NamedBlock> blocks(targets.size());
+    for (size_t i = 0; i < targets.size(); ++i) {
+        const Target& t = targets[i];
+        blocks[i].rows = t.lastRow - t.firstRow + 1;
+        blocks[i].columns = static_cast<uint16_t>(t.lastCol - t.firstCol + 1);
+        blocks[i].cells.resize(static_cast<size_t>(blocks[i].rows) * blocks[i].columns);
+    }
+
+    for (auto& [sheet, members] : bySheet) {
+        XLWorksheet ws = wb.worksheet(sheet);
+        const XLSharedStrings& sharedStrings = get_parent_doc(ws).sharedStrings();
+        std::sort(members.begin(), members.end(),
+                  [&](size_t a, size_t b) { return targets[a].firstRow < targets[b].firstRow; });
+
+        // One forward pass over <sheetData>; a row's values are decoded once for all the
+        // ranges that span it
+        size_t next = 0;
+        std::vector<size_t> active;
+        XMLNode sheetData = sheet_data_node(ws);
+        for (XMLNode rowNode = sheetData.first_child_of_type(pugi::node_element); !rowNode.empty();
+             rowNode = rowNode.next_sibling_of_type(pugi::node_element)) {
+            const uint32_t row = rowNode.attribute("r").as_uint();
+            while (next < members.size() && targets[members[next]].firstRow <= row) {
+                active.push_back(members[next++]);
+            }
+            active.erase(std::remove_if(active.begin(), active.end(),
+                                        [&](size_t i) { return targets[i].lastRow < row; }),
+                         active.end());
+            if (active.empty()) {
+                if (next == members.size()) break;
+                continue;
+            }
+
+            const std::vector<XLCellValue> values = XLRow(rowNode, sharedStrings).values();
+            for (size_t i : active) {
+                const Target& t = targets[i];
+                NamedBlock& block = blocks[i];
+                const size_t base = static_cast<size_t>(row - t.firstRow) * block.columns;
+                for (uint16_t c = 0; c < block.columns; ++c) {
+                    const size_t col = t.firstCol - 1 + c;
+                    if (col >= values.size()) break;
+                    block.cells[base + c] = CellData::from(values[col]);
+                }
+            }
+        }
+    }
+    return blocks;
+}
@@ -0,0 +1,71 @@
+#ifndef PYOPENXLSX_NAMED_RANGES_HPP
+#define PYOPENXLSX_NAMED_RANGES_HPP
+
+/**
+ * @file named_ranges.hpp
+ * @brief Hashed lookup of defined names and batch reads of the ranges they name.
+ *
+ * XLDefinedNames::get and exists walk the <definedNames> element on every
+ * call, so resolving a name per setting of a configuration sheet is
+ * quadratic. DefinedNameIndex hashes the names once (case-insensitively, as
+ * Excel compares them) and keeps every scope of a name in one bucket.
+ * read_named_ranges() resolves a batch of names, groups their ranges by sheet
+ * and reads each sheet in a single pass over its <sheetData>.
+ *
+ * The index holds the XML nodes of the names: names added or removed other
+ * than through it are not seen, and a removed one leaves a dangling node.
+ */
+
+#include <cstdint>
+#include <optional>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "bindings.hpp"
+#include "internal_access.hpp"
+
+class DefinedNameIndex {
+   public:
+    explicit DefinedNameIndex(XLWorkbook& wb);
+
+    size_t size() const { return m_size; }
+
+    // The name in exactly this scope: global when `localSheetId` is empty (as XLDefinedNames::get)
+    XLDefinedName get(const std::string& name, std::optional<uint32_t> localSheetId) const;
+    // The name as a formula on sheet `localSheetId` sees it: the sheet's own name, else the global
+    // one
+    XLDefinedName resolve(const std::string& name, std::optional<uint32_t> localSheetId) const;
+
+    // Write through to the workbook and keep the index in sync
+    XLDefinedName append(const std::string& name, const std::string& formula,
+                         std::optional<uint32_t> localSheetId);
+    bool remove(const std::string& name, std::optional<uint32_t> localSheetId);
+
+   private:
+    XMLNode find(const std::string& name, std::optional<uint32_t> localSheetId) const;
+    void insert(const XMLNode& node);
+
+    XLDefinedNames m_names;
+    XMLNode m_root;                                                 // <definedNames>
+    std::unordered_map<std::string, std::vector<XMLNode>> m_nodes;  // by lower-case name
+    size_t m_size = 0;
+};
+
+struct NamedBlock {
+    uint32_t rows = 0;
+    uint16_t columns = 0;
+    std::vector<CellData> cells;  // row-major
+};
+
+/**
+ * Values of the ranges named in `names`, in the same order. A name may be
+ * qualified with a sheet ("Sheet2!Total" or "'My Sheet'!Total") to pick the
+ * name local to that sheet before the global one. Raises KeyError for unknown
+ * names or sheets and ValueError for names that do not refer to a single cell
+ * range. Safe to call without the GIL.
+ */
+std::vector<NamedBlock> read_named_ranges(XLWorkbook& wb, const DefinedNameIndex& index,
+                                          const std::vector<std::string>& names);
+
+#endif  // PYOPENXLSX_NAMED_RANGES_HPP
@@ -0,0 +1,787 @@
+#include "number_format.hpp"
+
+#include <algorithm>
+#include <cctype>
+#include <cmath>
+#include <cstddef>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <vector>
+
+namespace {
+
+enum class TokenType { Literal, DatePart, AmPm, Digit, Decimal, Comma, Percent, Exponent, Text };
+
+struct Token {
+    TokenType type;
+    std::string text;  // literal text, lower-cased date part, digit placeholder, "E+"/"E-"
+};
+
+struct Section {
+    std::vector<Token> tokens;
+    bool general = false;
+    bool fraction = false;
+    bool date = false;
+};
+
+// "%.*f" of `value`, rounded half away from zero as Excel does rather than to the nearest
+// binary value: the value is taken at 15 significant digits (Excel's precision), so binary
+// noise such as 0.1234 * 100 = 12.340000000000002 does not decide a tie
+std::string format_fixed(double value, int decimals) {
+    char buf[400];
+    if (!std::isfinite(value) || std::fabs(value) >= 1e15 || decimals > 300) {
+        std::snprintf(buf, sizeof(buf), "%.*f", decimals, value);
+        return buf;
+    }
+    std::snprintf(buf, sizeof(buf), "%.14e", std::fabs(value));
+    const std::string mantissa = std::string(1, buf[0]) + std::string(buf + 2, 14);
+    const int exponent = std::atoi(std::strchr(buf, 'e') + 1);
+
+    // The digits of round(|value| * 10^decimals)
+    const int keep = exponent + 1 + decimals;
+    std::string digits;
+    if (keep > 0) {
+        digits = mantissa.substr(0, static_cast<size_t>(std::min(keep, 15)));
+        if (keep > 15) digits.append(static_cast<size_t>(keep - 15), '0');
+    }
+    if (keep >= 0 && keep < 15 && mantissa[static_cast<size_t>(keep)] >= '5') {
+        size_t i = digits.size();
+        while (i > 0 && digits[i - 1] == '9') digits[--i] = '0';
+        if (i == 0) {
+            digits.insert(0, 1, '1');
+        } else {
+            ++digits[i - 1];
+        }
+    }
+
+    const size_t width = static_cast<size_t>(decimals) + 1;
+    if (digits.size() < width) digits.insert(0, width - digits.size(), '0');
+    std::string text = std::signbit(value) ? "-" : "";
+    text += digits.substr(0, digits.size() - static_cast<size_t>(decimals));
+    if (decimals > 0) text += "." + digits.substr(digits.size() - static_cast<size_t>(decimals));
+    return text;
+}
+
+constexpr const char* kMonthNames[] = {"January",   "February", "March",    "April",
+                                       "May",       "June",     "July",     "August",
+                                       "September", "October",  "November", "December"};
+constexpr const char* kDayNames[] = {"Sunday",   "Monday", "Tuesday", "Wednesday",
+                                     "Thursday", "Friday", "Saturday"};
+
+char lower(char c) { return static_cast<char>(std::tolower(static_cast<unsigned char>(c))); }
+
+bool starts_with_nocase(std::string_view text, size_t pos, std::string_view prefix) {
+    if (pos + prefix.size() > text.size()) return false;
+    for (size_t i = 0; i < prefix.size(); ++i) {
+        if (lower(text[pos + i]) != lower(prefix[i])) return false;
+    }
+    return true;
+}
+
+// Split a format code on ';' outside quotes, escapes and brackets
+std::vector<std::string_view> split_sections(std::string_view code) {
+    std::vector<std::string_view> sections;
+    size_t start = 0;
+    bool quoted = false;
+    bool bracket = false;
+    for (size_t i = 0; i < code.size(); ++i) {
+        const char c = code[i];
+        if (quoted) {
+            quoted = c != '"';
+        } else if (bracket) {
+            bracket = c != ']';
+        } else if (c == '"') {
+            quoted = true;
+        } else if (c == '[') {
+            bracket = true;
+        } else if (c == '\\' || c == '_' || c == '*') {
+            ++i;
+        } else if (c == ';') {
+            sections.push_back(code.substr(start, i - start));
+            start = i + 1;
+        }
+    }
+    sections.push_back(code.substr(start));
+    return sections;
+}
+
+void add_literal(Section& section, std::string_view text) {
+    if (!section.tokens.empty() && section.tokens.back().type == TokenType::Literal) {
+        section.tokens.back().text.append(text);
+    } else {
+        section.tokens.push_back({TokenType::Literal, std::string(text)});
+    }
+}
+
+Section parse_section(std::string_view code) {
+    Section section;
+    for (size_t i = 0; i < code.size(); ++i) {
+        const char c = code[i];
+        const char lc = lower(c);
+        if (c == '"') {
+            const size_t end = code.find('"', i + 1);
+            const size_t stop = end == std::string_view::npos ? code.size() : end;
+            add_literal(section, code.substr(i + 1, stop - i - 1));
+            i = stop;
+        } else if (c == '\\') {
+            if (i + 1 < code.size()) add_literal(section, code.substr(++i, 1));
+        } else if (c == '_') {
+            ++i;
+            add_literal(section, " ");
+        } else if (c == '*') {
+            ++i;  // repeat-fill character: no fixed width
+        } else if (c == '[') {
+            const size_t end = code.find(']', i);
+            const size_t stop = end == std::string_view::npos ? code.size() : end;
+            std::string_view inner = code.substr(i + 1, stop - i - 1);
+            if (!inner.empty() &&
+                (lower(inner[0]) == 'h' || lower(inner[0]) == 'm' || lower(inner[0]) == 's')) {
+                std::string part(1, '[');
+                for (char ch : inner) part += lower(ch);
+                part += ']';
+                section.tokens.push_back({TokenType::DatePart, part});
+                section.date = true;
+            } else if (!inner.empty() && inner[0] == '$') {
+                // Currency/locale tag such as [$€-407]: the symbol is displayed
+                add_literal(section, inner.substr(1, inner.find('-') == std::string_view::npos
+                                                         ? std::string_view::npos
+                                                         : inner.find('-') - 1));
+            }
+            i = stop;
+        } else if (starts_with_nocase(code, i, "general")) {
+            section.general = true;
+            i += 6;
+        } else if (starts_with_nocase(code, i, "am/pm")) {
+            section.tokens.push_back({TokenType::AmPm, "am/pm"});
+            i += 4;
+        } else if (starts_with_nocase(code, i, "a/p")) {
+            section.tokens.push_back({TokenType::AmPm, "a/p"});
+            i += 2;
+        } else if (lc == 'e' && i + 1 < code.size() && (code[i + 1] == '+' || code[i + 1] == '-')) {
+            section.tokens.push_back({TokenType::Exponent, std::string("E") + code[i + 1]});
+            ++i;
+        } else if (lc == 'y' || lc == 'm' || lc == 'd' || lc == 'h' || lc == 's') {
+            std::string part;
+            while (i < code.size() && lower(code[i]) == lc) part += lc, ++i;
+            --i;
+            section.tokens.push_back({TokenType::DatePart, part});
+            section.date = true;
+        } else if (c == '0' || c == '#' || c == '?') {
+            section.tokens.push_back({TokenType::Digit, std::string(1, c)});
+        } else if (c == '.') {
+            // ".0" after seconds is fractional seconds
+            if (section.date && i + 1 < code.size() && code[i + 1] == '0') {
+                std::string part(".");
+                while (i + 1 < code.size() && code[i + 1] == '0') part += '0', ++i;
+                section.tokens.push_back({TokenType::DatePart, part});
+            } else {
+                section.tokens.push_back({TokenType::Decimal, "."});
+            }
+        } else if (c == ',') {
+            section.tokens.push_back({TokenType::Comma, ","});
+        } else if (c == '%') {
+            section.tokens.push_back({TokenType::Percent, "%"});
+        } else if (c == '@') {
+            section.tokens.push_back({TokenType::Text, "@"});
+        } else if (c == '/' && !section.tokens.empty() &&
+                   section.tokens.back().type == TokenType::Digit) {
+            section.fraction = true;
+        } else {
+            add_literal(section, code.substr(i, 1));
+        }
+    }
+    return section;
+}
+
+// ---------------------------------------------------------------- dates
+
+struct DateParts {
+    int year = 1900, month = 1, day = 0, weekday = 0;
+    int64_t hour = 0, minute = 0, second = 0;
+    double subsecond = 0.0;
+};
+
+// Howard Hinnant's civil_from_days
+void civil_from_days(int64_t z, int& y, int& m, int& d) {
+    z += 719468;
+    const int64_t era = (z >= 0 ? z : z - 146096) / 146097;
+    const auto doe = static_cast<unsigned>(z - era * 146097);
+    const unsigned yoe = (doe - doe / 1460 + doe / 36524 - doe / 146096) / 365;
+    const unsigned doy = doe - (365 * yoe + yoe / 4 - yoe / 100);
+    const unsigned mp = (5 * doy + 2) / 153;
+    d = static_cast<int>(doy - (153 * mp + 2) / 5 + 1);
+    m = static_cast<int>(mp < 10 ? mp + 3 : mp - 9);
+    y = static_cast<int>(yoe + era * 400 + (m <= 2 ? 1 : 0));
+}
+
+DateParts serial_to_date(double serial, int fractionDigits) {
+    DateParts parts;
+    const double scale = std::pow(10.0, fractionDigits);
+    // Round to the displayed precision so 0.99999 shows as the next day
+    const double ticks = std::round(serial * 86400.0 * scale);
+    auto days = static_cast<int64_t>(std::floor(ticks / (86400.0 * scale)));
+    const double dayTicks = ticks - static_cast<double>(days) * 86400.0 * scale;
+    const auto secs = static_cast<int64_t>(std::floor(dayTicks / scale));
+    parts.subsecond = (dayTicks - static_cast<double>(secs) * scale) / scale;
+    parts.hour = secs / 3600;
+    parts.minute = (secs / 60) % 60;
+    parts.second = secs % 60;
+
+    if (days == 60) {  // Excel's phantom 1900-02-29
+        parts.year = 1900;
+        parts.month = 2;
+        parts.day = 29;
+        parts.weekday = 3;
+        return parts;
+    }
+    if (days == 0) {  // "1900-01-00"
+        parts.weekday = 6;
+        return parts;
+    }
+    // Days since 1970-01-01; serial 61 is 1900-03-01
+    const int64_t unixDays = days < 60 ? days - 25568 : days - 25569;
+    civil_from_days(unixDays, parts.year, parts.month, parts.day);
+    parts.weekday = static_cast<int>(((unixDays % 7) + 11) % 7);
+    return parts;
+}
+
+std::string pad(int64_t value, size_t width) {
+    std::string text = std::to_string(value);
+    if (text.size() < width) text.insert(0, width - text.size(), '0');
+    return text;
+}
+
+// "m" means minutes right after an hour or right before a seconds part
+bool is_minutes(const std::vector<Token>& tokens, size_t index) {
+    for (size_t j = index; j-- > 0;) {
+        if (tokens[j].type != TokenType::DatePart) continue;
+        if (tokens[j].text[0] == 'h' || tokens[j].text.rfind("[h", 0) == 0) return true;
+        break;
+    }
+    for (size_t j = index + 1; j < tokens.size(); ++j) {
+        if (tokens[j].type != TokenType::DatePart) continue;
+        return tokens[j].text[0] == 's' || tokens[j].text.rfind("[s", 0) == 0;
+    }
+    return false;
+}
+
+std::string render_date(double serial, const Section& section) {
+    if (serial < 0) return std::string(10, '#');
+
+    const auto& tokens = section.tokens;
+    bool twelveHour = false;
+    int fractionDigits = 0;
+    for (const auto& token : tokens) {
+        if (token.type == TokenType::AmPm) twelveHour = true;
+        if (token.type == TokenType::DatePart && token.text[0] == '.') {
+            fractionDigits = std::max<int>(fractionDigits, static_cast<int>(token.text.size()) - 1);
+        }
+    }
+    const DateParts parts = serial_to_date(serial, fractionDigits);
+
+    const double totalDays = std::floor(serial * 86400.0 + 0.5) / 86400.0;
+    std::string out;
+    for (size_t i = 0; i < tokens.size(); ++i) {
+        const Token& token = tokens[i];
+        const std::string& t = token.text;
+        switch (token.type) {
+            case TokenType::Literal:
+                out += t;
+                break;
+            case TokenType::AmPm: {
+                const bool pm = parts.hour >= 12;
+                out += t == "a/p" ? (pm ? "P" : "A") : (pm ? "PM" : "AM");
+                break;
+            }
+            case TokenType::DatePart: {
+                const size_t n = t.size();
+                if (t[0] == '[') {
+                    const size_t width = n - 2;
+                    if (t[1] == 'h') {
+                        out += pad(static_cast<int64_t>(std::floor(totalDays * 24.0)), width);
+                    } else if (t[1] == 'm') {
+                        out += pad(static_cast<int64_t>(std::floor(totalDays * 1440.0)), width);
+                    } else {
+                        out += pad(static_cast<int64_t>(std::floor(totalDays * 86400.0)), width);
+                    }
+                } else if (t[0] == '.') {
+                    char buf[32];
+                    std::snprintf(buf, sizeof(buf), "%.*f", static_cast<int>(n - 1),
+                                  parts.subsecond);
+                    out += buf + 1;  // drop the leading "0"
+                } else if (t[0] == 'y') {
+                    out += n <= 2 ? pad(parts.year % 100, 2) : pad(parts.year, 4);
+                } else if (t[0] == 'm' && n <= 2 && is_minutes(tokens, i)) {
+                    out += pad(parts.minute, n);
+                } else if (t[0] == 'm') {
+                    const char* name = kMonthNames[parts.month - 1];
+                    if (n <= 2)
+                        out += pad(parts.month, n);
+                    else if (n == 3)
+                        out += std::string(name, 3);
+                    else if (n == 5)
+                        out += name[0];
+                    else
+                        out += name;
+                } else if (t[0] == 'd') {
+                    const char* name = kDayNames[parts.weekday];
+                    if (n <= 2)
+                        out += pad(parts.day, n);
+                    else if (n == 3)
+                        out += std::string(name, 3);
+                    else
+                        out += name;
+                } else if (t[0] == 'h') {
+                    int64_t hour = parts.hour;
+                    if (twelveHour) hour = hour % 12 == 0 ? 12 : hour % 12;
+                    out += pad(hour, std::min<size_t>(n, 2));
+                } else if (t[0] == 's') {
+                    out += pad(parts.second, std::min<size_t>(n, 2));
+                }
+                break;
+            }
+            default:
+                out += t;
+                break;
+        }
+    }
+    return out;
+}
+
+// ---------------------------------------------------------------- numbers
+
+std::string group_thousands(const std::string& digits) {
+    std::string out;
+    const size_t n = digits.size();
+    for (size_t i = 0; i < n; ++i) {
+        out += digits[i];
+        if (i + 1 < n && (n - i - 1) % 3 == 0) out += ',';
+    }
+    return out;
+}
+
+// Fill integer placeholders right to left; the leftmost placeholder takes any extra digits
+std::string fill_integer(const std::vector<Token>& tokens, std::string digits) {
+    if (digits == "0") digits.clear();  // "#" shows nothing for a zero integer part
+    std::string out;
+    size_t firstDigit = tokens.size();
+    for (size_t i = 0; i < tokens.size(); ++i) {
+        if (tokens[i].type == TokenType::Digit) {
+            firstDigit = i;
+            break;
+        }
+    }
+    for (size_t i = tokens.size(); i-- > 0;) {
+        const Token& token = tokens[i];
+        if (token.type == TokenType::Literal || token.type == TokenType::Percent) {
+            out.insert(0, token.text);
+            continue;
+        }
+        if (token.type != TokenType::Digit) continue;
+        if (i == firstDigit) {
+            if (!digits.empty()) {
+                out.insert(0, digits);
+            } else if (token.text == "0") {
+                out.insert(0, "0");
+            } else if (token.text == "?") {
+                out.insert(0, " ");
+            }
+        } else if (!digits.empty()) {
+            out.insert(0, 1, digits.back());
+            digits.pop_back();
+        } else if (token.text == "0") {
+            out.insert(0, "0");
+        } else if (token.text == "?") {
+            out.insert(0, " ");
+        }
+    }
+    return out;
+}
+
+// Fill decimal placeholders left to right; trailing zeros are dropped for '#' and blanked for '?'
+std::string fill_fraction(const std::vector<Token>& tokens, std::string digits) {
+    std::vector<const Token*> placeholders;
+    for (const auto& token : tokens) {
+        if (token.type == TokenType::Digit) placeholders.push_back(&token);
+    }
+    size_t keep = digits.size();
+    while (keep > 0 && digits[keep - 1] == '0' && placeholders[keep - 1]->text != "0") --keep;
+
+    std::string out;
+    size_t index = 0;
+    for (const auto& token : tokens) {
+        if (token.type == TokenType::Digit) {
+            if (index < keep)
+                out += digits[index];
+            else if (token.text == "0")
+                out += '0';
+            else if (token.text == "?")
+                out += ' ';
+            ++index;
+        } else if (token.type == TokenType::Literal || token.type == TokenType::Percent) {
+            out += token.text;
+        }
+    }
+    return out;
+}
+
+std::string render_numeric(double value, const Section& section, bool negativeSection) {
+    const auto& tokens = section.tokens;
+    int percents = 0;
+    for (const auto& token : tokens) percents += token.type == TokenType::Percent;
+    value *= std::pow(100.0, percents);
+
+    // Split the token stream into prefix / integer / fraction / exponent / suffix
+    size_t firstDigit = tokens.size();
+    size_t lastDigit = 0;
+    size_t decimalAt = tokens.size();
+    size_t exponentAt = tokens.size();
+    for (size_t i = 0; i < tokens.size(); ++i) {
+        const auto type = tokens[i].type;
+        if (type == TokenType::Digit) {
+            firstDigit = std::min(firstDigit, i);
+            lastDigit = i;
+        } else if (type == TokenType::Decimal && decimalAt == tokens.size() &&
+                   exponentAt == tokens.size()) {
+            decimalAt = i;
+        } else if (type == TokenType::Exponent && exponentAt == tokens.size()) {
+            exponentAt = i;
+        }
+    }
+    if (firstDigit == tokens.size()) {
+        // No placeholders at all: only literal text (e.g. "-" for zero)
+        std::string out;
+        for (const auto& token : tokens) {
+            if (token.type == TokenType::Literal || token.type == TokenType::Percent) {
+                out += token.text;
+            }
+        }
+        return out;
+    }
+    const size_t mantissaEnd = std::min(exponentAt, lastDigit + 1);
+    const size_t integerEnd = std::min(decimalAt, mantissaEnd);
+
+    std::vector<Token> integerTokens(tokens.begin() + static_cast<std::ptrdiff_t>(firstDigit),
+                                     tokens.begin() + static_cast<std::ptrdiff_t>(integerEnd));
+    std::vector<Token> fractionTokens;
+    if (decimalAt < mantissaEnd) {
+        fractionTokens.assign(tokens.begin() + static_cast<std::ptrdiff_t>(decimalAt) + 1,
+                              tokens.begin() + static_cast<std::ptrdiff_t>(mantissaEnd));
+    }
+
+    // Commas: between integer placeholders they group thousands, trailing ones scale by 1000
+    bool grouping = false;
+    size_t lastIntegerDigit = firstDigit;
+    for (size_t i = firstDigit; i < integerEnd; ++i) {
+        if (tokens[i].type == TokenType::Digit) lastIntegerDigit = i;
+    }
+    for (size_t i = firstDigit; i < integerEnd; ++i) {
+        if (tokens[i].type == TokenType::Comma && i < lastIntegerDigit) grouping = true;
+    }
+    for (size_t i = lastIntegerDigit + 1; i < tokens.size() && tokens[i].type == TokenType::Comma;
+         ++i) {
+        value /= 1000.0;
+    }
+    integerTokens.erase(std::remove_if(integerTokens.begin(), integerTokens.end(),
+                                       [](const Token& t) { return t.type == TokenType::Comma; }),
+                        integerTokens.end());
+
+    int decimals = 0;
+    for (const auto& token : fractionTokens) decimals += token.type == TokenType::Digit;
+
+    const bool negative = value < 0 && !negativeSection;
+    double magnitude = std::fabs(value);
+
+    std::string exponentText;
+    if (exponentAt < tokens.size()) {
+        int integerDigits = 0;
+        for (const auto& token : integerTokens) integerDigits += token.type == TokenType::Digit;
+        integerDigits = std::max(integerDigits, 1);
+        int exponent = 0;
+        if (magnitude != 0.0) {
+            exponent = static_cast<int>(std::floor(std::log10(magnitude)));
+            // Engineering-style codes (##0.0E+0) keep exponents at multiples of the integer width
+            if (integerDigits > 1) {
+                exponent =
+                    static_cast<int>(std::floor(static_cast<double>(exponent) / integerDigits)) *
+                    integerDigits;
+            }
+            double mantissa = magnitude / std::pow(10.0, exponent);
+            const double rounded =
+                std::round(mantissa * std::pow(10.0, decimals)) / std::pow(10.0, decimals);
+            if (rounded >= std::pow(10.0, integerDigits)) exponent += integerDigits;
+            magnitude /= std::pow(10.0, exponent);
+        }
+        int exponentDigits = 0;
+        for (size_t i = exponentAt + 1; i < tokens.size() && tokens[i].type == TokenType::Digit;
+             ++i) {
+            ++exponentDigits;
+        }
+        const std::string sign =
+            exponent < 0 ? "-" : (tokens[exponentAt].text[1] == '+' ? "+" : "");
+        exponentText = "E" + sign + pad(std::abs(exponent), static_cast<size_t>(exponentDigits));
+    }
+
+    const std::string fixed = format_fixed(magnitude, decimals);
+    const size_t point = fixed.find('.');
+    std::string integerDigits = fixed.substr(0, point);
+    std::string fractionDigits = point == std::string::npos ? "" : fixed.substr(point + 1);
+    if (grouping) integerDigits = group_thousands(integerDigits);
+
+    std::string out;
+    for (size_t i = 0; i < firstDigit; ++i) {
+        if (tokens[i].type == TokenType::Literal || tokens[i].type == TokenType::Percent) {
+            out += tokens[i].text;
+        }
+    }
+    if (negative) out.insert(0, "-");
+    out += fill_integer(integerTokens, integerDigits);
+    if (decimalAt < mantissaEnd) out += "." + fill_fraction(fractionTokens, fractionDigits);
+    out += exponentText;
+    size_t suffixFrom = lastDigit + 1;
+    for (size_t i = suffixFrom; i < tokens.size(); ++i) {
+        if (tokens[i].type == TokenType::Literal || tokens[i].type == TokenType::Percent) {
+            out += tokens[i].text;
+        }
+    }
+    return out;
+}
+
+// Literal text that shows a currency symbol ($, €, £, ¥, ₩, ₹, ...)
+bool has_currency_symbol(std::string_view text) {
+    for (size_t i = 0; i < text.size(); ++i) {
+        const auto byte = static_cast<unsigned char>(text[i]);
+        if (byte == '$') return true;
+        // U+00A2-U+00A5 (cent, pound, currency sign, yen)
+        if (byte == 0xC2 && i + 1 < text.size()) {
+            const auto next = static_cast<unsigned char>(text[i + 1]);
+            if (next >= 0xA2 && next <= 0xA5) return true;
+        }
+        // Currency Symbols block U+20A0-U+20CF (euro, won, rupee, ...)
+        if (byte == 0xE2 && i + 1 < text.size() &&
+            static_cast<unsigned char>(text[i + 1]) == 0x82) {
+            return true;
+        }
+    }
+    return false;
+}
+
+}  // namespace
+
+std::string_view builtin_number_format(uint32_t numFmtId) {
+    switch (numFmtId) {
+        case 0:
+            return "General";
+        case 1:
+            return "0";
+        case 2:
+            return "0.00";
+        case 3:
+            return "#,##0";
+        case 4:
+            return "#,##0.00";
+        case 5:
+            return "$#,##0_);($#,##0)";
+        case 6:
+            return "$#,##0_);[Red]($#,##0)";
+        case 7:
+            return "$#,##0.00_);($#,##0.00)";
+        case 8:
+            return "$#,##0.00_);[Red]($#,##0.00)";
+        case 9:
+            return "0%";
+        case 10:
+            return "0.00%";
+        case 11:
+            return "0.00E+00";
+        case 12:
+            return "# ?/?";
+        case 13:
+            return "# ?\?/?\?";
+        case 14:
+            return "m/d/yyyy";
+        case 15:
+            return "d-mmm-yy";
+        case 16:
+            return "d-mmm";
+        case 17:
+            return "mmm-yy";
+        case 18:
+            return "h:mm AM/PM";
+        case 19:
+            return "h:mm:ss AM/PM";
+        case 20:
+            return "h:mm";
+        case 21:
+            return "h:mm:ss";
+        case 22:
+            return "m/d/yyyy h:mm";
+        case 37:
+            return "#,##0_);(#,##0)";
+        case 38:
+            return "#,##0_);[Red](#,##0)";
+        case 39:
+            return "#,##0.00_);(#,##0.00)";
+        case 40:
+            return "#,##0.00_);[Red](#,##0.00)";
+        case 41:
+            return "_(* #,##0_);_(* \\(#,##0\\);_(* \"-\"_);_(@_)";
+        case 42:
+            return "_(\"$\"* #,##0_);_(\"$\"* \\(#,##0\\);_(\"$\"* \"-\"_);_(@_)";
+        case 43:
+            return "_(* #,##0.00_);_(* \\(#,##0.00\\);_(* \"-\"??_);_(@_)";
+        case 44:
+            return "_(\"$\"* #,##0.00_);_(\"$\"* \\(#,##0.00\\);_(\"$\"* \"-\"??_);_(@_)";
+        case 45:
+            return "mm:ss";
+        case 46:
+            return "[h]:mm:ss";
+        case 47:
+            return "mmss.0";
+        case 48:
+            return "##0.0E+0";
+        case 49:
+            return "@";
+        default:
+            // Locale-dependent East Asian date ids: use the short date
+            if ((numFmtId >= 27 && numFmtId <= 36) || (numFmtId >= 50 && numFmtId <= 58)) {
+                return "m/d/yyyy";
+            }
+            return {};
+    }
+}
+
+bool is_date_format_code(std::string_view code) {
+    const auto sections = split_sections(code);
+    return !sections.empty() && parse_section(sections.front()).date;
+}
+
+NumberFormatCategory classify_number_format(std::string_view code) {
+    const Section section = parse_section(split_sections(code).front());
+    if (section.date) {
+        bool hasDate = false;
+        bool hasTime = false;
+        for (size_t i = 0; i < section.tokens.size(); ++i) {
+            const Token& token = section.tokens[i];
+            if (token.type == TokenType::AmPm) hasTime = true;
+            if (token.type != TokenType::DatePart) continue;
+            const char kind = token.text[0];
+            if (kind == 'y' || kind == 'd' ||
+                (kind == 'm' && (token.text.size() > 2 || !is_minutes(section.tokens, i)))) {
+                hasDate = true;
+            } else {
+                hasTime = true;
+            }
+        }
+        if (hasDate && hasTime) return NumberFormatCategory::DateTime;
+        return hasTime ? NumberFormatCategory::Time : NumberFormatCategory::Date;
+    }
+    if (section.general) return NumberFormatCategory::General;
+    if (section.fraction) return NumberFormatCategory::Fraction;
+
+    bool digits = false;
+    bool text = false;
+    bool currency = false;
+    for (const auto& token : section.tokens) {
+        switch (token.type) {
+            case TokenType::Exponent:
+                return NumberFormatCategory::Scientific;
+            case TokenType::Percent:
+                return NumberFormatCategory::Percent;
+            case TokenType::Digit:
+                digits = true;
+                break;
+            case TokenType::Text:
+                text = true;
+                break;
+            case TokenType::Literal:
+                currency = currency || has_currency_symbol(token.text);
+                break;
+            default:
+                break;
+        }
+    }
+    if (!digits) return text ? NumberFormatCategory::Text : NumberFormatCategory::General;
+    return currency ? NumberFormatCategory::Currency : NumberFormatCategory::Number;
+}
+
+std::string format_general(double value) {
+    if (std::isnan(value) || std::isinf(value)) return "#NUM!";
+    if (value == 0.0) return "0";
+    const double magnitude = std::fabs(value);
+    char buf[64];
+    if (magnitude < 1e11 && magnitude >= 1e-9) {
+        const int integerDigits =
+            magnitude >= 1.0 ? static_cast<int>(std::floor(std::log10(magnitude))) + 1 : 1;
+        const int decimals = std::max(0, 10 - integerDigits);
+        std::string text = format_fixed(value, decimals);
+        if (text.find('.') != std::string::npos) {
+            text.erase(text.find_last_not_of('0') + 1);
+            if (text.back() == '.') text.pop_back();
+        }
+        if (text != "0" && text != "-0") return text;
+    }
+    std::snprintf(buf, sizeof(buf), "%.5E", value);
+    std::string text = buf;
+    const size_t e = text.find('E');
+    std::string mantissa = text.substr(0, e);
+    mantissa.erase(mantissa.find_last_not_of('0') + 1);
+    if (mantissa.back() == '.') mantissa.pop_back();
+    return mantissa + text.substr(e);
+}
+
+bool serial_to_datetime(double serial, SerialDateTime& out) {
+    constexpr int64_t kMicrosPerDay = 86400LL * 1000000LL;
+    // Serials outside 0001-01-01 .. 9999-12-31
+    if (!(serial > -693594.0 && serial < 2958466.0)) return false;
+    const auto micros =
+        static_cast<int64_t>(std::llround(serial * static_cast<double>(kMicrosPerDay)));
+    int64_t days = micros / kMicrosPerDay;
+    int64_t rest = micros % kMicrosPerDay;
+    if (rest < 0) {
+        rest += kMicrosPerDay;
+        --days;
+    }
+    civil_from_days(days - 25569, out.year, out.month, out.day);
+    if (out.year < 1 || out.year > 9999) return false;
+    const int64_t seconds = rest / 1000000;
+    out.hour = static_cast<int>(seconds / 3600);
+    out.minute = static_cast<int>(seconds / 60 % 60);
+    out.second = static_cast<int>(seconds % 60);
+    out.microsecond = static_cast<int>(rest % 1000000);
+    return true;
+}
+
+std::string render_number(double value, std::string_view code) {
+    if (code.empty()) return format_general(value);
+    const auto sections = split_sections(code);
+
+    size_t index = 0;
+    bool negativeSection = false;
+    if (value < 0 && sections.size() >= 2) {
+        index = 1;
+        negativeSection = true;
+    } else if (value == 0 && sections.size() >= 3) {
+        index = 2;
+    }
+    const Section section = parse_section(sections[index]);
+
+    if (section.date) return render_date(value, section);
+    if (section.general || section.fraction) {
+        std::string text = format_general(negativeSection ? std::fabs(value) : value);
+        if (!section.general) return text;
+        // "General" may be wrapped in literal text, e.g. General" units"
+        std::string out;
+        for (const auto& token : section.tokens) out += token.text;
+        return out.empty() ? text : text + out;
+    }
+    for (const auto& token : section.tokens) {
+        if (token.type == TokenType::Digit || token.type == TokenType::Literal ||
+            token.type == TokenType::Percent) {
+            return render_numeric(value, section, negativeSection);
+        }
+    }
+    // Text-only section ("@") or an empty section
+    return section.tokens.empty() ? std::string() : format_general(value);
+}
@@ -0,0 +1,59 @@
+#ifndef PYOPENXLSX_NUMBER_FORMAT_HPP
+#define PYOPENXLSX_NUMBER_FORMAT_HPP
+
+/**
+ * @file number_format.hpp
+ * @brief Renderer for Excel number format codes.
+ *
+ * Produces the text Excel displays for a numeric cell: General, fixed and
+ * grouped decimals, scaling commas, percentages, scientific notation, literal
+ * text, positive/negative/zero sections and date/time codes (1900 date system,
+ * including elapsed [h]:mm). Fractions ("# ?/?") fall back to General.
+ * Colours, conditions and locale tags in brackets are ignored.
+ */
+
+#include <cstdint>
+#include <string>
+#include <string_view>
+
+// Broad kind of value a format code displays
+enum class NumberFormatCategory : uint8_t {
+    General,
+    Number,
+    Currency,
+    Percent,
+    Scientific,
+    Fraction,
+    Date,
+    Time,
+    DateTime,
+    Text,
+};
+
+// Format code of a built-in numFmtId (en-US), or an empty view if the id is not built in
+std::string_view builtin_number_format(uint32_t numFmtId);
+
+// True if the code formats numbers as a date and/or time
+bool is_date_format_code(std::string_view code);
+
+// Category of a format code, judged from its first (positive) section
+NumberFormatCategory classify_number_format(std::string_view code);
+
+// Excel's "General" rendering: up to 11 characters, scientific for very large/small values
+std::string format_general(double value);
+
+// Display text of `value` under format `code`
+std::string render_number(double value, std::string_view code);
+
+// Calendar fields of a date/time serial
+struct SerialDateTime {
+    int year = 1899, month = 12, day = 30;
+    int hour = 0, minute = 0, second = 0, microsecond = 0;
+};
+
+// Split a serial counted in days from 1899-12-30 (as Python's date arithmetic does, so
+// serials before 1900-03-01 land one day earlier than Excel shows them), rounded to the
+// microsecond. Returns false outside the years 1-9999.
+bool serial_to_datetime(double serial, SerialDateTime& out);
+
+#endif  // PYOPENXLSX_NUMBER_FORMAT_HPP
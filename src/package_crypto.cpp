@@ -0,0 +1,829 @@
+#include "package_crypto.hpp"
+
+#include <mbedtls/aes.h>
+#include <mbedtls/base64.h>
+#include <mbedtls/ctr_drbg.h>
+#include <mbedtls/entropy.h>
+#include <mbedtls/md.h>
+#include <mbedtls/platform_util.h>
+#include <mbedtls/sha512.h>
+
+#include <XLCrypto.hpp>
+#include <XLException.hpp>
+#include <algorithm>
+#include <array>
+#include <cstring>
+#include <exception>
+#include <list>
+#include <mutex>
+#include <pugixml.hpp>
+#include <stdexcept>
+#include <string_view>
+#include <thread>
+#include <utility>
+
+using OpenXLSX::XLInternalError;
+
+namespace {
+
+constexpr uint32_t kEndOfChain = 0xFFFFFFFE;
+constexpr uint32_t kFreeSector = 0xFFFFFFFF;
+constexpr uint32_t kFatSector = 0xFFFFFFFD;
+constexpr uint32_t kDifatSector = 0xFFFFFFFC;
+constexpr uint32_t kNoStream = 0xFFFFFFFF;
+constexpr uint32_t kSectorSize = 512;
+constexpr uint32_t kMiniSectorSize = 64;
+constexpr uint32_t kMiniStreamCutoff = 4096;
+constexpr uint32_t kHeaderDifatEntries = 109;
+constexpr size_t kSegmentSize = 4096;
+constexpr int kSpinCount = 100000;
+constexpr size_t kKeyCacheSize = 16;
+
+using Digest = std::array<uint8_t, 64>;
+
+// Block keys of MS-OFFCRYPTO 2.3.4.11 - 2.3.4.14
+constexpr uint8_t kBlockVerifierInput[] = {0xfe, 0xa7, 0xd2, 0x76, 0x3b, 0x4b, 0x9e, 0x79};
+constexpr uint8_t kBlockVerifierValue[] = {0xd7, 0xaa, 0x0f, 0x6d, 0x30, 0x61, 0x34, 0x4e};
+constexpr uint8_t kBlockEncryptedKey[] = {0x14, 0x6e, 0x0b, 0xe7, 0xab, 0xac, 0xd0, 0xd6};
+constexpr uint8_t kBlockIntegrityKey[] = {0x5f, 0xb2, 0xad, 0x01, 0x0c, 0xb9, 0xe1, 0xf6};
+constexpr uint8_t kBlockIntegrityValue[] = {0xa0, 0x67, 0x7f, 0x02, 0xb2, 0x2c, 0x84, 0x33};
+
+uint32_t get_u16(const uint8_t* p) { return p[0] | (p[1] << 8); }
+uint32_t get_u32(const uint8_t* p) { return get_u16(p) | (get_u16(p + 2) << 16); }
+uint64_t get_u64(const uint8_t* p) {
+    return get_u32(p) | (static_cast<uint64_t>(get_u32(p + 4)) << 32);
+}
+
+void put_u16(uint8_t* p, uint32_t v) {
+    p[0] = v & 0xFF;
+    p[1] = (v >> 8) & 0xFF;
+}
+void put_u32(uint8_t* p, uint32_t v) {
+    put_u16(p, v & 0xFFFF);
+    put_u16(p + 2, v >> 16);
+}
+void put_u64(uint8_t* p, uint64_t v) {
+    put_u32(p, static_cast<uint32_t>(v));
+    put_u32(p + 4, static_cast<uint32_t>(v >> 32));
+}
+
+uint64_t round_up(uint64_t size, uint64_t block) { return (size + block - 1) / block * block; }
+
+Digest sha512(std::initializer_list<gsl::span<const uint8_t>> parts) {
+    mbedtls_sha512_context ctx;
+    mbedtls_sha512_init(&ctx);
+    mbedtls_sha512_starts(&ctx, 0);
+    for (const auto part : parts) mbedtls_sha512_update(&ctx, part.data(), part.size());
+    Digest out;
+    mbedtls_sha512_finish(&ctx, out.data());
+    mbedtls_sha512_free(&ctx);
+    return out;
+}
+
+// Passwords are hashed as UTF-16LE; `password` is UTF-8
+std::vector<uint8_t> utf16le(const std::string& password) {
+    std::vector<uint8_t> out;
+    out.reserve(password.size() * 2);
+    auto put = [&](uint32_t unit) {
+        out.push_back(unit & 0xFF);
+        out.push_back((unit >> 8) & 0xFF);
+    };
+    for (size_t i = 0; i < password.size();) {
+        const auto lead = static_cast<uint8_t>(password[i]);
+        const size_t length = lead < 0x80    ? 1
+                              : lead >= 0xF0 ? 4
+                              : lead >= 0xE0 ? 3
+                              : lead >= 0xC0 ? 2
+                                             : 1;
+        uint32_t cp = length == 1 ? lead : lead & (0xFF >> (length + 1));
+        bool valid = i + length <= password.size();
+        for (size_t k = 1; valid && k < length; ++k) {
+            const auto next = static_cast<uint8_t>(password[i + k]);
+            valid = (next & 0xC0) == 0x80;
+            cp = (cp << 6) | (next & 0x3F);
+        }
+        if (!valid) {
+            cp = lead;  // not UTF-8: take the byte as Latin-1
+            i += 1;
+        } else {
+            i += length;
+        }
+        if (cp >= 0x10000) {
+            cp -= 0x10000;
+            put(0xD800 | (cp >> 10));
+            put(0xDC00 | (cp & 0x3FF));
+        } else {
+            put(cp);
+        }
+    }
+    return out;
+}
+
+// Password hash after `spinCount` rounds (MS-OFFCRYPTO 2.3.4.11), cached by password and salt
+class KeyCache {
+   public:
+    Digest derive(const std::string& password, gsl::span<const uint8_t> salt, int spinCount) {
+        std::vector<uint8_t> unicode = utf16le(password);
+        uint8_t spin[4];
+        put_u32(spin, static_cast<uint32_t>(spinCount));
+        const Digest id = sha512({spin, salt, unicode});
+        {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            for (auto it = m_entries.begin(); it != m_entries.end(); ++it) {
+                if (it->first == id) {
+                    m_entries.splice(m_entries.begin(), m_entries, it);
+                    return it->second;
+                }
+            }
+        }
+
+        Digest hash = sha512({salt, unicode});
+        mbedtls_platform_zeroize(unicode.data(), unicode.size());
+        uint8_t round[4 + 64];
+        for (int i = 0; i < spinCount; ++i) {
+            put_u32(round, static_cast<uint32_t>(i));
+            std::memcpy(round + 4, hash.data(), hash.size());
+            mbedtls_sha512(round, sizeof(round), hash.data(), 0);
+        }
+        mbedtls_platform_zeroize(round, sizeof(round));
+
+        std::lock_guard<std::mutex> lock(m_mutex);
+        m_entries.emplace_front(id, hash);
+        if (m_entries.size() > kKeyCacheSize) m_entries.pop_back();
+        return hash;
+    }
+
+   private:
+    std::mutex m_mutex;
+    std::list<std::pair<Digest, Digest>> m_entries;  // most recently used first
+};
+
+KeyCache& key_cache() {
+    static KeyCache cache;
+    return cache;
+}
+
+// Key of `bytes` bytes for one purpose (`block`) from the password hash
+std::vector<uint8_t> derive_key(const Digest& hash, gsl::span<const uint8_t> block, size_t bytes) {
+    const Digest full = sha512({hash, block});
+    std::vector<uint8_t> key(full.begin(), full.begin() + std::min(bytes, full.size()));
+    key.resize(bytes, 0x36);
+    return key;
+}
+
+// IV of `bytes` bytes: the hash of the salt and a block key or segment index
+std::vector<uint8_t> derive_iv(gsl::span<const uint8_t> salt, gsl::span<const uint8_t> block,
+                               size_t bytes) {
+    const Digest full = sha512({salt, block});
+    std::vector<uint8_t> iv(full.begin(), full.begin() + std::min(bytes, full.size()));
+    iv.resize(bytes, 0x36);
+    return iv;
+}
+
+class Aes {
+   public:
+    Aes(gsl::span<const uint8_t> key, bool encrypt)
+        : m_mode(encrypt ? MBEDTLS_AES_ENCRYPT : MBEDTLS_AES_DECRYPT) {
+        mbedtls_aes_init(&m_ctx);
+        const auto bits = static_cast<unsigned int>(key.size() * 8);
+        const int rc = encrypt ? mbedtls_aes_setkey_enc(&m_ctx, key.data(), bits)
+                               : mbedtls_aes_setkey_dec(&m_ctx, key.data(), bits);
+        if (rc != 0) {
+            mbedtls_aes_free(&m_ctx);
+            throw XLInternalError("AES key setup failed");
+        }
+    }
+    ~Aes() { mbedtls_aes_free(&m_ctx); }
+    Aes(const Aes&) = delete;
+    Aes& operator=(const Aes&) = delete;
+
+    // CBC over `size` bytes, a multiple of 16; `in` and `out` may be the same buffer
+    void cbc(const uint8_t* in, uint8_t* out, size_t size, gsl::span<const uint8_t> iv) {
+        uint8_t chain[16] = {};
+        std::memcpy(chain, iv.data(), std::min<size_t>(iv.size(), 16));
+        mbedtls_aes_crypt_cbc(&m_ctx, m_mode, size, chain, in, out);
+    }
+
+    // CBC over `data` zero-padded to a multiple of 16
+    std::vector<uint8_t> cbc(gsl::span<const uint8_t> data, gsl::span<const uint8_t> iv) {
+        std::vector<uint8_t> out(data.begin(), data.end());
+        out.resize(round_up(out.size(), 16), 0);
+        cbc(out.data(), out.data(), out.size(), iv);
+        return out;
+    }
+
+   private:
+    mbedtls_aes_context m_ctx;
+    int m_mode;
+};
+
+class Random {
+   public:
+    Random() {
+        mbedtls_entropy_init(&m_entropy);
+        mbedtls_ctr_drbg_init(&m_drbg);
+        static const char kPersonalization[] = "pyopenxlsx_agile";
+        if (mbedtls_ctr_drbg_seed(&m_drbg, mbedtls_entropy_func, &m_entropy,
+                                  reinterpret_cast<const unsigned char*>(kPersonalization),
+                                  sizeof(kPersonalization) - 1) != 0) {
+            mbedtls_ctr_drbg_free(&m_drbg);
+            mbedtls_entropy_free(&m_entropy);
+            throw XLInternalError("Failed to seed the random generator");
+        }
+    }
+    ~Random() {
+        mbedtls_ctr_drbg_free(&m_drbg);
+        mbedtls_entropy_free(&m_entropy);
+    }
+    Random(const Random&) = delete;
+    Random& operator=(const Random&) = delete;
+
+    std::vector<uint8_t> bytes(size_t size) {
+        std::vector<uint8_t> out(size);
+        if (mbedtls_ctr_drbg_random(&m_drbg, out.data(), out.size()) != 0)
+            throw XLInternalError("Failed to generate random bytes");
+        return out;
+    }
+
+   private:
+    mbedtls_entropy_context m_entropy;
+    mbedtls_ctr_drbg_context m_drbg;
+};
+
+std::string base64(gsl::span<const uint8_t> data) {
+    size_t length = 0;
+    mbedtls_base64_encode(nullptr, 0, &length, data.data(), data.size());
+    std::string out(length, '\0');
+    mbedtls_base64_encode(reinterpret_cast<unsigned char*>(out.data()), out.size(), &length,
+                          data.data(), data.size());
+    out.resize(length);
+    return out;
+}
+
+std::vector<uint8_t> unbase64(const char* text) {
+    const size_t size = std::strlen(text);
+    size_t length = 0;
+    mbedtls_base64_decode(nullptr, 0, &length, reinterpret_cast<const unsigned char*>(text), size);
+    std::vector<uint8_t> out(length);
+    if (mbedtls_base64_decode(out.data(), out.size(), &length,
+                              reinterpret_cast<const unsigned char*>(text), size) != 0) {
+        throw XLInternalError("Invalid base64 value in EncryptionInfo");
+    }
+    out.resize(length);
+    return out;
+}
+
+// Run work(first, last) over [0, segments) split into contiguous ranges, one per thread
+template <class Work>
+void for_segments(size_t segments, size_t workers, Work work) {
+    if (workers == 0) {
+        // At least 64 segments (256 KB) a thread; small packages are not worth the threads
+        const size_t cores = std::max(1u, std::thread::hardware_concurrency());
+        workers = std::min<size_t>({cores, 8, segments / 64});
+    }
+    workers = std::max<size_t>(1, std::min(workers, segments));
+    if (workers == 1) {
+        work(0, segments);
+        return;
+    }
+
+    std::exception_ptr error;
+    std::mutex errorMutex;
+    auto run = [&](size_t first, size_t last) {
+        try {
+            work(first, last);
+        } catch (...) {
+            std::lock_guard<std::mutex> lock(errorMutex);
+            if (!error) error = std::current_exception();
+        }
+    };
+    const size_t per = (segments + workers - 1) / workers;
+    std::vector<std::thread> threads;
+    threads.reserve(workers - 1);
+    for (size_t first = per; first < segments; first += per) {
+        threads.emplace_back(run, first, std::min(segments, first + per));
+    }
+    run(0, std::min(segments, per));
+    for (auto& thread : threads) thread.join();
+    if (error) std::rethrow_exception(error);
+}
+
+// Read-only view of the streams of a compound (OLE) file
+class CompoundFile {
+   public:
+    explicit CompoundFile(gsl::span<const uint8_t> data) : m_data(data) {
+        static const uint8_t kMagic[] = {0xD0, 0xCF, 0x11, 0xE0, 0xA1, 0xB1, 0x1A, 0xE1};
+        if (data.size() < 512 || std::memcmp(data.data(), kMagic, sizeof(kMagic)) != 0)
+            throw XLInternalError("Not an encrypted workbook (no compound file header)");
+        const uint8_t* header = data.data();
+        const uint32_t sectorShift = get_u16(header + 0x1E);
+        if (sectorShift != 9 && sectorShift != 12)
+            throw XLInternalError("Unsupported compound file sector size");
+        m_sectorSize = 1u << sectorShift;
+        m_miniSectorSize = 1u << get_u16(header + 0x20);
+        m_cutoff = get_u32(header + 0x38);
+
+        // FAT sectors are listed in the header, then in the DIFAT chain
+        const uint32_t fatCount = get_u32(header + 0x2C);
+        std::vector<uint32_t> fatSectors;
+        for (uint32_t i = 0; i < kHeaderDifatEntries && fatSectors.size() < fatCount; ++i) {
+            const uint32_t sector = get_u32(header + 0x4C + i * 4);
+            if (sector != kFreeSector) fatSectors.push_back(sector);
+        }
+        uint32_t difat = get_u32(header + 0x44);
+        for (uint32_t k = get_u32(header + 0x48);
+             k > 0 && difat < kDifatSector && fatSectors.size() < fatCount; --k) {
+            const uint8_t* p = sector(difat);
+            const uint32_t perSector = m_sectorSize / 4 - 1;
+            for (uint32_t i = 0; i < perSector && fatSectors.size() < fatCount; ++i) {
+                const uint32_t entry = get_u32(p + i * 4);
+                if (entry != kFreeSector) fatSectors.push_back(entry);
+            }
+            difat = get_u32(p + perSector * 4);
+        }
+        m_fat.reserve(fatSectors.size() * (m_sectorSize / 4));
+        for (const uint32_t fatSector : fatSectors) {
+            const uint8_t* p = sector(fatSector);
+            for (uint32_t i = 0; i < m_sectorSize / 4; ++i) m_fat.push_back(get_u32(p + i * 4));
+        }
+
+        const uint32_t miniFatStart = get_u32(header + 0x3C);
+        if (miniFatStart != kEndOfChain && miniFatStart != kFreeSector) {
+            for (const uint32_t miniFatSector : chain(miniFatStart, m_fat)) {
+                const uint8_t* p = sector(miniFatSector);
+                for (uint32_t i = 0; i < m_sectorSize / 4; ++i)
+                    m_miniFat.push_back(get_u32(p + i * 4));
+            }
+        }
+
+        for (const uint32_t dirSector : chain(get_u32(header + 0x30), m_fat)) {
+            const uint8_t* p = sector(dirSector);
+            for (uint32_t i = 0; i < m_sectorSize / 128; ++i) {
+                const uint8_t* dir = p + i * 128;
+                const uint32_t nameBytes = std::min<uint32_t>(get_u16(dir + 0x40), 64);
+                Entry entry;
+                for (uint32_t j = 0; j + 1 < nameBytes; j += 2) {
+                    if (dir[j] == 0 && dir[j + 1] == 0) break;
+                    entry.name += static_cast<char>(dir[j]);
+                }
+                entry.type = dir[0x42];
+                entry.start = get_u32(dir + 0x74);
+                entry.size = get_u32(dir + 0x78);
+                if (m_sectorSize == 4096)
+                    entry.size |= static_cast<uint64_t>(get_u32(dir + 0x7C)) << 32;
+                m_entries.push_back(std::move(entry));
+            }
+        }
+        if (!m_entries.empty() && m_entries.front().type == 5) {
+            m_miniStream = read(m_entries.front().start, m_entries.front().size);
+        }
+    }
+
+    // Contents of a stream: a view into the file when its sectors are contiguous, otherwise
+    // a copy made in `scratch`
+    gsl::span<const uint8_t> stream(std::string_view name, std::vector<uint8_t>& scratch) const {
+        const auto it = std::find_if(m_entries.begin(), m_entries.end(),
+                                     [&](const Entry& e) { return e.type == 2 && e.name == name; });
+        if (it == m_entries.end())
+            throw XLInternalError("Missing stream in encrypted workbook: " + std::string(name));
+        if (it->size == 0) return {};
+
+        if (it->size < m_cutoff) {
+            scratch.clear();
+            scratch.reserve(it->size);
+            for (const uint32_t mini : chain(it->start, m_miniFat)) {
+                const uint64_t offset = static_cast<uint64_t>(mini) * m_miniSectorSize;
+                const uint64_t take =
+                    std::min<uint64_t>(m_miniSectorSize, it->size - scratch.size());
+                if (offset + take > m_miniStream.size())
+                    throw XLInternalError("Truncated compound file");
+                scratch.insert(scratch.end(), m_miniStream.begin() + offset,
+                               m_miniStream.begin() + offset + take);
+                if (scratch.size() == it->size) break;
+            }
+            if (scratch.size() != it->size) throw XLInternalError("Truncated compound file");
+            return scratch;
+        }
+
+        const std::vector<uint32_t> sectors = chain(it->start, m_fat);
+        bool contiguous = true;
+        for (size_t i = 1; contiguous && i < sectors.size(); ++i)
+            contiguous = sectors[i] == sectors[0] + i;
+        const uint64_t offset =
+            (static_cast<uint64_t>(sectors.empty() ? 0 : sectors[0]) + 1) * m_sectorSize;
+        if (contiguous && !sectors.empty() && sectors.size() * m_sectorSize >= it->size &&
+            offset + it->size <= m_data.size()) {
+            return m_data.subspan(offset, it->size);
+        }
+        scratch = read(it->start, it->size);
+        return scratch;
+    }
+
+   private:
+    struct Entry {
+        std::string name;
+        uint8_t type = 0;
+        uint32_t start = kEndOfChain;
+        uint64_t size = 0;
+    };
+
+    const uint8_t* sector(uint32_t index) const {
+        const uint64_t offset = (static_cast<uint64_t>(index) + 1) * m_sectorSize;
+        if (offset + m_sectorSize > m_data.size()) throw XLInternalError("Truncated compound file");
+        return m_data.data() + offset;
+    }
+
+    static std::vector<uint32_t> chain(uint32_t start, const std::vector<uint32_t>& table) {
+        std::vector<uint32_t> out;
+        for (uint32_t current = start; current != kEndOfChain; current = table[current]) {
+            if (current >= table.size() || out.size() >= table.size())
+                throw XLInternalError("Corrupt compound file sector chain");
+            out.push_back(current);
+        }
+        return out;
+    }
+
+    std::vector<uint8_t> read(uint32_t start, uint64_t size) const {
+        std::vector<uint8_t> out;
+        if (size == 0) return out;
+        out.reserve(size);
+        for (const uint32_t index : chain(start, m_fat)) {
+            const uint64_t offset = (static_cast<uint64_t>(index) + 1) * m_sectorSize;
+            const uint64_t take = std::min<uint64_t>(m_sectorSize, size - out.size());
+            if (offset + take > m_data.size()) throw XLInternalError("Truncated compound file");
+            out.insert(out.end(), m_data.begin() + offset, m_data.begin() + offset + take);
+            if (out.size() == size) break;
+        }
+        if (out.size() != size) throw XLInternalError("Truncated compound file");
+        return out;
+    }
+
+    gsl::span<const uint8_t> m_data;
+    uint32_t m_sectorSize = kSectorSize;
+    uint32_t m_miniSectorSize = kMiniSectorSize;
+    uint32_t m_cutoff = kMiniStreamCutoff;
+    std::vector<uint32_t> m_fat;
+    std::vector<uint32_t> m_miniFat;
+    std::vector<Entry> m_entries;
+    std::vector<uint8_t> m_miniStream;
+};
+
+// An empty compound file (version 3, 512-byte sectors) with room for the EncryptionInfo and
+// EncryptedPackage streams; their offsets are returned in `infoOffset` and `packageOffset`.
+// Each stream is contiguous, so the package can be encrypted straight into the file.
+std::vector<uint8_t> compound_file(uint64_t infoSize, uint64_t packageSize, uint64_t& infoOffset,
+                                   uint64_t& packageOffset) {
+    struct Stream {
+        const char* name;
+        uint64_t size;
+        bool mini;
+        uint32_t start = kEndOfChain;  // first (mini) sector
+        uint32_t count = 0;            // number of (mini) sectors
+    };
+    Stream streams[2] = {{"EncryptionInfo", infoSize, infoSize < kMiniStreamCutoff},
+                         {"EncryptedPackage", packageSize, packageSize < kMiniStreamCutoff}};
+
+    uint32_t miniSectors = 0;
+    uint64_t dataSectors = 1;  // directory
+    for (Stream& s : streams) {
+        if (s.mini) {
+            s.count = static_cast<uint32_t>(round_up(s.size, kMiniSectorSize) / kMiniSectorSize);
+            if (s.count > 0) s.start = miniSectors;
+            miniSectors += s.count;
+        } else {
+            s.count = gsl::narrow<uint32_t>(round_up(s.size, kSectorSize) / kSectorSize);
+            dataSectors += s.count;
+        }
+    }
+    const uint64_t miniStreamSize = static_cast<uint64_t>(miniSectors) * kMiniSectorSize;
+    const auto miniStreamSectors =
+        static_cast<uint32_t>(round_up(miniStreamSize, kSectorSize) / kSectorSize);
+    const auto miniFatSectors =
+        static_cast<uint32_t>(round_up(miniSectors * 4ull, kSectorSize) / kSectorSize);
+    dataSectors += miniStreamSectors + miniFatSectors;
+
+    // FAT sectors must map themselves and the DIFAT sectors that list them beyond the header's 109
+    constexpr uint32_t kPerSector = kSectorSize / 4;
+    uint32_t fatSectors = 1;
+    uint32_t difatSectors = 0;
+    for (;;) {
+        difatSectors = fatSectors > kHeaderDifatEntries
+                           ? (fatSectors - kHeaderDifatEntries + kPerSector - 2) / (kPerSector - 1)
+                           : 0;
+        if (static_cast<uint64_t>(fatSectors) * kPerSector >=
+            dataSectors + fatSectors + difatSectors)
+            break;
+        ++fatSectors;
+    }
+    const uint64_t totalSectors = dataSectors + fatSectors + difatSectors;
+    if (totalSectors >= kDifatSector) throw XLInternalError("Package too large to encrypt");
+
+    std::vector<uint8_t> file(kSectorSize * (totalSectors + 1), 0);
+    auto at = [&](uint32_t sector) {
+        return file.data() + (static_cast<uint64_t>(sector) + 1) * kSectorSize;
+    };
+
+    // Sector order: FAT, DIFAT, directory, mini FAT, mini stream, then the regular streams
+    uint32_t next = fatSectors + difatSectors;
+    const uint32_t dirStart = next++;
+    const uint32_t miniFatStart = miniFatSectors ? next : kEndOfChain;
+    next += miniFatSectors;
+    const uint32_t miniStreamStart = miniStreamSectors ? next : kEndOfChain;
+    next += miniStreamSectors;
+    for (Stream& s : streams) {
+        if (s.mini || s.count == 0) continue;
+        s.start = next;
+        next += s.count;
+    }
+
+    std::vector<uint32_t> fat(static_cast<size_t>(fatSectors) * kPerSector, kFreeSector);
+    for (uint32_t i = 0; i < fatSectors; ++i) fat[i] = kFatSector;
+    for (uint32_t i = 0; i < difatSectors; ++i) fat[fatSectors + i] = kDifatSector;
+    auto link = [](std::vector<uint32_t>& table, uint32_t start, uint32_t count) {
+        for (uint32_t i = 0; i < count; ++i)
+            table[start + i] = i + 1 < count ? start + i + 1 : kEndOfChain;
+    };
+    link(fat, dirStart, 1);
+    if (miniFatSectors) link(fat, miniFatStart, miniFatSectors);
+    if (miniStreamSectors) link(fat, miniStreamStart, miniStreamSectors);
+    for (const Stream& s : streams) {
+        if (!s.mini && s.count) link(fat, s.start, s.count);
+    }
+    for (uint32_t i = 0; i < fatSectors; ++i) {
+        for (uint32_t j = 0; j < kPerSector; ++j) put_u32(at(i) + j * 4, fat[i * kPerSector + j]);
+    }
+
+    std::vector<uint32_t> miniFat(static_cast<size_t>(miniFatSectors) * kPerSector, kFreeSector);
+    for (const Stream& s : streams) {
+        if (s.mini && s.count) link(miniFat, s.start, s.count);
+    }
+    for (size_t i = 0; i < miniFat.size(); ++i) put_u32(at(miniFatStart) + i * 4, miniFat[i]);
+
+    // Header
+    static const uint8_t kMagic[] = {0xD0, 0xCF, 0x11, 0xE0, 0xA1, 0xB1, 0x1A, 0xE1};
+    uint8_t* header = file.data();
+    std::memcpy(header, kMagic, sizeof(kMagic));
+    put_u16(header + 0x18, 0x003E);  // minor version
+    put_u16(header + 0x1A, 0x0003);  // major version
+    put_u16(header + 0x1C, 0xFFFE);  // byte order
+    put_u16(header + 0x1E, 9);       // sector shift
+    put_u16(header + 0x20, 6);       // mini sector shift
+    put_u32(header + 0x2C, fatSectors);
+    put_u32(header + 0x30, dirStart);
+    put_u32(header + 0x38, kMiniStreamCutoff);
+    put_u32(header + 0x3C, miniFatStart);
+    put_u32(header + 0x40, miniFatSectors);
+    put_u32(header + 0x44, difatSectors ? fatSectors : kEndOfChain);
+    put_u32(header + 0x48, difatSectors);
+    for (uint32_t i = 0; i < kHeaderDifatEntries; ++i) {
+        put_u32(header + 0x4C + i * 4, i < fatSectors ? i : kFreeSector);
+    }
+    for (uint32_t k = 0; k < difatSectors; ++k) {
+        uint8_t* p = at(fatSectors + k);
+        for (uint32_t j = 0; j < kPerSector - 1; ++j) {
+            const uint64_t index =
+                kHeaderDifatEntries + static_cast<uint64_t>(k) * (kPerSector - 1) + j;
+            put_u32(p + j * 4, index < fatSectors ? static_cast<uint32_t>(index) : kFreeSector);
+        }
+        put_u32(p + (kPerSector - 1) * 4, k + 1 < difatSectors ? fatSectors + k + 1 : kEndOfChain);
+    }
+
+    // Directory: the root storage, EncryptionInfo (black) and EncryptedPackage (red) as its
+    // right sibling, which keeps the red-black tree valid
+    auto entry = [&](uint32_t index, const char* name, uint8_t type, uint8_t color, uint32_t right,
+                     uint32_t child, uint32_t start, uint64_t size) {
+        uint8_t* dir = at(dirStart) + index * 128;
+        const size_t length = std::strlen(name);
+        for (size_t i = 0; i < length; ++i) dir[i * 2] = static_cast<uint8_t>(name[i]);
+        put_u16(dir + 0x40, static_cast<uint32_t>((length + 1) * 2));
+        dir[0x42] = type;
+        dir[0x43] = color;
+        put_u32(dir + 0x44, kNoStream);
+        put_u32(dir + 0x48, right);
+        put_u32(dir + 0x4C, child);
+        put_u32(dir + 0x74, start);
+        put_u32(dir + 0x78, static_cast<uint32_t>(size));
+    };
+    entry(0, "Root Entry", 5, 1, kNoStream, 1, miniStreamStart, miniStreamSize);
+    entry(1, streams[0].name, 2, 1, 2, kNoStream, streams[0].start, streams[0].size);
+    entry(2, streams[1].name, 2, 0, kNoStream, kNoStream, streams[1].start, streams[1].size);
+    for (uint32_t i = 3; i < kSectorSize / 128; ++i) {
+        uint8_t* dir = at(dirStart) + i * 128;
+        put_u32(dir + 0x44, kNoStream);
+        put_u32(dir + 0x48, kNoStream);
+        put_u32(dir + 0x4C, kNoStream);
+    }
+
+    auto offset = [&](const Stream& s) -> uint64_t {
+        if (s.count == 0) return 0;
+        if (s.mini)
+            return (static_cast<uint64_t>(miniStreamStart) + 1) * kSectorSize +
+                   s.start * kMiniSectorSize;
+        return (static_cast<uint64_t>(s.start) + 1) * kSectorSize;
+    };
+    infoOffset = offset(streams[0]);
+    packageOffset = offset(streams[1]);
+    return file;
+}
+
+// EncryptionInfo stream: version header and the Agile XML descriptor
+std::string encryption_info(gsl::span<const uint8_t> saltData, gsl::span<const uint8_t> saltKey,
+                            gsl::span<const uint8_t> encryptedHmacKey,
+                            gsl::span<const uint8_t> encryptedHmacValue,
+                            gsl::span<const uint8_t> encryptedVerifierInput,
+                            gsl::span<const uint8_t> encryptedVerifierValue,
+                            gsl::span<const uint8_t> encryptedKeyValue) {
+    std::string info(8, '\0');
+    put_u32(reinterpret_cast<uint8_t*>(info.data()), 0x00040004);  // Agile
+    put_u32(reinterpret_cast<uint8_t*>(info.data()) + 4, 0x00000040);
+    info +=
+        "<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"yes\"?>\r\n"
+        "<encryption xmlns=\"http://schemas.microsoft.com/office/2006/encryption\" "
+        "xmlns:p=\"http://schemas.microsoft.com/office/2006/keyEncryptor/password\" "
+        "xmlns:c=\"http://schemas.microsoft.com/office/2006/keyEncryptor/certificate\">\r\n"
+        "  <keyData saltSize=\"16\" blockSize=\"16\" keyBits=\"256\" hashSize=\"64\" "
+        "cipherAlgorithm=\"AES\" "
+        "cipherChaining=\"ChainingModeCBC\" hashAlgorithm=\"SHA512\" saltValue=\"" +
+        base64(saltData) +
+        "\"/>\r\n"
+        "  <dataIntegrity encryptedHmacKey=\"" +
+        base64(encryptedHmacKey) + "\" encryptedHmacValue=\"" + base64(encryptedHmacValue) +
+        "\"/>\r\n"
+        "  <keyEncryptors>\r\n"
+        "    <keyEncryptor "
+        "uri=\"http://schemas.microsoft.com/office/2006/keyEncryptor/password\">\r\n"
+        "      <p:encryptedKey spinCount=\"" +
+        std::to_string(kSpinCount) +
+        "\" saltSize=\"16\" blockSize=\"16\" keyBits=\"256\" hashSize=\"64\" "
+        "cipherAlgorithm=\"AES\" "
+        "cipherChaining=\"ChainingModeCBC\" hashAlgorithm=\"SHA512\" saltValue=\"" +
+        base64(saltKey) + "\" encryptedVerifierHashInput=\"" + base64(encryptedVerifierInput) +
+        "\" encryptedVerifierHashValue=\"" + base64(encryptedVerifierValue) +
+        "\" encryptedKeyValue=\"" + base64(encryptedKeyValue) +
+        "\"/>\r\n"
+        "    </keyEncryptor>\r\n"
+        "  </keyEncryptors>\r\n"
+        "</encryption>";
+    return info;
+}
+
+void check_algorithms(const pugi::xml_node& node) {
+    if (std::string_view(node.attribute("cipherAlgorithm").as_string()) != "AES" ||
+        std::string_view(node.attribute("cipherChaining").as_string()) != "ChainingModeCBC" ||
+        std::string_view(node.attribute("hashAlgorithm").as_string()) != "SHA512") {
+        throw XLInternalError(
+            "Unsupported encryption algorithm (AES-CBC with SHA-512 is supported)");
+    }
+}
+
+}  // namespace
+
+std::vector<uint8_t> decrypt_package(gsl::span<const uint8_t> data, const std::string& password,
+                                     size_t workers) {
+    const CompoundFile file(data);
+    std::vector<uint8_t> infoScratch;
+    const gsl::span<const uint8_t> info = file.stream("EncryptionInfo", infoScratch);
+    if (info.size() < 8) throw XLInternalError("Invalid EncryptionInfo stream");
+    if (get_u32(info.data()) != 0x00040004) {
+        // Standard encryption (small, older files)
+        return OpenXLSX::decryptDocument(data, password);
+    }
+
+    pugi::xml_document doc;
+    if (!doc.load_buffer(info.data() + 8, info.size() - 8))
+        throw XLInternalError("Failed to parse EncryptionInfo XML");
+    const pugi::xml_node root = doc.child("encryption");
+    const pugi::xml_node keyData = root.child("keyData");
+    const pugi::xml_node encryptedKey =
+        root.child("keyEncryptors").child("keyEncryptor").child("p:encryptedKey");
+    if (!keyData || !encryptedKey) throw XLInternalError("Invalid Agile EncryptionInfo XML");
+    check_algorithms(keyData);
+    check_algorithms(encryptedKey);
+
+    const std::vector<uint8_t> keySalt = unbase64(encryptedKey.attribute("saltValue").as_string());
+    const size_t keyBytes = encryptedKey.attribute("keyBits").as_uint(256) / 8;
+    const Digest hash = key_cache().derive(password, keySalt,
+                                           encryptedKey.attribute("spinCount").as_int(kSpinCount));
+
+    // The verifier tells a wrong password apart from a corrupt file
+    const std::vector<uint8_t> verifierInput =
+        Aes(derive_key(hash, kBlockVerifierInput, keyBytes), false)
+            .cbc(unbase64(encryptedKey.attribute("encryptedVerifierHashInput").as_string()),
+                 keySalt);
+    const std::vector<uint8_t> verifierValue =
+        Aes(derive_key(hash, kBlockVerifierValue, keyBytes), false)
+            .cbc(unbase64(encryptedKey.attribute("encryptedVerifierHashValue").as_string()),
+                 keySalt);
+    const size_t saltSize =
+        std::min<size_t>(encryptedKey.attribute("saltSize").as_uint(16), verifierInput.size());
+    const Digest expected = sha512({gsl::span<const uint8_t>(verifierInput.data(), saltSize)});
+    if (verifierValue.size() < expected.size() ||
+        !std::equal(expected.begin(), expected.end(), verifierValue.begin())) {
+        throw std::invalid_argument("Incorrect password");
+    }
+
+    std::vector<uint8_t> packageKey =
+        Aes(derive_key(hash, kBlockEncryptedKey, keyBytes), false)
+            .cbc(unbase64(encryptedKey.attribute("encryptedKeyValue").as_string()), keySalt);
+    packageKey.resize(keyData.attribute("keyBits").as_uint(256) / 8);
+    const std::vector<uint8_t> dataSalt = unbase64(keyData.attribute("saltValue").as_string());
+    const size_t blockSize = keyData.attribute("blockSize").as_uint(16);
+
+    std::vector<uint8_t> packageScratch;
+    const gsl::span<const uint8_t> package = file.stream("EncryptedPackage", packageScratch);
+    if (package.size() < 8) throw XLInternalError("Invalid EncryptedPackage stream");
+    const uint64_t originalSize = get_u64(package.data());
+    const gsl::span<const uint8_t> payload = package.subspan(8);
+
+    std::vector<uint8_t> plain(round_up(payload.size(), 16));
+    const size_t segments = (payload.size() + kSegmentSize - 1) / kSegmentSize;
+    for_segments(segments, workers, [&](size_t first, size_t last) {
+        Aes aes(packageKey, false);
+        uint8_t index[4];
+        for (size_t i = first; i < last; ++i) {
+            put_u32(index, static_cast<uint32_t>(i));
+            const std::vector<uint8_t> iv = derive_iv(dataSalt, index, blockSize);
+            const size_t offset = i * kSegmentSize;
+            const size_t size = std::min(kSegmentSize, payload.size() - offset);
+            if (size % 16 == 0) {
+                aes.cbc(payload.data() + offset, plain.data() + offset, size, iv);
+            } else {
+                // A truncated last segment: zero-pad it to the cipher block
+                const std::vector<uint8_t> segment = aes.cbc(payload.subspan(offset, size), iv);
+                std::memcpy(plain.data() + offset, segment.data(), segment.size());
+            }
+        }
+    });
+    mbedtls_platform_zeroize(packageKey.data(), packageKey.size());
+
+    if (originalSize <= plain.size()) plain.resize(originalSize);
+    return plain;
+}
+
+std::vector<uint8_t> encrypt_package(gsl::span<const uint8_t> zip, const std::string& password,
+                                     size_t workers) {
+    Random random;
+    const std::vector<uint8_t> dataSalt = random.bytes(16);
+    const std::vector<uint8_t> keySalt = random.bytes(16);
+    const std::vector<uint8_t> verifier = random.bytes(16);
+    std::vector<uint8_t> packageKey = random.bytes(32);
+    std::vector<uint8_t> hmacKey = random.bytes(64);
+
+    const Digest hash = key_cache().derive(password, keySalt, kSpinCount);
+    const std::vector<uint8_t> encryptedKeyValue =
+        Aes(derive_key(hash, kBlockEncryptedKey, 32), true).cbc(packageKey, keySalt);
+    const std::vector<uint8_t> encryptedVerifierInput =
+        Aes(derive_key(hash, kBlockVerifierInput, 32), true).cbc(verifier, keySalt);
+    const std::vector<uint8_t> encryptedVerifierValue =
+        Aes(derive_key(hash, kBlockVerifierValue, 32), true).cbc(sha512({verifier}), keySalt);
+    const std::vector<uint8_t> encryptedHmacKey =
+        Aes(packageKey, true).cbc(hmacKey, derive_iv(dataSalt, kBlockIntegrityKey, 16));
+
+    // The descriptor has the same length whatever the HMAC value, so the file can be laid
+    // out before the package is encrypted into it
+    const std::vector<uint8_t> noHmac(64);
+    const size_t infoSize =
+        encryption_info(dataSalt, keySalt, encryptedHmacKey, noHmac, encryptedVerifierInput,
+                        encryptedVerifierValue, encryptedKeyValue)
+            .size();
+    const uint64_t packageSize = 8 + round_up(zip.size(), 16);
+    uint64_t infoOffset = 0;
+    uint64_t packageOffset = 0;
+    std::vector<uint8_t> file = compound_file(infoSize, packageSize, infoOffset, packageOffset);
+
+    uint8_t* package = file.data() + packageOffset;
+    put_u64(package, zip.size());
+    const size_t segments = (zip.size() + kSegmentSize - 1) / kSegmentSize;
+    for_segments(segments, workers, [&](size_t first, size_t last) {
+        Aes aes(packageKey, true);
+        uint8_t index[4];
+        for (size_t i = first; i < last; ++i) {
+            put_u32(index, static_cast<uint32_t>(i));
+            const std::vector<uint8_t> iv = derive_iv(dataSalt, index, 16);
+            const size_t offset = i * kSegmentSize;
+            const size_t size = std::min(kSegmentSize, zip.size() - offset);
+            if (size % 16 == 0) {
+                aes.cbc(zip.data() + offset, package + 8 + offset, size, iv);
+            } else {
+                const std::vector<uint8_t> segment = aes.cbc(zip.subspan(offset, size), iv);
+                std::memcpy(package + 8 + offset, segment.data(), segment.size());
+            }
+        }
+    });
+
+    // Data integrity: HMAC-SHA512 over the whole EncryptedPackage stream
+    Digest hmac;
+    mbedtls_md_hmac(mbedtls_md_info_from_type(MBEDTLS_MD_SHA512), hmacKey.data(), hmacKey.size(),
+                    package, packageSize, hmac.data());
+    const std::vector<uint8_t> encryptedHmacValue =
+        Aes(packageKey, true).cbc(hmac, derive_iv(dataSalt, kBlockIntegrityValue, 16));
+    mbedtls_platform_zeroize(packageKey.data(), packageKey.size());
+    mbedtls_platform_zeroize(hmacKey.data(), hmacKey.size());
+
+    const std::string info =
+        encryption_info(dataSalt, keySalt, encryptedHmacKey, encryptedHmacValue,
+                        encryptedVerifierInput, encryptedVerifierValue, encryptedKeyValue);
+    if (info.size() != infoSize) throw XLInternalError("EncryptionInfo size mismatch");
+    std::memcpy(file.data() + infoOffset, info.data(), info.size());
+    return file;
+}
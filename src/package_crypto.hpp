@@ -0,0 +1,33 @@
+#ifndef PYOPENXLSX_PACKAGE_CRYPTO_HPP
+#define PYOPENXLSX_PACKAGE_CRYPTO_HPP
+
+/**
+ * @file package_crypto.hpp
+ * @brief Agile (ECMA-376) encryption of workbook packages, entirely in memory.
+ *
+ * The encrypted package is a sequence of independent 4096-byte segments, each
+ * AES-CBC encrypted under the package key with an IV derived from the segment
+ * index, so segments are encrypted and decrypted by several threads at once.
+ * The password key derivation (100000 SHA-512 rounds) is cached per password
+ * and salt, which makes reopening a file that was just saved or opened cheap.
+ *
+ * The compound (OLE) container is read and written here as well, with DIFAT
+ * sectors, so packages larger than about 7 MB round-trip. Standard (non
+ * Agile) encryption is still decrypted by OpenXLSX.
+ */
+
+#include <cstdint>
+#include <gsl/gsl>
+#include <string>
+#include <vector>
+
+// Decrypt an encrypted workbook file into its zip package. Throws std::invalid_argument
+// for an incorrect password. `workers` 0 picks the thread count from the package size.
+std::vector<uint8_t> decrypt_package(gsl::span<const uint8_t> data, const std::string& password,
+                                     size_t workers = 0);
+
+// Encrypt a zip package into an Agile-encrypted workbook file
+std::vector<uint8_t> encrypt_package(gsl::span<const uint8_t> zip, const std::string& password,
+                                     size_t workers = 0);
+
+#endif  // PYOPENXLSX_PACKAGE_CRYPTO_HPP
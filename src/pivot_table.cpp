@@ -1,4 +1,694 @@
-#include "bindings.hpp"
+#include "pivot_table.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <limits>
+#include <numeric>
+#include <optional>
+#include <unordered_map>
+
+#include "aggregation.hpp"
+#include "internal_access.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+// Shortest "%g" text that reads back as the same double
+std::string format_double(double value) {
+    char buf[32];
+    std::snprintf(buf, sizeof(buf), "%.15g", value);
+    if (std::strtod(buf, nullptr) != value) std::snprintf(buf, sizeof(buf), "%.17g", value);
+    return buf;
+}
+
+// Package path of a relationship target, which is relative to the folder of its owner part
+std::string resolve_part_path(const std::string& ownerPath, const std::string& target) {
+    if (!target.empty() && target[0] == '/') return target.substr(1);
+    const size_t slash = ownerPath.find_last_of('/');
+    const std::string combined =
+        (slash == std::string::npos ? std::string() : ownerPath.substr(0, slash + 1)) + target;
+    std::vector<std::string> segments;
+    size_t start = 0;
+    while (start <= combined.size()) {
+        size_t end = combined.find('/', start);
+        if (end == std::string::npos) end = combined.size();
+        const std::string segment = combined.substr(start, end - start);
+        if (segment == "..") {
+            if (!segments.empty()) segments.pop_back();
+        } else if (!segment.empty() && segment != ".") {
+            segments.push_back(segment);
+        }
+        start = end + 1;
+    }
+    std::string path;
+    for (const std::string& segment : segments) {
+        if (!path.empty()) path += '/';
+        path += segment;
+    }
+    return path;
+}
+
+// The loaded XML of a package part, or nullptr when the part has not been loaded
+XLXmlData* loaded_xml_data(XLDocument& doc, const std::string& path) {
+    XLQuery query(XLQueryType::QueryXmlData);
+    query.setParam("xmlPath", path);
+    try {
+        return doc.execQuery(query).result<XLXmlData*>();
+    } catch (const XLInternalError&) {
+        return nullptr;
+    }
+}
+
+std::optional<XLRelationshipItem> find_relationship(const XLRelationships& rels,
+                                                    XLRelationshipType type) {
+    for (const XLRelationshipItem& item : rels.relationships()) {
+        if (item.type() == type) return item;
+    }
+    return std::nullopt;
+}
+
+struct CacheField {
+    bool axis = false;
+    std::unordered_map<std::string, uint32_t> index;  // item key -> shared item
+    std::vector<AggValue> items;                      // shared items in order of appearance
+    std::vector<uint32_t> sorted;                     // display position -> shared item
+    std::vector<uint32_t> rank;                       // shared item -> display position
+    bool hasString = false;
+    bool hasNumber = false;
+    bool hasBoolean = false;
+    bool hasBlank = false;
+    bool allIntegers = true;
+    double minValue = std::numeric_limits<double>::infinity();
+    double maxValue = -std::numeric_limits<double>::infinity();
+
+    void observe(const AggValue& item) {
+        switch (item.kind) {
+            case AggValue::Kind::Number:
+                hasNumber = true;
+                allIntegers = allIntegers && std::floor(item.number) == item.number;
+                minValue = std::min(minValue, item.number);
+                maxValue = std::max(maxValue, item.number);
+                break;
+            case AggValue::Kind::String:
+                hasString = true;
+                break;
+            case AggValue::Kind::Boolean:
+                hasBoolean = true;
+                break;
+            case AggValue::Kind::Blank:
+                hasBlank = true;
+                break;
+        }
+    }
+
+    uint32_t share(const AggValue& item) {
+        auto [it, inserted] = index.try_emplace(item.key(), static_cast<uint32_t>(items.size()));
+        if (inserted) items.push_back(item);
+        return it->second;
+    }
+
+    void sort_items() {
+        sorted.resize(items.size());
+        std::iota(sorted.begin(), sorted.end(), 0U);
+        std::stable_sort(sorted.begin(), sorted.end(), [this](uint32_t a, uint32_t b) {
+            return agg_value_less(items[a], items[b]);
+        });
+        rank.resize(items.size());
+        for (uint32_t pos = 0; pos < sorted.size(); ++pos) rank[sorted[pos]] = pos;
+    }
+};
+
+AggFunc subtotal_func(XLPivotSubtotal subtotal) {
+    switch (subtotal) {
+        case XLPivotSubtotal::Average:
+            return AggFunc::Mean;
+        case XLPivotSubtotal::Count:
+            return AggFunc::Count;
+        case XLPivotSubtotal::Max:
+            return AggFunc::Max;
+        case XLPivotSubtotal::Min:
+            return AggFunc::Min;
+        case XLPivotSubtotal::Product:
+            return AggFunc::Product;
+        default:
+            return AggFunc::Sum;
+    }
+}
+
+// Excel shows 0 for the max/min/product of a group without numbers, and nothing for an
+// empty group or the average of no numbers
+std::optional<double> subtotal_result(const Accumulator& acc, XLPivotSubtotal subtotal) {
+    if (acc.values == 0) return std::nullopt;
+    const AggFunc func = subtotal_func(subtotal);
+    const std::optional<double> value = acc.result(func);
+    return value || func == AggFunc::Mean ? value : 0.0;
+}
+
+const char* subtotal_caption(XLPivotSubtotal subtotal) {
+    switch (subtotal) {
+        case XLPivotSubtotal::Average:
+            return "Average";
+        case XLPivotSubtotal::Count:
+            return "Count";
+        case XLPivotSubtotal::Max:
+            return "Max";
+        case XLPivotSubtotal::Min:
+            return "Min";
+        case XLPivotSubtotal::Product:
+            return "Product";
+        default:
+            return "Sum";
+    }
+}
+
+struct DataField {
+    size_t field;
+    XLPivotSubtotal subtotal;
+    std::string name;
+};
+
+// Distinct item combinations of the fields on one axis, as display positions
+struct AxisKeys {
+    std::unordered_map<std::string, uint32_t> ids;
+    std::vector<std::vector<uint32_t>> keys;
+    std::vector<uint32_t> order;  // key ids in display order
+
+    int64_t id(const std::vector<uint32_t>& key) {
+        if (key.empty()) return -1;
+        std::string packed(reinterpret_cast<const char*>(key.data()),
+                           key.size() * sizeof(uint32_t));
+        auto [it, inserted] =
+            ids.try_emplace(std::move(packed), static_cast<uint32_t>(keys.size()));
+        if (inserted) keys.push_back(key);
+        return it->second;
+    }
+
+    void sort_keys() {
+        order.resize(keys.size());
+        std::iota(order.begin(), order.end(), 0U);
+        std::sort(order.begin(), order.end(),
+                  [this](uint32_t a, uint32_t b) { return keys[a] < keys[b]; });
+    }
+};
+
+// One rendered row or column of the table. `key` -1 aggregates over every item of the axis
+// and `data` -1 means the value field is not on this axis.
+struct Leaf {
+    int64_t key;
+    int data;
+    bool grand;
+};
+
+std::vector<Leaf> build_leaves(const AxisKeys& axis, bool hasFields, bool dataOnAxis,
+                               size_t dataCount, bool grandTotals) {
+    std::vector<Leaf> leaves;
+    const int lastData = dataOnAxis ? static_cast<int>(dataCount) : 1;
+    const auto push_all = [&](int64_t key, bool grand) {
+        for (int d = 0; d < lastData; ++d) leaves.push_back({key, dataOnAxis ? d : -1, grand});
+    };
+    if (hasFields) {
+        for (uint32_t key : axis.order) push_all(key, false);
+        if (grandTotals && dataCount > 0) push_all(-1, true);
+    } else {
+        push_all(-1, false);
+    }
+    return leaves;
+}
+
+// Display positions of a leaf's items, with the data field index as the innermost level
+std::vector<uint32_t> leaf_members(const Leaf& leaf, const AxisKeys& axis) {
+    std::vector<uint32_t> members;
+    if (leaf.key >= 0) members = axis.keys[static_cast<size_t>(leaf.key)];
+    if (leaf.data >= 0) members.push_back(static_cast<uint32_t>(leaf.data));
+    return members;
+}
+
+// Number of leading levels `leaf` shares with the previous leaf on the same axis
+size_t repeated_levels(const std::vector<uint32_t>& members,
+                       const std::vector<uint32_t>& previous) {
+    size_t same = 0;
+    while (same < members.size() && same < previous.size() && members[same] == previous[same])
+        ++same;
+    return same;
+}
+
+void write_axis_items(XMLNode node, const std::vector<Leaf>& leaves, const AxisKeys& axis) {
+    node.remove_children();
+    std::vector<uint32_t> previous;
+    for (const Leaf& leaf : leaves) {
+        XMLNode i = node.append_child("i");
+        if (leaf.grand) {
+            i.append_attribute("t").set_value("grand");
+            if (leaf.data > 0) i.append_attribute("i").set_value(leaf.data);
+            i.append_child("x");
+            previous.clear();
+            continue;
+        }
+        std::vector<uint32_t> members = leaf_members(leaf, axis);
+        const size_t same = repeated_levels(members, previous);
+        if (same > 0) i.append_attribute("r").set_value(static_cast<uint32_t>(same));
+        if (leaf.data > 0) i.append_attribute("i").set_value(leaf.data);
+        for (size_t level = same; level < members.size(); ++level) {
+            XMLNode x = i.append_child("x");
+            if (members[level] != 0) x.append_attribute("v").set_value(members[level]);
+        }
+        previous = std::move(members);
+    }
+    if (leaves.empty()) node.append_child("i");
+    node.remove_attribute("count");
+    node.append_attribute("count").set_value(
+        static_cast<uint32_t>(std::max<size_t>(leaves.size(), 1)));
+}
+
+void set_attribute(XMLNode node, const char* name, const std::string& value) {
+    XMLAttribute attr = node.attribute(name);
+    if (attr.empty()) attr = node.append_attribute(name);
+    attr.set_value(value.c_str());
+}
+
+XMLNode append_value(XMLNode parent, const AggValue& item) {
+    switch (item.kind) {
+        case AggValue::Kind::Number: {
+            XMLNode n = parent.append_child("n");
+            n.append_attribute("v").set_value(format_double(item.number).c_str());
+            return n;
+        }
+        case AggValue::Kind::String: {
+            XMLNode s = parent.append_child("s");
+            s.append_attribute("v").set_value(item.text.c_str());
+            return s;
+        }
+        case AggValue::Kind::Boolean: {
+            XMLNode b = parent.append_child("b");
+            b.append_attribute("v").set_value(item.number != 0.0 ? "1" : "0");
+            return b;
+        }
+        default:
+            return parent.append_child("m");
+    }
+}
+
+void write_shared_items(XMLNode fieldNode, const CacheField& field) {
+    XMLNode shared = fieldNode.child("sharedItems");
+    if (shared.empty()) shared = fieldNode.append_child("sharedItems");
+    shared.remove_attributes();
+    shared.remove_children();
+
+    const bool textual = field.hasString || field.hasBoolean;
+    if (!textual && !field.hasBlank && field.hasNumber) {
+        shared.append_attribute("containsSemiMixedTypes").set_value("0");
+    }
+    if (!textual && (field.hasNumber || field.hasBlank)) {
+        shared.append_attribute("containsString").set_value("0");
+    }
+    if (field.hasBlank) shared.append_attribute("containsBlank").set_value("1");
+    if (textual && field.hasNumber) shared.append_attribute("containsMixedTypes").set_value("1");
+    if (field.hasNumber) {
+        shared.append_attribute("containsNumber").set_value("1");
+        if (field.allIntegers) shared.append_attribute("containsInteger").set_value("1");
+        shared.append_attribute("minValue").set_value(format_double(field.minValue).c_str());
+        shared.append_attribute("maxValue").set_value(format_double(field.maxValue).c_str());
+    }
+    if (!field.axis) return;
+    shared.append_attribute("count").set_value(static_cast<uint32_t>(field.items.size()));
+    for (const AggValue& item : field.items) append_value(shared, item);
+}
+
+}  // namespace
+
+std::string compute_pivot_table(XLWorksheet& ws, XLPivotTable& pivotTable,
+                                const XLPivotTableOptions& options) {
+    XLDocument& doc = get_parent_doc(ws);
+
+    // Locate the cache definition and records parts through the relationships
+    const std::string tablePath = get_xml_path(pivotTable);
+    const auto cacheRel =
+        find_relationship(pivotTable.relationships(), XLRelationshipType::PivotCacheDefinition);
+    XLXmlData* cacheData =
+        cacheRel ? loaded_xml_data(doc, resolve_part_path(tablePath, cacheRel->target())) : nullptr;
+    if (cacheData == nullptr) throw py::value_error("pivot table has no cache definition");
+    XLPivotCacheDefinition cacheDef(cacheData);
+    const std::string cachePath = get_xml_path(cacheDef);
+    const auto recordsRel =
+        find_relationship(cacheDef.relationships(), XLRelationshipType::PivotCacheRecords);
+    XLXmlData* recordsData =
+        recordsRel ? loaded_xml_data(doc, resolve_part_path(cachePath, recordsRel->target()))
+                   : nullptr;
+    if (recordsData == nullptr) throw py::value_error("pivot cache has no records part");
+    XLPivotCacheRecords cacheRecords(recordsData);
+
+    // Source block: "Sheet!A1:D100", "'My Sheet'!$A$1:$D$100" or a range on `ws`
+    std::string sheetName;
+    std::string sourceRef = options.sourceRange;
+    const size_t bang = sourceRef.rfind('!');
+    if (bang != std::string::npos) {
+        sheetName = sourceRef.substr(0, bang);
+        sourceRef = sourceRef.substr(bang + 1);
+        if (sheetName.size() >= 2 && sheetName.front() == '\'' && sheetName.back() == '\'') {
+            std::string unquoted;
+            for (size_t i = 1; i + 1 < sheetName.size(); ++i) {
+                unquoted += sheetName[i];
+                if (sheetName[i] == '\'' && sheetName[i + 1] == '\'') ++i;
+            }
+            sheetName = std::move(unquoted);
+        }
+    }
+    uint32_t firstRow = 0;
+    uint32_t lastRow = 0;
+    uint16_t firstCol = 0;
+    uint16_t lastCol = 0;
+    if (!parse_range_ref(sourceRef, firstRow, firstCol, lastRow, lastCol)) {
+        throw py::value_error(("invalid pivot source range: " + options.sourceRange).c_str());
+    }
+    uint32_t targetRow = 0;
+    uint16_t targetCol = 0;
+    if (!parse_cell_ref(options.targetCell.c_str(), targetRow, targetCol)) {
+        throw py::value_error(("invalid pivot target cell: " + options.targetCell).c_str());
+    }
+    XLWorksheet source = sheetName.empty() ? ws : doc.workbook().worksheet(sheetName);
+
+    XMLNode cacheRoot = get_xml_doc(cacheDef).document_element();
+    std::vector<XMLNode> fieldNodes;
+    for (XMLNode f = cacheRoot.child("cacheFields").child("cacheField"); !f.empty();
+         f = f.next_sibling("cacheField")) {
+        fieldNodes.push_back(f);
+    }
+    const size_t fieldCount = static_cast<size_t>(lastCol - firstCol) + 1;
+    if (fieldNodes.size() != fieldCount) {
+        throw py::value_error("pivot cache fields do not match the source range");
+    }
+    std::vector<std::string> names;
+    for (XMLNode f : fieldNodes) names.emplace_back(f.attribute("name").value());
+
+    // Same matching as addPivotTable: first header with that name, unknown names are skipped
+    const auto field_indices = [&names](const std::vector<XLPivotField>& fields) {
+        std::vector<size_t> indices;
+        for (const XLPivotField& f : fields) {
+            auto it = std::find(names.begin(), names.end(), f.name);
+            if (it != names.end()) indices.push_back(static_cast<size_t>(it - names.begin()));
+        }
+        return indices;
+    };
+    const std::vector<size_t> rowFields = field_indices(options.rows);
+    const std::vector<size_t> colFields = field_indices(options.columns);
+    const std::vector<size_t> pageFields = field_indices(options.filters);
+    std::vector<DataField> dataFields;
+    for (const XLPivotField& f : options.data) {
+        auto it = std::find(names.begin(), names.end(), f.name);
+        if (it == names.end()) continue;
+        dataFields.push_back({static_cast<size_t>(it - names.begin()), f.subtotal,
+                              f.customName.empty()
+                                  ? std::string(subtotal_caption(f.subtotal)) + " of " + f.name
+                                  : f.customName});
+    }
+    const size_t dataCount = dataFields.size();
+
+    std::vector<CacheField> fields(fieldCount);
+    for (const auto* axis : {&rowFields, &colFields, &pageFields}) {
+        for (size_t idx : *axis) fields[idx].axis = true;
+    }
+
+    // Read every record once; axis fields keep the shared item index of each value
+    const size_t recordCount = lastRow - firstRow;
+    std::vector<AggValue> records;
+    std::vector<uint32_t> shared(recordCount * fieldCount, 0);
+    {
+        py::gil_scoped_release release;
+        if (recordCount > 0) records = read_block(source, firstRow + 1, firstCol, lastRow, lastCol);
+        for (size_t r = 0; r < recordCount; ++r) {
+            for (size_t c = 0; c < fieldCount; ++c) {
+                const AggValue& item = records[r * fieldCount + c];
+                fields[c].observe(item);
+                if (fields[c].axis) shared[r * fieldCount + c] = fields[c].share(item);
+            }
+        }
+    }
+    for (CacheField& field : fields) {
+        if (field.axis) field.sort_items();
+    }
+
+    // Hash aggregation: one accumulator per data field for every (row key, column key) pair,
+    // plus the row, column and grand totals (key -1)
+    AxisKeys rowKeys;
+    AxisKeys colKeys;
+    std::unordered_map<uint64_t, size_t> slots;
+    std::vector<Accumulator> accumulators;
+    const auto slot_key = [](int64_t rowKey, int64_t colKey) {
+        return (static_cast<uint64_t>(rowKey + 1) << 32) | static_cast<uint64_t>(colKey + 1);
+    };
+    {
+        py::gil_scoped_release release;
+        std::vector<uint32_t> key;
+        const auto axis_key = [&](const std::vector<size_t>& axisFields, size_t r) {
+            key.clear();
+            for (size_t idx : axisFields)
+                key.push_back(fields[idx].rank[shared[r * fieldCount + idx]]);
+            return key;
+        };
+        for (size_t r = 0; r < recordCount; ++r) {
+            const int64_t rowKey = rowKeys.id(axis_key(rowFields, r));
+            const int64_t colKey = colKeys.id(axis_key(colFields, r));
+            if (dataCount == 0) continue;
+            const std::pair<int64_t, int64_t> targets[] = {
+                {rowKey, colKey}, {rowKey, -1}, {-1, colKey}, {-1, -1}};
+            for (size_t t = 0; t < 4; ++t) {
+                // Skip pairs already covered when an axis has no fields
+                if ((t == 1 && colKey == -1) || (t == 2 && rowKey == -1) ||
+                    (t == 3 && (rowKey == -1 || colKey == -1))) {
+                    continue;
+                }
+                auto [it, inserted] = slots.try_emplace(
+                    slot_key(targets[t].first, targets[t].second), accumulators.size());
+                if (inserted) accumulators.resize(accumulators.size() + dataCount);
+                for (size_t d = 0; d < dataCount; ++d) {
+                    accumulators[it->second + d].add(records[r * fieldCount + dataFields[d].field]);
+                }
+            }
+        }
+        rowKeys.sort_keys();
+        colKeys.sort_keys();
+    }
+
+    // Layout: tabular form, one label column per row level and one header row per column level
+    const bool dataOnRows = dataCount > 1 && options.dataOnRows;
+    const bool dataOnCols = dataCount > 1 && !options.dataOnRows;
+    const std::vector<Leaf> rowLeaves =
+        build_leaves(rowKeys, !rowFields.empty(), dataOnRows, dataCount, options.colGrandTotals);
+    std::vector<Leaf> colLeaves =
+        build_leaves(colKeys, !colFields.empty(), dataOnCols, dataCount, options.rowGrandTotals);
+    if (colFields.empty() && !dataOnCols && dataCount == 0) colLeaves.clear();
+
+    const size_t rowLevels = rowFields.size() + (dataOnRows ? 1 : 0);
+    const size_t colLevels = colFields.size() + (dataOnCols ? 1 : 0);
+    const size_t labelCols = std::max<size_t>(rowLevels, 1);
+    const size_t headerRows = colLevels + 1;
+    const size_t height = headerRows + rowLeaves.size();
+    const size_t width = labelCols + colLeaves.size();
+    if (targetRow + height - 1 > kExcelMaxRows || targetCol + width - 1 > kExcelMaxCols) {
+        throw py::value_error("pivot table does not fit on the worksheet");
+    }
+
+    std::vector<AggValue> grid(height * width);
+    const auto at = [&](size_t r, size_t c) -> AggValue& { return grid[r * width + c]; };
+    const auto label = [](const AggValue& item) {
+        return item.kind == AggValue::Kind::Blank ? AggValue::of_text("(blank)") : item;
+    };
+    const auto axis_label = [&](size_t fieldIdx, uint32_t position) {
+        const CacheField& field = fields[fieldIdx];
+        return label(field.items[field.sorted[position]]);
+    };
+    const std::string totalCaption = dataCount == 1 ? dataFields[0].name : "Total";
+
+    const size_t labelRow = headerRows - 1;
+    for (size_t level = 0; level < rowFields.size(); ++level) {
+        at(labelRow, level) = AggValue::of_text(names[rowFields[level]]);
+    }
+    if (dataOnRows) at(labelRow, rowFields.size()) = AggValue::of_text("Values");
+    if (colLevels == 0) {
+        for (size_t j = 0; j < colLeaves.size(); ++j)
+            at(0, labelCols + j) = AggValue::of_text(totalCaption);
+    } else {
+        if (dataCount == 1) at(0, 0) = AggValue::of_text(dataFields[0].name);
+        for (size_t level = 0; level < colLevels && labelCols + level < width; ++level) {
+            at(0, labelCols + level) =
+                AggValue::of_text(level < colFields.size() ? names[colFields[level]] : "Values");
+        }
+    }
+
+    // Outer labels are shown once per group, as Excel does in tabular form
+    const auto render_leaves = [&](const std::vector<Leaf>& leaves, const AxisKeys& axis,
+                                   const std::vector<size_t>& axisFields, bool columns) {
+        const size_t first = columns ? labelCols : headerRows;
+        const auto cell = [&](size_t index, size_t level) -> AggValue& {
+            return columns ? at(1 + level, first + index) : at(first + index, level);
+        };
+        std::vector<uint32_t> previous;
+        for (size_t i = 0; i < leaves.size(); ++i) {
+            const Leaf& leaf = leaves[i];
+            if (leaf.grand) {
+                cell(i, 0) = AggValue::of_text(
+                    leaf.data >= 0 ? "Total " + dataFields[leaf.data].name : "Grand Total");
+                previous.clear();
+                continue;
+            }
+            std::vector<uint32_t> members = leaf_members(leaf, axis);
+            const size_t same = i == 0 ? 0 : repeated_levels(members, previous);
+            for (size_t level = same; level < axisFields.size(); ++level) {
+                cell(i, level) = axis_label(axisFields[level], members[level]);
+            }
+            if (leaf.data >= 0) {
+                cell(i, axisFields.size()) = AggValue::of_text(dataFields[leaf.data].name);
+            } else if (axisFields.empty() && !columns) {
+                cell(i, 0) = AggValue::of_text(totalCaption);
+            }
+            previous = std::move(members);
+        }
+    };
+    render_leaves(rowLeaves, rowKeys, rowFields, false);
+    if (colLevels > 0) render_leaves(colLeaves, colKeys, colFields, true);
+
+    if (dataCount > 0) {
+        for (size_t i = 0; i < rowLeaves.size(); ++i) {
+            for (size_t j = 0; j < colLeaves.size(); ++j) {
+                const Leaf& rowLeaf = rowLeaves[i];
+                const Leaf& colLeaf = colLeaves[j];
+                auto found = slots.find(slot_key(rowLeaf.key, colLeaf.key));
+                if (found == slots.end()) continue;
+                const size_t d = static_cast<size_t>(rowLeaf.data >= 0 ? rowLeaf.data
+                                                                       : std::max(colLeaf.data, 0));
+                if (auto value =
+                        subtotal_result(accumulators[found->second + d], dataFields[d].subtotal)) {
+                    at(headerRows + i, labelCols + j) = AggValue::of_number(*value);
+                }
+            }
+        }
+    }
+
+    // Cache definition: shared items for axis fields, value summaries for the rest
+    cacheRoot.remove_attribute("saveData");
+    set_attribute(cacheRoot, "r:id", recordsRel->id());
+    set_attribute(cacheRoot, "recordCount", std::to_string(recordCount));
+    for (size_t c = 0; c < fieldCount; ++c) write_shared_items(fieldNodes[c], fields[c]);
+
+    XMLNode recordsRoot = get_xml_doc(cacheRecords).document_element();
+    recordsRoot.remove_children();
+    set_attribute(recordsRoot, "count", std::to_string(recordCount));
+    for (size_t r = 0; r < recordCount; ++r) {
+        XMLNode record = recordsRoot.append_child("r");
+        for (size_t c = 0; c < fieldCount; ++c) {
+            if (fields[c].axis) {
+                record.append_child("x").append_attribute("v").set_value(
+                    shared[r * fieldCount + c]);
+            } else {
+                append_value(record, records[r * fieldCount + c]);
+            }
+        }
+    }
+
+    // Table definition: sorted field items, the rendered row/column items and the location
+    XMLNode tableRoot = get_xml_doc(pivotTable).document_element();
+    XMLNode pivotFields = tableRoot.child("pivotFields");
+    size_t fieldIdx = 0;
+    for (XMLNode pf = pivotFields.child("pivotField"); !pf.empty() && fieldIdx < fieldCount;
+         pf = pf.next_sibling("pivotField"), ++fieldIdx) {
+        const CacheField& field = fields[fieldIdx];
+        const bool isData =
+            std::any_of(dataFields.begin(), dataFields.end(),
+                        [fieldIdx](const DataField& d) { return d.field == fieldIdx; });
+        if (isData) set_attribute(pf, "dataField", "1");
+        if (!field.axis) continue;
+        // Only the grand totals are rendered, so Excel should not add subtotals on refresh
+        set_attribute(pf, "defaultSubtotal", "0");
+        pf.remove_child("items");
+        XMLNode items = pf.append_child("items");
+        items.append_attribute("count").set_value(static_cast<uint32_t>(field.sorted.size()));
+        for (uint32_t sharedIdx : field.sorted) {
+            items.append_child("item").append_attribute("x").set_value(sharedIdx);
+        }
+    }
+
+    size_t dataIdx = 0;
+    for (XMLNode df = tableRoot.child("dataFields").child("dataField");
+         !df.empty() && dataIdx < dataCount; df = df.next_sibling("dataField"), ++dataIdx) {
+        set_attribute(df, "name", dataFields[dataIdx].name);
+    }
+
+    XMLNode rowItems = tableRoot.child("rowItems");
+    if (!rowItems.empty()) write_axis_items(rowItems, rowLeaves, rowKeys);
+    XMLNode colItems = tableRoot.child("colItems");
+    if (colItems.empty()) {
+        XMLNode anchor = pivotFields;
+        for (const char* name : {"rowFields", "rowItems", "colFields"}) {
+            if (!tableRoot.child(name).empty()) anchor = tableRoot.child(name);
+        }
+        colItems = tableRoot.insert_child_after("colItems", anchor);
+    }
+    write_axis_items(colItems, colLeaves, colKeys);
+
+    const std::string ref = make_cell_ref(targetRow, targetCol) + ":" +
+                            make_cell_ref(gsl::narrow<uint32_t>(targetRow + height - 1),
+                                          gsl::narrow<uint16_t>(targetCol + width - 1));
+    XMLNode location = tableRoot.child("location");
+    set_attribute(location, "ref", ref);
+    set_attribute(location, "firstHeaderRow", "1");
+    set_attribute(location, "firstDataRow", std::to_string(headerRows));
+    set_attribute(location, "firstDataCol", std::to_string(labelCols));
+    if (!pageFields.empty()) {
+        set_attribute(location, "rowPageCount", std::to_string(pageFields.size()));
+        set_attribute(location, "colPageCount", "1");
+    }
+
+    // Rendered cells
+    for (size_t r = 0; r < height; ++r) {
+        for (size_t c = 0; c < width; ++c) {
+            const AggValue& item = at(r, c);
+            if (item.kind == AggValue::Kind::Blank) continue;
+            XLCell cell =
+                ws.cell(gsl::narrow<uint32_t>(targetRow + r), gsl::narrow<uint16_t>(targetCol + c));
+            if (item.kind == AggValue::Kind::Number) {
+                cell.value() = item.number;
+            } else if (item.kind == AggValue::Kind::Boolean) {
+                cell.value() = item.number != 0.0;
+            } else {
+                cell.value() = item.text;
+            }
+        }
+    }
+    return ref;
+}
+
+std::vector<std::tuple<std::string, std::string, uint32_t, uint32_t, uint32_t>>
+pivot_table_locations(XLWorksheet& ws) {
+    XLDocument& doc = get_parent_doc(ws);
+    const std::string sheetPath = get_xml_path(ws);
+    const std::string fileName = sheetPath.substr(sheetPath.find_last_of('/') + 1);
+    const auto sheetNo = static_cast<uint16_t>(std::strtoul(fileName.c_str() + 5, nullptr, 10));
+
+    std::vector<std::tuple<std::string, std::string, uint32_t, uint32_t, uint32_t>> tables;
+    if (!doc.hasSheetRelationships(sheetNo)) return tables;
+    for (const XLRelationshipItem& rel : doc.sheetRelationships(sheetNo).relationships()) {
+        if (rel.type() != XLRelationshipType::PivotTable) continue;
+        const std::string path = resolve_part_path(sheetPath, rel.target());
+        // Parts created in this session live in memory; those of a loaded file are parsed here
+        pugi::xml_document parsed;
+        XMLNode root;
+        if (XLXmlData* data = loaded_xml_data(doc, path)) {
+            root = data->getXmlDocument()->document_element();
+        } else if (parsed.load_string(doc.extractXmlFromArchive(path).c_str())) {
+            root = parsed.document_element();
+        }
+        if (root.empty()) continue;
+        XMLNode location = root.child("location");
+        tables.emplace_back(root.attribute("name").value(), location.attribute("ref").value(),
+                            location.attribute("firstHeaderRow").as_uint(),
+                            location.attribute("firstDataRow").as_uint(),
+                            location.attribute("firstDataCol").as_uint());
+    }
+    return tables;
+}
 
 void init_pivot_table(py::module_& m) {
     py::enum_<XLPivotSubtotal>(m, "XLPivotSubtotal")
@@ -0,0 +1,28 @@
+#ifndef PYOPENXLSX_PIVOT_TABLE_HPP
+#define PYOPENXLSX_PIVOT_TABLE_HPP
+
+#include <cstdint>
+#include <string>
+#include <tuple>
+#include <vector>
+
+#include "bindings.hpp"
+
+/**
+ * Fill in a pivot table created by XLWorksheet::addPivotTable with the same `options`.
+ *
+ * The source range is read once and aggregated with a single hash pass keyed by the row
+ * and column item combinations. The cache definition gets the shared items of every axis
+ * field, the cache records get one <r> per source row, and the table definition gets its
+ * sorted items, row/column items and final location. The aggregated block is written to
+ * `ws` in tabular layout (one label column per row field, no subtotals) so the values are
+ * visible without a refresh. Returns the reference of the rendered block.
+ */
+std::string compute_pivot_table(XLWorksheet& ws, XLPivotTable& pivotTable,
+                                const XLPivotTableOptions& options);
+
+// (name, location ref, firstHeaderRow, firstDataRow, firstDataCol) of each pivot table on `ws`
+std::vector<std::tuple<std::string, std::string, uint32_t, uint32_t, uint32_t>>
+pivot_table_locations(XLWorksheet& ws);
+
+#endif  // PYOPENXLSX_PIVOT_TABLE_HPP
@@ -43,6 +43,8 @@ from ._openxlsx import (
     XLBorders,
     XLNumberFormat,
     XLNumberFormats,
+    XLNumberFormatCategory,
+    XLStyleTable,
     XLCellReference,
     XLCellRange,
     XLDateTime,
@@ -71,9 +73,19 @@ from .worksheet import Worksheet
 from .column import Column
 from .table import Table
 from .page_setup import PageMargins, PrintOptions, PageSetup
-from .workbook import Workbook, load_workbook, load_workbook_async
+from .workbook import (
+    Workbook,
+    concat_sheets,
+    concat_sheets_async,
+    load_workbook,
+    load_workbook_async,
+)
 from .merge import MergeCells as PythonMergeCells
 from .data_validation import DataValidation, DataValidations
+from .defined_names import DefinedNames
+from .template import Template
+from .conditional_formatting import ConditionalFormatBatch
+from .aggregation import GroupBy, GroupResult
 
 # Constant shortcuts for ease of use
 XLPatternNone = getattr(XLPatternType, "None")
@@ -97,6 +109,11 @@ __all__ = [
     "PythonMergeCells",
     "DataValidation",
     "DataValidations",
+    "DefinedNames",
+    "Template",
+    "ConditionalFormatBatch",
+    "GroupBy",
+    "GroupResult",
     "Table",
     "PageMargins",
     "PrintOptions",
@@ -110,6 +127,8 @@ __all__ = [
     "XLStreamWriter",
     "load_workbook",
     "load_workbook_async",
+    "concat_sheets",
+    "concat_sheets_async",
     "Font",
     "Fill",
     "Alignment",
@@ -161,6 +180,8 @@ __all__ = [
     "XLBorders",
     "XLNumberFormat",
     "XLNumberFormats",
+    "XLNumberFormatCategory",
+    "XLStyleTable",
     "XLCellReference",
     "XLCellRange",
     "XLDateTime",
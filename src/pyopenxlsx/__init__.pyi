@@ -44,8 +44,14 @@ from .workbook import (
     Workbook as Workbook,
     load_workbook as load_workbook,
     load_workbook_async as load_workbook_async,
+    concat_sheets as concat_sheets,
+    concat_sheets_async as concat_sheets_async,
 )
 from .merge import MergeCells as MergeCells
+from .defined_names import DefinedNames as DefinedNames
+from .template import Template as Template
+from .conditional_formatting import ConditionalFormatBatch as ConditionalFormatBatch
+from .aggregation import GroupBy as GroupBy, GroupResult as GroupResult
 
 XLPatternNone: XLPatternType
 XLPatternSolid: XLPatternType
@@ -64,6 +70,11 @@ __all__ = [
     "Workbook",
     "Worksheet",
     "MergeCells",
+    "DefinedNames",
+    "Template",
+    "ConditionalFormatBatch",
+    "GroupBy",
+    "GroupResult",
     "Formula",
     "FormulaEngine",
     "Cell",
@@ -71,6 +82,8 @@ __all__ = [
     "Column",
     "load_workbook",
     "load_workbook_async",
+    "concat_sheets",
+    "concat_sheets_async",
     "Font",
     "Fill",
     "Alignment",
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any, List, Union, overload, Iterator, Optional, Iterable
+from typing import Any, Dict, List, Tuple, Union, overload, Iterator, Optional, Iterable
 import datetime
 
 __version__: str
@@ -267,6 +267,16 @@ class XLDefinedNames:
     def __getitem__(self, name: str) -> XLDefinedName: ...
     def __iter__(self) -> Iterator[XLDefinedName]: ...
 
+class XLDefinedNameIndex:
+    def __init__(self, workbook: XLWorkbook) -> None: ...
+    def __len__(self) -> int: ...
+    def get(self, name: str, local_sheet_id: Optional[int] = None) -> XLDefinedName: ...
+    def resolve(self, name: str, local_sheet_id: Optional[int] = None) -> XLDefinedName: ...
+    def append(
+        self, name: str, formula: str, local_sheet_id: Optional[int] = None
+    ) -> XLDefinedName: ...
+    def remove(self, name: str, local_sheet_id: Optional[int] = None) -> bool: ...
+
 class XLDataValidation:
     def empty(self) -> bool: ...
     def sqref(self) -> str: ...
@@ -557,6 +567,41 @@ class XLStyles:
     def cell_formats(self) -> XLCellFormats: ...
     def number_formats(self) -> XLNumberFormats: ...
 
+class XLNumberFormatCategory(Enum):
+    General: int
+    Number: int
+    Currency: int
+    Percent: int
+    Scientific: int
+    Fraction: int
+    Date: int
+    Time: int
+    DateTime: int
+    Text: int
+
+class XLStyleTable:
+    def __init__(self, styles: XLStyles) -> None: ...
+    def __len__(self) -> int: ...
+    def number_format_id(self, xf: int) -> int: ...
+    def font_index(self, xf: int) -> int: ...
+    def fill_index(self, xf: int) -> int: ...
+    def border_index(self, xf: int) -> int: ...
+    def category(self, xf: int) -> XLNumberFormatCategory: ...
+    def is_date(self, xf: int) -> bool: ...
+    def format_code(self, xf: int) -> str: ...
+    @property
+    def number_format_ids(self) -> Any: ...
+    @property
+    def font_indices(self) -> Any: ...
+    @property
+    def fill_indices(self) -> Any: ...
+    @property
+    def border_indices(self) -> Any: ...
+    @property
+    def categories(self) -> Any: ...
+    @property
+    def date_mask(self) -> Any: ...
+
 class ImageInfo:
     @property
     def name(self) -> str: ...
@@ -565,6 +610,23 @@ class ImageInfo:
     @property
     def extension(self) -> str: ...
 
+class XLArchiveEntryStream:
+    @property
+    def name(self) -> str: ...
+    @property
+    def closed(self) -> bool: ...
+    def read(self, size: int = -1) -> bytes: ...
+    def readinto(self, buffer: Any) -> int: ...
+    def tell(self) -> int: ...
+    def readable(self) -> bool: ...
+    def seekable(self) -> bool: ...
+    def writable(self) -> bool: ...
+    def __iter__(self) -> XLArchiveEntryStream: ...
+    def __next__(self) -> bytes: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> XLArchiveEntryStream: ...
+    def __exit__(self, exc_type: Any = None, exc_value: Any = None, traceback: Any = None) -> None: ...
+
 class XLProperties:
     @overload
     def set_property(self, name: str, value: str) -> None: ...
@@ -596,6 +658,10 @@ class XLWorkbook:
     def add_worksheet(self, name: str) -> XLWorksheet: ...
     def delete_sheet(self, name: str) -> None: ...
     def clone_sheet(self, existingName: str, newName: str) -> None: ...
+    def import_sheet(self, source: XLWorksheet, name: str) -> XLWorksheet: ...
+    def read_named_ranges(
+        self, index: XLDefinedNameIndex, names: List[str]
+    ) -> Dict[str, List[List[Any]]]: ...
     def sheet_count(self) -> int: ...
     def worksheet_names(self) -> List[str]: ...
     def sheet_exists(self, name: str) -> bool: ...
@@ -859,6 +925,15 @@ class XLAutoFilter:
     def set_ref(self, ref: str) -> None: ...
     def filter_column(self, col_id: int) -> XLFilterColumn: ...
 
+class XLHyperlinkIndex:
+    def __init__(self, worksheet: XLWorksheet) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, ref: str) -> bool: ...
+    def get(self, ref: str) -> str: ...
+    def set(self, ref: str, target: str) -> None: ...
+    def update(self, links: List[Tuple[str, str, str, bool]]) -> None: ...
+    def remove(self, ref: str) -> bool: ...
+
 class XLWorksheet:
     def name(self) -> str: ...
     def set_name(self, name: str) -> None: ...
@@ -901,6 +976,7 @@ class XLWorksheet:
     def has_hyperlink(self, cellRef: str) -> bool: ...
     def get_hyperlink(self, cellRef: str) -> str: ...
     def remove_hyperlink(self, cellRef: str) -> None: ...
+    def add_hyperlinks(self, links: List[Tuple[str, str, str, bool]]) -> int: ...
     def data_validations(self) -> XLDataValidations: ...
     def tables(self) -> XLTables: ...
     @overload
@@ -926,8 +1002,11 @@ class XLWorksheet:
     def delete_row(self, row_number: int, count: int) -> bool: ...
     def insert_column(self, col_number: int, count: int = 1) -> bool: ...
     def delete_column(self, col_number: int, count: int = 1) -> bool: ...
+    def shift_rows(self, deleted: List[int], inserted: List[Tuple[int, int]]) -> None: ...
+    def shift_columns(self, deleted: List[int], inserted: List[Tuple[int, int]]) -> None: ...
     def column_format(self, column: str) -> int: ...
     def merges(self) -> XLMergeCells: ...
+    def append_merges(self, references: List[str]) -> None: ...
     @overload
     def set_column_format(self, column: str, cellFormatIndex: int) -> None: ...
     @overload
@@ -984,10 +1063,28 @@ class XLWorksheet:
         width: int,
         height: int,
     ) -> None: ...
-    def get_rows_data(self) -> List[List[Any]]: ...
-    def get_row_values(self, row: int) -> List[Any]: ...
+    def get_rows_data(
+        self,
+        convert_dates: bool = False,
+        formatted: bool = False,
+        style_table: Optional[XLStyleTable] = None,
+    ) -> List[List[Any]]: ...
+    def get_row_values(
+        self,
+        row: int,
+        convert_dates: bool = False,
+        formatted: bool = False,
+        style_table: Optional[XLStyleTable] = None,
+    ) -> List[Any]: ...
     def get_range_data(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
+        formatted: bool = False,
+        style_table: Optional[XLStyleTable] = None,
     ) -> List[List[Any]]: ...
     def get_cell_value(self, row: int, col: int) -> Any: ...
     def iter_row_values(self) -> RowValuesIterator: ...
@@ -995,6 +1092,34 @@ class XLWorksheet:
     def get_range_values(
         self, start_row: int, start_col: int, end_row: int, end_col: int
     ) -> Any: ...
+    def group_by(
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        key_cols: List[int],
+        value_cols: List[int],
+        funcs: List[str],
+        filters: List[Tuple[int, str, Any]] = ...,
+        sort: bool = True,
+        target: Optional[XLWorksheet] = None,
+        target_row: int = 1,
+        target_col: int = 1,
+        header: List[str] = ...,
+    ) -> Tuple[List[List[Any]], Any]: ...
+    def get_range_datetimes(
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        style_table: Optional[XLStyleTable] = None,
+    ) -> Any: ...
+    def get_range_styles(
+        self, start_row: int, start_col: int, end_row: int, end_col: int
+    ) -> Any: ...
+    def set_range_styles(self, start_row: int, start_col: int, styles: Any) -> None: ...
     def set_cell_value(self, row: int, col: int, value: Any) -> None: ...
     def write_rows_data(
         self, start_row: int, start_col: int, rows: List[List[Any]]
@@ -1004,7 +1129,20 @@ class XLWorksheet:
     def add_chart(
         self, type: Any, name: str, row: int, col: int, width: int, height: int
     ) -> Any: ...
-    def add_pivot_table(self, options: XLPivotTableOptions) -> None: ...
+    def add_images(self, images: List[Tuple[Union[bytes, str], int, int, int, int]]) -> List[str]: ...
+    def add_charts(
+        self,
+        types: List[XLChartType],
+        names: List[str],
+        anchors: List[Tuple[int, int, int, int]],
+        titles: List[str],
+        series: List[List[Tuple[str, str, str]]],
+    ) -> List[Any]: ...
+    def add_pivot_table(self, options: XLPivotTableOptions) -> XLPivotTable: ...
+    def compute_pivot_table(
+        self, pivot_table: XLPivotTable, options: XLPivotTableOptions
+    ) -> str: ...
+    def pivot_table_locations(self) -> List[Tuple[str, str, int, int, int]]: ...
     def add_table_slicer(
         self,
         cell_reference: str,
@@ -1022,6 +1160,13 @@ class XLWorksheet:
     def stream_writer(self) -> Any: ...
     def stream_reader(self) -> Any: ...
     def auto_fit_column(self, col: int) -> None: ...
+    def auto_fit_columns(
+        self, columns: List[int], sample_rows: int = 0, max_width: float = 255.0
+    ) -> List[Tuple[int, float]]: ...
+    def set_column_widths(self, columns: List[int], widths: List[float]) -> None: ...
+    def set_row_heights(self, rows: List[int], heights: List[float]) -> None: ...
+    def set_row_outline_levels(self, rows: List[int], levels: List[int]) -> None: ...
+    def set_rows_hidden(self, rows: List[int], hidden: bool = True) -> None: ...
     def apply_auto_filter(self) -> None: ...
     def set_print_area(self, sqref: str) -> None: ...
     def set_print_title_rows(self, start: int, end: int) -> None: ...
@@ -1030,7 +1175,16 @@ class XLWorksheet:
         self, location: str, data_range: str, type: XLSparklineType = ...
     ) -> None: ...
     def add_comment(self, cell_ref: str, text: str, author: str) -> None: ...
+    def add_comments(
+        self, comments: List[Tuple[str, str, str]], shared_shape: bool = False
+    ) -> int: ...
     def add_conditional_formatting(self, sqref: str, rule: XLCfRule) -> None: ...
+    def add_data_validations(
+        self, sqrefs: List[str], configs: List[XLDataValidationConfig]
+    ) -> int: ...
+    def add_conditional_formats(
+        self, sqrefs: List[str], rules: List[XLCfRule], dxfs: List[Optional[Any]]
+    ) -> int: ...
     def remove_conditional_formatting(self, sqref: str) -> None: ...
     def clear_all_conditional_formatting(self) -> None: ...
     def page_margins(self) -> XLPageMargins: ...
@@ -1053,6 +1207,17 @@ class XLMergeCells:
     def delete_merge(self, rangeRef: str) -> None: ...
     def __getitem__(self, index: int) -> str: ...
 
+class XLMergeIndex:
+    def __init__(self, merges: XLMergeCells) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, reference: str) -> None: ...
+    def add_many(self, references: List[str]) -> None: ...
+    def remove(self, reference: str) -> bool: ...
+    def covering(self, row: int, column: int) -> Optional[str]: ...
+    def intersecting(
+        self, first_row: int, first_column: int, last_row: int, last_column: int
+    ) -> List[str]: ...
+
 class XLCellReference:
     @overload
     def __init__(self, address: str) -> None: ...
@@ -1066,6 +1231,8 @@ class XLCellRange:
     def address(self) -> str: ...
     def num_rows(self) -> int: ...
     def num_columns(self) -> int: ...
+    def top_left(self) -> XLCellReference: ...
+    def bottom_right(self) -> XLCellReference: ...
     def clear(self) -> None: ...
     def __iter__(self) -> Iterator[XLCell]: ...
 
@@ -1154,12 +1321,31 @@ class XLPersons:
     def person(self, id: str) -> XLPerson: ...
     def add_person(self, display_name: str) -> str: ...
 
+class XLMemoryArchive:
+    @overload
+    def __init__(self) -> None: ...
+    @overload
+    def __init__(self, data: Union[bytes, bytearray, memoryview], password: str = "") -> None: ...
+    @staticmethod
+    def load(path: str, password: str = "") -> XLMemoryArchive: ...
+    @staticmethod
+    def map(path: str, password: str = "") -> XLMemoryArchive: ...
+    @property
+    def name(self) -> str: ...
+    @property
+    def size(self) -> int: ...
+    def to_bytes(self, password: str = "") -> bytes: ...
+    def write(self, path: str, force_overwrite: bool = True, password: str = "") -> None: ...
+    def stored_entry(self, path: str) -> Optional[memoryview]: ...
+
 class XLDocument:
     @overload
     def __init__(self) -> None: ...
     @overload
     def __init__(self, path: str) -> None: ...
     @overload
+    def __init__(self, archive: XLMemoryArchive) -> None: ...
+    @overload
     def open(self, path: str) -> None: ...
     @overload
     def open(self, path: str, password: str) -> None: ...
@@ -1190,6 +1376,15 @@ class XLDocument:
     def styles(self) -> XLStyles: ...
     def get_embedded_images(self) -> List[ImageInfo]: ...
     def get_image_data(self, image_path: str) -> bytes: ...
+    def extract_images(self, output_dir: str, workers: int = 1, dedup: bool = False) -> List[str]: ...
+    def open_entry_stream(
+        self,
+        path: str,
+        chunk_size: int = 65536,
+        from_file: bool = True,
+        archive: Optional[XLMemoryArchive] = None,
+    ) -> XLArchiveEntryStream: ...
+    def add_archive_entry_from_file(self, path: str, file_path: str) -> None: ...
     def get_archive_entries(self) -> List[str]: ...
     def has_archive_entry(self, path: str) -> bool: ...
     def get_archive_entry(self, path: str) -> bytes: ...
@@ -1459,3 +1654,24 @@ class XLStreamWriter:
     def close(self) -> None: ...
     def __enter__(self) -> XLStreamWriter: ...
     def __exit__(self, type: Any, value: Any, traceback: Any) -> None: ...
+
+def concat_sheets(
+    paths: List[str],
+    output: str,
+    sheet: str = "",
+    output_sheet: str = "",
+    header_first: bool = True,
+    source_column: str = "",
+    workers: int = 0,
+) -> int: ...
+class XLWorkbookTemplate:
+    def __init__(self, package: Any) -> None: ...
+    @property
+    def fields(self) -> List[str]: ...
+    @property
+    def blocks(self) -> Dict[str, List[str]]: ...
+    def render(self, data: Any) -> bytes: ...
+    def render_to(self, data: Any, path: str) -> None: ...
+    def render_many(self, datas: Iterable[Any], paths: List[str], workers: int = 0) -> None: ...
+
+def comment_box_size(text: str) -> Tuple[int, int]: ...
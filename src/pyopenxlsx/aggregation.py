@@ -0,0 +1,191 @@
+import math
+
+from ._openxlsx import XLCellReference
+from .merge import _parse_bounds
+
+_FUNCS = ("sum", "count", "mean", "min", "max", "product", "distinct")
+_OPS = ("==", "!=", "<", "<=", ">", ">=")
+
+
+class GroupBy:
+    """
+    Groups the rows of a worksheet range and aggregates them natively.
+
+    The range is read, filtered, hashed and aggregated in C++ with the GIL
+    released, so no Python object is created per cell. The result is either
+    returned as arrays or written straight to a target sheet.
+
+    Example::
+
+        totals = (
+            ws.group_by("Region", "Product")
+            .where("Year", ">=", 2023)
+            .agg(revenue=("Amount", "sum"), orders=("Order", "count"))
+        )
+        df = totals.to_dataframe()
+    """
+
+    __slots__ = ("_bounds", "_filters", "_header", "_keys", "_names", "_worksheet")
+
+    def __init__(self, worksheet, keys, ref=None, header=True):
+        """
+        :param worksheet: The Worksheet holding the data
+        :param keys: Key columns, as header names, column letters or 1-based numbers
+        :param ref: Range to group, e.g. "A1:F5000". Defaults to the used range.
+        :param header: Whether the first row of the range holds column names
+        """
+        if ref is None:
+            last = XLCellReference(max(worksheet.max_row, 1), max(worksheet.max_column, 1))
+            ref = f"A1:{last.address()}"
+        self._worksheet = worksheet
+        self._bounds = _parse_bounds(ref)
+        self._header = header
+        first_row, first_col, _, last_col = self._bounds
+        self._names = (
+            worksheet.get_range_data(first_row, first_col, first_row, last_col)[0]
+            if header
+            else []
+        )
+        self._keys = [self._column(key) for key in keys]
+        self._filters = []
+
+    def where(self, column, op, value):
+        """
+        Only keep the rows whose `column` value compares to `value`.
+
+        Ordering comparisons only match values of the same kind (numbers with
+        numbers, text with text); text compares case-insensitively.
+
+        :param column: Header name, column letter or 1-based column number
+        :param op: One of "==", "!=", "<", "<=", ">", ">="
+        :param value: Value to compare with
+        :return: self, so calls can be chained
+        """
+        if op not in _OPS:
+            raise ValueError(f"Unknown filter operator {op!r}; expected one of {_OPS}")
+        self._filters.append((self._column(column), op, value))
+        return self
+
+    def agg(self, *specs, target=None, target_cell="A1", header=True, sort=True, **named):
+        """
+        Aggregate the groups.
+
+        :param specs: (column, func) pairs, named "<column>_<func>" in the result
+        :param named: name=(column, func) pairs. func is one of "sum", "count",
+            "mean", "min", "max", "product" or "distinct" (count of distinct values).
+        :param target: Optional Worksheet to write the result to
+        :param target_cell: Top-left cell of the written result
+        :param header: Write the key and aggregate names above the written result
+        :param sort: Order the groups by their keys (Excel's sort order) instead
+            of by first appearance
+        :return: A GroupResult
+        """
+        names, columns, funcs = [], [], []
+        for name, spec in [(None, spec) for spec in specs] + list(named.items()):
+            try:
+                column, func = spec
+            except (TypeError, ValueError):
+                raise ValueError(f"Aggregation {spec!r} must be a (column, func) pair") from None
+            func = str(func).lower()
+            if func not in _FUNCS:
+                raise ValueError(f"Unknown aggregation {func!r}; expected one of {_FUNCS}")
+            names.append(name if name is not None else f"{column}_{func}")
+            columns.append(self._column(column))
+            funcs.append(func)
+
+        key_names = [self._label(col) for col in self._keys]
+        first_row, first_col, last_row, last_col = self._bounds
+        if self._header:
+            first_row += 1
+        kwargs = {}
+        if target is not None:
+            cell = XLCellReference(target_cell.replace("$", "").upper())
+            kwargs = {
+                "target": target._sheet,
+                "target_row": cell.row(),
+                "target_col": cell.column(),
+                "header": [str(name) for name in key_names + names] if header else [],
+            }
+        if first_row > last_row:
+            import numpy as np
+
+            if kwargs.get("header"):
+                target.write_row(kwargs["target_row"], kwargs["header"], kwargs["target_col"])
+            return GroupResult(key_names, [], names, np.empty((0, len(funcs))))
+        keys, values = self._worksheet._sheet.group_by(
+            first_row, first_col, last_row, last_col, self._keys, columns, funcs,
+            self._filters, sort, **kwargs
+        )
+        return GroupResult(key_names, [tuple(key) for key in keys], names, values)
+
+    def _column(self, column):
+        if isinstance(column, str):
+            if column in self._names:
+                col = self._bounds[1] + self._names.index(column)
+            else:
+                col = _column_letters_number(column)
+        else:
+            col = int(column)
+        if not self._bounds[1] <= col <= self._bounds[3]:
+            raise ValueError(f"Column {column!r} is not part of the grouped range")
+        return col
+
+    def _label(self, col):
+        if self._header:
+            name = self._names[col - self._bounds[1]]
+            if name is not None:
+                return name
+        return XLCellReference(1, col).address()[:-1]
+
+
+class GroupResult:
+    """
+    The result of GroupBy.agg().
+
+    `keys` holds one tuple of key values per group and `values` a float64 array
+    of shape (groups, aggregates), NaN where a group had nothing to aggregate
+    (e.g. the mean of a text-only column).
+    """
+
+    __slots__ = ("key_names", "keys", "names", "values")
+
+    def __init__(self, key_names, keys, names, values):
+        self.key_names = key_names
+        self.keys = keys
+        self.names = names
+        self.values = values
+
+    def __len__(self):
+        return len(self.keys)
+
+    def to_rows(self):
+        """
+        Return the result as a list of rows, keys first, with None for NaN.
+        """
+        return [
+            list(key) + [None if math.isnan(value) else value for value in row]
+            for key, row in zip(self.keys, self.values.tolist())
+        ]
+
+    def to_dataframe(self):
+        """
+        Return the result as a pandas DataFrame indexed by the key columns.
+        """
+        import pandas as pd  # type: ignore
+
+        if len(self.key_names) == 1:
+            index = pd.Index([key[0] for key in self.keys], name=self.key_names[0])
+        elif self.key_names:
+            index = pd.MultiIndex.from_tuples(self.keys, names=self.key_names)
+        else:
+            index = None
+        return pd.DataFrame(self.values, index=index, columns=self.names)
+
+
+def _column_letters_number(letters):
+    number = 0
+    for ch in letters.upper():
+        if not "A" <= ch <= "Z":
+            raise ValueError(f"Unknown column {letters!r}")
+        number = number * 26 + (ord(ch) - ord("A") + 1)
+    return number
@@ -0,0 +1,32 @@
+from typing import Any, List, Optional, Tuple, Union
+
+class GroupBy:
+    def __init__(
+        self,
+        worksheet: Any,
+        keys: Tuple[Union[str, int], ...],
+        ref: Optional[str] = None,
+        header: bool = True,
+    ) -> None: ...
+    def where(self, column: Union[str, int], op: str, value: Any) -> "GroupBy": ...
+    def agg(
+        self,
+        *specs: Tuple[Union[str, int], str],
+        target: Optional[Any] = None,
+        target_cell: str = "A1",
+        header: bool = True,
+        sort: bool = True,
+        **named: Tuple[Union[str, int], str],
+    ) -> "GroupResult": ...
+
+class GroupResult:
+    key_names: List[Any]
+    keys: List[Tuple[Any, ...]]
+    names: List[str]
+    values: Any
+    def __init__(
+        self, key_names: List[Any], keys: List[Tuple[Any, ...]], names: List[str], values: Any
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def to_rows(self) -> List[List[Any]]: ...
+    def to_dataframe(self) -> Any: ...
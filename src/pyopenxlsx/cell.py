@@ -1,5 +1,5 @@
+from ._openxlsx import comment_box_size
 from .formula import Formula
-from .styles import is_date_format
 from datetime import datetime, date, timedelta
 from weakref import ref as weakref
 
@@ -71,33 +71,8 @@ class Cell:
             comments.delete_comment(addr)
         else:
             val_str = str(value)
-
-            # --- Auto-size Logic ---
-            try:
-                # Estimate dimensions based on text content
-                lines = val_str.split("\n")
-                line_count = len(lines)
-
-                # More accurate width estimation: count chars, giving more weight to non-ASCII
-                def content_width(s):
-                    return sum(2 if ord(c) > 127 else 1 for c in s)
-
-                max_width = max(content_width(line) for line in lines) if lines else 0
-
-                # Heuristic settings:
-                # Average column width handles ~10-12 units of content_width
-                col_span = max(3, int(max_width / 10) + 1)
-                if col_span > 12:
-                    col_span = 12  # Moderate cap for width
-
-                # Average row height handles 1 line of text
-                row_span = line_count + 1
-                if row_span < 3:
-                    row_span = 3  # Minimum height
-
-                comments.set(addr, val_str, 0, col_span, row_span)
-            except Exception:
-                comments.set(addr, val_str)
+            col_span, row_span = comment_box_size(val_str)
+            comments.set(addr, val_str, 0, col_span, row_span)
 
     @property
     def value(self):
@@ -146,22 +121,24 @@ class Cell:
     def font(self):
         if self._workbook is None:
             return None
-        cf = self._workbook.styles.cell_formats().cell_format_by_index(self.style_index)
-        return self._workbook.styles.fonts().font_by_index(cf.font_index())
+        table = self._workbook._style_table_for(self.style_index)
+        return self._workbook.styles.fonts().font_by_index(table.font_index(self.style_index))
 
     @property
     def fill(self):
         if self._workbook is None:
             return None
-        cf = self._workbook.styles.cell_formats().cell_format_by_index(self.style_index)
-        return self._workbook.styles.fills().fill_by_index(cf.fill_index())
+        table = self._workbook._style_table_for(self.style_index)
+        return self._workbook.styles.fills().fill_by_index(table.fill_index(self.style_index))
 
     @property
     def border(self):
         if self._workbook is None:
             return None
-        cf = self._workbook.styles.cell_formats().cell_format_by_index(self.style_index)
-        return self._workbook.styles.borders().border_by_index(cf.border_index())
+        table = self._workbook._style_table_for(self.style_index)
+        return self._workbook.styles.borders().border_by_index(
+            table.border_index(self.style_index)
+        )
 
     @property
     def alignment(self):
@@ -182,36 +159,4 @@ class Cell:
         style_idx = self.style_index
         if style_idx < 0:
             return False
-
-        # Check cache
-        if style_idx in self._workbook._date_format_cache:
-            return self._workbook._date_format_cache[style_idx]
-
-        # Get styles from workbook
-        styles = self._workbook.styles
-        cfs = styles.cell_formats()
-        if style_idx >= cfs.count():
-            self._workbook._date_format_cache[style_idx] = False
-            return False
-
-        cf = cfs.cell_format_by_index(style_idx)
-        nf_id = cf.number_format_id()
-
-        # Check standard formats
-        if is_date_format(nf_id):
-            self._workbook._date_format_cache[style_idx] = True
-            return True
-
-        # Check custom formats via string
-        nfs = styles.number_formats()
-        try:
-            val = nfs.number_format_by_id(nf_id)
-            if val:
-                res = is_date_format(val.format_code())
-                self._workbook._date_format_cache[style_idx] = res
-                return res
-        except Exception:
-            pass
-
-        self._workbook._date_format_cache[style_idx] = False
-        return False
+        return self._workbook._style_table_for(style_idx).is_date(style_idx)
@@ -0,0 +1,128 @@
+from ._openxlsx import XLCellReference, XLChartType
+
+# Hidden sheet that holds the series data written by add_chart_from_arrays()
+_DATA_SHEET = "_chart_data"
+_MAX_COLUMNS = 16384
+
+_CHART_TYPES = {name.lower(): member for name, member in XLChartType.__members__.items()}
+
+
+def add_charts_from_arrays(worksheet, charts):
+    """
+    Create charts from in-memory data.
+
+    The data of every chart is written in one bulk call to a hidden sheet
+    shared by the workbook, one column block per chart (x values first, then
+    one column per series, with the series names in the first row). The
+    charts are then created in a single native pass over the sheet drawing.
+
+    :param worksheet: The Worksheet that gets the charts
+    :param charts: Iterable of dicts with the arguments of
+        Worksheet.add_chart_from_arrays()
+    :return: List of XLChart objects, in order
+    """
+    specs = [_ChartSpec(**chart) for chart in charts]
+    if not specs:
+        return []
+
+    wb = worksheet._workbook
+    if _DATA_SHEET in wb:
+        sheet = wb[_DATA_SHEET]
+        first_col = sheet.max_column + 1 if sheet.max_row > 0 else 1
+    else:
+        sheet = wb.create_sheet(_DATA_SHEET)
+        sheet.sheet_state = "hidden"
+        first_col = 1
+
+    columns = []
+    series = []
+    for spec in specs:
+        col = first_col + len(columns)
+        categories_ref = ""
+        if spec.x is not None:
+            columns.append([None] + spec.x)
+            categories_ref = _column_ref(col, 2, len(spec.x) + 1)
+            col += 1
+        chart_series = []
+        for i, ys in enumerate(spec.ys):
+            name = spec.names[i] if spec.names is not None else None
+            columns.append([name] + ys)
+            title = _column_ref(col + i, 1, 1) if name is not None else ""
+            chart_series.append((_column_ref(col + i, 2, len(ys) + 1), title, categories_ref))
+        series.append(chart_series)
+
+    height = max(len(column) for column in columns)
+    rows = [
+        [column[r] if r < len(column) else None for column in columns] for r in range(height)
+    ]
+    last_col = first_col + len(columns) - 1
+    if last_col > _MAX_COLUMNS:
+        raise ValueError("Chart data does not fit on the hidden data sheet")
+    sheet.write_rows(1, rows, start_col=first_col)
+
+    return worksheet._sheet.add_charts(
+        [spec.chart_type for spec in specs],
+        [spec.name for spec in specs],
+        [spec.anchor for spec in specs],
+        [spec.title for spec in specs],
+        series,
+    )
+
+
+class _ChartSpec:
+    __slots__ = ("anchor", "chart_type", "name", "names", "title", "x", "ys")
+
+    def __init__(
+        self,
+        chart_type,
+        ys,
+        x=None,
+        names=None,
+        anchor="A1",
+        width=480,
+        height=288,
+        title=None,
+        name=None,
+    ):
+        if isinstance(chart_type, str):
+            try:
+                chart_type = _CHART_TYPES[chart_type.replace("_", "").lower()]
+            except KeyError:
+                raise ValueError(f"Unknown chart type {chart_type!r}") from None
+        self.chart_type = chart_type
+
+        ys = _to_list(ys)
+        if not ys or not _is_sequence(ys[0]):
+            ys = [ys]
+        self.ys = [_to_list(values) for values in ys]
+        if not all(self.ys):
+            raise ValueError("Every series needs at least one value")
+        self.x = _to_list(x) if x is not None else None
+        if names is not None:
+            names = [str(n) for n in ([names] if isinstance(names, str) else names)]
+            if len(names) != len(self.ys):
+                raise ValueError(f"Got {len(names)} names for {len(self.ys)} series")
+        self.names = names
+
+        ref = XLCellReference(anchor.replace("$", "").upper())
+        self.anchor = (ref.row(), ref.column(), int(width), int(height))
+        self.title = title or ""
+        self.name = name or title or "Chart"
+
+
+def _is_sequence(value):
+    # A series is any sized, non-text value: a list, tuple, 1-D array, ...
+    return hasattr(value, "__len__") and not isinstance(value, (str, bytes))
+
+
+def _to_list(values):
+    # numpy arrays (and their rows) become plain lists for the bulk writer
+    tolist = getattr(values, "tolist", None)
+    return tolist() if tolist is not None else list(values)
+
+
+def _column_ref(col, first_row, last_row):
+    letters = XLCellReference(1, col).address()[:-1]
+    if first_row == last_row:
+        return f"'{_DATA_SHEET}'!${letters}${first_row}"
+    return f"'{_DATA_SHEET}'!${letters}${first_row}:${letters}${last_row}"
@@ -0,0 +1,3 @@
+from typing import Any, Dict, Iterable, List
+
+def add_charts_from_arrays(worksheet: Any, charts: Iterable[Dict[str, Any]]) -> List[Any]: ...
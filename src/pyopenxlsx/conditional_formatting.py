@@ -0,0 +1,64 @@
+class ConditionalFormatBatch:
+    """
+    Collects conditional formatting rules and writes them in one native pass.
+
+    Identical rules are merged into a single multi-range block and identical
+    dxfs share one differential format, which keeps the sheet XML small when
+    thousands of rules are added (e.g. one per flagged row).
+
+    Example::
+
+        with ws.conditional_format_batch() as batch:
+            for row in flagged_rows:
+                batch.add(f"A{row}:F{row}", XLCellIsRule(">", "100"), red)
+    """
+
+    __slots__ = ("_worksheet", "_sqrefs", "_rules", "_dxfs")
+
+    def __init__(self, worksheet):
+        self._worksheet = worksheet
+        self._sqrefs = []
+        self._rules = []
+        self._dxfs = []
+
+    def add(self, sqref, rule, dxf=None):
+        """
+        Queue a rule for the given range.
+
+        :param sqref: Range reference, e.g. "A1:D10" (space-separated for several ranges)
+        :param rule: An XLCfRule, e.g. from XLCellIsRule() or XLFormulaRule()
+        :param dxf: Optional XLDxf with the formatting to apply when the rule matches
+        :return: self, so calls can be chained
+        """
+        if rule is None:
+            raise ValueError("rule must not be None")
+        self._sqrefs.append(str(sqref))
+        self._rules.append(rule)
+        self._dxfs.append(dxf)
+        return self
+
+    def __len__(self):
+        return len(self._sqrefs)
+
+    def commit(self):
+        """
+        Write every queued rule to the worksheet and clear the batch.
+
+        :return: Number of rules written after merging
+        """
+        if not self._sqrefs:
+            return 0
+        written = self._worksheet._sheet.add_conditional_formats(
+            self._sqrefs, self._rules, self._dxfs
+        )
+        self._sqrefs = []
+        self._rules = []
+        self._dxfs = []
+        return written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
@@ -0,0 +1,11 @@
+from typing import Any, Optional
+
+class ConditionalFormatBatch:
+    def __init__(self, worksheet: Any) -> None: ...
+    def add(
+        self, sqref: str, rule: Any, dxf: Optional[Any] = None
+    ) -> "ConditionalFormatBatch": ...
+    def __len__(self) -> int: ...
+    def commit(self) -> int: ...
+    def __enter__(self) -> "ConditionalFormatBatch": ...
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None: ...
@@ -4,8 +4,36 @@ from ._openxlsx import (
     XLDataValidationOperator,
     XLDataValidationErrorStyle,
     XLDataValidationConfig,
+    XLCellReference,
 )
 
+# Excel rejects inline list formulas ("a,b,c" with the quotes) longer than this
+_MAX_INLINE_LIST = 255
+# Hidden sheet that holds list sources written by DataValidations.add_many()
+_LIST_SHEET = "_lists"
+
+_TYPES = {
+    "none": getattr(XLDataValidationType, "None"),
+    "custom": XLDataValidationType.Custom,
+    "date": XLDataValidationType.Date,
+    "decimal": XLDataValidationType.Decimal,
+    "list": XLDataValidationType.List,
+    "text_length": XLDataValidationType.TextLength,
+    "time": XLDataValidationType.Time,
+    "whole": XLDataValidationType.Whole,
+}
+
+_OPERATORS = {
+    "between": XLDataValidationOperator.Between,
+    "equal": XLDataValidationOperator.Equal,
+    "greater_than": XLDataValidationOperator.GreaterThan,
+    "greater_than_or_equal": XLDataValidationOperator.GreaterThanOrEqual,
+    "less_than": XLDataValidationOperator.LessThan,
+    "less_than_or_equal": XLDataValidationOperator.LessThanOrEqual,
+    "not_between": XLDataValidationOperator.NotBetween,
+    "not_equal": XLDataValidationOperator.NotEqual,
+}
+
 
 class DataValidation:
     """
@@ -227,58 +255,82 @@ class DataValidations:
         """
         Convenience method to add a data validation rule.
         """
-        config = XLDataValidationConfig()
-        # Mapping for type
-        types = {
-            "none": getattr(XLDataValidationType, "None"),
-            "custom": XLDataValidationType.Custom,
-            "date": XLDataValidationType.Date,
-            "decimal": XLDataValidationType.Decimal,
-            "list": XLDataValidationType.List,
-            "text_length": XLDataValidationType.TextLength,
-            "time": XLDataValidationType.Time,
-            "whole": XLDataValidationType.Whole,
-        }
-        config.type = types.get(type.lower(), getattr(XLDataValidationType, "None"))
-
-        # Mapping for operator
-        ops = {
-            "between": XLDataValidationOperator.Between,
-            "equal": XLDataValidationOperator.Equal,
-            "greater_than": XLDataValidationOperator.GreaterThan,
-            "greater_than_or_equal": XLDataValidationOperator.GreaterThanOrEqual,
-            "less_than": XLDataValidationOperator.LessThan,
-            "less_than_or_equal": XLDataValidationOperator.LessThanOrEqual,
-            "not_between": XLDataValidationOperator.NotBetween,
-            "not_equal": XLDataValidationOperator.NotEqual,
-        }
-        config.operator_ = ops.get(operator.lower(), XLDataValidationOperator.Between)  # type: ignore
-
-        config.formula1 = str(formula1)
-        config.formula2 = str(formula2)
-
-        # Handle optional kwargs
-        if "allow_blank" in kwargs:
-            config.allow_blank = bool(kwargs["allow_blank"])
-        if "show_drop_down" in kwargs:
-            config.show_drop_down = bool(kwargs["show_drop_down"])
-        if "show_input_message" in kwargs:
-            config.show_input_message = bool(kwargs["show_input_message"])
-        if "show_error_message" in kwargs:
-            config.show_error_message = bool(kwargs["show_error_message"])
-        if "prompt_title" in kwargs:
-            config.prompt_title = str(kwargs["prompt_title"])
-        if "prompt" in kwargs:
-            config.prompt = str(kwargs["prompt"])
-        if "error_title" in kwargs:
-            config.error_title = str(kwargs["error_title"])
-        if "error" in kwargs:
-            config.error = str(kwargs["error"])
-
+        config = _make_config(type, operator, formula1, formula2, **kwargs)
         return DataValidation(
             self._dvs.add_validation(config, str(sqref)), self._worksheet
         )
 
+    def add_many(self, entries):
+        """
+        Add many validation rules in one native pass.
+
+        Entries with identical configs become a single rule whose sqref is
+        the union of their ranges, coalesced and normalized (e.g. one
+        dropdown per row over A2:A5000 becomes one rule on "A2:A5000").
+
+        Each config is an XLDataValidationConfig or a dict of add_validation()
+        keyword arguments. A dict may give ``items=[...]`` for a dropdown
+        list; lists too long for Excel's 255-character inline limit (or
+        containing commas) are written to the hidden "_lists" sheet and
+        referenced from there, with identical lists sharing one column.
+
+        :param entries: Iterable of (sqref, config) pairs
+        :return: Number of validation rules written
+        """
+        ws = self._worksheet
+        sqrefs = []
+        configs = []
+        built = {}  # id(dict) -> (dict, config); the dict is kept so its id isn't reused
+        lists = {}
+        for sqref, config in entries:
+            if isinstance(config, dict):
+                cached = built.get(id(config))
+                if cached is None:
+                    cached = built[id(config)] = (
+                        config,
+                        self._config_from_dict(config, lists),
+                    )
+                config = cached[1]
+            elif not isinstance(config, XLDataValidationConfig):
+                raise TypeError("config must be an XLDataValidationConfig or a dict")
+            sqrefs.append(str(sqref))
+            configs.append(config)
+        if not sqrefs:
+            return 0
+        return ws._sheet.add_data_validations(sqrefs, configs)
+
+    def _config_from_dict(self, options, lists):
+        options = dict(options)
+        items = options.pop("items", None)
+        if items is not None:
+            options["type"] = "list"
+            options["formula1"] = self._list_formula([str(i) for i in items], lists)
+            options.setdefault("allow_blank", True)
+        return _make_config(**options)
+
+    def _list_formula(self, items, lists):
+        inline = '"' + ",".join(i.replace('"', '""') for i in items) + '"'
+        if len(inline) <= _MAX_INLINE_LIST and not any("," in i for i in items):
+            return inline
+        key = tuple(items)
+        if key not in lists:
+            lists[key] = self._write_list_source(items)
+        return lists[key]
+
+    def _write_list_source(self, items):
+        # One column per distinct list on a hidden sheet shared by the workbook
+        wb = self._worksheet._workbook
+        if _LIST_SHEET in wb:
+            sheet = wb[_LIST_SHEET]
+            col = sheet.max_column + 1 if sheet.max_row > 0 else 1
+        else:
+            sheet = wb.create_sheet(_LIST_SHEET)
+            sheet.sheet_state = "hidden"
+            col = 1
+        sheet.write_rows(1, [[i] for i in items], start_col=col)
+        letters = XLCellReference(1, col).address()[:-1]
+        return f"'{_LIST_SHEET}'!${letters}$1:${letters}${len(items)}"
+
     def remove(self, index_or_sqref):
         """Remove a data validation rule by index or sqref."""
         if isinstance(index_or_sqref, int):
@@ -289,3 +341,30 @@ class DataValidations:
     def clear(self):
         """Clear all data validation rules."""
         self._dvs.clear()
+
+
+def _make_config(type="none", operator="between", formula1="", formula2="", **kwargs):
+    config = XLDataValidationConfig()
+    config.type = _TYPES.get(type.lower(), getattr(XLDataValidationType, "None"))
+    config.operator_ = _OPERATORS.get(operator.lower(), XLDataValidationOperator.Between)  # type: ignore
+    config.formula1 = str(formula1)
+    config.formula2 = str(formula2)
+
+    # Handle optional kwargs
+    if "allow_blank" in kwargs:
+        config.allow_blank = bool(kwargs["allow_blank"])
+    if "show_drop_down" in kwargs:
+        config.show_drop_down = bool(kwargs["show_drop_down"])
+    if "show_input_message" in kwargs:
+        config.show_input_message = bool(kwargs["show_input_message"])
+    if "show_error_message" in kwargs:
+        config.show_error_message = bool(kwargs["show_error_message"])
+    if "prompt_title" in kwargs:
+        config.prompt_title = str(kwargs["prompt_title"])
+    if "prompt" in kwargs:
+        config.prompt = str(kwargs["prompt"])
+    if "error_title" in kwargs:
+        config.error_title = str(kwargs["error_title"])
+    if "error" in kwargs:
+        config.error = str(kwargs["error"])
+    return config
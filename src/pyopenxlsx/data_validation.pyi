@@ -1,7 +1,8 @@
-from typing import Any, List, Union, Optional, Iterator
+from typing import Any, Dict, Iterable, List, Union, Optional, Iterator, Tuple
 from ._openxlsx import (
     XLDataValidationType,
     XLDataValidationOperator,
+    XLDataValidationConfig,
 )
 
 class DataValidation:
@@ -64,5 +65,9 @@ class DataValidations:
         formula2: str = ...,
         **kwargs: Any,
     ) -> DataValidation: ...
+    def add_many(
+        self,
+        entries: Iterable[Tuple[str, Union[XLDataValidationConfig, Dict[str, Any]]]],
+    ) -> int: ...
     def remove(self, index_or_sqref: Union[int, str]) -> None: ...
     def clear(self) -> None: ...
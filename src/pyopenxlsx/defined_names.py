@@ -0,0 +1,69 @@
+from ._openxlsx import XLDefinedNameIndex
+
+
+class DefinedNames:
+    """
+    Collection of defined names (named ranges) of a workbook.
+
+    Names are compared case-insensitively, as in Excel. Lookups go through a
+    native hash index that is built on first use and kept in sync by
+    ``append`` and ``remove``; names added or removed through the raw
+    ``XLDefinedNames`` are not seen by it. A name is global, or local to the
+    sheet at 0-based position ``local_sheet_id``.
+    """
+
+    def __init__(self, raw_workbook):
+        self._wb = raw_workbook
+        self._names = raw_workbook.defined_names()
+        self._index = None
+
+    def __len__(self):
+        return self._names.count()
+
+    def count(self):
+        return len(self)
+
+    def __iter__(self):
+        return iter(self._names.all())
+
+    def all(self):
+        return self._names.all()
+
+    def __contains__(self, name):
+        return self.exists(name)
+
+    def __getitem__(self, name):
+        dn = self.get(name)
+        if not dn.valid():
+            raise KeyError(f"Defined name '{name}' not found")
+        return dn
+
+    def append(self, name, formula, local_sheet_id=None):
+        """Add a name referring to ``formula`` (e.g. ``"Sheet1!$A$1:$B$3"``)."""
+        return self._get_index().append(name, formula, local_sheet_id)
+
+    def remove(self, name, local_sheet_id=None):
+        """Remove the name in exactly this scope; returns whether one was removed."""
+        return self._get_index().remove(name, local_sheet_id)
+
+    def get(self, name, local_sheet_id=None):
+        """
+        Return the name in exactly this scope (global when ``local_sheet_id``
+        is None). The result's ``valid()`` is False when there is no such name.
+        """
+        return self._get_index().get(name, local_sheet_id)
+
+    def exists(self, name, local_sheet_id=None):
+        return self.get(name, local_sheet_id).valid()
+
+    def resolve(self, name, local_sheet_id=None):
+        """
+        Return the name as seen from the sheet at ``local_sheet_id``: the name
+        local to that sheet if there is one, otherwise the global name.
+        """
+        return self._get_index().resolve(name, local_sheet_id)
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = XLDefinedNameIndex(self._wb)
+        return self._index
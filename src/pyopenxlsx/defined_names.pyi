@@ -0,0 +1,18 @@
+from typing import Iterator, List, Optional
+from ._openxlsx import XLDefinedName, XLWorkbook
+
+class DefinedNames:
+    def __init__(self, raw_workbook: XLWorkbook) -> None: ...
+    def __len__(self) -> int: ...
+    def count(self) -> int: ...
+    def __iter__(self) -> Iterator[XLDefinedName]: ...
+    def all(self) -> List[XLDefinedName]: ...
+    def __contains__(self, name: str) -> bool: ...
+    def __getitem__(self, name: str) -> XLDefinedName: ...
+    def append(
+        self, name: str, formula: str, local_sheet_id: Optional[int] = None
+    ) -> XLDefinedName: ...
+    def remove(self, name: str, local_sheet_id: Optional[int] = None) -> bool: ...
+    def get(self, name: str, local_sheet_id: Optional[int] = None) -> XLDefinedName: ...
+    def exists(self, name: str, local_sheet_id: Optional[int] = None) -> bool: ...
+    def resolve(self, name: str, local_sheet_id: Optional[int] = None) -> XLDefinedName: ...
@@ -1,6 +1,19 @@
+from ._openxlsx import XLCellReference, XLMergeIndex
+
+
 class MergeCells:
-    def __init__(self, raw_merges):
+    """
+    Collection of merged ranges of a worksheet.
+
+    Point and area lookups (``covering``, ``intersecting``) go through a native
+    interval tree that is built on first use and kept in sync by ``append``,
+    ``extend`` and ``delete``.
+    """
+
+    def __init__(self, raw_merges, raw_sheet=None):
         self._merges = raw_merges
+        self._sheet = raw_sheet
+        self._index = None
 
     def __len__(self):
         return self._merges.count()
@@ -18,11 +31,74 @@ class MergeCells:
     def append(self, reference):
         """Append a new merged range (e.g. 'A1:B2')."""
         self._merges.append_merge(reference)
+        if self._index is not None:
+            self._index.add(reference)
+
+    def extend(self, references):
+        """
+        Append many merged ranges at once.
+
+        Overlaps (against existing merges and among the new ranges) are checked
+        in O(n log n) before anything is written; a ValueError is raised and no
+        range is added if any two overlap.
+        """
+        references = list(references)
+        if not references:
+            return
+        if self._sheet is not None:
+            self._sheet.append_merges(references)
+        else:
+            for reference in references:
+                self._merges.append_merge(reference)
+        if self._index is not None:
+            self._index.add_many(references)
 
     def delete(self, index):
         """Delete a merged range by index."""
+        reference = self._merges[index]
         self._merges.delete_merge(index)
+        if self._index is not None:
+            self._index.remove(reference)
 
     def find(self, reference):
         """Find index of a merged range. Returns -1 if not found."""
         return self._merges.find_merge(reference)
+
+    def covering(self, row, col):
+        """
+        Return the merged range containing the cell at (row, col), or None.
+        """
+        return self._get_index().covering(row, col)
+
+    def intersecting(self, reference):
+        """
+        Return the merged ranges that intersect a range, ordered by top-left cell.
+
+        :param reference: Range address such as 'A1:D10', or a Range object
+        """
+        if hasattr(reference, "bounds"):
+            first_row, first_col, last_row, last_col = reference.bounds
+        else:
+            first_row, first_col, last_row, last_col = _parse_bounds(reference)
+        return self._get_index().intersecting(first_row, first_col, last_row, last_col)
+
+    def _get_index(self):
+        # The count check catches merges changed through another wrapper
+        if self._index is None or len(self._index) != len(self):
+            self._index = XLMergeIndex(self._merges)
+        return self._index
+
+    def _invalidate(self):
+        self._index = None
+
+
+def _parse_bounds(reference):
+    first, _, last = reference.replace("$", "").upper().partition(":")
+    top_left = XLCellReference(first)
+    bottom_right = XLCellReference(last) if last else top_left
+    return (
+        top_left.row(),
+        top_left.column(),
+        bottom_right.row(),
+        bottom_right.column(),
+    )
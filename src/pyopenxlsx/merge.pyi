@@ -1,12 +1,18 @@
-from typing import Iterator
-from ._openxlsx import XLMergeCells
+from typing import Iterable, Iterator, List, Optional, Union
+from ._openxlsx import XLMergeCells, XLWorksheet
+from .range import Range
 
 class MergeCells:
-    def __init__(self, raw_merges: XLMergeCells) -> None: ...
+    def __init__(
+        self, raw_merges: XLMergeCells, raw_sheet: Optional[XLWorksheet] = None
+    ) -> None: ...
     def __len__(self) -> int: ...
     def __getitem__(self, index: int) -> str: ...
     def __iter__(self) -> Iterator[str]: ...
     def __contains__(self, item: str) -> bool: ...
     def append(self, reference: str) -> None: ...
+    def extend(self, references: Iterable[str]) -> None: ...
     def delete(self, index: int) -> None: ...
     def find(self, reference: str) -> int: ...
+    def covering(self, row: int, col: int) -> Optional[str]: ...
+    def intersecting(self, reference: Union[str, Range]) -> List[str]: ...
@@ -42,6 +42,159 @@ class Range:
     def num_columns(self):
         return self._range.num_columns()
 
+    @property
+    def bounds(self):
+        """
+        The range corners as a 1-based ``(min_row, min_col, max_row, max_col)`` tuple.
+        """
+        top_left = self._range.top_left()
+        bottom_right = self._range.bottom_right()
+        return (
+            top_left.row(),
+            top_left.column(),
+            bottom_right.row(),
+            bottom_right.column(),
+        )
+
+    @property
+    def values(self):
+        """
+        All cell values of the range as ``list[list[Any]]``.
+
+        Read in a single native pass without creating Cell objects.
+        Empty cells are returned as None.
+        """
+        ws = self._worksheet
+        if ws is None:
+            flat = [Cell(c).value for c in self._range]
+            ncols = self.num_columns
+            return [flat[i : i + ncols] for i in range(0, len(flat), ncols)]
+        return ws._sheet.get_range_data(*self.bounds)
+
+    @values.setter
+    def values(self, data):
+        self.assign(data)
+
+    def to_numpy(self, dtype=float):
+        """
+        Read the range into a 2D numpy array.
+
+        Numeric and boolean dtypes are filled natively (non-numeric cells
+        become 0). Any other dtype (e.g. ``object`` or ``str``) is built from
+        :attr:`values`.
+
+        :param dtype: Target numpy dtype, defaults to float64
+        :return: numpy.ndarray with shape ``(num_rows, num_columns)``
+        """
+        import numpy as np
+
+        dtype = np.dtype(dtype)
+        ws = self._worksheet
+        if dtype.kind in "fiub" and ws is not None:
+            arr = ws._sheet.get_range_values(*self.bounds)
+            return arr if dtype == arr.dtype else arr.astype(dtype)
+        if dtype.kind in "fiub":
+            rows = [
+                [v if isinstance(v, (int, float)) else 0 for v in row]
+                for row in self.values
+            ]
+            return np.array(rows, dtype=dtype).reshape(self.num_rows, self.num_columns)
+        return np.array(self.values, dtype=dtype).reshape(
+            self.num_rows, self.num_columns
+        )
+
+    async def to_numpy_async(self, dtype=float):
+        return await asyncio.to_thread(self.to_numpy, dtype)
+
+    def assign(self, data):
+        """
+        Write values into the range in a single native pass.
+
+        :param data: A 2D numpy array, a sequence of row sequences, or a
+            scalar that is broadcast to every cell. A 1D array or sequence is
+            accepted for single-row and single-column ranges.
+        :raises ValueError: If the shape of ``data`` does not match the range.
+        """
+        nrows, ncols = self.num_rows, self.num_columns
+        ws = self._worksheet
+
+        if hasattr(data, "ndim") and hasattr(data, "dtype"):
+            import numpy as np
+
+            if data.ndim == 1 and data.size == nrows * ncols and 1 in (nrows, ncols):
+                data = data.reshape(nrows, ncols)
+            if data.ndim != 2 or data.shape != (nrows, ncols):
+                raise ValueError(
+                    f"Array of shape {data.shape} does not match range "
+                    f"{self.address} of shape {(nrows, ncols)}"
+                )
+            kind = data.dtype.kind
+            if ws is not None and kind in "fiub":
+                target = np.float64 if kind == "f" else np.int64 if kind in "iu" else np.bool_
+                min_row, min_col = self.bounds[:2]
+                ws._sheet.write_range_data(
+                    min_row, min_col, np.ascontiguousarray(data, dtype=target)
+                )
+                return
+            rows = data.tolist()
+        elif isinstance(data, (list, tuple)):
+            rows = [list(row) if isinstance(row, (list, tuple)) else [row] for row in data]
+            if nrows == 1 and len(rows) == ncols and all(len(r) == 1 for r in rows):
+                rows = [[r[0] for r in rows]]
+        else:
+            rows = [[data] * ncols for _ in range(nrows)]
+
+        if len(rows) != nrows or any(len(row) != ncols for row in rows):
+            raise ValueError(
+                f"Data does not match range {self.address} of shape {(nrows, ncols)}"
+            )
+
+        if ws is None:
+            flat = [v for row in rows for v in row]
+            for c, v in zip(self._range, flat):
+                Cell(c).value = v
+            return
+        min_row, min_col = self.bounds[:2]
+        ws._sheet.write_rows_data(min_row, min_col, rows)
+
+    async def assign_async(self, data):
+        await asyncio.to_thread(self.assign, data)
+
+    @property
+    def styles(self):
+        """
+        Style indices of all cells in the range as a 2D ``uint32`` numpy array.
+
+        Cells without an explicit style report index 0.
+        """
+        ws = self._worksheet
+        if ws is None:
+            import numpy as np
+
+            flat = [c.cell_format() for c in self._range]
+            return np.array(flat, dtype=np.uint32).reshape(
+                self.num_rows, self.num_columns
+            )
+        return ws._sheet.get_range_styles(*self.bounds)
+
+    @styles.setter
+    def styles(self, styles):
+        """
+        Apply style indices to the range; a scalar, a per-column vector, a
+        ``(rows, 1)`` per-row array or a full 2D array (numpy broadcasting).
+        """
+        ws = self._worksheet
+        if ws is None:
+            import numpy as np
+
+            grid = np.broadcast_to(
+                np.asarray(styles), (self.num_rows, self.num_columns)
+            ).ravel()
+            for c, s in zip(self._range, grid):
+                c.set_cell_format(int(s))
+            return
+        ws.set_range_styles(*self.bounds, styles)
+
     def clear(self):
         self._range.clear()
 
@@ -1,4 +1,4 @@
-from typing import Any, Iterator, Optional
+from typing import Any, Iterator, List, Optional, Tuple
 from ._openxlsx import XLCellRange
 from .cell import Cell
 
@@ -14,5 +14,19 @@ class Range:
     def num_rows(self) -> int: ...
     @property
     def num_columns(self) -> int: ...
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]: ...
+    @property
+    def values(self) -> List[List[Any]]: ...
+    @values.setter
+    def values(self, data: Any) -> None: ...
+    def to_numpy(self, dtype: Any = ...) -> Any: ...
+    async def to_numpy_async(self, dtype: Any = ...) -> Any: ...
+    def assign(self, data: Any) -> None: ...
+    async def assign_async(self, data: Any) -> None: ...
+    @property
+    def styles(self) -> Any: ...
+    @styles.setter
+    def styles(self, styles: Any) -> None: ...
     def clear(self) -> None: ...
     async def clear_async(self) -> None: ...
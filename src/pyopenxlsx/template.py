@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+from ._openxlsx import XLWorkbookTemplate
+from .workbook import _read_source
+
+
+class Template:
+    """
+    A template workbook that is parsed once and rendered many times.
+
+    Text cells holding ``{{name}}`` placeholders are filled from a mapping. A
+    cell holding nothing but one placeholder takes the value with its type
+    (numbers, booleans, dates and text; None leaves it blank), so the
+    template cell's number format applies; in longer text, and in page headers
+    and footers, the value's ``str()`` is substituted. Rows with
+    ``{{block.field}}`` placeholders repeat once per item of ``data["block"]``
+    (a list of mappings; an empty list leaves one blank copy) and the rows
+    below move down; formulas, merged cells, conditional formats, data
+    validations, hyperlinks, tables and defined names follow, and ranges over
+    the template rows grow over all copies.
+
+    Only the worksheets with placeholders are kept parsed; every other part
+    of the package is copied to the output as it is stored in the template.
+    Formulas are recalculated when the rendered workbook is opened. Rendering
+    runs without the GIL, so threads render in parallel, and a Template can be
+    pickled to hand it to worker processes.
+    """
+
+    def __init__(self, source):
+        """
+        :param source: Path of the template file, its bytes, or a binary file object
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                data = f.read()
+        else:
+            data = bytes(_read_source(source))
+        self._data = data
+        self._template = XLWorkbookTemplate(data)
+
+    @property
+    def fields(self):
+        """Names of the ``{{name}}`` placeholders, in order of first use."""
+        return list(self._template.fields)
+
+    @property
+    def blocks(self):
+        """Repeating blocks, each with the names of its item fields."""
+        return self._template.blocks
+
+    def render(self, data, output=None):
+        """
+        Fill the template with ``data``.
+
+        :param data: Mapping with a value for every field and a list of
+            mappings for every block
+        :param output: Path or binary file object to write to; None to return
+            the package bytes
+        :return: The package bytes when ``output`` is None
+        """
+        if output is None:
+            return self._template.render(data)
+        if isinstance(output, (str, os.PathLike)):
+            self._template.render_to(data, os.fspath(output))
+            return None
+        output.write(self._template.render(data))
+        return None
+
+    async def render_async(self, data, output=None):
+        return await asyncio.to_thread(self.render, data, output)
+
+    def render_many(self, data, outputs, workers=None):
+        """
+        Render ``data[i]`` into the file ``outputs[i]`` on native threads.
+
+        :param data: Sequence of mappings, as for ``render``
+        :param outputs: Paths of the files to write, one per mapping
+        :param workers: Number of threads; the core count (at most 8) by default
+        """
+        data = list(data)
+        outputs = [os.fspath(output) for output in outputs]
+        if len(data) != len(outputs):
+            raise ValueError("Expected one output per mapping")
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._template.render_many(data, outputs, workers or 0)
+
+    async def render_many_async(self, data, outputs, workers=None):
+        return await asyncio.to_thread(self.render_many, data, outputs, workers)
+
+    def __reduce__(self):
+        return (Template, (self._data,))
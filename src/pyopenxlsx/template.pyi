@@ -0,0 +1,30 @@
+import os
+from typing import Any, BinaryIO, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+class Template:
+    def __init__(
+        self, source: Union[str, os.PathLike[str], bytes, bytearray, memoryview, BinaryIO]
+    ) -> None: ...
+    @property
+    def fields(self) -> List[str]: ...
+    @property
+    def blocks(self) -> Dict[str, List[str]]: ...
+    def render(
+        self, data: Mapping[str, Any], output: Union[str, os.PathLike[str], BinaryIO, None] = None
+    ) -> Optional[bytes]: ...
+    async def render_async(
+        self, data: Mapping[str, Any], output: Union[str, os.PathLike[str], BinaryIO, None] = None
+    ) -> Optional[bytes]: ...
+    def render_many(
+        self,
+        data: Iterable[Mapping[str, Any]],
+        outputs: Sequence[Union[str, os.PathLike[str]]],
+        workers: Optional[int] = None,
+    ) -> None: ...
+    async def render_many_async(
+        self,
+        data: Iterable[Mapping[str, Any]],
+        outputs: Sequence[Union[str, os.PathLike[str]]],
+        workers: Optional[int] = None,
+    ) -> None: ...
+    def __reduce__(self) -> Any: ...
@@ -6,6 +6,7 @@ from weakref import WeakValueDictionary
 from . import _openxlsx
 from ._openxlsx import XLProperty, XLLineStyle, XLPatternType
 from .worksheet import Worksheet
+from .defined_names import DefinedNames
 from .styles import Style
 
 
@@ -173,29 +174,53 @@ class Workbook:
     of Worksheet objects when they are no longer referenced elsewhere.
     """
 
-    def __init__(self, filename=None, force_overwrite=True, password=None):
-        self._doc = _openxlsx.XLDocument()
+    def __init__(self, filename=None, force_overwrite=True, password=None, mmap=False):
+        """
+        :param filename: Path of the workbook to open, or its contents as a
+            bytes-like object or a binary file object (e.g. ``io.BytesIO``).
+            A new workbook is created when None.
+        :param force_overwrite: Kept for compatibility; new workbooks are created in memory
+        :param password: Password of an encrypted workbook
+        :param mmap: Read the file through a memory mapping instead of copying it;
+            stored (uncompressed) parts are then returned as zero-copy memoryviews
+        """
         self._temp_file = None  # Track temp file for cleanup
-        if filename:
-            if password is not None:
-                self._doc.open(str(filename), password)
-            else:
-                self._doc.open(str(filename))
+        self._spool_files = []  # Parts written by write_archive_entry(), until saved
+        self._written_entries = set()
+        self._archive = None  # In-memory archive of workbooks not backed by a file
+        self._password = None
+        if filename is None:
+            # New workbooks live in memory until they are saved
+            self._archive = _openxlsx.XLMemoryArchive()
+            self._doc = _openxlsx.XLDocument(self._archive)
+            self._doc.create(self._archive.name, True)
+            self._filename = None
+        elif isinstance(filename, (bytes, bytearray, memoryview)) or hasattr(filename, "read"):
+            data = _read_source(filename)
+            self._archive = _openxlsx.XLMemoryArchive(data, password or "")
+            self._doc = _openxlsx.XLDocument(self._archive)
+            self._doc.open(self._archive.name)
+            self._filename = None
+            self._password = password
+        elif mmap or password is not None:
+            # Encrypted workbooks are decrypted in memory, never to a temporary file
+            load = _openxlsx.XLMemoryArchive.map if mmap else _openxlsx.XLMemoryArchive.load
+            self._archive = load(str(filename), password or "")
+            self._doc = _openxlsx.XLDocument(self._archive)
+            self._doc.open(self._archive.name)
             self._filename = str(filename)
+            self._password = password
         else:
-            # Use a temporary file to avoid polluting the current directory
-            # OpenXLSX's create() writes to disk immediately
-            fd, temp_path = tempfile.mkstemp(suffix=".xlsx", prefix="pyopenxlsx_")
-            os.close(fd)  # Close the file descriptor, XLDocument will manage the file
-            self._temp_file = temp_path
-            self._doc.create(temp_path, force_overwrite)
-            self._filename = None
+            self._doc = _openxlsx.XLDocument()
+            self._doc.open(str(filename))
+            self._filename = str(filename)
         self._wb = self._doc.workbook()
         # Use WeakValueDictionary to avoid keeping Worksheet objects alive indefinitely
         # Worksheets will be garbage collected when no external references remain
         self._sheets = WeakValueDictionary()
         self._styles = None
-        self._date_format_cache = {}
+        self._style_table = None
+        self._defined_names = None
 
     @property
     def has_macro(self):
@@ -203,25 +228,100 @@ class Workbook:
         return self._doc.has_macro()
 
     def save(self, filename=None, force_overwrite=True, password=None):
-        if filename:
-            if password is not None:
-                self._doc.save_as(str(filename), force_overwrite, password)
-            else:
-                self._doc.save_as(str(filename), force_overwrite)
+        """
+        Save the workbook.
+
+        :param filename: Path to save to, or a binary file object to write the
+            package to. Defaults to the path the workbook was opened from.
+        :param force_overwrite: Overwrite an existing file
+        :param password: Encrypt the saved workbook with this password
+        """
+        if filename is not None and hasattr(filename, "write"):
+            filename.write(self.to_bytes(password=password))
+            return
+        if self._archive is not None:
+            filename = filename or self._filename
+            if not filename:
+                raise ValueError("No filename specified")
+            self._commit()
+            self._archive.write(str(filename), force_overwrite, self._save_password(password))
+            return
+        if password is not None:
+            filename = filename or self._filename
+            if not filename:
+                raise ValueError("No filename specified")
+            # Encrypted natively, from the package read back into memory
+            archive = _openxlsx.XLMemoryArchive.load(self._save_temp())
+            archive.write(str(filename), force_overwrite, password)
+        elif filename:
+            self._doc.save_as(str(filename), force_overwrite)
         elif self._filename:
-            # OpenXLSX's save() doesn't take a password, but save_as does
-            if password is not None:
-                self._doc.save_as(self._filename, force_overwrite, password)
-            else:
-                self._doc.save()
+            # to_bytes() may have moved the document to a temporary file
+            self._doc.save_as(self._filename, True)
         else:
             raise ValueError("No filename specified")
+        self._release_spool()
+
+    def to_bytes(self, password=None):
+        """
+        Return the workbook package as bytes.
+
+        Workbooks created in memory or loaded from bytes or a file object are
+        serialized straight into the returned bytes object, without temporary
+        files. Workbooks opened from a path are written through a temporary
+        copy, which is removed when the workbook is closed.
+
+        :param password: Encrypt the package with this password
+        :return: bytes
+        """
+        if self._archive is not None:
+            self._commit()
+            return self._archive.to_bytes(self._save_password(password))
+        path = self._save_temp()
+        if password is not None:
+            return _openxlsx.XLMemoryArchive.load(path).to_bytes(password)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _save_temp(self):
+        # Writes a path-backed document to its temporary copy and returns the copy's path
+        if self._temp_file is None:
+            fd, self._temp_file = tempfile.mkstemp(suffix=".xlsx", prefix="pyopenxlsx_")
+            os.close(fd)
+        self._doc.save_as(self._temp_file, True)
+        self._release_spool()
+        return self._temp_file
+
+    async def to_bytes_async(self, password=None):
+        """Async version of to_bytes."""
+        return await asyncio.to_thread(self.to_bytes, password)
+
+    def _commit(self):
+        # Serializes the document into its in-memory archive
+        self._doc.save_as(self._archive.name, True)
+        self._release_spool()
+
+    def _release_spool(self):
+        # Once saved, the parts streamed by write_archive_entry() live in the package
+        for path in self._spool_files:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._spool_files.clear()
+
+    def _save_password(self, password):
+        # Workbooks loaded with a password stay encrypted, like file-backed ones
+        if password is None:
+            password = self._password
+        return password or ""
 
     async def save_async(self, filename=None, force_overwrite=True, password=None):
         await asyncio.to_thread(self.save, filename, force_overwrite, password)
 
     def close(self):
         self._doc.close()
+        self._release_spool()
         # Clean up temporary file if it was created
         if self._temp_file and os.path.exists(self._temp_file):
             try:
@@ -251,12 +351,54 @@ class Workbook:
             self._styles = self._doc.styles()
         return self._styles
 
+    @property
+    def style_table(self):
+        """
+        Per-style lookup table (``XLStyleTable``) resolved once from the styles.
+
+        Maps each style index to its number format id and code, format category,
+        date flag and font/fill/border indices, both per index and as numpy
+        arrays. It is rebuilt after ``add_style()``.
+        """
+        if self._style_table is None:
+            self._style_table = _openxlsx.XLStyleTable(self.styles)
+        return self._style_table
+
+    def _style_table_for(self, style_index):
+        # Formats created through the raw XLStyles API are picked up on first use
+        table = self.style_table
+        if style_index >= len(table) and style_index < self.styles.cell_formats().count():
+            table = self._style_table = _openxlsx.XLStyleTable(self.styles)
+        return table
+
     @property
     def defined_names(self):
         """
         Access the collection of defined names (named ranges) in the workbook.
         """
-        return self._wb.defined_names()
+        if self._defined_names is None:
+            self._defined_names = DefinedNames(self._wb)
+        return self._defined_names
+
+    def read_named_ranges(self, names):
+        """
+        Read the values of many named ranges at once.
+
+        The names are resolved through the hashed name index and their ranges
+        grouped by sheet; each sheet is then read in a single native pass with
+        the GIL released. ``"Sheet2!Total"`` reads the name local to Sheet2,
+        falling back to the global ``Total``.
+
+        :param names: Iterable of defined names
+        :return: dict mapping each name to its values as a list of rows
+        :raises KeyError: For unknown names or sheets
+        :raises ValueError: For names that do not refer to a single cell range
+        """
+        names = list(names)
+        return self._wb.read_named_ranges(self.defined_names._get_index(), names)
+
+    async def read_named_ranges_async(self, names):
+        return await asyncio.to_thread(self.read_named_ranges, list(names))
 
     @property
     def properties(self):
@@ -293,6 +435,7 @@ class Workbook:
             protection = style_obj.protection
 
         # Create a new cell format entry (default)
+        self._style_table = None
         index = self.styles.cell_formats().create()
         xf = self.styles.cell_formats().cell_format_by_index(index)
 
@@ -501,6 +644,34 @@ class Workbook:
     async def copy_worksheet_async(self, from_worksheet):
         return await asyncio.to_thread(self.copy_worksheet, from_worksheet)
 
+    def import_sheet(self, source, name=None):
+        """
+        Copy a worksheet of another open workbook into this one as a new sheet.
+
+        Cell values and formulas, merged ranges, column and row dimensions,
+        data validations, conditional formats and hyperlinks are copied in one
+        native pass over the sheet XML. Cell formats are matched by content:
+        a format that already exists here is reused, and each distinct new
+        one is added once. Drawings, images, comments and tables are not
+        copied.
+
+        :param source: Worksheet to copy, from any workbook
+        :param name: Title of the new sheet; defaults to the source's title
+        :return: The new Worksheet
+        """
+        if not isinstance(source, Worksheet):
+            raise TypeError("Must be a Worksheet object")
+        if name is None:
+            name = source.title
+        if name in self.sheetnames:
+            raise ValueError(f"Worksheet {name} already exists")
+        self.workbook.import_sheet(source._sheet, name)
+        self._style_table = None
+        return self[name]
+
+    async def import_sheet_async(self, source, name=None):
+        return await asyncio.to_thread(self.import_sheet, source, name)
+
     @property
     def sheetnames(self):
         return list(self.workbook.worksheet_names())
@@ -561,13 +732,81 @@ class Workbook:
             path: Path in the archive (e.g., 'xl/workbook.xml').
 
         Returns:
-            bytes: The raw binary data of the entry.
+            bytes: The raw binary data of the entry; a read-only memoryview into
+            the file for stored (uncompressed) entries of a workbook opened with
+            ``mmap=True``.
 
         Raises:
             RuntimeError: If the entry is not found in the archive.
         """
+        view = self._stored_entry(path)
+        if view is not None:
+            return view
         return self._doc.get_archive_entry(path)
 
+    def open_archive_entry(self, path, chunk_size=65536):
+        """
+        Open an entry of the underlying zip archive for reading in chunks.
+
+        The entry is inflated as it is read, with the GIL released, so large
+        parts such as ``xl/sharedStrings.xml`` can be hashed, searched or
+        forwarded in constant memory. The reader has its own handle on the
+        workbook file, so the workbook can be saved while it is open; parts
+        that only exist in memory (written or added since the last save) are
+        inflated into a buffer when the reader is opened.
+
+        Args:
+            path: Path in the archive (e.g., 'xl/worksheets/sheet1.xml').
+            chunk_size: Size of the chunks yielded when iterating the reader.
+
+        Returns:
+            A binary file-like reader with ``read(n)``, ``readinto(buffer)``,
+            ``tell()`` and ``close()``; iterating it yields ``bytes`` chunks.
+
+        Raises:
+            RuntimeError: If the entry is not found in the archive.
+
+        Example:
+            >>> with wb.open_archive_entry("xl/sharedStrings.xml") as f:
+            ...     digest = hashlib.file_digest(f, "sha256")
+        """
+        return self._doc.open_entry_stream(
+            path, chunk_size, path not in self._written_entries, self._archive
+        )
+
+    def write_archive_entry(self, path, chunks):
+        """
+        Write an entry of the underlying zip archive from an iterable of bytes.
+
+        The chunks are spooled to a temporary file and compressed into the
+        package when the workbook is saved, so custom parts of any size are
+        written in constant memory. Registering a content type or relationship
+        for the part is up to the caller.
+
+        Args:
+            path: Path in the archive (e.g., 'customXml/item1.xml').
+            chunks: Iterable of bytes-like objects, or a single one.
+
+        Raises:
+            ValueError: If `path` is a part the package already had; those are
+                written back by the document on save.
+        """
+        if path not in self._written_entries and self._doc.has_archive_entry(path):
+            raise ValueError(f"Archive entry already exists: {path}")
+        if isinstance(chunks, (bytes, bytearray, memoryview)):
+            chunks = (chunks,)
+        fd, spool = tempfile.mkstemp(suffix=".part", prefix="pyopenxlsx_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            self._doc.add_archive_entry_from_file(path, spool)
+        except BaseException:
+            os.unlink(spool)
+            raise
+        self._spool_files.append(spool)
+        self._written_entries.add(path)
+
     def get_embedded_images(self):
         """
         Get a list of all embedded images in the workbook.
@@ -592,7 +831,8 @@ class Workbook:
                                or just the filename (e.g., 'image1.png')
 
         Returns:
-            bytes: The raw binary data of the image.
+            bytes: The raw binary data of the image (a read-only memoryview for
+            stored images of a workbook opened with ``mmap=True``).
 
         Raises:
             RuntimeError: If the image is not found in the archive.
@@ -605,43 +845,83 @@ class Workbook:
             ...     with open("extracted_image.png", "wb") as f:
             ...         f.write(data)
         """
+        path = image_path_or_name
+        if "/" not in path:
+            path = "xl/media/" + path
+        view = self._stored_entry(path)
+        if view is not None:
+            return view
         return self._doc.get_image_data(image_path_or_name)
 
-    def extract_images(self, output_dir):
+    def _stored_entry(self, path):
+        # Zero-copy view of an unchanged stored entry of a memory-mapped workbook
+        if self._archive is None or self._filename is None:
+            return None
+        return self._archive.stored_entry(path)
+
+    def iter_images(self, chunk_size=None):
+        """
+        Iterate over the embedded images without loading them all at once.
+
+        Each media part is visited once, however many drawings reference it.
+
+        Args:
+            chunk_size: When None, yield every image as a whole. Otherwise the
+                        image is decompressed and yielded in chunks of at most
+                        chunk_size bytes, all chunks of one image before the next.
+
+        Yields:
+            tuple[ImageInfo, bytes]: The image and its data (or the next chunk of it).
+
+        Example:
+            >>> sizes = collections.Counter()
+            >>> for img, chunk in wb.iter_images(chunk_size=1 << 20):
+            ...     sizes[img.name] += len(chunk)
+        """
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive number of bytes")
+        for img in self.get_embedded_images():
+            if chunk_size is None:
+                yield img, self._doc.get_archive_entry(img.path)
+                continue
+            with self._doc.open_entry_stream(img.path) as stream:
+                while chunk := stream.read(chunk_size):
+                    yield img, chunk
+
+    def extract_images(self, output_dir, workers=None, dedup=False):
         """
         Extract all embedded images to a directory.
 
+        The images are decompressed and written natively by up to `workers`
+        threads, without passing through Python.
+
         Args:
             output_dir: Directory path where images will be saved.
                        Will be created if it doesn't exist.
+            workers: Number of extraction threads (defaults to the CPU count, at most 8).
+            dedup: Write media parts with identical content only once, under the
+                   name of the first one. Off by default, so every part of
+                   ``get_embedded_images()`` is written under its own name.
 
         Returns:
             list[str]: List of paths to the extracted image files.
 
         Example:
             >>> wb = Workbook("test.xlsx")
-            >>> extracted = wb.extract_images("./images/")
+            >>> extracted = wb.extract_images("./images/", workers=4)
             >>> print(f"Extracted {len(extracted)} images")
         """
-        import os
-
         os.makedirs(output_dir, exist_ok=True)
-
-        images = self.get_embedded_images()
-        extracted_paths = []
-
-        for img in images:
-            data = self.get_image_data(img.path)
-            output_path = os.path.join(output_dir, img.name)
-            with open(output_path, "wb") as f:
-                f.write(data)
-            extracted_paths.append(output_path)
-
-        return extracted_paths
-
-    async def extract_images_async(self, output_dir):
+        if workers is None:
+            workers = min(os.cpu_count() or 1, 8)
+        elif workers < 1:
+            raise ValueError("workers must be at least 1")
+        paths = self._doc.extract_images(os.fspath(output_dir), workers, dedup)
+        return list(dict.fromkeys(paths))
+
+    async def extract_images_async(self, output_dir, workers=None, dedup=False):
         """Async version of extract_images."""
-        return await asyncio.to_thread(self.extract_images, output_dir)
+        return await asyncio.to_thread(self.extract_images, output_dir, workers, dedup)
 
     def __del__(self):
         # Ensure temporary file is cleaned up even if close() was not called
@@ -650,11 +930,74 @@ class Workbook:
                 os.unlink(self._temp_file)
             except (OSError, FileNotFoundError):
                 pass
+        if getattr(self, "_spool_files", None):
+            self._release_spool()
+
+
+def load_workbook(filename, password=None, mmap=False):
+    """
+    Open a workbook from a path, a bytes-like object or a binary file object.
+
+    With ``mmap=True`` a file is read through a memory mapping, see :class:`Workbook`.
+    """
+    return Workbook(filename, password=password, mmap=mmap)
+
+
+def _read_source(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    getbuffer = getattr(source, "getbuffer", None)
+    if getbuffer is not None and source.tell() == 0:
+        # BytesIO: read its buffer without copying
+        return getbuffer()
+    return source.read()
 
 
-def load_workbook(filename, password=None):
-    return Workbook(filename, password=password)
+async def load_workbook_async(filename, password=None, mmap=False):
+    return await asyncio.to_thread(load_workbook, filename, password, mmap)
 
 
-async def load_workbook_async(filename, password=None):
-    return await asyncio.to_thread(load_workbook, filename, password)
+def concat_sheets(paths, sheet, output, header="first", source_column=None, workers=None):
+    """
+    Append the rows of one sheet of many workbook files into a new workbook.
+
+    Every input is read with its stream reader on a native thread and the rows
+    are written, in input order, through a stream writer; values never become
+    Python objects. At most ``workers`` inputs are open at once and only a few
+    thousand rows of each are buffered ahead of the writer. Cell values (the
+    cached results, for formulas) are copied; styles and empty rows are not.
+
+    :param paths: Input workbook files
+    :param sheet: Name of the sheet to read from every input (and the title of
+        the output sheet), or None for the first sheet
+    :param output: Path of the workbook to create; an existing file is replaced
+    :param header: ``"first"`` when the first row of every input is a header,
+        written once from the first input; None to copy every row
+    :param source_column: When given, a column holding the input path is
+        prepended to every row, with this text in the header row
+    :param workers: Number of reader threads; up to 4 by default
+    :return: Number of rows written, the header included
+    """
+    if header not in ("first", None):
+        raise ValueError('header must be "first" or None')
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    paths = [os.fspath(path) for path in paths]
+    for path in paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+    return _openxlsx.concat_sheets(
+        paths,
+        os.fspath(output),
+        sheet=sheet or "",
+        output_sheet=sheet or "",
+        header_first=header == "first",
+        source_column=source_column or "",
+        workers=workers or 0,
+    )
+
+
+async def concat_sheets_async(paths, sheet, output, header="first", source_column=None, workers=None):
+    return await asyncio.to_thread(
+        concat_sheets, paths, sheet, output, header, source_column, workers
+    )
@@ -1,6 +1,15 @@
-from typing import Any, List, Optional, Union, Dict, Iterator
-from ._openxlsx import XLDocument, XLWorkbook, XLStyles, XLProperty, XLDefinedNames
+import os
+from typing import Any, BinaryIO, List, Optional, Union, Dict, Iterable, Iterator, Tuple
+from ._openxlsx import (
+    XLDocument,
+    XLWorkbook,
+    XLStyles,
+    XLStyleTable,
+    XLProperty,
+    XLArchiveEntryStream,
+)
 from .worksheet import Worksheet
+from .defined_names import DefinedNames
 from .styles import Font, Fill, Border, Alignment, Style, Protection
 
 class DocumentProperties:
@@ -53,18 +62,32 @@ class Workbook:
     _sheets: Dict[str, Worksheet]
 
     @property
-    def defined_names(self) -> XLDefinedNames: ...
+    def defined_names(self) -> DefinedNames: ...
+    def read_named_ranges(self, names: Iterable[str]) -> Dict[str, List[List[Any]]]: ...
+    async def read_named_ranges_async(
+        self, names: Iterable[str]
+    ) -> Dict[str, List[List[Any]]]: ...
     def __init__(
-        self, filename: Optional[str] = None, force_overwrite: bool = True
+        self,
+        filename: Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, None] = None,
+        force_overwrite: bool = True,
+        password: Optional[str] = None,
+        mmap: bool = False,
     ) -> None: ...
     @property
     def has_macro(self) -> bool: ...
     def save(
-        self, filename: Optional[str] = None, force_overwrite: bool = True, password: Optional[str] = None
+        self,
+        filename: Union[str, os.PathLike, BinaryIO, None] = None,
+        force_overwrite: bool = True,
+        password: Optional[str] = None,
+        mmap: bool = False,
     ) -> None: ...
     async def save_async(
         self, filename: Optional[str] = None, force_overwrite: bool = True, password: Optional[str] = None
     ) -> None: ...
+    def to_bytes(self, password: Optional[str] = None) -> bytes: ...
+    async def to_bytes_async(self, password: Optional[str] = None) -> bytes: ...
     def close(self) -> None: ...
     async def close_async(self) -> None: ...
     def __enter__(self) -> Workbook: ...
@@ -74,6 +97,8 @@ class Workbook:
     @property
     def styles(self) -> XLStyles: ...
     @property
+    def style_table(self) -> XLStyleTable: ...
+    @property
     def properties(self) -> DocumentProperties: ...
     @property
     def custom_properties(self) -> CustomProperties: ...
@@ -111,6 +136,10 @@ class Workbook:
     async def remove_async(self, worksheet: Worksheet) -> None: ...
     def copy_worksheet(self, from_worksheet: Worksheet) -> Worksheet: ...
     async def copy_worksheet_async(self, from_worksheet: Worksheet) -> Worksheet: ...
+    def import_sheet(self, source: Worksheet, name: Optional[str] = None) -> Worksheet: ...
+    async def import_sheet_async(
+        self, source: Worksheet, name: Optional[str] = None
+    ) -> Worksheet: ...
     @property
     def sheetnames(self) -> List[str]: ...
     def __getitem__(self, key: str) -> Worksheet: ...
@@ -120,11 +149,44 @@ class Workbook:
     def __contains__(self, key: str) -> bool: ...
     def get_archive_entries(self) -> List[str]: ...
     def has_archive_entry(self, path: str) -> bool: ...
-    def get_archive_entry(self, path: str) -> bytes: ...
+    def get_archive_entry(self, path: str) -> Union[bytes, memoryview]: ...
+    def open_archive_entry(self, path: str, chunk_size: int = 65536) -> XLArchiveEntryStream: ...
+    def write_archive_entry(
+        self, path: str, chunks: Union[bytes, bytearray, memoryview, Iterable[Union[bytes, bytearray, memoryview]]]
+    ) -> None: ...
     def get_embedded_images(self) -> List[Any]: ...
-    def get_image_data(self, image_path_or_name: str) -> bytes: ...
-    def extract_images(self, output_dir: str) -> List[str]: ...
-    async def extract_images_async(self, output_dir: str) -> List[str]: ...
+    def get_image_data(self, image_path_or_name: str) -> Union[bytes, memoryview]: ...
+    def iter_images(self, chunk_size: Optional[int] = None) -> Iterator[Tuple[Any, bytes]]: ...
+    def extract_images(
+        self, output_dir: Union[str, os.PathLike], workers: Optional[int] = None, dedup: bool = False
+    ) -> List[str]: ...
+    async def extract_images_async(
+        self, output_dir: Union[str, os.PathLike], workers: Optional[int] = None, dedup: bool = False
+    ) -> List[str]: ...
 
-def load_workbook(filename: str, password: Optional[str] = None) -> Workbook: ...
-async def load_workbook_async(filename: str, password: Optional[str] = None) -> Workbook: ...
+def load_workbook(
+    filename: Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO],
+    password: Optional[str] = None,
+    mmap: bool = False,
+) -> Workbook: ...
+async def load_workbook_async(
+    filename: Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO],
+    password: Optional[str] = None,
+    mmap: bool = False,
+) -> Workbook: ...
+def concat_sheets(
+    paths: Iterable[Union[str, os.PathLike]],
+    sheet: Optional[str],
+    output: Union[str, os.PathLike],
+    header: Optional[str] = "first",
+    source_column: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> int: ...
+async def concat_sheets_async(
+    paths: Iterable[Union[str, os.PathLike]],
+    sheet: Optional[str],
+    output: Union[str, os.PathLike],
+    header: Optional[str] = "first",
+    source_column: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> int: ...
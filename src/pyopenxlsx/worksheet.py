@@ -1,12 +1,15 @@
 import asyncio
 from weakref import WeakValueDictionary
 
-from ._openxlsx import XLSheetState
+from ._openxlsx import XLHyperlinkIndex, XLSheetState
 from .cell import Cell
 from .range import Range
-from .merge import MergeCells
+from .merge import MergeCells, _parse_bounds
 from .column import Column
 from .data_validation import DataValidations
+from .conditional_formatting import ConditionalFormatBatch
+from .aggregation import GroupBy
+from .chart import add_charts_from_arrays
 from .table import Table
 from .autofilter import AutoFilter
 from .page_setup import PageMargins, PrintOptions, PageSetup
@@ -26,6 +29,9 @@ class Worksheet:
         # Use WeakValueDictionary to avoid keeping Cell objects alive indefinitely
         # Cells will be garbage collected when no external references remain
         self._cells = WeakValueDictionary()
+        self._merges = None
+        # Hyperlink lookup index, built on first has_hyperlink/get_hyperlink
+        self._hyperlinks = None
 
     @property
     def title(self):
@@ -144,12 +150,14 @@ class Worksheet:
 
     def merge_cells(self, range_string):
         self._sheet.merge_cells(range_string)
+        self._invalidate_merges()
 
     async def merge_cells_async(self, range_string):
         await asyncio.to_thread(self.merge_cells, range_string)
 
     def unmerge_cells(self, range_string):
         self._sheet.unmerge_cells(range_string)
+        self._invalidate_merges()
 
     async def unmerge_cells_async(self, range_string):
         await asyncio.to_thread(self.unmerge_cells, range_string)
@@ -163,27 +171,140 @@ class Worksheet:
     def set_row_format(self, row, style_index):
         self._sheet.set_row_format(row, style_index)
 
+    def set_column_widths(self, widths):
+        """
+        Set the width of many columns in one native pass.
+
+        :param widths: Mapping (or iterable of pairs) ``{column: width}``; columns
+            may be numbers or letters
+        """
+        items = widths.items() if hasattr(widths, "items") else widths
+        columns, values = [], []
+        for col, width in items:
+            columns.append(_column_number(col))
+            values.append(float(width))
+        _check_bounds(columns, columns=True)
+        self._sheet.set_column_widths(columns, values)
+
+    def set_row_heights(self, heights, start_row=1):
+        """
+        Set the height of many rows in one native pass.
+
+        :param heights: Mapping ``{row: height}``, or a sequence / 1D array of
+            heights for consecutive rows beginning at ``start_row``
+        :param start_row: First row when ``heights`` is a sequence
+        """
+        rows, values = _normalize_row_values(heights, start_row)
+        self._sheet.set_row_heights(rows, [float(v) for v in values])
+
+    def set_row_outline_levels(self, levels, start_row=1):
+        """
+        Set the outline (grouping) level of many rows in one native pass.
+
+        :param levels: Mapping ``{row: level}``, or a sequence / 1D array of
+            levels (0-7) for consecutive rows beginning at ``start_row``.
+            Level 0 removes a row from its group.
+        :param start_row: First row when ``levels`` is a sequence
+        """
+        rows, values = _normalize_row_values(levels, start_row)
+        values = [int(v) for v in values]
+        if any(v < 0 or v > 7 for v in values):
+            raise ValueError("Outline levels must be between 0 and 7")
+        self._sheet.set_row_outline_levels(rows, values)
+
+    def hide_rows(self, indices, hidden=True):
+        """
+        Hide (or, with ``hidden=False``, unhide) many rows in one native pass.
+
+        :param indices: Iterable of 1-based row numbers
+        """
+        self._sheet.set_rows_hidden(_normalize_indices(indices), bool(hidden))
+
     def insert_row(self, row_number, count=1):
         """Insert one or more rows at the given row number (1-based)."""
+        self._invalidate_merges()
+        self._hyperlinks = None
         return self._sheet.insert_row(row_number, count)
 
     def delete_row(self, row_number, count=1):
         """Delete one or more rows starting at the given row number (1-based)."""
+        self._invalidate_merges()
+        self._hyperlinks = None
         if count == 1:
             return self._sheet.delete_row(row_number)
         return self._sheet.delete_row(row_number, count)
 
     def insert_column(self, col_number, count=1):
         """Insert one or more columns at the given column number (1-based)."""
+        self._invalidate_merges()
+        self._hyperlinks = None
         return self._sheet.insert_column(col_number, count)
 
     def delete_column(self, col_number, count=1):
         """Delete one or more columns starting at the given column number (1-based)."""
+        self._invalidate_merges()
+        self._hyperlinks = None
         return self._sheet.delete_column(col_number, count)
 
+    def delete_rows(self, indices):
+        """
+        Delete many (possibly non-contiguous) rows at once.
+
+        The shift map is computed once and applied in a single pass over cells,
+        formulas, merges, data validations, conditional formatting, hyperlinks,
+        tables and defined names. Prefer this over calling delete_row() in a
+        loop, which rewrites every subsequent row on each call.
+
+        :param indices: Iterable of 1-based row numbers, in the current numbering
+        """
+        self._shift("rows", _normalize_indices(indices), [])
+
+    def insert_rows(self, inserts):
+        """
+        Insert blank rows at several positions at once.
+
+        :param inserts: Mapping (or iterable of pairs) ``{row: count}``; inserts
+            ``count`` blank rows before each ``row`` of the current numbering
+        """
+        self._shift("rows", [], _normalize_inserts(inserts))
+
+    def delete_columns(self, indices):
+        """
+        Delete many (possibly non-contiguous) columns at once.
+
+        :param indices: Iterable of 1-based column numbers or letters
+        """
+        self._shift("columns", _normalize_indices(indices, columns=True), [])
+
+    def insert_columns(self, inserts):
+        """
+        Insert blank columns at several positions at once.
+
+        :param inserts: Mapping (or iterable of pairs) ``{column: count}``
+        """
+        self._shift("columns", [], _normalize_inserts(inserts, columns=True))
+
+    def _shift(self, axis, deleted, inserted):
+        if not deleted and not inserted:
+            return
+        # Cached Cell objects point at nodes that are about to move or disappear
+        self._cells.clear()
+        self._invalidate_merges()
+        self._hyperlinks = None
+        if axis == "rows":
+            self._sheet.shift_rows(deleted, inserted)
+        else:
+            self._sheet.shift_columns(deleted, inserted)
+
     @property
     def merges(self):
-        return MergeCells(self._sheet.merges())
+        if self._merges is None:
+            self._merges = MergeCells(self._sheet.merges(), self._sheet)
+        return self._merges
+
+    def _invalidate_merges(self):
+        if self._merges is not None:
+            self._merges._invalidate()
 
     def column(self, col):
         """
@@ -425,6 +546,104 @@ class Worksheet:
     async def add_image_async(self, img_path, anchor="A1", width=None, height=None):
         await asyncio.to_thread(self.add_image, img_path, anchor, width, height)
 
+    def add_images(self, images):
+        """
+        Add many images in one native pass.
+
+        Files are read natively, images with identical bytes are stored once
+        in the package, and missing sizes are read from the PNG, JPEG or GIF
+        header (no Pillow needed).
+
+        :param images: Iterable of ``(source, anchor, width, height)`` tuples, where
+            source is a file path or the image bytes. anchor, width and height
+            may be omitted (defaulting to "A1" and the image's own size); when
+            only one of width/height is given the other keeps the aspect ratio.
+        :return: List with the package path of the media part each image uses
+        """
+        from pathlib import Path
+
+        from ._openxlsx import XLCellReference
+
+        items = []
+        for image in images:
+            if isinstance(image, (str, bytes, bytearray, memoryview, Path)):
+                image = (image,)
+            image = tuple(image)
+            if not 1 <= len(image) <= 4:
+                raise ValueError("Each image must be (source, anchor, width, height)")
+            source, anchor, width, height = image + ("A1", None, None)[len(image) - 1 :]
+            if isinstance(source, (bytearray, memoryview)):
+                source = bytes(source)
+            elif not isinstance(source, bytes):
+                source = str(source)
+                if not Path(source).exists():
+                    raise FileNotFoundError(f"Image file not found: {source}")
+            ref = XLCellReference(anchor.replace("$", "").upper())
+            items.append((source, ref.row(), ref.column(), int(width or 0), int(height or 0)))
+        return self._sheet.add_images(items)
+
+    async def add_images_async(self, images):
+        """Async version of add_images()."""
+        return await asyncio.to_thread(self.add_images, images)
+
+    def add_chart_from_arrays(
+        self,
+        chart_type,
+        ys,
+        x=None,
+        names=None,
+        anchor="A1",
+        width=480,
+        height=288,
+        title=None,
+        name=None,
+    ):
+        """
+        Add a chart whose series come from in-memory arrays.
+
+        The data is written in bulk to a hidden "_chart_data" sheet and the
+        series references are built automatically.
+
+        :param chart_type: An XLChartType or its name, e.g. "line" or "column_stacked"
+        :param ys: One sequence of values, or a sequence of series (e.g. a 2D numpy
+            array with one series per row, or a list of 1D arrays)
+        :param x: Optional categories (or x values for scatter charts)
+        :param names: Optional series names, one per series
+        :param anchor: Cell reference for the top-left corner of the chart
+        :param width: Width of the chart in pixels
+        :param height: Height of the chart in pixels
+        :param title: Optional chart title
+        :param name: Drawing object name. Defaults to the title.
+        :return: The XLChart, for further styling
+        """
+        return self.add_charts_from_arrays(
+            [
+                {
+                    "chart_type": chart_type,
+                    "ys": ys,
+                    "x": x,
+                    "names": names,
+                    "anchor": anchor,
+                    "width": width,
+                    "height": height,
+                    "title": title,
+                    "name": name,
+                }
+            ]
+        )[0]
+
+    def add_charts_from_arrays(self, charts):
+        """
+        Add many charts from in-memory arrays at once.
+
+        The data of all charts is written to the hidden data sheet in one bulk
+        call and the charts are created in one pass over the sheet drawing.
+
+        :param charts: Iterable of dicts with the arguments of add_chart_from_arrays()
+        :return: List of XLChart objects, in order
+        """
+        return add_charts_from_arrays(self, charts)
+
     def add_hyperlink(self, cell_ref, url, tooltip=""):
         """
         Add an external hyperlink to a cell.
@@ -434,6 +653,8 @@ class Worksheet:
         :param tooltip: Optional tooltip text.
         """
         self._sheet.add_hyperlink(cell_ref, url, tooltip)
+        if self._hyperlinks is not None:
+            self._hyperlinks.set(cell_ref, url)
 
     def add_internal_hyperlink(self, cell_ref, location, tooltip=""):
         """
@@ -444,18 +665,60 @@ class Worksheet:
         :param tooltip: Optional tooltip text.
         """
         self._sheet.add_internal_hyperlink(cell_ref, location, tooltip)
+        if self._hyperlinks is not None:
+            self._hyperlinks.set(cell_ref, location)
+
+    def add_hyperlinks(self, links):
+        """
+        Add or replace many hyperlinks in one native pass.
+
+        External links to the same URL share one relationship, including links
+        already on the sheet.
+
+        :param links: Iterable of ``(cell_ref, url, tooltip)`` tuples. tooltip may be
+            omitted. A url starting with ``#`` (e.g. ``'#Sheet2!A1'``) links to a
+            location in the workbook. A cell listed twice keeps its last link.
+        :return: Number of hyperlinks written
+        """
+        items = []
+        for link in links:
+            link = tuple(link)
+            if not 2 <= len(link) <= 3:
+                raise ValueError("Each hyperlink must be (cell_ref, url, tooltip)")
+            cell_ref, url = link[:2]
+            tooltip = link[2] if len(link) == 3 else ""
+            internal = url.startswith("#")
+            items.append(
+                (cell_ref.replace("$", "").upper(), url[1:] if internal else url, tooltip or "", internal)
+            )
+        written = self._sheet.add_hyperlinks(items)
+        if self._hyperlinks is not None:
+            self._hyperlinks.update(items)
+        return written
+
+    async def add_hyperlinks_async(self, links):
+        """Async version of add_hyperlinks()."""
+        return await asyncio.to_thread(self.add_hyperlinks, links)
 
     def has_hyperlink(self, cell_ref):
         """Check if a cell has a hyperlink."""
-        return self._sheet.has_hyperlink(cell_ref)
+        return cell_ref in self._hyperlink_index()
 
     def get_hyperlink(self, cell_ref):
         """Get the hyperlink target for a cell."""
-        return self._sheet.get_hyperlink(cell_ref)
+        return self._hyperlink_index().get(cell_ref)
 
     def remove_hyperlink(self, cell_ref):
         """Remove a hyperlink from a cell."""
         self._sheet.remove_hyperlink(cell_ref)
+        if self._hyperlinks is not None:
+            self._hyperlinks.remove(cell_ref)
+
+    def _hyperlink_index(self):
+        # Built on first lookup and kept in sync by the hyperlink methods above
+        if self._hyperlinks is None:
+            self._hyperlinks = XLHyperlinkIndex(self._sheet)
+        return self._hyperlinks
 
     def freeze_panes(self, row_or_ref, col=None):
         """
@@ -575,6 +838,86 @@ class Worksheet:
         raw_table = tables.add(name, range_string)
         return Table(raw_table, self)
 
+    def add_pivot_table(self, options, compute=True):
+        """
+        Add a pivot table to the worksheet.
+
+        :param options: XLPivotTableOptions with the source range, target cell and fields.
+        :param compute: Aggregate the source range natively and write the pivot cache
+            records and the rendered values, so the table shows its data before Excel
+            refreshes it (and in readers that never do).
+        :return: The XLPivotTable.
+        """
+        pivot = self._sheet.add_pivot_table(options)
+        if compute:
+            self._sheet.compute_pivot_table(pivot, options)
+        return pivot
+
+    def read_pivot_table(self, name=None):
+        """
+        Read the rendered values of a pivot table into a pandas DataFrame.
+
+        Row labels become the index and column labels the columns (a MultiIndex
+        when there are several levels). Outer labels that are shown once per
+        group are repeated for every member.
+
+        :param name: Pivot table name. Defaults to the first pivot table on the sheet.
+        :return: A pandas DataFrame.
+        """
+        import pandas as pd  # type: ignore
+
+        for table_name, ref, first_header_row, first_data_row, first_data_col in (
+            self._sheet.pivot_table_locations()
+        ):
+            if name is None or table_name == name:
+                break
+        else:
+            raise KeyError(
+                f"No pivot table named {name!r}" if name else "Worksheet has no pivot tables"
+            )
+
+        block = self.get_range_data(*_parse_bounds(ref))
+        first_data_row = max(first_data_row, 1)
+        label_row = block[first_data_row - 1]
+        # Without column fields the only header row is the one holding the row labels
+        header_rows = block[first_header_row:first_data_row]
+        level_names = block[first_header_row - 1][first_data_col:] if header_rows else []
+        header_rows = header_rows or [label_row]
+
+        row_labels = _repeat_group_labels(
+            tuple(row[:first_data_col]) for row in block[first_data_row:]
+        )
+        col_labels = _repeat_group_labels(
+            zip(*(row[first_data_col:] for row in header_rows))
+        )
+        if first_data_col == 1:
+            index = pd.Index([label[0] for label in row_labels], name=label_row[0])
+        else:
+            index = pd.MultiIndex.from_tuples(
+                row_labels, names=label_row[:first_data_col]
+            )
+        level_names = (level_names + [None] * len(header_rows))[: len(header_rows)]
+        if len(header_rows) == 1:
+            columns = pd.Index([label[0] for label in col_labels], name=level_names[0])
+        else:
+            columns = pd.MultiIndex.from_tuples(col_labels, names=level_names)
+        values = [row[first_data_col:] for row in block[first_data_row:]]
+        return pd.DataFrame(values, index=index, columns=columns)
+
+    def group_by(self, *keys, ref=None, header=True):
+        """
+        Group the rows of a range by key columns for native aggregation.
+
+        Chain .where() filters and finish with .agg(), e.g.
+        ``ws.group_by("Region").agg(total=("Amount", "sum"))``.
+
+        :param keys: Key columns, as header names, column letters or 1-based numbers
+        :param ref: Range to group. Defaults to the used range.
+        :param header: Whether the first row of the range holds column names
+        :return: A GroupBy
+        """
+        return GroupBy(self, keys, ref=ref, header=header)
+
     @property
     def page_margins(self):
         """
@@ -596,7 +939,7 @@ class Worksheet:
         """
         return PageSetup(self._sheet.page_setup(), self)
 
-    def get_rows_data(self):
+    def get_rows_data(self, convert_dates: bool = False, formatted: bool = False):
         """
         Get all rows data as list[list[Any]].
 
@@ -604,28 +947,46 @@ class Worksheet:
         without creating intermediate Cell objects. Much faster than iterating
         through ws.rows for large worksheets.
 
+        :param convert_dates: Return date/time formatted numbers as datetime
+            objects, like Cell.value (time-only values fall on 1899-12-30)
+        :param formatted: Return numbers and booleans as the text Excel
+            displays for their number format (e.g. "12.50%", "1,234")
         :return: list[list[Any]] - All cell values, with None for empty cells
         """
-        return self._sheet.get_rows_data()
+        return self._sheet.get_rows_data(
+            convert_dates, formatted, self._cached_style_table(convert_dates, formatted)
+        )
 
-    async def get_rows_data_async(self):
+    async def get_rows_data_async(
+        self, convert_dates: bool = False, formatted: bool = False
+    ):
         """Async version of get_rows_data()."""
-        return await asyncio.to_thread(self.get_rows_data)
+        return await asyncio.to_thread(self.get_rows_data, convert_dates, formatted)
 
-    def get_row_values(self, row: int):
+    def get_row_values(
+        self, row: int, convert_dates: bool = False, formatted: bool = False
+    ):
         """
         Get a single row's values as list[Any].
 
         :param row: Row number (1-indexed)
+        :param convert_dates: See get_rows_data()
+        :param formatted: See get_rows_data()
         :return: list[Any] - Cell values for the specified row
         """
-        return self._sheet.get_row_values(row)
+        return self._sheet.get_row_values(
+            row, convert_dates, formatted, self._cached_style_table(convert_dates, formatted)
+        )
 
-    async def get_row_values_async(self, row: int):
+    async def get_row_values_async(
+        self, row: int, convert_dates: bool = False, formatted: bool = False
+    ):
         """Async version of get_row_values()."""
-        return await asyncio.to_thread(self.get_row_values, row)
+        return await asyncio.to_thread(
+            self.get_row_values, row, convert_dates, formatted
+        )
 
-    def iter_row_values(self):
+    def iter_row_values(self, convert_dates: bool = False, formatted: bool = False):
         """
         Iterate over rows, yielding each row's values as list[Any].
 
@@ -633,13 +994,22 @@ class Worksheet:
         without creating Cell objects. Use this for efficient row-by-row
         processing of large worksheets.
 
+        :param convert_dates: See get_rows_data()
+        :param formatted: See get_rows_data()
         :yields: list[Any] - Cell values for each row
         """
+        table = self._cached_style_table(convert_dates, formatted)
         for row_idx in range(1, self.max_row + 1):
-            yield self._sheet.get_row_values(row_idx)
+            yield self._sheet.get_row_values(row_idx, convert_dates, formatted, table)
 
     def get_range_data(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
+        formatted: bool = False,
     ):
         """
         Get a range of cells as list[list[Any]].
@@ -651,18 +1021,46 @@ class Worksheet:
         :param start_col: Starting column number (1-indexed)
         :param end_row: Ending row number (1-indexed, inclusive)
         :param end_col: Ending column number (1-indexed, inclusive)
+        :param convert_dates: See get_rows_data()
+        :param formatted: See get_rows_data()
         :return: list[list[Any]] - Cell values in the range
         """
-        return self._sheet.get_range_data(start_row, start_col, end_row, end_col)
+        return self._sheet.get_range_data(
+            start_row,
+            start_col,
+            end_row,
+            end_col,
+            convert_dates,
+            formatted,
+            self._cached_style_table(convert_dates, formatted),
+        )
 
     async def get_range_data_async(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
+        formatted: bool = False,
     ):
         """Async version of get_range_data()."""
         return await asyncio.to_thread(
-            self.get_range_data, start_row, start_col, end_row, end_col
+            self.get_range_data,
+            start_row,
+            start_col,
+            end_row,
+            end_col,
+            convert_dates,
+            formatted,
         )
 
+    def _cached_style_table(self, convert_dates, formatted):
+        # The workbook's cached table, so repeated reads don't rebuild it natively
+        if (convert_dates or formatted) and self._workbook is not None:
+            return self._workbook.style_table
+        return None
+
     def get_cell_value(self, row: int, column: int):
         """
         Get a single cell's value directly without creating a Cell object.
@@ -833,7 +1231,7 @@ class Worksheet:
             self.read_dataframe, start_row, start_col, end_row, end_col, header
         )
 
-    def write_range(self, start_row: int, start_col: int, data):
+    def write_range(self, start_row: int, start_col: int, data, styles=None):
         """
         Write a 2D numpy array or any object supporting the buffer protocol to a worksheet range.
 
@@ -842,15 +1240,25 @@ class Worksheet:
         :param start_row: Starting row number (1-indexed)
         :param start_col: Starting column number (1-indexed)
         :param data: 2D numpy array or buffer-compatible object
+        :param styles: Optional style indices for the written block, broadcast
+            as in set_range_styles()
         """
         self._sheet.write_range_data(start_row, start_col, data)
+        if styles is not None:
+            rows, cols = memoryview(data).shape
+            self._write_block_styles(start_row, start_col, rows, cols, styles)
 
-    async def write_range_async(self, start_row: int, start_col: int, data):
+    async def write_range_async(self, start_row: int, start_col: int, data, styles=None):
         """Async version of write_range()."""
-        await asyncio.to_thread(self.write_range, start_row, start_col, data)
+        await asyncio.to_thread(self.write_range, start_row, start_col, data, styles)
 
     def get_range_values(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
     ):
         """
         Read a range of numeric cells into a 2D numpy array of doubles.
@@ -861,16 +1269,79 @@ class Worksheet:
         :param start_col: Starting column number (1-indexed)
         :param end_row: Ending row number (1-indexed, inclusive)
         :param end_col: Ending column number (1-indexed, inclusive)
-        :return: 2D numpy array (float64)
+        :param convert_dates: Return a datetime64[ms] array instead, holding the
+            date/time formatted cells and NaT everywhere else
+        :return: 2D numpy array (float64, or datetime64[ms])
         """
+        if convert_dates:
+            ms = self._sheet.get_range_datetimes(
+                start_row, start_col, end_row, end_col, self._cached_style_table(True, False)
+            )
+            return ms.view("datetime64[ms]")
         return self._sheet.get_range_values(start_row, start_col, end_row, end_col)
 
     async def get_range_values_async(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
     ):
         """Async version of get_range_values()."""
         return await asyncio.to_thread(
-            self.get_range_values, start_row, start_col, end_row, end_col
+            self.get_range_values, start_row, start_col, end_row, end_col, convert_dates
+        )
+
+    def get_range_styles(
+        self, start_row: int, start_col: int, end_row: int, end_col: int
+    ):
+        """
+        Read the style index of every cell in a range into a 2D numpy array.
+
+        Cells without an explicit style report index 0.
+
+        :return: 2D numpy array (uint32) of shape (rows, columns)
+        """
+        _check_bounds((start_row, end_row))
+        _check_bounds((start_col, end_col), columns=True)
+        if end_row < start_row or end_col < start_col:
+            raise ValueError("The range end must not precede its start")
+        return self._sheet.get_range_styles(start_row, start_col, end_row, end_col)
+
+    def set_range_styles(
+        self, start_row: int, start_col: int, end_row: int, end_col: int, styles
+    ):
+        """
+        Apply style indices to every cell in a range in one native pass.
+
+        ``styles`` follows numpy broadcasting against the range shape: a
+        single index styles the whole block, a 1D vector gives one style per
+        column, a ``(rows, 1)`` array gives one style per row, and a full 2D
+        array styles each cell. Broadcast inputs are not expanded in memory.
+
+        :param styles: Style index or array-like of indices (from
+            ``Workbook.add_style()``)
+
+        Example::
+
+            odd = wb.add_style(fill=Fill(color="EEEEEE"))
+            stripes = np.where(np.arange(1000) % 2, odd, 0)[:, None]
+            ws.set_range_styles(2, 1, 1001, 20, stripes)  # zebra rows
+        """
+        _check_bounds((start_row, end_row))
+        _check_bounds((start_col, end_col), columns=True)
+        if end_row < start_row or end_col < start_col:
+            raise ValueError("The range end must not precede its start")
+        shape = (end_row - start_row + 1, end_col - start_col + 1)
+        self._sheet.set_range_styles(start_row, start_col, _broadcast_styles(styles, shape))
+
+    async def set_range_styles_async(
+        self, start_row: int, start_col: int, end_row: int, end_col: int, styles
+    ):
+        """Async version of set_range_styles()."""
+        await asyncio.to_thread(
+            self.set_range_styles, start_row, start_col, end_row, end_col, styles
         )
 
     # ============================================================
@@ -905,7 +1376,7 @@ class Worksheet:
         """Async version of set_cell_value()."""
         await asyncio.to_thread(self.set_cell_value, row, column, value)
 
-    def write_rows(self, start_row: int, data, start_col: int = 1):
+    def write_rows(self, start_row: int, data, start_col: int = 1, styles=None):
         """
         Write a 2D Python list to a worksheet range.
 
@@ -915,6 +1386,8 @@ class Worksheet:
         :param start_row: Starting row number (1-indexed)
         :param data: 2D list/tuple of values [[row1_val1, row1_val2, ...], [row2_val1, ...], ...]
         :param start_col: Starting column number (1-indexed), defaults to 1
+        :param styles: Optional style indices for the written block (as wide as
+            the longest row), broadcast as in set_range_styles()
 
         Example::
 
@@ -931,10 +1404,21 @@ class Worksheet:
         else:
             data = [list(row) if not isinstance(row, list) else row for row in data]
         self._sheet.write_rows_data(start_row, start_col, data)
+        if styles is not None and data:
+            width = max(len(row) for row in data)
+            self._write_block_styles(start_row, start_col, len(data), width, styles)
 
-    async def write_rows_async(self, start_row: int, data, start_col: int = 1):
+    async def write_rows_async(
+        self, start_row: int, data, start_col: int = 1, styles=None
+    ):
         """Async version of write_rows()."""
-        await asyncio.to_thread(self.write_rows, start_row, data, start_col)
+        await asyncio.to_thread(self.write_rows, start_row, data, start_col, styles)
+
+    def _write_block_styles(self, start_row, start_col, rows, cols, styles):
+        if rows and cols:
+            self.set_range_styles(
+                start_row, start_col, start_row + rows - 1, start_col + cols - 1, styles
+            )
 
     def write_row(self, row: int, values, start_col: int = 1):
         """
@@ -993,6 +1477,28 @@ class Worksheet:
         """Auto-fit the specified column."""
         self._sheet.auto_fit_column(column_number)
 
+    def auto_fit_columns(self, cols=None, sample_rows=None, max_width=255.0):
+        """
+        Auto-fit many columns in a single pass over the sheet data.
+
+        Widths are measured from the text each cell displays, so numbers and
+        dates are rendered through their number format first, and character
+        widths come from a table cached per font. Merged cells are skipped.
+
+        :param cols: Columns to fit (numbers or letters); ``None`` fits every
+            used column
+        :param sample_rows: Examine only about this many evenly spaced rows,
+            for very tall sheets; ``None`` examines every row
+        :param max_width: Upper bound for the fitted widths
+        :return: Dict ``{column: width}`` of the widths that were applied
+        """
+        columns = [] if cols is None else sorted({_column_number(c) for c in cols})
+        _check_bounds(columns, columns=True)
+        if max_width <= 0:
+            raise ValueError("max_width must be positive")
+        pairs = self._sheet.auto_fit_columns(columns, sample_rows or 0, float(max_width))
+        return dict(pairs)
+
     def apply_auto_filter(self):
         """Apply auto filter to the worksheet."""
         self._sheet.apply_auto_filter()
@@ -1001,6 +1507,15 @@ class Worksheet:
         """Add conditional formatting to a range."""
         self._sheet.add_conditional_formatting(sqref, rule)
 
+    def conditional_format_batch(self):
+        """
+        Create a ConditionalFormatBatch that adds many rules in one pass.
+
+        Identical rules are merged into one multi-range block and identical
+        dxfs are pooled. Use it as a context manager, or call commit().
+        """
+        return ConditionalFormatBatch(self)
+
     def remove_conditional_formatting(self, sqref: str):
         """Remove conditional formatting from a range."""
         self._sheet.remove_conditional_formatting(sqref)
@@ -1034,6 +1549,35 @@ class Worksheet:
         """Add a simple (legacy) comment."""
         self._sheet.add_comment(cell_ref, text, author)
 
+    def add_comments(self, comments, shared_shape=False):
+        """
+        Add or replace many legacy comments in one native pass.
+
+        Authors are interned, every note box is sized from its text, and the
+        comments and VML parts are each written in a single pass.
+
+        :param comments: Iterable of ``(cell_ref, text, author)`` tuples. author may
+            be omitted (or empty) for the sheet's first author. A cell listed
+            twice keeps its last comment.
+        :param shared_shape: Keep the look of the note boxes in one VML shape type
+            that every note refers to, instead of repeating it on each note. This
+            makes the drawing part much smaller for large batches.
+        :return: Number of comments written
+        """
+        items = []
+        for comment in comments:
+            comment = tuple(comment)
+            if not 2 <= len(comment) <= 3:
+                raise ValueError("Each comment must be (cell_ref, text, author)")
+            cell_ref, text = comment[:2]
+            author = comment[2] if len(comment) == 3 else ""
+            items.append((cell_ref.replace("$", "").upper(), str(text), author or ""))
+        return self._sheet.add_comments(items, shared_shape)
+
+    async def add_comments_async(self, comments, shared_shape=False):
+        """Async version of add_comments()."""
+        return await asyncio.to_thread(self.add_comments, comments, shared_shape)
+
     def add_threaded_comment(self, cell_ref: str, text: str, author: str = ""):
         """Add a modern threaded comment."""
         return self._sheet.add_threaded_comment(cell_ref, text, author)
@@ -1041,3 +1585,86 @@ class Worksheet:
     def add_threaded_reply(self, parent_id: str, text: str, author: str = ""):
         """Add a reply to a threaded comment."""
         return self._sheet.add_threaded_reply(parent_id, text, author)
+
+
+_MAX_ROWS = 1048576
+_MAX_COLUMNS = 16384
+
+
+def _column_number(col):
+    if isinstance(col, str):
+        number = 0
+        for ch in col.upper():
+            number = number * 26 + (ord(ch) - ord("A") + 1)
+        return number
+    return int(col)
+
+
+def _repeat_group_labels(labels):
+    # Pivot tables show an outer label only on the first member of its group
+    filled = []
+    previous = ()
+    for label in labels:
+        label = tuple(label)
+        first = next((i for i, v in enumerate(label) if v is not None), len(label))
+        if first == len(label):
+            first = 0
+        inherited = previous[:first]
+        current = inherited + (None,) * (first - len(inherited)) + label[first:]
+        filled.append(current)
+        previous = current
+    return filled
+
+
+def _broadcast_styles(styles, shape):
+    import numpy as np
+
+    arr = np.asarray(styles)
+    if arr.dtype != np.uint32:
+        if arr.size and (arr.dtype.kind not in "iub" or arr.min() < 0):
+            raise ValueError("Style indices must be non-negative integers")
+        arr = arr.astype(np.uint32)
+    try:
+        return np.broadcast_to(arr, shape)
+    except ValueError:
+        raise ValueError(
+            f"styles of shape {arr.shape} cannot be broadcast to the range shape {shape}"
+        ) from None
+
+
+def _check_bounds(indices, columns=False):
+    limit = _MAX_COLUMNS if columns else _MAX_ROWS
+    if any(i < 1 or i > limit for i in indices):
+        raise ValueError(
+            f"{'Column' if columns else 'Row'} numbers must be between 1 and {limit}"
+        )
+
+
+def _normalize_indices(indices, columns=False):
+    convert = _column_number if columns else int
+    result = sorted({convert(i) for i in indices})
+    if result:
+        _check_bounds((result[0], result[-1]), columns)
+    return result
+
+
+def _normalize_inserts(inserts, columns=False):
+    convert = _column_number if columns else int
+    items = inserts.items() if hasattr(inserts, "items") else inserts
+    result = sorted((convert(at), int(count)) for at, count in items if int(count) > 0)
+    if result:
+        _check_bounds((result[0][0], result[-1][0]), columns)
+    return result
+
+
+def _normalize_row_values(values, start_row):
+    if hasattr(values, "items"):
+        rows = [int(row) for row in values.keys()]
+        values = list(values.values())
+    else:
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        values = list(values)
+        rows = list(range(start_row, start_row + len(values)))
+    _check_bounds(rows)
+    return rows, values
@@ -4,9 +4,19 @@ from .range import Range
 from .merge import MergeCells
 from .column import Column
 from .data_validation import DataValidations
+from .conditional_formatting import ConditionalFormatBatch
+from .aggregation import GroupBy
 from .table import Table
 from .autofilter import AutoFilter
-from ._openxlsx import XLWorksheet, XLDrawing, XLStreamWriter, XLStreamReader
+from ._openxlsx import (
+    XLWorksheet,
+    XLDrawing,
+    XLStreamWriter,
+    XLStreamReader,
+    XLPivotTable,
+    XLChartType,
+    XLPivotTableOptions,
+)
 
 class Worksheet:
     _sheet: XLWorksheet
@@ -54,10 +64,29 @@ class Worksheet:
     async def unmerge_cells_async(self, range_string: str) -> None: ...
     def set_column_format(self, column: Union[int, str], style_index: int) -> None: ...
     def set_row_format(self, row: int, style_index: int) -> None: ...
+    def set_column_widths(
+        self,
+        widths: Union[Dict[Union[int, str], float], Iterable[Tuple[Union[int, str], float]]],
+    ) -> None: ...
+    def set_row_heights(
+        self, heights: Union[Dict[int, float], Iterable[float]], start_row: int = 1
+    ) -> None: ...
+    def set_row_outline_levels(
+        self, levels: Union[Dict[int, int], Iterable[int]], start_row: int = 1
+    ) -> None: ...
+    def hide_rows(self, indices: Iterable[int], hidden: bool = True) -> None: ...
     def insert_row(self, row_number: int, count: int = 1) -> bool: ...
     def delete_row(self, row_number: int, count: int = 1) -> bool: ...
     def insert_column(self, col_number: int, count: int = 1) -> bool: ...
     def delete_column(self, col_number: int, count: int = 1) -> bool: ...
+    def delete_rows(self, indices: Iterable[int]) -> None: ...
+    def insert_rows(
+        self, inserts: Union[Dict[int, int], Iterable[Tuple[int, int]]]
+    ) -> None: ...
+    def delete_columns(self, indices: Iterable[Union[int, str]]) -> None: ...
+    def insert_columns(
+        self, inserts: Union[Dict[Union[int, str], int], Iterable[Tuple[Union[int, str], int]]]
+    ) -> None: ...
     @property
     def merges(self) -> MergeCells: ...
     def column(self, col: Union[int, str]) -> Column: ...
@@ -110,9 +139,24 @@ class Worksheet:
         width: Optional[int] = None,
         height: Optional[int] = None,
     ) -> None: ...
+    def add_images(self, images: Iterable[Any]) -> List[str]: ...
+    async def add_images_async(self, images: Iterable[Any]) -> List[str]: ...
     def add_shape(
         self, row: int = 1, col: int = 1, shape_type: str = "Rectangle", **kwargs: Any
     ) -> None: ...
+    def add_chart_from_arrays(
+        self,
+        chart_type: Union[XLChartType, str],
+        ys: Any,
+        x: Optional[Iterable[Any]] = None,
+        names: Optional[Union[str, Iterable[str]]] = None,
+        anchor: str = "A1",
+        width: int = 480,
+        height: int = 288,
+        title: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> Any: ...
+    def add_charts_from_arrays(self, charts: Iterable[Dict[str, Any]]) -> List[Any]: ...
     async def add_image_async(
         self,
         img_path: str,
@@ -124,6 +168,8 @@ class Worksheet:
     def add_internal_hyperlink(
         self, cell_ref: str, location: str, tooltip: str = ""
     ) -> None: ...
+    def add_hyperlinks(self, links: Iterable[Tuple[str, ...]]) -> int: ...
+    async def add_hyperlinks_async(self, links: Iterable[Tuple[str, ...]]) -> int: ...
     def has_hyperlink(self, cell_ref: str) -> bool: ...
     def get_hyperlink(self, cell_ref: str) -> str: ...
     def remove_hyperlink(self, cell_ref: str) -> None: ...
@@ -148,16 +194,38 @@ class Worksheet:
     def zoom(self) -> int: ...
     @zoom.setter
     def zoom(self, value: int) -> None: ...
-    def get_rows_data(self) -> List[List[Any]]: ...
-    async def get_rows_data_async(self) -> List[List[Any]]: ...
-    def get_row_values(self, row: int) -> List[Any]: ...
-    async def get_row_values_async(self, row: int) -> List[Any]: ...
-    def iter_row_values(self) -> Iterator[List[Any]]: ...
+    def get_rows_data(
+        self, convert_dates: bool = False, formatted: bool = False
+    ) -> List[List[Any]]: ...
+    async def get_rows_data_async(
+        self, convert_dates: bool = False, formatted: bool = False
+    ) -> List[List[Any]]: ...
+    def get_row_values(
+        self, row: int, convert_dates: bool = False, formatted: bool = False
+    ) -> List[Any]: ...
+    async def get_row_values_async(
+        self, row: int, convert_dates: bool = False, formatted: bool = False
+    ) -> List[Any]: ...
+    def iter_row_values(
+        self, convert_dates: bool = False, formatted: bool = False
+    ) -> Iterator[List[Any]]: ...
     def get_range_data(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
+        formatted: bool = False,
     ) -> List[List[Any]]: ...
     async def get_range_data_async(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
+        formatted: bool = False,
     ) -> List[List[Any]]: ...
     def get_cell_value(self, row: int, column: int) -> Any: ...
     async def get_cell_value_async(self, row: int, column: int) -> Any: ...
@@ -165,23 +233,52 @@ class Worksheet:
     async def write_dataframe_async(self, df: Any, start_row: int = 1, start_col: int = 1, header: bool = True, index: bool = False) -> None: ...
     def read_dataframe(self, start_row: int = 1, start_col: int = 1, end_row: Optional[int] = None, end_col: Optional[int] = None, header: bool = True) -> Any: ...
     async def read_dataframe_async(self, start_row: int = 1, start_col: int = 1, end_row: Optional[int] = None, end_col: Optional[int] = None, header: bool = True) -> Any: ...
-    def write_range(self, start_row: int, start_col: int, data: Any) -> None: ...
+    def write_range(
+        self, start_row: int, start_col: int, data: Any, styles: Any = None
+    ) -> None: ...
     async def write_range_async(
-        self, start_row: int, start_col: int, data: Any
+        self, start_row: int, start_col: int, data: Any, styles: Any = None
     ) -> None: ...
     def get_range_values(
-        self, start_row: int, start_col: int, end_row: int, end_col: int
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
     ) -> Any: ...
     async def get_range_values_async(
+        self,
+        start_row: int,
+        start_col: int,
+        end_row: int,
+        end_col: int,
+        convert_dates: bool = False,
+    ) -> Any: ...
+    def get_range_styles(
         self, start_row: int, start_col: int, end_row: int, end_col: int
     ) -> Any: ...
+    def set_range_styles(
+        self, start_row: int, start_col: int, end_row: int, end_col: int, styles: Any
+    ) -> None: ...
+    async def set_range_styles_async(
+        self, start_row: int, start_col: int, end_row: int, end_col: int, styles: Any
+    ) -> None: ...
     def set_cell_value(self, row: int, column: int, value: Any) -> None: ...
     async def set_cell_value_async(self, row: int, column: int, value: Any) -> None: ...
     def write_rows(
-        self, start_row: int, data: Iterable[Iterable[Any]], start_col: int = 1
+        self,
+        start_row: int,
+        data: Iterable[Iterable[Any]],
+        start_col: int = 1,
+        styles: Any = None,
     ) -> None: ...
     async def write_rows_async(
-        self, start_row: int, data: Iterable[Iterable[Any]], start_col: int = 1
+        self,
+        start_row: int,
+        data: Iterable[Iterable[Any]],
+        start_col: int = 1,
+        styles: Any = None,
     ) -> None: ...
     def write_row(
         self, row: int, values: Iterable[Any], start_col: int = 1
@@ -202,9 +299,22 @@ class Worksheet:
     @property
     def page_setup(self) -> Any: ...
     def add_table(self, name: str, range_string: str) -> Any: ...
+    def add_pivot_table(
+        self, options: XLPivotTableOptions, compute: bool = True
+    ) -> XLPivotTable: ...
+    def read_pivot_table(self, name: Optional[str] = None) -> Any: ...
+    def group_by(
+        self, *keys: Union[str, int], ref: Optional[str] = None, header: bool = True
+    ) -> GroupBy: ...
     def stream_writer(self) -> XLStreamWriter: ...
     def stream_reader(self) -> XLStreamReader: ...
     def auto_fit_column(self, col: int) -> None: ...
+    def auto_fit_columns(
+        self,
+        cols: Optional[Iterable[Union[int, str]]] = None,
+        sample_rows: Optional[int] = None,
+        max_width: float = 255.0,
+    ) -> Dict[int, float]: ...
     def apply_auto_filter(self) -> None: ...
     def set_print_area(self, sqref: str) -> None: ...
     def set_print_title_rows(self, start: int, end: int) -> None: ...
@@ -213,6 +323,13 @@ class Worksheet:
         self, location: str, data_range: str, type: Any = ..., options: Any = ...
     ) -> None: ...
     def add_comment(self, cell_ref: str, text: str, author: str = ...) -> None: ...
+    def add_comments(
+        self, comments: Iterable[Tuple[Any, ...]], shared_shape: bool = False
+    ) -> int: ...
+    async def add_comments_async(
+        self, comments: Iterable[Tuple[Any, ...]], shared_shape: bool = False
+    ) -> int: ...
     def add_conditional_formatting(self, sqref: str, rule: Any) -> None: ...
+    def conditional_format_batch(self) -> ConditionalFormatBatch: ...
     def remove_conditional_formatting(self, sqref: str) -> None: ...
     def clear_all_conditional_formatting(self) -> None: ...
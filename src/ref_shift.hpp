@@ -0,0 +1,537 @@
+#ifndef PYOPENXLSX_REF_SHIFT_HPP
+#define PYOPENXLSX_REF_SHIFT_HPP
+
+/**
+ * @file ref_shift.hpp
+ * @brief Row/column shift maps and A1-reference rewriting.
+ *
+ * An AxisShift describes a batch of deletions and insertions along one axis
+ * (rows or columns), expressed in the *original* numbering. It is built once and
+ * answers "where does index i end up" in O(log k), so a structural edit of any
+ * size is applied in a single pass over the sheet instead of once per row.
+ *
+ * The reference helpers rewrite A1-style references (cells, areas, whole rows,
+ * whole columns, optionally sheet-qualified) inside formulas and sqref lists.
+ * References that lose all of their cells become #REF!.
+ *
+ * This header has no OpenXLSX dependency.
+ */
+
+#include <algorithm>
+#include <cctype>
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <utility>
+#include <vector>
+
+class AxisShift {
+public:
+    AxisShift() = default;
+
+    /**
+     * @param deleted  Indices (1-based, original numbering) to remove.
+     * @param inserted (index, count) pairs: insert `count` blank slots before original `index`.
+     * @param limit    Largest valid index (1048576 for rows, 16384 for columns).
+     */
+    AxisShift(std::vector<uint32_t> deleted, std::vector<std::pair<uint32_t, uint32_t>> inserted,
+              uint32_t limit)
+        : m_deleted(std::move(deleted)), m_limit(limit) {
+        std::sort(m_deleted.begin(), m_deleted.end());
+        m_deleted.erase(std::unique(m_deleted.begin(), m_deleted.end()), m_deleted.end());
+
+        std::sort(inserted.begin(), inserted.end());
+        for (const auto& [at, count] : inserted) {
+            if (count == 0) continue;
+            if (!m_insertAt.empty() && m_insertAt.back() == at) {
+                m_insertTotal.back() += count;
+            } else {
+                m_insertAt.push_back(at);
+                m_insertTotal.push_back((m_insertTotal.empty() ? 0 : m_insertTotal.back()) + count);
+            }
+        }
+    }
+
+    bool empty() const { return m_deleted.empty() && m_insertAt.empty(); }
+
+    bool has_deletions() const { return !m_deleted.empty(); }
+
+    uint32_t limit() const { return m_limit; }
+
+    // Smallest original index whose position or existence changes (limit + 1 if none)
+    uint32_t first_affected() const {
+        uint32_t first = m_limit + 1;
+        if (!m_deleted.empty()) first = std::min(first, m_deleted.front());
+        if (!m_insertAt.empty()) first = std::min(first, m_insertAt.front());
+        return first;
+    }
+
+    bool is_deleted(uint32_t i) const {
+        return std::binary_search(m_deleted.begin(), m_deleted.end(), i);
+    }
+
+    // New position of original index i, or 0 if it was deleted or pushed past the limit
+    uint32_t map(uint32_t i) const {
+        if (is_deleted(i)) return 0;
+        return clamp(static_cast<int64_t>(i) - deleted_before(i) + inserted_up_to(i));
+    }
+
+    /**
+     * Map the inclusive span [first, last]. Insertions strictly inside the span widen it,
+     * deletions shrink it. Returns false when every index of the span was deleted.
+     * A span covering the whole axis (e.g. A:A seen as rows 1:1048576) is left as is.
+     */
+    bool map_span(uint32_t first, uint32_t last, uint32_t& newFirst, uint32_t& newLast) const {
+        if (first == 1 && last == m_limit) {
+            newFirst = first;
+            newLast = last;
+            return true;
+        }
+        int64_t nf = static_cast<int64_t>(first) - deleted_before(first) + inserted_up_to(first);
+        int64_t nl = static_cast<int64_t>(last) - deleted_before(last + 1) + inserted_up_to(last);
+        if (nl < nf || nf > m_limit) return false;
+        newFirst = static_cast<uint32_t>(nf);
+        newLast = static_cast<uint32_t>(std::min<int64_t>(nl, m_limit));
+        return true;
+    }
+
+private:
+    // Number of deleted indices strictly below i
+    int64_t deleted_before(uint32_t i) const {
+        return std::lower_bound(m_deleted.begin(), m_deleted.end(), i) - m_deleted.begin();
+    }
+
+    // Number of slots inserted at or before original index i
+    int64_t inserted_up_to(uint32_t i) const {
+        auto it = std::upper_bound(m_insertAt.begin(), m_insertAt.end(), i);
+        if (it == m_insertAt.begin()) return 0;
+        return static_cast<int64_t>(m_insertTotal[(it - m_insertAt.begin()) - 1]);
+    }
+
+    uint32_t clamp(int64_t v) const {
+        return (v < 1 || v > m_limit) ? 0 : static_cast<uint32_t>(v);
+    }
+
+    std::vector<uint32_t> m_deleted;
+    std::vector<uint32_t> m_insertAt;
+    std::vector<uint64_t> m_insertTotal;  // prefix sums of inserted counts
+    uint32_t m_limit = 0;
+};
+
+/**
+ * What to rewrite. `rows`/`cols` may be empty shifts. References qualified with
+ * `sheetName` are rewritten; unqualified ones only when `unqualifiedIsTarget` is set
+ * (true for formulas stored on the sheet itself).
+ */
+struct RefShiftContext {
+    const AxisShift& rows;
+    const AxisShift& cols;
+    std::string sheetName;
+    bool unqualifiedIsTarget = true;
+};
+
+namespace ref_shift_detail {
+
+inline bool is_ident_char(char c) {
+    return std::isalnum(static_cast<unsigned char>(c)) || c == '_' || c == '.' || c == '$' ||
+           c == '\\';
+}
+
+inline bool iequals(std::string_view a, std::string_view b) {
+    if (a.size() != b.size()) return false;
+    for (size_t i = 0; i < a.size(); ++i) {
+        if (std::toupper(static_cast<unsigned char>(a[i])) !=
+            std::toupper(static_cast<unsigned char>(b[i])))
+            return false;
+    }
+    return true;
+}
+
+// One endpoint of a reference: "$A$1", "A", "$12" ...
+struct RefPart {
+    bool colAbs = false;
+    bool rowAbs = false;
+    uint32_t col = 0;  // 0 = no column component
+    uint32_t row = 0;  // 0 = no row component
+};
+
+// Parse one endpoint starting at s[pos]; advances pos. Returns false if nothing parsed.
+inline bool parse_part(std::string_view s, size_t& pos, RefPart& part) {
+    size_t p = pos;
+    RefPart out;
+    if (p < s.size() && s[p] == '$') {
+        out.colAbs = true;
+        ++p;
+    }
+    size_t letters = 0;
+    uint32_t col = 0;
+    while (p < s.size() && s[p] >= 'A' && s[p] <= 'Z' && letters < 4) {
+        col = col * 26 + static_cast<uint32_t>(s[p] - 'A' + 1);
+        ++p;
+        ++letters;
+    }
+    if (letters == 0) {
+        // Row-only part: "$12" or "12" (colAbs flag actually marked the row)
+        out.rowAbs = out.colAbs;
+        out.colAbs = false;
+    } else if (letters > 3 || col > 16384) {
+        return false;
+    } else {
+        out.col = col;
+        if (p < s.size() && s[p] == '$') {
+            out.rowAbs = true;
+            ++p;
+        }
+    }
+    size_t digits = 0;
+    uint64_t row = 0;
+    while (p < s.size() && s[p] >= '0' && s[p] <= '9' && digits < 8) {
+        row = row * 10 + static_cast<uint64_t>(s[p] - '0');
+        ++p;
+        ++digits;
+    }
+    if (digits > 0) {
+        if (row == 0 || row > 1048576) return false;
+        out.row = static_cast<uint32_t>(row);
+    } else if (letters == 0 || out.rowAbs) {
+        return false;  // "$" alone, or "A$" without a row
+    }
+    pos = p;
+    part = out;
+    return true;
+}
+
+inline std::string column_name(uint32_t col) {
+    std::string letters;
+    while (col > 0) {
+        letters.insert(letters.begin(), static_cast<char>('A' + (col - 1) % 26));
+        col = (col - 1) / 26;
+    }
+    return letters;
+}
+
+inline void write_part(std::string& out, const RefPart& part) {
+    if (part.col != 0) {
+        if (part.colAbs) out += '$';
+        out += column_name(part.col);
+    }
+    if (part.row != 0) {
+        if (part.rowAbs) out += '$';
+        out += std::to_string(part.row);
+    }
+}
+
+/**
+ * Parse a reference ("A1", "A1:B2", "A:C", "1:3") at s[pos]. On success `end` is one past
+ * the reference and `a`/`b` hold the endpoints (b == a for a single cell).
+ */
+inline bool parse_ref(std::string_view s, size_t pos, size_t& end, RefPart& a, RefPart& b,
+                      bool& isArea) {
+    size_t p = pos;
+    if (!parse_part(s, p, a)) return false;
+    isArea = false;
+    b = a;
+    if (p < s.size() && s[p] == ':') {
+        size_t q = p + 1;
+        RefPart second;
+        if (parse_part(s, q, second) && (second.col != 0) == (a.col != 0) &&
+            (second.row != 0) == (a.row != 0)) {
+            b = second;
+            isArea = true;
+            p = q;
+        }
+    }
+    // Whole rows / whole columns need both endpoints ("A:A", "3:3")
+    if ((a.col == 0 || a.row == 0) && !isArea) return false;
+    if (p < s.size() && (is_ident_char(s[p]) || s[p] == '(' || s[p] == '!' || s[p] == '[')) {
+        return false;
+    }
+    end = p;
+    return true;
+}
+
+/**
+ * Shift a parsed reference. Returns false if the reference was deleted entirely.
+ */
+inline bool shift_parts(const RefShiftContext& ctx, RefPart& a, RefPart& b, bool isArea) {
+    if (!isArea) {
+        if (a.row != 0 && !ctx.rows.empty()) {
+            a.row = ctx.rows.map(a.row);
+            if (a.row == 0) return false;
+        }
+        if (a.col != 0 && !ctx.cols.empty()) {
+            a.col = ctx.cols.map(a.col);
+            if (a.col == 0) return false;
+        }
+        b = a;
+        return true;
+    }
+    if (a.row != 0 && !ctx.rows.empty()) {
+        uint32_t r1 = std::min(a.row, b.row);
+        uint32_t r2 = std::max(a.row, b.row);
+        if (!ctx.rows.map_span(r1, r2, r1, r2)) return false;
+        a.row = r1;
+        b.row = r2;
+    }
+    if (a.col != 0 && !ctx.cols.empty()) {
+        uint32_t c1 = std::min(a.col, b.col);
+        uint32_t c2 = std::max(a.col, b.col);
+        if (!ctx.cols.map_span(c1, c2, c1, c2)) return false;
+        a.col = c1;
+        b.col = c2;
+    }
+    return true;
+}
+
+}  // namespace ref_shift_detail
+
+/**
+ * Rewrite a bare reference ("B3" or "B3:D9", no sheet name) with `shift`, called as
+ * shift(a, b, isArea) like ref_shift_detail::shift_parts; `isArea` is passed as an lvalue,
+ * so a shift that takes it by reference may widen a single cell to an area. Returns false
+ * if `shift` did.
+ */
+template <typename ShiftFn>
+bool rewrite_range_ref(std::string_view ref, ShiftFn&& shift, std::string& out) {
+    using namespace ref_shift_detail;
+    size_t end = 0;
+    RefPart a;
+    RefPart b;
+    bool isArea = false;
+    if (!parse_ref(ref, 0, end, a, b, isArea) || end != ref.size()) {
+        out.assign(ref);
+        return true;  // not something we understand: leave untouched
+    }
+    if (!shift(a, b, isArea)) return false;
+    out.clear();
+    write_part(out, a);
+    if (isArea && !(a.row == b.row && a.col == b.col && a.row != 0 && a.col != 0)) {
+        out += ':';
+        write_part(out, b);
+    }
+    return true;
+}
+
+/**
+ * Shift a bare reference ("B3" or "B3:D9", no sheet name).
+ * Returns false if every cell of the reference was deleted.
+ */
+inline bool shift_range_ref(std::string_view ref, const RefShiftContext& ctx, std::string& out) {
+    return rewrite_range_ref(
+        ref,
+        [&](ref_shift_detail::RefPart& a, ref_shift_detail::RefPart& b, bool isArea) {
+            return ref_shift_detail::shift_parts(ctx, a, b, isArea);
+        },
+        out);
+}
+
+/**
+ * Rewrite a space-separated sqref list with `shift` (see rewrite_range_ref). References
+ * it rejects are dropped; the result is empty when nothing remains.
+ */
+template <typename ShiftFn>
+std::string rewrite_sqref(std::string_view sqref, ShiftFn&& shift) {
+    std::string result;
+    std::string shifted;
+    size_t pos = 0;
+    while (pos < sqref.size()) {
+        while (pos < sqref.size() && sqref[pos] == ' ') ++pos;
+        size_t end = sqref.find(' ', pos);
+        if (end == std::string_view::npos) end = sqref.size();
+        if (end > pos && rewrite_range_ref(sqref.substr(pos, end - pos), shift, shifted)) {
+            if (!result.empty()) result += ' ';
+            result += shifted;
+        }
+        pos = end;
+    }
+    return result;
+}
+
+/**
+ * Shift a space-separated sqref list. Deleted references are dropped; the result
+ * is empty when nothing remains.
+ */
+inline std::string shift_sqref(std::string_view sqref, const RefShiftContext& ctx) {
+    return rewrite_sqref(
+        sqref, [&](ref_shift_detail::RefPart& a, ref_shift_detail::RefPart& b, bool isArea) {
+            return ref_shift_detail::shift_parts(ctx, a, b, isArea);
+        });
+}
+
+/**
+ * Rewrite every reference in a formula (without the leading '=') with `shift` (see
+ * rewrite_range_ref); references it rejects become #REF!. References qualified with a
+ * sheet name are rewritten when `isTarget(name)` holds, unqualified ones only when
+ * `unqualifiedIsTarget` is set. String literals and structured table references are
+ * copied verbatim.
+ */
+template <typename TargetFn, typename ShiftFn>
+std::string rewrite_formula_refs_if(std::string_view f, TargetFn&& isTarget,
+                                    bool unqualifiedIsTarget, ShiftFn&& shift) {
+    using namespace ref_shift_detail;
+    std::string out;
+    out.reserve(f.size() + 8);
+    size_t i = 0;
+    const size_t n = f.size();
+
+    // Try to rewrite a reference starting at `pos`. `target` says whether it belongs to
+    // the sheet being edited. Returns the position after the reference, or npos.
+    auto emit_ref = [&](size_t pos, bool target, std::string_view qualifier) -> size_t {
+        size_t end = 0;
+        RefPart a;
+        RefPart b;
+        bool isArea = false;
+        if (!parse_ref(f, pos, end, a, b, isArea)) return std::string_view::npos;
+        out.append(qualifier);
+        if (!target) {
+            out.append(f.substr(pos, end - pos));
+        } else if (!shift(a, b, isArea)) {
+            out += "#REF!";
+        } else {
+            write_part(out, a);
+            if (isArea) {
+                out += ':';
+                write_part(out, b);
+            }
+        }
+        return end;
+    };
+
+    while (i < n) {
+        char ch = f[i];
+        if (ch == '"') {
+            size_t j = i + 1;
+            while (j < n) {
+                if (f[j] == '"') {
+                    if (j + 1 < n && f[j + 1] == '"') {
+                        j += 2;
+                        continue;
+                    }
+                    break;
+                }
+                ++j;
+            }
+            j = std::min(j + 1, n);
+            out.append(f.substr(i, j - i));
+            i = j;
+            continue;
+        }
+        if (ch == '[') {
+            int depth = 0;
+            size_t j = i;
+            while (j < n) {
+                if (f[j] == '[') ++depth;
+                if (f[j] == ']' && --depth == 0) break;
+                ++j;
+            }
+            j = std::min(j + 1, n);
+            out.append(f.substr(i, j - i));
+            i = j;
+            continue;
+        }
+        if (ch == '\'') {
+            // Quoted sheet name: 'My Sheet'!A1
+            size_t j = i + 1;
+            std::string name;
+            while (j < n) {
+                if (f[j] == '\'') {
+                    if (j + 1 < n && f[j + 1] == '\'') {
+                        name += '\'';
+                        j += 2;
+                        continue;
+                    }
+                    break;
+                }
+                name += f[j++];
+            }
+            if (j + 1 < n && f[j + 1] == '!') {
+                std::string_view qualifier = f.substr(i, j + 2 - i);
+                size_t end = emit_ref(j + 2, isTarget(std::string_view(name)), qualifier);
+                if (end != std::string_view::npos) {
+                    i = end;
+                    continue;
+                }
+            }
+            j = std::min(j + 1, n);
+            out.append(f.substr(i, j - i));
+            i = j;
+            continue;
+        }
+        bool tokenStart = (i == 0 || !is_ident_char(f[i - 1])) && is_ident_char(ch);
+        if (!tokenStart) {
+            out += ch;
+            ++i;
+            continue;
+        }
+        size_t j = i;
+        while (j < n && is_ident_char(f[j])) ++j;
+        if (j < n && f[j] == '!') {
+            std::string_view name = f.substr(i, j - i);
+            size_t end = emit_ref(j + 1, isTarget(name), f.substr(i, j + 1 - i));
+            if (end != std::string_view::npos) {
+                i = end;
+                continue;
+            }
+        } else {
+            size_t end = emit_ref(i, unqualifiedIsTarget, std::string_view());
+            if (end != std::string_view::npos) {
+                i = end;
+                continue;
+            }
+        }
+        out.append(f.substr(i, j - i));
+        i = j;
+    }
+    return out;
+}
+
+/**
+ * rewrite_formula_refs_if for the references to one sheet: those qualified with
+ * `sheetName`, and unqualified ones when `unqualifiedIsTarget` is set.
+ */
+template <typename ShiftFn>
+std::string rewrite_formula_refs(std::string_view f, std::string_view sheetName,
+                                 bool unqualifiedIsTarget, ShiftFn&& shift) {
+    return rewrite_formula_refs_if(
+        f, [&](std::string_view name) { return ref_shift_detail::iequals(name, sheetName); },
+        unqualifiedIsTarget, std::forward<ShiftFn>(shift));
+}
+
+/**
+ * Move the relative parts of every reference in a formula by (dRow, dCol), as when the
+ * formula is copied to another cell. Parts pushed off the sheet become #REF!.
+ */
+inline std::string translate_formula_refs(std::string_view f, int64_t dRow, int64_t dCol,
+                                          uint32_t maxRow, uint32_t maxCol) {
+    using ref_shift_detail::RefPart;
+    auto move = [&](RefPart& part) {
+        if (part.row != 0 && !part.rowAbs) {
+            const int64_t row = int64_t{part.row} + dRow;
+            if (row < 1 || row > maxRow) return false;
+            part.row = static_cast<uint32_t>(row);
+        }
+        if (part.col != 0 && !part.colAbs) {
+            const int64_t col = int64_t{part.col} + dCol;
+            if (col < 1 || col > maxCol) return false;
+            part.col = static_cast<uint32_t>(col);
+        }
+        return true;
+    };
+    return rewrite_formula_refs_if(
+        f, [](std::string_view) { return true; }, true,
+        [&](RefPart& a, RefPart& b, bool isArea) { return move(a) && (!isArea || move(b)); });
+}
+
+/**
+ * Rewrite every reference in a formula (without the leading '='). String literals
+ * and structured table references are copied verbatim.
+ */
+inline std::string shift_formula_refs(std::string_view f, const RefShiftContext& ctx) {
+    return rewrite_formula_refs(
+        f, ctx.sheetName, ctx.unqualifiedIsTarget,
+        [&](ref_shift_detail::RefPart& a, ref_shift_detail::RefPart& b, bool isArea) {
+            return ref_shift_detail::shift_parts(ctx, a, b, isArea);
+        });
+}
+
+#endif  // PYOPENXLSX_REF_SHIFT_HPP
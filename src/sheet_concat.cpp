@@ -0,0 +1,197 @@
+#include "sheet_concat.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>
+#include <deque>
+#include <exception>
+#include <filesystem>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
+
+#include "bindings.hpp"
+
+namespace {
+
+using Row = std::vector<XLCellValue>;
+using Batch = std::vector<Row>;
+
+constexpr size_t kBatchRows = 1024;   // rows handed over at a time
+constexpr size_t kQueuedBatches = 4;  // per input, before its reader waits for the writer
+
+// The rows of one input, produced by a reader thread and consumed in input order
+struct InputRows {
+    std::mutex mutex;
+    std::condition_variable changed;
+    std::deque<Batch> batches;
+    bool done = false;
+    std::exception_ptr error;
+};
+
+// Reader threads, each working through the inputs one file at a time. Stopped and
+// joined on destruction, including when the writer fails.
+class InputReaders {
+   public:
+    InputReaders(const std::vector<std::string>& paths, const ConcatOptions& options)
+        : m_paths(paths), m_sheet(options.sheet) {
+        m_inputs.reserve(paths.size());
+        for (size_t i = 0; i < paths.size(); ++i) m_inputs.push_back(std::make_unique<InputRows>());
+
+        size_t workers = options.workers;
+        if (workers == 0) {
+            workers = std::min<size_t>(std::max(1u, std::thread::hardware_concurrency()), 4);
+        }
+        workers = std::max<size_t>(1, std::min(workers, paths.size()));
+        m_threads.reserve(workers);
+        for (size_t t = 0; t < workers; ++t) m_threads.emplace_back([this] { run(); });
+    }
+
+    ~InputReaders() {
+        m_stopped = true;
+        for (auto& input : m_inputs) {
+            if (!input) continue;
+            std::lock_guard<std::mutex> lock(input->mutex);
+            input->changed.notify_all();
+        }
+        for (auto& thread : m_threads) thread.join();
+    }
+
+    InputReaders(const InputReaders&) = delete;
+    InputReaders& operator=(const InputReaders&) = delete;
+
+    // The next batch of input `i`; false once the input is exhausted
+    bool next(size_t i, Batch& batch) {
+        InputRows& input = *m_inputs[i];
+        {
+            std::unique_lock<std::mutex> lock(input.mutex);
+            input.changed.wait(lock, [&] { return !input.batches.empty() || input.done; });
+            if (input.batches.empty()) {
+                if (input.error) std::rethrow_exception(input.error);
+                return false;
+            }
+            batch = std::move(input.batches.front());
+            input.batches.pop_front();
+        }
+        input.changed.notify_all();
+        return true;
+    }
+
+    // Input `i` has been written; nothing of it is needed anymore
+    void release(size_t i) { m_inputs[i].reset(); }
+
+   private:
+    void run() {
+        for (size_t i = m_next++; i < m_paths.size() && !m_stopped; i = m_next++) {
+            InputRows& input = *m_inputs[i];
+            std::exception_ptr error;
+            try {
+                read(m_paths[i], input);
+            } catch (const std::invalid_argument&) {
+                error = std::current_exception();
+            } catch (const std::exception& e) {
+                error = std::make_exception_ptr(
+                    std::runtime_error("Could not read " + m_paths[i] + ": " + e.what()));
+            }
+            // Notified under the lock: once the writer sees `done` it may release the input
+            std::lock_guard<std::mutex> lock(input.mutex);
+            input.error = error;
+            input.done = true;
+            input.changed.notify_all();
+        }
+    }
+
+    void read(const std::string& path, InputRows& input) {
+        XLDocument doc;
+        doc.open(path);
+        XLWorkbook workbook = doc.workbook();
+        if (!m_sheet.empty() && !workbook.worksheetExists(m_sheet)) {
+            throw std::invalid_argument("Worksheet " + m_sheet + " does not exist in " + path);
+        }
+        XLWorksheet ws = m_sheet.empty() ? workbook.worksheet(1) : workbook.worksheet(m_sheet);
+        XLStreamReader reader = ws.streamReader();
+
+        Batch batch;
+        batch.reserve(kBatchRows);
+        while (reader.hasNext()) {
+            Row row = reader.nextRow();
+            if (row.empty()) continue;
+            batch.push_back(std::move(row));
+            if (batch.size() == kBatchRows) {
+                if (!push(input, std::move(batch))) return;
+                batch = Batch();
+                batch.reserve(kBatchRows);
+            }
+        }
+        reader.close();
+        if (!batch.empty()) push(input, std::move(batch));
+        doc.close();
+    }
+
+    // Queue a batch, waiting while the input is kBatchRows * kQueuedBatches rows ahead
+    // of the writer; false when the run was stopped
+    bool push(InputRows& input, Batch batch) {
+        {
+            std::unique_lock<std::mutex> lock(input.mutex);
+            input.changed.wait(lock,
+                               [&] { return input.batches.size() < kQueuedBatches || m_stopped; });
+            if (m_stopped) return false;
+            input.batches.push_back(std::move(batch));
+        }
+        input.changed.notify_all();
+        return true;
+    }
+
+    const std::vector<std::string>& m_paths;
+    const std::string m_sheet;
+    std::vector<std::unique_ptr<InputRows>> m_inputs;
+    std::vector<std::thread> m_threads;
+    std::atomic<size_t> m_next{0};
+    std::atomic<bool> m_stopped{false};
+};
+
+}  // namespace
+
+uint64_t concat_sheets(const std::vector<std::string>& paths, const std::string& output,
+                       const ConcatOptions& options) {
+    XLDocument out;
+    out.create(output, true);
+    uint64_t written = 0;
+    try {
+        XLWorksheet ws = out.workbook().worksheet(1);
+        if (!options.outputSheet.empty()) ws.setName(options.outputSheet);
+        XLStreamWriter writer = ws.streamWriter();
+
+        if (!paths.empty()) {
+            InputReaders readers(paths, options);
+            Batch batch;
+            for (size_t i = 0; i < paths.size(); ++i) {
+                bool firstRow = true;
+                while (readers.next(i, batch)) {
+                    for (Row& row : batch) {
+                        const bool header = options.headerFirst && firstRow;
+                        firstRow = false;
+                        if (header && i > 0) continue;
+                        if (!options.sourceColumn.empty()) {
+                            row.insert(row.begin(),
+                                       XLCellValue(header ? options.sourceColumn : paths[i]));
+                        }
+                        writer.appendRow(row);
+                        ++written;
+                    }
+                }
+                readers.release(i);
+            }
+        }
+        writer.close();
+        out.save();
+        out.close();
+    } catch (...) {
+        out.close();
+        std::error_code ec;
+        std::filesystem::remove(std::filesystem::u8path(output), ec);
+        throw;
+    }
+    return written;
+}
@@ -0,0 +1,32 @@
+#ifndef PYOPENXLSX_SHEET_CONCAT_HPP
+#define PYOPENXLSX_SHEET_CONCAT_HPP
+
+/**
+ * @file sheet_concat.hpp
+ * @brief Append the rows of one sheet of many workbook files into a new workbook.
+ *
+ * Worker threads open the inputs (each thread one file at a time, claimed in
+ * order) and read the sheet with an XLStreamReader into a bounded per-file
+ * queue of row batches. The calling thread drains the queues in input order
+ * into the XLStreamWriter of the output sheet, so rows never pass through
+ * Python and at most `workers` inputs are held in memory at once.
+ */
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+struct ConcatOptions {
+    std::string sheet;         // sheet to read from every input; empty for the first sheet
+    std::string outputSheet;   // title of the output sheet; empty for "Sheet1"
+    bool headerFirst = true;   // the first row of every input is a header, written once
+    std::string sourceColumn;  // when set, prepend a column with the input path under this header
+    size_t workers = 0;        // 0 picks min(inputs, cores, 4)
+};
+
+// Write the rows of `paths` into a new workbook at `output` and return the number of
+// rows written (header included). Safe to call without the GIL.
+uint64_t concat_sheets(const std::vector<std::string>& paths, const std::string& output,
+                       const ConcatOptions& options);
+
+#endif  // PYOPENXLSX_SHEET_CONCAT_HPP
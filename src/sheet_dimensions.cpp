@@ -0,0 +1,387 @@
+#include "sheet_dimensions.hpp"
+
+#include <algorithm>
+#include <array>
+#include <cctype>
+#include <cmath>
+#include <cstdio>
+#include <cstring>
+#include <numeric>
+#include <optional>
+#include <string>
+#include <unordered_map>
+#include <utility>
+
+#include "internal_access.hpp"
+#include "merge_index.hpp"
+#include "number_format.hpp"
+#include "sheet_xml.hpp"
+#include "style_table.hpp"
+
+namespace {
+
+std::string format_number(double value) {
+    char buf[32];
+    std::snprintf(buf, sizeof(buf), "%.15g", value);
+    return buf;
+}
+
+// Order of the updates sorted by index, keeping only the last update of each index
+template <typename Index>
+std::vector<size_t> last_update_order(const std::vector<Index>& indices) {
+    std::vector<size_t> order(indices.size());
+    std::iota(order.begin(), order.end(), size_t{0});
+    std::stable_sort(order.begin(), order.end(),
+                     [&indices](size_t a, size_t b) { return indices[a] < indices[b]; });
+    std::vector<size_t> unique;
+    unique.reserve(order.size());
+    for (size_t i = 0; i < order.size(); ++i) {
+        if (i + 1 < order.size() && indices[order[i + 1]] == indices[order[i]]) continue;
+        unique.push_back(order[i]);
+    }
+    return unique;
+}
+
+/**
+ * Apply `update(colNode, i)` to column cols[i], creating missing <col> records in place.
+ *
+ * XLWorksheet splits every multi-column <col> span into single-column records when it is
+ * constructed (including during save), so this keeps that one-record-per-column layout:
+ * the sorted updates are merged with the sorted <col> nodes in one forward walk, and a
+ * span that still covers a target column is split around it.
+ */
+template <typename Fn>
+void update_column_records(XLWorksheet& ws, const std::vector<uint16_t>& cols, Fn&& update) {
+    if (cols.empty()) return;
+
+    XMLNode root = get_xml_doc(ws).document_element();
+    XMLNode colsNode = root.child("cols");
+    if (colsNode.empty()) colsNode = root.insert_child_before("cols", root.child("sheetData"));
+
+    XMLNode colNode = colsNode.first_child_of_type(pugi::node_element);
+    for (size_t i : last_update_order(cols)) {
+        const uint32_t c = cols[i];
+        while (!colNode.empty() && colNode.attribute("max").as_uint() < c) {
+            colNode = colNode.next_sibling_of_type(pugi::node_element);
+        }
+        if (colNode.empty() || colNode.attribute("min").as_uint() > c) {
+            XMLNode created = colNode.empty() ? colsNode.append_child("col")
+                                              : colsNode.insert_child_before("col", colNode);
+            created.append_attribute("min").set_value(c);
+            created.append_attribute("max").set_value(c);
+            colNode = created;
+        } else {
+            const uint32_t first = colNode.attribute("min").as_uint();
+            const uint32_t last = colNode.attribute("max").as_uint();
+            if (first < c) {
+                XMLNode before = colsNode.insert_copy_before(colNode, colNode);
+                before.attribute("max").set_value(c - 1);
+                colNode.attribute("min").set_value(c);
+            }
+            if (last > c) {
+                XMLNode after = colsNode.insert_copy_after(colNode, colNode);
+                after.attribute("min").set_value(c + 1);
+                colNode.attribute("max").set_value(c);
+            }
+        }
+        update(colNode, i);
+    }
+}
+
+/**
+ * Apply `update(rowNode, i)` to row rows[i], creating missing <row> records in place.
+ * The sorted updates are merged with the sorted <row> nodes in one forward walk.
+ */
+template <typename Fn>
+void update_row_records(XLWorksheet& ws, const std::vector<uint32_t>& rows, Fn&& update) {
+    if (rows.empty()) return;
+
+    XMLNode sheetData = sheet_data_node(ws);
+    XMLNode rowNode = sheetData.first_child_of_type(pugi::node_element);
+    for (size_t i : last_update_order(rows)) {
+        const uint32_t r = rows[i];
+        while (!rowNode.empty() && rowNode.attribute("r").as_uint() < r) {
+            rowNode = rowNode.next_sibling_of_type(pugi::node_element);
+        }
+        if (rowNode.empty()) {
+            rowNode = sheetData.append_child("row");
+            rowNode.append_attribute("r").set_value(r);
+        } else if (rowNode.attribute("r").as_uint() != r) {
+            rowNode = sheetData.insert_child_before("row", rowNode);
+            rowNode.append_attribute("r").set_value(r);
+        }
+        update(rowNode, i);
+    }
+}
+
+void check_columns(const std::vector<uint16_t>& cols) {
+    for (auto c : cols) Expects(c >= 1 && c <= kExcelMaxCols);
+}
+
+void check_rows(const std::vector<uint32_t>& rows) {
+    for (auto r : rows) Expects(r >= 1 && r <= kExcelMaxRows);
+}
+
+void set_attribute(XMLNode node, const char* name, const char* value) {
+    auto attr = node.attribute(name);
+    if (attr.empty()) attr = node.append_attribute(name);
+    attr.set_value(value);
+}
+
+}  // namespace
+
+void set_column_widths(XLWorksheet& ws, std::vector<uint16_t> cols, std::vector<double> widths) {
+    Expects(cols.size() == widths.size());
+    check_columns(cols);
+    py::gil_scoped_release release;
+    update_column_records(ws, cols, [&widths](XMLNode col, size_t i) {
+        set_attribute(col, "width", format_number(widths[i]).c_str());
+        set_attribute(col, "customWidth", "1");
+    });
+}
+
+void set_row_heights(XLWorksheet& ws, std::vector<uint32_t> rows, std::vector<double> heights) {
+    Expects(rows.size() == heights.size());
+    check_rows(rows);
+    py::gil_scoped_release release;
+    update_row_records(ws, rows, [&heights](XMLNode row, size_t i) {
+        set_attribute(row, "ht", format_number(heights[i]).c_str());
+        set_attribute(row, "customHeight", "1");
+    });
+}
+
+void set_row_outline_levels(XLWorksheet& ws, std::vector<uint32_t> rows,
+                            std::vector<uint8_t> levels) {
+    Expects(rows.size() == levels.size());
+    for (auto level : levels) Expects(level <= 7);
+    check_rows(rows);
+    py::gil_scoped_release release;
+
+    uint8_t maxLevel = 0;
+    update_row_records(ws, rows, [&](XMLNode row, size_t i) {
+        if (levels[i] == 0) {
+            row.remove_attribute("outlineLevel");
+        } else {
+            set_attribute(row, "outlineLevel", std::to_string(levels[i]).c_str());
+            maxLevel = std::max(maxLevel, levels[i]);
+        }
+    });
+    if (maxLevel == 0) return;
+
+    // Same sheet-level outline settings as XLWorksheet::groupRows
+    XMLNode root = get_xml_doc(ws).document_element();
+    XMLNode sheetPr = root.child("sheetPr");
+    if (sheetPr.empty()) sheetPr = root.prepend_child("sheetPr");
+    XMLNode outlinePr = sheetPr.child("outlinePr");
+    if (outlinePr.empty()) outlinePr = sheetPr.append_child("outlinePr");
+    if (outlinePr.attribute("summaryBelow").empty()) {
+        outlinePr.append_attribute("summaryBelow").set_value("1");
+    }
+    if (outlinePr.attribute("summaryRight").empty()) {
+        outlinePr.append_attribute("summaryRight").set_value("1");
+    }
+    // Excel sizes the outline gutter from sheetFormatPr/@outlineLevelRow
+    XMLNode formatPr = root.child("sheetFormatPr");
+    if (!formatPr.empty() && formatPr.attribute("outlineLevelRow").as_uint() < maxLevel) {
+        auto attr = formatPr.attribute("outlineLevelRow");
+        if (attr.empty()) attr = formatPr.append_attribute("outlineLevelRow");
+        attr.set_value(maxLevel);
+    }
+}
+
+void set_rows_hidden(XLWorksheet& ws, std::vector<uint32_t> rows, bool hidden) {
+    check_rows(rows);
+    py::gil_scoped_release release;
+    update_row_records(ws, rows, [hidden](XMLNode row, size_t) {
+        if (hidden) {
+            set_attribute(row, "hidden", "1");
+        } else {
+            row.remove_attribute("hidden");
+        }
+    });
+}
+
+namespace {
+
+// Character widths in units of the default font's digit width (Excel's column width unit)
+using WidthTable = std::array<float, 128>;
+
+WidthTable make_width_table(const std::string& fontName, double fontSize, bool bold) {
+    WidthTable table;
+    std::string family;
+    for (char c : fontName)
+        family += static_cast<char>(std::tolower(static_cast<unsigned char>(c)));
+    const bool monospace = family.find("courier") != std::string::npos ||
+                           family.find("consolas") != std::string::npos ||
+                           family.find("mono") != std::string::npos;
+
+    for (size_t c = 0; c < table.size(); ++c) {
+        const auto ch = static_cast<char>(c);
+        float width = 1.0f;
+        if (monospace) {
+            width = 1.0f;
+        } else if (std::strchr("il.,:;'|!`", ch) != nullptr) {
+            width = 0.45f;
+        } else if (std::strchr("frtjI ()[]{}-/\\\"", ch) != nullptr) {
+            width = 0.6f;
+        } else if (std::strchr("mwMW%@", ch) != nullptr) {
+            width = 1.5f;
+        } else if (ch >= 'A' && ch <= 'Z') {
+            width = 1.15f;
+        }
+        table[c] = width;
+    }
+
+    float scale = static_cast<float>(fontSize > 0 ? fontSize / 11.0 : 1.0);
+    if (bold) scale *= 1.08f;
+    if (monospace) scale *= 1.15f;
+    for (auto& width : table) width *= scale;
+    return table;
+}
+
+// Style lookups for auto-fit: xf -> font width table (built once per font) and format code
+class FitStyles {
+   public:
+    explicit FitStyles(XLDocument& doc) : m_styles(doc.styles()), m_table(m_styles) {}
+
+    const WidthTable& widths(uint32_t xf) { return font_widths(m_table.font_index(xf)); }
+    std::string_view format_code(uint32_t xf) const { return m_table.format_code(xf); }
+
+   private:
+    const WidthTable& font_widths(uint32_t fontIndex) {
+        auto it = m_fonts.find(fontIndex);
+        if (it != m_fonts.end()) return it->second;
+        XLFonts& fonts = m_styles.fonts();
+        WidthTable table = make_width_table("Calibri", 11.0, false);
+        if (fontIndex < fonts.count()) {
+            XLFont font = fonts[fontIndex];
+            table = make_width_table(font.fontName(), static_cast<double>(font.fontSize()),
+                                     font.bold());
+        }
+        return m_fonts.emplace(fontIndex, table).first->second;
+    }
+
+    XLStyles& m_styles;
+    StyleTable m_table;
+    std::unordered_map<uint32_t, WidthTable> m_fonts;  // node-based: references stay valid
+};
+
+// Widest line of `text`, in column width units
+float text_width(std::string_view text, const WidthTable& widths) {
+    float widest = 0.0f;
+    float line = 0.0f;
+    for (size_t i = 0; i < text.size();) {
+        const auto byte = static_cast<unsigned char>(text[i]);
+        if (byte == '\n') {
+            widest = std::max(widest, line);
+            line = 0.0f;
+            ++i;
+        } else if (byte < 0x80) {
+            line += widths[byte];
+            ++i;
+        } else if ((byte & 0xE0) == 0xC0) {  // accented Latin, Greek, Cyrillic
+            line += 1.1f * widths['0'];
+            i += 2;
+        } else if ((byte & 0xF0) == 0xE0) {  // CJK and other full-width scripts
+            line += 2.0f * widths['0'];
+            i += 3;
+        } else {
+            line += 2.0f * widths['0'];
+            i += 4;
+        }
+    }
+    return std::max(widest, line);
+}
+
+// Displayed text of a <c> node, or an empty string for empty cells
+std::string cell_display_text(XMLNode cell, const XLSharedStrings& sharedStrings,
+                              FitStyles& styles) {
+    const std::string_view type = cell.attribute("t").value();
+    XMLNode value = cell.child("v");
+    if (type == "s") {
+        const int32_t index = value.text().as_int(-1);
+        if (index < 0 || index >= sharedStrings.stringCount()) return {};
+        return sharedStrings.getString(index);
+    }
+    if (type == "inlineStr") {
+        std::string text;
+        XMLNode is = cell.child("is");
+        for (XMLNode t = is.child("t"); !t.empty(); t = t.next_sibling("t")) text += t.text().get();
+        for (XMLNode run = is.child("r"); !run.empty(); run = run.next_sibling("r")) {
+            text += run.child("t").text().get();
+        }
+        return text;
+    }
+    if (value.empty()) return {};
+    if (type == "b") return value.text().as_bool() ? "TRUE" : "FALSE";
+    if (type == "str" || type == "e") return value.text().get();
+
+    const double number = value.text().as_double();
+    const std::string_view code = styles.format_code(cell.attribute("s").as_uint());
+    if (code == "@") return value.text().get();
+    return render_number(number, code);
+}
+
+}  // namespace
+
+std::vector<std::pair<uint16_t, double>> auto_fit_columns(XLWorksheet& ws,
+                                                          std::vector<uint16_t> cols,
+                                                          uint32_t sampleRows, double maxWidth) {
+    check_columns(cols);
+    py::gil_scoped_release release;
+
+    std::vector<bool> wanted(kExcelMaxCols + 1, cols.empty());
+    for (auto c : cols) wanted[c] = true;
+    std::vector<float> widest(kExcelMaxCols + 1, -1.0f);
+
+    XLDocument& doc = get_parent_doc(ws);
+    const XLSharedStrings& sharedStrings = doc.sharedStrings();
+    FitStyles styles(doc);
+    XLMergeCells& merges = ws.merges();
+    std::optional<MergeIndex> mergeIndex;
+    if (merges.count() > 0) mergeIndex.emplace(merges);
+
+    XMLNode sheetData = sheet_data_node(ws);
+    uint32_t stride = 1;
+    if (sampleRows > 0) {
+        const uint32_t lastRow =
+            sheetData.last_child_of_type(pugi::node_element).attribute("r").as_uint();
+        stride = std::max<uint32_t>(1, (lastRow + sampleRows - 1) / sampleRows);
+    }
+
+    // One row-major pass over every requested column
+    for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();
+         row = row.next_sibling_of_type(pugi::node_element)) {
+        const uint32_t r = row.attribute("r").as_uint();
+        if (stride > 1 && (r - 1) % stride != 0) continue;
+        for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+             cell = cell.next_sibling_of_type(pugi::node_element)) {
+            const uint16_t c = cell_ref_column(cell.attribute("r").value());
+            if (c == 0 || !wanted[c]) continue;
+            // Like Excel, merged cells do not take part in auto-fit
+            if (mergeIndex && mergeIndex->covering(r, c)) continue;
+            const std::string text = cell_display_text(cell, sharedStrings, styles);
+            if (text.empty()) continue;
+            const uint32_t xf = cell.attribute("s").as_uint();
+            widest[c] = std::max(widest[c], text_width(text, styles.widths(xf)));
+        }
+    }
+
+    std::vector<uint16_t> fitted;
+    std::vector<double> widths;
+    for (uint32_t c = 1; c <= kExcelMaxCols; ++c) {
+        if (widest[c] < 0) continue;
+        fitted.push_back(static_cast<uint16_t>(c));
+        widths.push_back(std::clamp(std::round((widest[c] + 1.2) * 100.0) / 100.0,
+                                    std::min(8.43, maxWidth), maxWidth));
+    }
+    update_column_records(ws, fitted, [&widths](XMLNode col, size_t i) {
+        set_attribute(col, "width", format_number(widths[i]).c_str());
+        set_attribute(col, "customWidth", "1");
+    });
+
+    std::vector<std::pair<uint16_t, double>> result;
+    result.reserve(fitted.size());
+    for (size_t i = 0; i < fitted.size(); ++i) result.emplace_back(fitted[i], widths[i]);
+    return result;
+}
@@ -0,0 +1,26 @@
+#ifndef PYOPENXLSX_SHEET_DIMENSIONS_HPP
+#define PYOPENXLSX_SHEET_DIMENSIONS_HPP
+
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+#include "bindings.hpp"
+
+// Bulk column/row dimension updates. Each call is a single pass over <cols> or <sheetData>;
+// `cols`/`rows` and the value vectors are parallel, and later duplicates win.
+void set_column_widths(XLWorksheet& ws, std::vector<uint16_t> cols, std::vector<double> widths);
+void set_row_heights(XLWorksheet& ws, std::vector<uint32_t> rows, std::vector<double> heights);
+// Levels 0-7; level 0 removes the row from its outline group
+void set_row_outline_levels(XLWorksheet& ws, std::vector<uint32_t> rows,
+                            std::vector<uint8_t> levels);
+void set_rows_hidden(XLWorksheet& ws, std::vector<uint32_t> rows, bool hidden);
+
+// Fit the width of `cols` (all used columns when empty) to their displayed text in one
+// row-major pass; `sampleRows` > 0 examines about that many evenly spaced rows.
+// Returns the (column, width) pairs that were applied.
+std::vector<std::pair<uint16_t, double>> auto_fit_columns(XLWorksheet& ws,
+                                                          std::vector<uint16_t> cols,
+                                                          uint32_t sampleRows, double maxWidth);
+
+#endif  // PYOPENXLSX_SHEET_DIMENSIONS_HPP
@@ -0,0 +1,411 @@
+#include "sheet_import.hpp"
+
+#include <cstdint>
+#include <cstdlib>
+#include <cstring>
+#include <string>
+#include <string_view>
+#include <unordered_map>
+#include <vector>
+
+#include "internal_access.hpp"
+
+namespace {
+
+// Worksheet children that only point at other parts of the package (drawings, VML,
+// tables, embedded objects ...), which are not copied along with the sheet
+bool refers_to_part(std::string_view tag) {
+    return tag == "drawing" || tag == "legacyDrawing" || tag == "legacyDrawingHF" ||
+           tag == "drawingHF" || tag == "picture" || tag == "oleObjects" || tag == "controls" ||
+           tag == "webPublishItems" || tag == "tableParts" || tag == "customProperties";
+}
+
+bool has_relationship_id(XMLNode node) {
+    if (!node.attribute("r:id").empty()) return true;
+    for (XMLNode child = node.first_child_of_type(pugi::node_element); !child.empty();
+         child = child.next_sibling_of_type(pugi::node_element)) {
+        if (has_relationship_id(child)) return true;
+    }
+    return false;
+}
+
+bool is_xf_reference(const char* name) {
+    return std::strcmp(name, "numFmtId") == 0 || std::strcmp(name, "fontId") == 0 ||
+           std::strcmp(name, "fillId") == 0 || std::strcmp(name, "borderId") == 0 ||
+           std::strcmp(name, "xfId") == 0;
+}
+
+// Content of a style record: attributes in document order, then the element and
+// (non-whitespace) text children. With `skipReferences`, the index attributes of
+// an <xf> are left out so that they can be compared by what they point to instead.
+void fingerprint(XMLNode node, std::string& out, bool skipReferences = false) {
+    for (auto attr = node.first_attribute(); !attr.empty(); attr = attr.next_attribute()) {
+        if (skipReferences && is_xf_reference(attr.name())) continue;
+        out += attr.name();
+        out += '=';
+        out += attr.value();
+        out += ';';
+    }
+    for (XMLNode child = node.first_child(); !child.empty(); child = child.next_sibling()) {
+        if (child.type() == pugi::node_element) {
+            out += '<';
+            out += child.name();
+            out += ':';
+            fingerprint(child, out);
+            out += '>';
+        } else if (child.type() == pugi::node_pcdata || child.type() == pugi::node_cdata) {
+            std::string_view text = child.value();
+            if (text.find_first_not_of(" \t\r\n") == std::string_view::npos) continue;
+            out += '[';
+            out += text;
+            out += ']';
+        }
+    }
+}
+
+std::string fingerprint_of(XMLNode node) {
+    std::string out;
+    fingerprint(node, out);
+    return out;
+}
+
+std::vector<XMLNode> records(XMLNode parent) {
+    std::vector<XMLNode> nodes;
+    for (XMLNode node = parent.first_child_of_type(pugi::node_element); !node.empty();
+         node = node.next_sibling_of_type(pugi::node_element)) {
+        nodes.push_back(node);
+    }
+    return nodes;
+}
+
+// The style records of one workbook with the fingerprints of the shared ones
+struct StyleRecords {
+    explicit StyleRecords(XLDocument& doc) {
+        XMLNode root = get_xml_doc(doc.styles()).document_element();
+        for (XMLNode format : records(root.child("numFmts"))) {
+            customFormats.emplace(format.attribute("numFmtId").as_uint(),
+                                  format.attribute("formatCode").value());
+        }
+        fonts = records(root.child("fonts"));
+        fills = records(root.child("fills"));
+        borders = records(root.child("borders"));
+        cellXfs = records(root.child("cellXfs"));
+        dxfs = records(root.child("dxfs"));
+        for (XMLNode node : fonts) fontKeys.push_back(fingerprint_of(node));
+        for (XMLNode node : fills) fillKeys.push_back(fingerprint_of(node));
+        for (XMLNode node : borders) borderKeys.push_back(fingerprint_of(node));
+    }
+
+    // An xf with its font, fill, border and number format resolved to their content
+    std::string xfKey(size_t xf) const {
+        XMLNode node = cellXfs[xf];
+        std::string key;
+        fingerprint(node, key, true);
+        const uint32_t numFmtId = node.attribute("numFmtId").as_uint();
+        auto custom = customFormats.find(numFmtId);
+        key += '\x1f';
+        key += custom != customFormats.end() ? custom->second : "#" + std::to_string(numFmtId);
+        key += '\x1f';
+        key += at(fontKeys, node.attribute("fontId").as_uint());
+        key += '\x1f';
+        key += at(fillKeys, node.attribute("fillId").as_uint());
+        key += '\x1f';
+        key += at(borderKeys, node.attribute("borderId").as_uint());
+        return key;
+    }
+
+    static const std::string& at(const std::vector<std::string>& keys, size_t index) {
+        static const std::string missing;
+        return index < keys.size() ? keys[index] : missing;
+    }
+
+    std::unordered_map<uint32_t, std::string> customFormats;
+    std::vector<XMLNode> fonts, fills, borders, cellXfs, dxfs;
+    std::vector<std::string> fontKeys, fillKeys, borderKeys;
+};
+
+// Source -> target style indices. Every target record is hashed once; source records
+// are resolved on first use and added to the target only when no equal record exists.
+class StyleRemap {
+   public:
+    StyleRemap(XLDocument& source, XLDocument& target)
+        : m_source(source), m_target(target), m_styles(target.styles()) {
+        index(m_fonts, m_target.fontKeys);
+        index(m_fills, m_target.fillKeys);
+        index(m_borders, m_target.borderKeys);
+        for (size_t i = 0; i < m_target.cellXfs.size(); ++i) {
+            m_xfs.emplace(m_target.xfKey(i), static_cast<uint32_t>(i));
+        }
+        for (size_t i = 0; i < m_target.dxfs.size(); ++i) {
+            m_dxfs.emplace(fingerprint_of(m_target.dxfs[i]), static_cast<uint32_t>(i));
+        }
+        m_xfMap.assign(m_source.cellXfs.size(), kUnmapped);
+        m_dxfMap.assign(m_source.dxfs.size(), kUnmapped);
+    }
+
+    uint32_t xf(uint32_t sourceXf) {
+        if (sourceXf >= m_xfMap.size()) return 0;
+        uint32_t& mapped = m_xfMap[sourceXf];
+        if (mapped != kUnmapped) return mapped;
+
+        std::string key = m_source.xfKey(sourceXf);
+        auto found = m_xfs.find(key);
+        if (found != m_xfs.end()) return mapped = found->second;
+
+        // A copy of the source xf pointing at the target's records
+        XMLNode source = m_source.cellXfs[sourceXf];
+        pugi::xml_document scratch;
+        XMLNode copy = scratch.append_copy(source);
+        set_reference(copy, "numFmtId", numberFormat(source.attribute("numFmtId").as_uint()));
+        set_reference(
+            copy, "fontId",
+            shared(m_fonts, m_source.fonts, m_source.fontKeys, source.attribute("fontId").as_uint(),
+                   [&](XMLNode node) { return m_styles.fonts().create(XLFont(node)); }));
+        set_reference(
+            copy, "fillId",
+            shared(m_fills, m_source.fills, m_source.fillKeys, source.attribute("fillId").as_uint(),
+                   [&](XMLNode node) { return m_styles.fills().create(XLFill(node)); }));
+        set_reference(copy, "borderId",
+                      shared(m_borders, m_source.borders, m_source.borderKeys,
+                             source.attribute("borderId").as_uint(), [&](XMLNode node) {
+                                 return m_styles.borders().create(XLBorder(node));
+                             }));
+        // Cell styles (cellStyleXfs) are not imported; fall back to Normal
+        if (!copy.attribute("xfId").empty()) copy.attribute("xfId").set_value(0);
+
+        mapped = static_cast<uint32_t>(m_styles.cellFormats().create(XLCellFormat(copy, true)));
+        m_xfs.emplace(std::move(key), mapped);
+        return mapped;
+    }
+
+    // Differential formats carry their font, fill and number format inline
+    uint32_t dxf(uint32_t sourceDxf) {
+        if (sourceDxf >= m_dxfMap.size()) return sourceDxf;
+        uint32_t& mapped = m_dxfMap[sourceDxf];
+        if (mapped != kUnmapped) return mapped;
+        XMLNode source = m_source.dxfs[sourceDxf];
+        std::string key = fingerprint_of(source);
+        auto found = m_dxfs.find(key);
+        if (found != m_dxfs.end()) return mapped = found->second;
+        mapped = static_cast<uint32_t>(m_styles.dxfs().create(XLDxf(source)));
+        m_dxfs.emplace(std::move(key), mapped);
+        return mapped;
+    }
+
+   private:
+    static constexpr uint32_t kUnmapped = UINT32_MAX;
+
+    static void index(std::unordered_map<std::string, uint32_t>& table,
+                      const std::vector<std::string>& keys) {
+        for (size_t i = 0; i < keys.size(); ++i) table.emplace(keys[i], static_cast<uint32_t>(i));
+    }
+
+    static void set_reference(XMLNode xf, const char* name, uint32_t value) {
+        auto attr = xf.attribute(name);
+        if (attr.empty()) attr = xf.append_attribute(name);
+        attr.set_value(value);
+    }
+
+    template <typename Create>
+    static uint32_t shared(std::unordered_map<std::string, uint32_t>& table,
+                           const std::vector<XMLNode>& nodes, const std::vector<std::string>& keys,
+                           uint32_t index, Create&& create) {
+        if (index >= nodes.size()) return 0;
+        auto found = table.find(keys[index]);
+        if (found != table.end()) return found->second;
+        auto created = static_cast<uint32_t>(create(nodes[index]));
+        table.emplace(keys[index], created);
+        return created;
+    }
+
+    // Built-in formats (no <numFmt> record) have the same id in every workbook
+    uint32_t numberFormat(uint32_t id) {
+        auto custom = m_source.customFormats.find(id);
+        if (custom == m_source.customFormats.end()) return id;
+        return m_styles.numberFormats().createNumberFormat(custom->second);
+    }
+
+    StyleRecords m_source;
+    StyleRecords m_target;
+    XLStyles& m_styles;
+    std::unordered_map<std::string, uint32_t> m_fonts, m_fills, m_borders, m_xfs, m_dxfs;
+    std::vector<uint32_t> m_xfMap, m_dxfMap;
+};
+
+// Source -> target shared string indices, resolved on first use
+class StringRemap {
+   public:
+    StringRemap(const XLSharedStrings& source, const XLSharedStrings& target)
+        : m_source(source), m_target(target), m_map(source.stringCount(), -1) {}
+
+    // -1 for an index the source does not have
+    int32_t operator()(int64_t index) {
+        if (index < 0 || index >= static_cast<int64_t>(m_map.size())) return -1;
+        int32_t& mapped = m_map[index];
+        if (mapped < 0)
+            mapped =
+                m_target.getOrCreateStringIndex(m_source.getString(static_cast<int32_t>(index)));
+        return mapped;
+    }
+
+   private:
+    const XLSharedStrings& m_source;
+    const XLSharedStrings& m_target;
+    std::vector<int32_t> m_map;
+};
+
+// The relationships of a worksheet part (created when the sheet has none yet)
+XLRelationships sheet_relationships(XLWorksheet& ws) {
+    const std::string sheetPath = get_xml_path(ws);
+    const std::string fileName = sheetPath.substr(sheetPath.find_last_of('/') + 1);
+    const auto sheetNo = static_cast<uint16_t>(std::strtoul(fileName.c_str() + 5, nullptr, 10));
+    return get_parent_doc(ws).sheetRelationships(sheetNo);
+}
+
+void remap_style(XMLNode node, const char* name, StyleRemap& styles) {
+    auto attr = node.attribute(name);
+    if (!attr.empty()) attr.set_value(styles.xf(attr.as_uint()));
+}
+
+void import_sheet_data(XMLNode sheetData, StyleRemap& styles, StringRemap& strings) {
+    for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();
+         row = row.next_sibling_of_type(pugi::node_element)) {
+        remap_style(row, "s", styles);
+        for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+             cell = cell.next_sibling_of_type(pugi::node_element)) {
+            // One pass over the attributes: style, type, and the cell and value metadata
+            // (dynamic arrays, rich values) that refer to metadata.xml, which is dropped
+            bool sharedString = false;
+            auto attr = cell.first_attribute();
+            while (!attr.empty()) {
+                auto next = attr.next_attribute();
+                const char* name = attr.name();
+                if (name[0] == 's' && name[1] == '\0') {
+                    attr.set_value(styles.xf(attr.as_uint()));
+                } else if (name[0] == 't' && name[1] == '\0') {
+                    sharedString = std::strcmp(attr.value(), "s") == 0;
+                } else if (std::strcmp(name, "cm") == 0 || std::strcmp(name, "vm") == 0) {
+                    cell.remove_attribute(attr);
+                }
+                attr = next;
+            }
+            if (!sharedString) continue;
+            XMLNode value = cell.child("v");
+            int32_t index = strings(value.text().as_llong(-1));
+            if (index >= 0) {
+                value.text().set(index);
+            } else {
+                cell.remove_attribute("t");
+                cell.remove_child(value);
+            }
+        }
+    }
+}
+
+// Namespace declarations (and their mc:Ignorable entries) the copied nodes may use
+void import_namespaces(XMLNode source, XMLNode target) {
+    for (auto attr = source.first_attribute(); !attr.empty(); attr = attr.next_attribute()) {
+        if (std::strncmp(attr.name(), "xmlns:", 6) == 0 && target.attribute(attr.name()).empty()) {
+            target.append_attribute(attr.name()).set_value(attr.value());
+        }
+    }
+    std::string_view sourceIgnorable = source.attribute("mc:Ignorable").value();
+    if (sourceIgnorable.empty()) return;
+    auto ignorable = target.attribute("mc:Ignorable");
+    if (ignorable.empty()) ignorable = target.append_attribute("mc:Ignorable");
+    std::string merged = ignorable.value();
+    std::string padded = " " + merged + " ";
+    size_t pos = 0;
+    while (pos < sourceIgnorable.size()) {
+        size_t end = sourceIgnorable.find(' ', pos);
+        if (end == std::string_view::npos) end = sourceIgnorable.size();
+        std::string prefix(sourceIgnorable.substr(pos, end - pos));
+        if (!prefix.empty() && padded.find(" " + prefix + " ") == std::string::npos) {
+            if (!merged.empty()) merged += ' ';
+            merged += prefix;
+            padded += prefix + " ";
+        }
+        pos = end + 1;
+    }
+    ignorable.set_value(merged.c_str());
+}
+
+void copy_worksheet(XLWorksheet& source, XLWorksheet& target, StyleRemap& styles,
+                    StringRemap& strings) {
+    XMLNode from = get_xml_doc(source).document_element();
+    XMLNode to = get_xml_doc(target).document_element();
+    import_namespaces(from, to);
+    to.remove_children();
+
+    for (XMLNode child = from.first_child_of_type(pugi::node_element); !child.empty();
+         child = child.next_sibling_of_type(pugi::node_element)) {
+        std::string_view tag = child.name();
+        if (refers_to_part(tag)) continue;
+        XMLNode copy = to.append_copy(child);
+
+        if (tag == "sheetData") {
+            import_sheet_data(copy, styles, strings);
+        } else if (tag == "cols") {
+            for (XMLNode col : copy.children("col")) remap_style(col, "style", styles);
+        } else if (tag == "sheetViews") {
+            for (XMLNode view : copy.children("sheetView")) view.remove_attribute("tabSelected");
+        } else if (tag == "conditionalFormatting") {
+            for (XMLNode rule : copy.children("cfRule")) {
+                auto dxfId = rule.attribute("dxfId");
+                if (!dxfId.empty()) dxfId.set_value(styles.dxf(dxfId.as_uint()));
+            }
+        } else if (tag == "hyperlinks") {
+            XLRelationships sourceLinks;
+            XLRelationships targetLinks;
+            XMLNode link = copy.child("hyperlink");
+            while (!link.empty()) {
+                XMLNode next = link.next_sibling("hyperlink");
+                auto id = link.attribute("r:id");
+                if (!id.empty()) {
+                    if (!sourceLinks.valid()) {
+                        sourceLinks = sheet_relationships(source);
+                        targetLinks = sheet_relationships(target);
+                    }
+                    std::string url = sourceLinks.relationshipById(id.value()).target();
+                    if (url.empty()) {
+                        copy.remove_child(link);
+                    } else {
+                        id.set_value(
+                            targetLinks.addRelationship(XLRelationshipType::Hyperlink, url, true)
+                                .id()
+                                .c_str());
+                    }
+                }
+                link = next;
+            }
+        } else if (tag == "pageSetup") {
+            copy.remove_attribute("r:id");  // printer settings part
+        } else if (tag == "extLst") {
+            XMLNode ext = copy.child("ext");
+            while (!ext.empty()) {
+                XMLNode next = ext.next_sibling("ext");
+                if (has_relationship_id(ext)) copy.remove_child(ext);
+                ext = next;
+            }
+        }
+    }
+}
+
+}  // namespace
+
+XLWorksheet import_sheet(XLWorkbook& target, XLWorksheet& source, const std::string& name) {
+    XLDocument& sourceDoc = get_parent_doc(source);
+    XLDocument& targetDoc = get_parent_doc(target);
+    target.addWorksheet(name);
+    try {
+        XLWorksheet sheet = target.worksheet(name);
+        StyleRemap styles(sourceDoc, targetDoc);
+        StringRemap strings(sourceDoc.sharedStrings(), targetDoc.sharedStrings());
+        copy_worksheet(source, sheet, styles, strings);
+    } catch (...) {
+        target.deleteSheet(name);
+        throw;
+    }
+    // A fresh object, so that merges and validations are read from the copied XML
+    return target.worksheet(name);
+}
@@ -0,0 +1,29 @@
+#ifndef PYOPENXLSX_SHEET_IMPORT_HPP
+#define PYOPENXLSX_SHEET_IMPORT_HPP
+
+/**
+ * @file sheet_import.hpp
+ * @brief Copy a worksheet from one workbook into another.
+ *
+ * XLWorkbook::cloneSheet only works inside one document. import_sheet copies
+ * the worksheet XML of any open workbook into a new sheet of the target with
+ * one pass over the copied nodes, rewriting what refers to workbook-level
+ * parts: cell, row and column style indices, shared string indices,
+ * conditional format dxf indices and external hyperlink relationships.
+ *
+ * Style indices are remapped through a table keyed by the content of each
+ * cell format (with its font, fill, border and number format resolved), so a
+ * source format that already exists in the target is reused and every
+ * distinct format is added only once.
+ */
+
+#include <string>
+
+#include "bindings.hpp"
+
+// Copy `source` into `target` as a new sheet named `name`. Drawings, comments,
+// tables and other parts the sheet refers to through relationships (besides
+// hyperlinks) are not copied.
+XLWorksheet import_sheet(XLWorkbook& target, XLWorksheet& source, const std::string& name);
+
+#endif  // PYOPENXLSX_SHEET_IMPORT_HPP
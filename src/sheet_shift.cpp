@@ -0,0 +1,556 @@
+#include "sheet_shift.hpp"
+
+#include <algorithm>
+#include <cstdlib>
+#include <cstring>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+
+#include "hyperlinks.hpp"
+#include "internal_access.hpp"
+#include "ref_shift.hpp"
+#include "sheet_xml.hpp"
+
+namespace {
+
+// Rewrite the text of a formula node (<f>, <formula>, <formula1> ...) in place
+void shift_formula_node(XMLNode node, const RefShiftContext& ctx) {
+    const char* text = node.text().get();
+    if (*text == '\0') return;
+    std::string shifted = shift_formula_refs(text, ctx);
+    if (shifted != text) node.text().set(shifted.c_str());
+}
+
+// Rewrite an attribute holding a single reference; returns false if it was deleted
+bool shift_ref_attribute(XMLNode node, const char* name, const RefShiftContext& ctx) {
+    auto attr = node.attribute(name);
+    if (attr.empty()) return true;
+    std::string shifted;
+    if (!shift_range_ref(attr.value(), ctx, shifted)) return false;
+    if (shifted != attr.value()) attr.set_value(shifted.c_str());
+    return true;
+}
+
+// A shared formula is stored once, on its master cell (<f t="shared" ref=".." si="N">text</f>);
+// the other cells of the range only carry <f t="shared" si="N"/>. When the master is about to
+// be deleted, the first surviving cell of the range takes over its text (moved to that cell)
+// and range. Runs before the shift, in the original numbering.
+void promote_shared_formula_masters(XMLNode sheetData, const RefShiftContext& ctx) {
+    const AxisShift& rows = ctx.rows;
+    const AxisShift& cols = ctx.cols;
+    if (!rows.has_deletions() && !cols.has_deletions()) return;
+    auto is_deleted = [&](uint32_t r, uint16_t c) {
+        return (!rows.empty() && rows.map(r) == 0) || (c != 0 && !cols.empty() && cols.map(c) == 0);
+    };
+    auto shared_formula = [](XMLNode cell) {
+        XMLNode formula = cell.child("f");
+        if (formula.empty() || std::strcmp(formula.attribute("t").value(), "shared") != 0) {
+            return XMLNode();
+        }
+        return formula;
+    };
+
+    struct Master {
+        std::string text;
+        std::string ref;
+        uint32_t row;
+        uint16_t col;
+        uint32_t firstRow;
+        uint32_t lastRow;
+        uint16_t firstCol;
+        uint16_t lastCol;
+    };
+    std::unordered_map<std::string, Master> orphaned;
+    for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();
+         row = row.next_sibling_of_type(pugi::node_element)) {
+        for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+             cell = cell.next_sibling_of_type(pugi::node_element)) {
+            XMLNode formula = shared_formula(cell);
+            if (formula.empty() || formula.attribute("ref").empty()) continue;
+            Master master;
+            if (!parse_cell_ref(cell.attribute("r").value(), master.row, master.col) ||
+                !is_deleted(master.row, master.col)) {
+                continue;
+            }
+            master.ref = formula.attribute("ref").value();
+            if (!parse_range_ref(master.ref, master.firstRow, master.firstCol, master.lastRow,
+                                 master.lastCol)) {
+                continue;
+            }
+            master.text = formula.text().get();
+            orphaned.emplace(formula.attribute("si").value(), std::move(master));
+        }
+    }
+    if (orphaned.empty()) return;
+
+    for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();
+         row = row.next_sibling_of_type(pugi::node_element)) {
+        for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+             cell = cell.next_sibling_of_type(pugi::node_element)) {
+            XMLNode formula = shared_formula(cell);
+            if (formula.empty() || !formula.attribute("ref").empty()) continue;
+            auto it = orphaned.find(formula.attribute("si").value());
+            if (it == orphaned.end()) continue;
+            const Master& master = it->second;
+            uint32_t r = 0;
+            uint16_t c = 0;
+            if (!parse_cell_ref(cell.attribute("r").value(), r, c) || is_deleted(r, c) ||
+                r < master.firstRow || r > master.lastRow || c < master.firstCol ||
+                c > master.lastCol) {
+                continue;
+            }
+            std::string text =
+                translate_formula_refs(master.text, int64_t{r} - master.row,
+                                       int64_t{c} - master.col, rows.limit(), cols.limit());
+            formula.text().set(text.c_str());
+            formula.insert_attribute_after("ref", formula.attribute("t"))
+                .set_value(master.ref.c_str());
+            orphaned.erase(it);
+            if (orphaned.empty()) return;
+        }
+    }
+}
+
+// Cells, formulas and row/column records of the sheet itself: one pass over <sheetData>
+void shift_sheet_data(XLWorksheet& ws, const RefShiftContext& ctx) {
+    const AxisShift& rows = ctx.rows;
+    const AxisShift& cols = ctx.cols;
+    XMLNode sheetData = sheet_data_node(ws);
+    if (sheetData.empty()) return;
+    promote_shared_formula_masters(sheetData, ctx);
+
+    XMLNode rowNode = sheetData.first_child_of_type(pugi::node_element);
+    while (!rowNode.empty()) {
+        XMLNode nextRow = rowNode.next_sibling_of_type(pugi::node_element);
+        uint32_t r = rowNode.attribute("r").as_uint();
+        uint32_t newRow = rows.empty() ? r : rows.map(r);
+        if (newRow == 0) {
+            sheetData.remove_child(rowNode);
+            rowNode = nextRow;
+            continue;
+        }
+        if (newRow != r) rowNode.attribute("r").set_value(newRow);
+        if (!cols.empty()) rowNode.remove_attribute("spans");
+
+        XMLNode cellNode = rowNode.first_child_of_type(pugi::node_element);
+        while (!cellNode.empty()) {
+            XMLNode nextCell = cellNode.next_sibling_of_type(pugi::node_element);
+            uint16_t c = cell_ref_column(cellNode.attribute("r").value());
+            uint32_t newCol = (cols.empty() || c == 0) ? c : cols.map(c);
+            if (c != 0 && newCol == 0) {
+                rowNode.remove_child(cellNode);
+                cellNode = nextCell;
+                continue;
+            }
+            if (c != 0 && (newRow != r || newCol != c)) {
+                cellNode.attribute("r").set_value(
+                    make_cell_ref(newRow, static_cast<uint16_t>(newCol)).c_str());
+            }
+            XMLNode formula = cellNode.child("f");
+            if (!formula.empty()) {
+                shift_formula_node(formula, ctx);
+                if (!shift_ref_attribute(formula, "ref", ctx)) formula.remove_attribute("ref");
+            }
+            cellNode = nextCell;
+        }
+        rowNode = nextRow;
+    }
+}
+
+// <cols> spans only move when columns are shifted
+void shift_column_records(XLWorksheet& ws, const AxisShift& cols) {
+    if (cols.empty()) return;
+    XMLNode colsNode = get_xml_doc(ws).document_element().child("cols");
+    if (colsNode.empty()) return;
+    XMLNode col = colsNode.first_child_of_type(pugi::node_element);
+    while (!col.empty()) {
+        XMLNode next = col.next_sibling_of_type(pugi::node_element);
+        uint32_t first = 0;
+        uint32_t last = 0;
+        if (!cols.map_span(col.attribute("min").as_uint(), col.attribute("max").as_uint(), first,
+                           last)) {
+            colsNode.remove_child(col);
+        } else {
+            col.attribute("min").set_value(first);
+            col.attribute("max").set_value(last);
+        }
+        col = next;
+    }
+    if (colsNode.first_child_of_type(pugi::node_element).empty()) {
+        get_xml_doc(ws).document_element().remove_child(colsNode);
+    }
+}
+
+// <filterColumn colId> counts from the first column of the filter range, which moves from
+// `firstCol` to `newFirstCol`; filters on deleted columns are dropped
+void shift_filter_columns(XMLNode autoFilter, uint16_t firstCol, uint32_t newFirstCol,
+                          const AxisShift& cols) {
+    if (cols.empty()) return;
+    XMLNode filter = autoFilter.child("filterColumn");
+    while (!filter.empty()) {
+        XMLNode next = filter.next_sibling("filterColumn");
+        const uint32_t newCol = cols.map(firstCol + filter.attribute("colId").as_uint());
+        if (newCol < newFirstCol) {
+            autoFilter.remove_child(filter);
+        } else {
+            filter.attribute("colId").set_value(newCol - newFirstCol);
+        }
+        filter = next;
+    }
+}
+
+// Rewrite an <autoFilter> range with its filter columns; returns false if it was deleted
+bool shift_auto_filter(XMLNode autoFilter, const RefShiftContext& ctx) {
+    uint32_t firstRow = 0;
+    uint32_t lastRow = 0;
+    uint16_t firstCol = 0;
+    uint16_t lastCol = 0;
+    const bool parsed =
+        parse_range_ref(autoFilter.attribute("ref").value(), firstRow, firstCol, lastRow, lastCol);
+    if (!shift_ref_attribute(autoFilter, "ref", ctx)) return false;
+    if (!parsed) return true;
+    uint32_t newFirstCol = 0;
+    uint32_t newLastCol = 0;
+    if (ctx.cols.map_span(firstCol, lastCol, newFirstCol, newLastCol)) {
+        shift_filter_columns(autoFilter, firstCol, newFirstCol, ctx.cols);
+    }
+    return true;
+}
+
+// Sheet-level XML parts that are not cached by OpenXLSX wrappers
+void shift_sheet_parts(XLWorksheet& ws, const RefShiftContext& ctx) {
+    XMLNode root = get_xml_doc(ws).document_element();
+
+    XMLNode dimension = root.child("dimension");
+    if (!dimension.empty() && !shift_ref_attribute(dimension, "ref", ctx)) {
+        dimension.attribute("ref").set_value("A1");
+    }
+
+    XMLNode autoFilter = root.child("autoFilter");
+    if (!autoFilter.empty() && !shift_auto_filter(autoFilter, ctx)) {
+        root.remove_child(autoFilter);
+    }
+
+    // Conditional formatting: sqref plus any references inside rule formulas
+    XMLNode cf = root.child("conditionalFormatting");
+    while (!cf.empty()) {
+        XMLNode next = cf.next_sibling("conditionalFormatting");
+        std::string sqref = shift_sqref(cf.attribute("sqref").value(), ctx);
+        if (sqref.empty()) {
+            root.remove_child(cf);
+        } else {
+            cf.attribute("sqref").set_value(sqref.c_str());
+            for (XMLNode rule = cf.child("cfRule"); !rule.empty();
+                 rule = rule.next_sibling("cfRule")) {
+                for (XMLNode formula = rule.child("formula"); !formula.empty();
+                     formula = formula.next_sibling("formula")) {
+                    shift_formula_node(formula, ctx);
+                }
+            }
+        }
+        cf = next;
+    }
+
+    // Data validation formulas (the sqref is updated through XLDataValidations)
+    XMLNode validations = root.child("dataValidations");
+    for (XMLNode dv = validations.child("dataValidation"); !dv.empty();
+         dv = dv.next_sibling("dataValidation")) {
+        shift_formula_node(dv.child("formula1"), ctx);
+        shift_formula_node(dv.child("formula2"), ctx);
+    }
+
+    XMLNode hyperlinks = root.child("hyperlinks");
+    if (!hyperlinks.empty()) {
+        std::vector<std::string> removedIds;
+        XMLNode link = hyperlinks.child("hyperlink");
+        while (!link.empty()) {
+            XMLNode next = link.next_sibling("hyperlink");
+            if (!shift_ref_attribute(link, "ref", ctx)) {
+                if (XMLAttribute id = link.attribute("r:id"); !id.empty()) {
+                    removedIds.emplace_back(id.value());
+                }
+                hyperlinks.remove_child(link);
+            }
+            link = next;
+        }
+        if (hyperlinks.child("hyperlink").empty()) root.remove_child(hyperlinks);
+        // Relationships of the removed links would otherwise be left behind in the sheet .rels
+        remove_hyperlink_relationships(ws, removedIds);
+    }
+}
+
+void shift_merges(XLWorksheet& ws, const RefShiftContext& ctx) {
+    XLMergeCells& merges = ws.merges();
+    const auto count = static_cast<int32_t>(merges.count());
+    if (count == 0) return;
+
+    std::vector<std::string> updated;
+    updated.reserve(static_cast<size_t>(count));
+    bool changed = false;
+    std::string shifted;
+    for (int32_t i = 0; i < count; ++i) {
+        std::string ref = merges.merge(i);
+        if (!shift_range_ref(ref, ctx, shifted) || shifted.find(':') == std::string::npos) {
+            changed = true;  // deleted, or collapsed to a single cell
+            continue;
+        }
+        changed = changed || shifted != ref;
+        updated.push_back(shifted);
+    }
+    if (!changed) return;
+
+    merges.deleteAll();
+    for (const auto& ref : updated) merges.appendMerge(ref);
+}
+
+void shift_data_validations(XLWorksheet& ws, const RefShiftContext& ctx) {
+    XLDataValidations& validations = ws.dataValidations();
+    for (size_t i = validations.count(); i-- > 0;) {
+        XLDataValidation dv = validations.at(i);
+        std::string sqref = dv.sqref();
+        std::string shifted = shift_sqref(sqref, ctx);
+        if (shifted.empty()) {
+            validations.remove(i);
+        } else if (shifted != sqref) {
+            dv.setSqref(shifted);
+        }
+    }
+}
+
+// The relationships of a worksheet part (created when the sheet has none yet)
+XLRelationships sheet_relationships(XLWorksheet& ws) {
+    const std::string sheetPath = get_xml_path(ws);
+    const std::string fileName = sheetPath.substr(sheetPath.find_last_of('/') + 1);
+    const auto sheetNo = static_cast<uint16_t>(std::strtoul(fileName.c_str() + 5, nullptr, 10));
+    return get_parent_doc(ws).sheetRelationships(sheetNo);
+}
+
+// Drop the part at `path` ("xl/tables/table1.xml") from the document. OpenXLSX has no call
+// for this; deleting a sheet removes the part, content type and cached XML that a workbook
+// relationship points at, so a temporary relationship is pointed at the part instead.
+void remove_part(XLDocument& doc, const std::string& path) {
+    if (path.rfind("xl/", 0) != 0) return;
+    XLRelationshipItem rel =
+        doc.workbookRelationships().addRelationship(XLRelationshipType::Table, path.substr(3));
+    doc.execCommand(XLCommand(XLCommandType::DeleteSheet)
+                        .setParam("sheetID", rel.id())
+                        .setParam("sheetName", std::string()));
+}
+
+// Keep the <tableColumn>s in step with the sheet columns: columns deleted from the table
+// lose their entry, and columns inserted inside it get one named "Column<n>" like Excel's,
+// which is also written to the (new, blank) header cell when the table has a header row
+void shift_table_columns(XLWorksheet& ws, XMLNode table, uint16_t firstCol, uint16_t lastCol,
+                         uint32_t newFirstCol, uint32_t newLastCol, uint32_t headerRow,
+                         const AxisShift& cols) {
+    XMLNode columns = table.child("tableColumns");
+    std::vector<XMLNode> entries;
+    std::unordered_set<std::string> names;
+    uint32_t nextId = 1;
+    for (XMLNode column = columns.child("tableColumn"); !column.empty();
+         column = column.next_sibling("tableColumn")) {
+        entries.push_back(column);
+        names.emplace(column.attribute("name").value());
+        nextId = std::max(nextId, column.attribute("id").as_uint() + 1);
+    }
+    if (entries.size() != size_t{lastCol} - firstCol + 1u) return;
+
+    uint32_t nameNo = 1;
+    auto insert_blank = [&](XMLNode before, uint32_t col) {
+        std::string name;
+        do {
+            name = "Column" + std::to_string(nameNo++);
+        } while (!names.insert(name).second);
+        XMLNode column = before.empty() ? columns.append_child("tableColumn")
+                                        : columns.insert_child_before("tableColumn", before);
+        column.append_attribute("id").set_value(nextId++);
+        column.append_attribute("name").set_value(name.c_str());
+        if (headerRow != 0) ws.cell(headerRow, static_cast<uint16_t>(col)).value() = name;
+    };
+
+    uint32_t previous = newFirstCol - 1;  // new position of the last column kept so far
+    for (size_t i = 0; i < entries.size(); ++i) {
+        const uint32_t newCol = cols.map(firstCol + static_cast<uint32_t>(i));
+        if (newCol == 0) {
+            columns.remove_child(entries[i]);
+            continue;
+        }
+        while (++previous < newCol) insert_blank(entries[i], previous);
+    }
+    while (++previous <= newLastCol) insert_blank(XMLNode(), previous);
+
+    size_t count = 0;
+    for (XMLNode column = columns.child("tableColumn"); !column.empty();
+         column = column.next_sibling("tableColumn")) {
+        ++count;
+    }
+    columns.attribute("count").set_value(count);
+}
+
+// Move a table with the sheet rows and columns. Returns false when the table has to be
+// removed: all of its cells, or its header row, were deleted.
+bool shift_table(XLWorksheet& ws, XLTable& table, const RefShiftContext& ctx) {
+    XMLNode node = get_xml_doc(table).document_element();
+    const std::string ref = node.attribute("ref").value();
+    uint32_t firstRow = 0;
+    uint32_t lastRow = 0;
+    uint16_t firstCol = 0;
+    uint16_t lastCol = 0;
+    if (!parse_range_ref(ref, firstRow, firstCol, lastRow, lastCol)) return true;
+    std::string shifted;
+    if (!shift_range_ref(ref, ctx, shifted)) return false;
+    const bool header = table.showHeaderRow();
+    if (header && !ctx.rows.empty() && ctx.rows.map(firstRow) == 0) return false;
+
+    uint32_t newFirstRow = 0;
+    uint32_t newLastRow = 0;
+    uint16_t newFirstCol = 0;
+    uint16_t newLastCol = 0;
+    parse_range_ref(shifted, newFirstRow, newFirstCol, newLastRow, newLastCol);
+    uint32_t totals = node.attribute("totalsRowCount").as_uint();
+    if (totals != 0 && !ctx.rows.empty() && ctx.rows.map(lastRow) == 0) {
+        node.remove_attribute("totalsRowCount");
+        totals = 0;
+    }
+    // Like Excel, keep one data row below the header when all of them were deleted
+    if (header && totals == 0 && newLastRow == newFirstRow && newLastRow < kExcelMaxRows) {
+        ++newLastRow;
+    }
+
+    if (!ctx.cols.empty()) {
+        shift_table_columns(ws, node, firstCol, lastCol, newFirstCol, newLastCol,
+                            header ? newFirstRow : 0, ctx.cols);
+    }
+    const std::string newRef =
+        make_cell_ref(newFirstRow, newFirstCol) + ":" + make_cell_ref(newLastRow, newLastCol);
+    if (newRef != ref) node.attribute("ref").set_value(newRef.c_str());
+
+    // The table's filter covers the table without its totals row
+    XMLNode autoFilter = node.child("autoFilter");
+    if (!autoFilter.empty()) {
+        shift_filter_columns(autoFilter, firstCol, newFirstCol, ctx.cols);
+        const std::string filterRef = make_cell_ref(newFirstRow, newFirstCol) + ":" +
+                                      make_cell_ref(newLastRow - totals, newLastCol);
+        autoFilter.attribute("ref").set_value(filterRef.c_str());
+    }
+    return true;
+}
+
+void shift_tables(XLWorksheet& ws, const RefShiftContext& ctx) {
+    XMLNode root = get_xml_doc(ws).document_element();
+    XMLNode tableParts = root.child("tableParts");
+    if (tableParts.empty()) return;
+
+    XLTables& tables = ws.tables();
+    std::unordered_map<std::string, XLTable> byPath;
+    for (size_t i = 0; i < tables.count(); ++i) {
+        XLTable table = tables[i];
+        byPath.emplace(get_xml_path(table), table);
+    }
+
+    XLDocument& doc = get_parent_doc(ws);
+    XLRelationships rels = sheet_relationships(ws);
+    const std::string sheetPath = get_xml_path(ws);
+    const std::string sheetDir = sheetPath.substr(0, sheetPath.find_last_of('/') + 1);
+    bool removed = false;
+    XMLNode part = tableParts.child("tablePart");
+    while (!part.empty()) {
+        XMLNode next = part.next_sibling("tablePart");
+        const std::string id = part.attribute("r:id").value();
+        if (rels.idExists(id)) {
+            // Resolved as in XLTableCollection::load
+            const std::string target = rels.relationshipById(id).target();
+            std::string path = eliminateDotAndDotDotFromPath(
+                !target.empty() && target.front() == '/' ? target : sheetDir + target);
+            if (!path.empty() && path.front() == '/') path.erase(0, 1);
+            auto it = byPath.find(path);
+            if (it != byPath.end() && !shift_table(ws, it->second, ctx)) {
+                tableParts.remove_child(part);
+                rels.deleteRelationship(id);
+                remove_part(doc, path);
+                removed = true;
+            }
+        }
+        part = next;
+    }
+    if (!removed) return;
+
+    size_t count = 0;
+    for (XMLNode p = tableParts.child("tablePart"); !p.empty(); p = p.next_sibling("tablePart")) {
+        ++count;
+    }
+    if (count == 0) {
+        root.remove_child(tableParts);
+    } else {
+        tableParts.attribute("count").set_value(count);
+    }
+    // The collection caches the tables it loaded, including the removed ones
+    tables = XLTables(root, &ws);
+}
+
+// Defined names and formulas on other sheets that point at this sheet
+void shift_workbook_references(XLWorksheet& ws, const AxisShift& rows, const AxisShift& cols) {
+    XLDocument& doc = get_parent_doc(ws);
+    XLWorkbook wb = doc.workbook();
+    const std::string sheetName = ws.name();
+    RefShiftContext external{rows, cols, sheetName, false};
+
+    auto&& definedNames = wb.definedNames();
+    for (auto& name : definedNames.all()) {
+        std::string refersTo = name.refersTo();
+        std::string shifted = shift_formula_refs(refersTo, external);
+        if (shifted != refersTo) name.setRefersTo(shifted);
+    }
+
+    for (const auto& otherName : wb.worksheetNames()) {
+        if (otherName == sheetName) continue;
+        XLWorksheet other = wb.worksheet(otherName);
+        XMLNode sheetData = sheet_data_node(other);
+        for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();
+             row = row.next_sibling_of_type(pugi::node_element)) {
+            for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+                 cell = cell.next_sibling_of_type(pugi::node_element)) {
+                XMLNode formula = cell.child("f");
+                if (!formula.empty()) shift_formula_node(formula, external);
+            }
+        }
+    }
+}
+
+void apply_shift(XLWorksheet& ws, const AxisShift& rows, const AxisShift& cols) {
+    if (rows.empty() && cols.empty()) return;
+    RefShiftContext local{rows, cols, ws.name(), true};
+
+    shift_sheet_data(ws, local);
+    shift_column_records(ws, cols);
+    shift_sheet_parts(ws, local);
+    shift_merges(ws, local);
+    shift_data_validations(ws, local);
+    shift_tables(ws, local);
+    shift_workbook_references(ws, rows, cols);
+}
+
+}  // namespace
+
+void shift_sheet_rows(XLWorksheet& ws, std::vector<uint32_t> deleted,
+                      std::vector<std::pair<uint32_t, uint32_t>> inserted) {
+    for (auto r : deleted) Expects(r >= 1 && r <= kExcelMaxRows);
+    for (const auto& ins : inserted) Expects(ins.first >= 1 && ins.first <= kExcelMaxRows);
+
+    py::gil_scoped_release release;
+    AxisShift rows(std::move(deleted), std::move(inserted), kExcelMaxRows);
+    AxisShift cols({}, {}, kExcelMaxCols);
+    apply_shift(ws, rows, cols);
+}
+
+void shift_sheet_columns(XLWorksheet& ws, std::vector<uint32_t> deleted,
+                         std::vector<std::pair<uint32_t, uint32_t>> inserted) {
+    for (auto c : deleted) Expects(c >= 1 && c <= kExcelMaxCols);
+    for (const auto& ins : inserted) Expects(ins.first >= 1 && ins.first <= kExcelMaxCols);
+
+    py::gil_scoped_release release;
+    AxisShift rows({}, {}, kExcelMaxRows);
+    AxisShift cols(std::move(deleted), std::move(inserted), kExcelMaxCols);
+    apply_shift(ws, rows, cols);
+}
@@ -0,0 +1,18 @@
+#ifndef PYOPENXLSX_SHEET_SHIFT_HPP
+#define PYOPENXLSX_SHEET_SHIFT_HPP
+
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+#include "bindings.hpp"
+
+// Batch row/column deletion and insertion.
+// `deleted` and `inserted` use the original numbering; `inserted` holds (index, count) pairs
+// meaning "insert count blank rows/columns before index".
+void shift_sheet_rows(XLWorksheet& ws, std::vector<uint32_t> deleted,
+                      std::vector<std::pair<uint32_t, uint32_t>> inserted);
+void shift_sheet_columns(XLWorksheet& ws, std::vector<uint32_t> deleted,
+                         std::vector<std::pair<uint32_t, uint32_t>> inserted);
+
+#endif  // PYOPENXLSX_SHEET_SHIFT_HPP
@@ -0,0 +1,132 @@
+#ifndef PYOPENXLSX_SHEET_XML_HPP
+#define PYOPENXLSX_SHEET_XML_HPP
+
+/**
+ * @file sheet_xml.hpp
+ * @brief Read-only helpers for walking a worksheet's <sheetData> XML directly.
+ *
+ * The bulk APIs use these instead of materialising XLCell objects when all they
+ * need is an attribute (such as the "s" style index) for a rectangular block.
+ * Rows and cells are stored in ascending order, so every walk is a single
+ * forward pass over the nodes that intersect the requested block.
+ */
+
+#include <cstdint>
+#include <string>
+
+#include "internal_access.hpp"
+
+// Parse "AB12" / "$AB$12" into 1-based row/column. Returns false on malformed input.
+inline bool parse_cell_ref(const char* ref, uint32_t& row, uint16_t& col) {
+    uint32_t c = 0;
+    uint32_t r = 0;
+    const char* p = ref;
+    if (*p == '$') ++p;
+    while (*p >= 'A' && *p <= 'Z') {
+        c = c * 26 + static_cast<uint32_t>(*p - 'A' + 1);
+        if (c > kExcelMaxCols) return false;
+        ++p;
+    }
+    if (*p == '$') ++p;
+    while (*p >= '0' && *p <= '9') {
+        r = r * 10 + static_cast<uint32_t>(*p - '0');
+        if (r > kExcelMaxRows) return false;
+        ++p;
+    }
+    if (*p != '\0' || r == 0 || c == 0) return false;
+    row = r;
+    col = static_cast<uint16_t>(c);
+    return true;
+}
+
+// Column number (1-based) of a cell reference such as "AB12"; 0 when malformed.
+inline uint16_t cell_ref_column(const char* ref) {
+    uint32_t c = 0;
+    for (const char* p = ref; *p >= 'A' && *p <= 'Z'; ++p) {
+        c = c * 26 + static_cast<uint32_t>(*p - 'A' + 1);
+        if (c > kExcelMaxCols) return 0;
+    }
+    return static_cast<uint16_t>(c);
+}
+
+inline std::string column_letters(uint16_t col) {
+    std::string letters;
+    while (col > 0) {
+        auto rem = static_cast<char>((col - 1) % 26);
+        letters.insert(letters.begin(), static_cast<char>('A' + rem));
+        col = static_cast<uint16_t>((col - 1) / 26);
+    }
+    return letters;
+}
+
+inline std::string make_cell_ref(uint32_t row, uint16_t col) {
+    return column_letters(col) + std::to_string(row);
+}
+
+// Parse "A1:C3" (or a single cell "B2") into an inclusive block. Returns false on malformed input.
+inline bool parse_range_ref(const std::string& ref, uint32_t& firstRow, uint16_t& firstCol,
+                            uint32_t& lastRow, uint16_t& lastCol) {
+    const auto colon = ref.find(':');
+    if (colon == std::string::npos) {
+        if (!parse_cell_ref(ref.c_str(), firstRow, firstCol)) return false;
+        lastRow = firstRow;
+        lastCol = firstCol;
+        return true;
+    }
+    if (!parse_cell_ref(ref.substr(0, colon).c_str(), firstRow, firstCol) ||
+        !parse_cell_ref(ref.c_str() + colon + 1, lastRow, lastCol)) {
+        return false;
+    }
+    return firstRow <= lastRow && firstCol <= lastCol;
+}
+
+inline XMLNode sheet_data_node(XLWorksheet& ws) {
+    return get_xml_doc(ws).document_element().child("sheetData");
+}
+
+// The <row> node for `row`, or an empty node; searches from whichever end is nearer.
+inline XMLNode find_row_node(XMLNode sheetData, uint32_t row) {
+    XMLNode node = sheetData.last_child_of_type(pugi::node_element);
+    if (node.empty()) return {};
+    const uint32_t last = node.attribute("r").as_uint();
+    if (row > last) return {};
+    if (last - row < row) {
+        while (!node.empty() && node.attribute("r").as_uint() > row) {
+            node = node.previous_sibling_of_type(pugi::node_element);
+        }
+    } else {
+        node = sheetData.first_child_of_type(pugi::node_element);
+        while (!node.empty() && node.attribute("r").as_uint() < row) {
+            node = node.next_sibling_of_type(pugi::node_element);
+        }
+    }
+    return !node.empty() && node.attribute("r").as_uint() == row ? node : XMLNode{};
+}
+
+/**
+ * Visit every <c> node inside the block [startRow, endRow] x [startCol, endCol].
+ * The callback receives (row, col, cellNode). Cells are visited in row-major order.
+ */
+template <typename Fn>
+void for_each_cell_node(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, uint32_t endRow,
+                        uint16_t endCol, Fn&& fn) {
+    XMLNode sheetData = sheet_data_node(ws);
+    if (sheetData.empty()) return;
+
+    for (XMLNode rowNode = sheetData.first_child_of_type(pugi::node_element); !rowNode.empty();
+         rowNode = rowNode.next_sibling_of_type(pugi::node_element)) {
+        uint32_t r = rowNode.attribute("r").as_uint();
+        if (r < startRow) continue;
+        if (r > endRow) break;
+
+        for (XMLNode cellNode = rowNode.first_child_of_type(pugi::node_element); !cellNode.empty();
+             cellNode = cellNode.next_sibling_of_type(pugi::node_element)) {
+            uint16_t c = cell_ref_column(cellNode.attribute("r").value());
+            if (c < startCol) continue;
+            if (c > endCol) break;
+            fn(r, c, cellNode);
+        }
+    }
+}
+
+#endif  // PYOPENXLSX_SHEET_XML_HPP
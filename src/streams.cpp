@@ -1,5 +1,6 @@
 #include "bindings.hpp"
 #include "internal_access.hpp"
+#include "sheet_concat.hpp"
 
 void init_streams(py::module_& m) {
     py::class_<XLStreamWriter>(m, "XLStreamWriter")
@@ -97,4 +98,18 @@ void init_streams(py::module_& m) {
             }
             return result;
         });
+
+    m.def(
+        "concat_sheets",
+        [](const std::vector<std::string>& paths, const std::string& output,
+           const std::string& sheet, const std::string& outputSheet, bool headerFirst,
+           const std::string& sourceColumn, size_t workers) {
+            ConcatOptions options{sheet, outputSheet, headerFirst, sourceColumn, workers};
+            py::gil_scoped_release release;
+            return concat_sheets(paths, output, options);
+        },
+        py::arg("paths"), py::arg("output"), py::arg("sheet") = "", py::arg("output_sheet") = "",
+        py::arg("header_first") = true, py::arg("source_column") = "", py::arg("workers") = 0,
+        "Append the rows of one sheet of every input file into a new workbook; returns the "
+        "number of rows written");
 }
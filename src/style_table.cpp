@@ -0,0 +1,48 @@
+#include "style_table.hpp"
+
+#include <unordered_map>
+
+StyleTable::StyleTable(XLStyles& styles) {
+    std::unordered_map<uint32_t, std::string> customCodes;
+    XLNumberFormats& numberFormats = styles.numberFormats();
+    for (size_t i = 0; i < numberFormats.count(); ++i) {
+        XLNumberFormat format = numberFormats[static_cast<XLStyleIndex>(i)];
+        customCodes.emplace(format.numberFormatId(), format.formatCode());
+    }
+
+    XLCellFormats& cellFormats = styles.cellFormats();
+    const size_t count = cellFormats.count();
+    m_numFmtIds.reserve(count);
+    m_fonts.reserve(count);
+    m_fills.reserve(count);
+    m_borders.reserve(count);
+    m_categories.reserve(count);
+    m_codeIndex.reserve(count);
+
+    // Each distinct numFmtId is resolved and classified once
+    std::unordered_map<uint32_t, uint32_t> codeSlots;
+    std::vector<NumberFormatCategory> codeCategories;
+    for (size_t xf = 0; xf < count; ++xf) {
+        XLCellFormat format = cellFormats[xf];
+        const uint32_t numFmtId = format.numberFormatId();
+        m_numFmtIds.push_back(numFmtId);
+        m_fonts.push_back(format.fontIndex());
+        m_fills.push_back(format.fillIndex());
+        m_borders.push_back(format.borderIndex());
+
+        auto slot = codeSlots.find(numFmtId);
+        if (slot == codeSlots.end()) {
+            auto custom = customCodes.find(numFmtId);
+            std::string code = custom != customCodes.end()
+                                   ? custom->second
+                                   : std::string(builtin_number_format(numFmtId));
+            if (code == "General") code.clear();
+            codeCategories.push_back(code.empty() ? NumberFormatCategory::General
+                                                  : classify_number_format(code));
+            m_codes.push_back(std::move(code));
+            slot = codeSlots.emplace(numFmtId, static_cast<uint32_t>(m_codes.size() - 1)).first;
+        }
+        m_codeIndex.push_back(slot->second);
+        m_categories.push_back(codeCategories[slot->second]);
+    }
+}
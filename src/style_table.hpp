@@ -0,0 +1,66 @@
+#ifndef PYOPENXLSX_STYLE_TABLE_HPP
+#define PYOPENXLSX_STYLE_TABLE_HPP
+
+/**
+ * @file style_table.hpp
+ * @brief Flat per-cell-format (xf) lookup vectors built once from the workbook styles.
+ *
+ * Reading a cell's number format, font, fill or border through XLStyles walks the
+ * styles XML on every call. StyleTable resolves every xf once: numFmtId, font/fill/
+ * border indices, the effective format code (custom or built-in) and its category.
+ * Lookups for an xf outside the table report the defaults (index 0, "General").
+ */
+
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include "bindings.hpp"
+#include "number_format.hpp"
+
+class StyleTable {
+   public:
+    explicit StyleTable(XLStyles& styles);
+
+    size_t size() const { return m_numFmtIds.size(); }
+
+    uint32_t number_format_id(uint32_t xf) const { return get(m_numFmtIds, xf); }
+    uint32_t font_index(uint32_t xf) const { return get(m_fonts, xf); }
+    uint32_t fill_index(uint32_t xf) const { return get(m_fills, xf); }
+    uint32_t border_index(uint32_t xf) const { return get(m_borders, xf); }
+    NumberFormatCategory category(uint32_t xf) const {
+        return xf < size() ? m_categories[xf] : NumberFormatCategory::General;
+    }
+    bool is_date(uint32_t xf) const { return is_date_category(category(xf)); }
+    // Effective format code; empty for General
+    std::string_view format_code(uint32_t xf) const {
+        return xf < size() ? std::string_view(m_codes[m_codeIndex[xf]]) : std::string_view();
+    }
+
+    const std::vector<uint32_t>& number_format_ids() const { return m_numFmtIds; }
+    const std::vector<uint32_t>& font_indices() const { return m_fonts; }
+    const std::vector<uint32_t>& fill_indices() const { return m_fills; }
+    const std::vector<uint32_t>& border_indices() const { return m_borders; }
+    const std::vector<NumberFormatCategory>& categories() const { return m_categories; }
+
+    static bool is_date_category(NumberFormatCategory category) {
+        return category == NumberFormatCategory::Date || category == NumberFormatCategory::Time ||
+               category == NumberFormatCategory::DateTime;
+    }
+
+   private:
+    static uint32_t get(const std::vector<uint32_t>& values, uint32_t xf) {
+        return xf < values.size() ? values[xf] : 0;
+    }
+
+    std::vector<uint32_t> m_numFmtIds;
+    std::vector<uint32_t> m_fonts;
+    std::vector<uint32_t> m_fills;
+    std::vector<uint32_t> m_borders;
+    std::vector<NumberFormatCategory> m_categories;
+    std::vector<uint32_t> m_codeIndex;  // xf -> m_codes
+    std::vector<std::string> m_codes;   // one entry per distinct numFmtId in use
+};
+
+#endif  // PYOPENXLSX_STYLE_TABLE_HPP
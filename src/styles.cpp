@@ -1,4 +1,24 @@
+#include <nanobind/ndarray.h>
+
+#include <memory>
+
 #include "bindings.hpp"
+#include "style_table.hpp"
+
+namespace {
+
+// Copy a lookup vector into a new 1D numpy array
+template <typename T, typename Source>
+py::ndarray<py::numpy, T, py::shape<-1>> to_numpy(const std::vector<Source>& values) {
+    auto data = std::make_unique<T[]>(values.size());
+    for (size_t i = 0; i < values.size(); ++i) data[i] = static_cast<T>(values[i]);
+    T* ptr = data.release();
+    py::capsule owner(ptr, [](void* p) noexcept { delete[] static_cast<T*>(p); });
+    size_t shape[1] = {values.size()};
+    return py::ndarray<py::numpy, T, py::shape<-1>>(ptr, 1, shape, owner);
+}
+
+}  // namespace
 
 void init_styles(py::module_& m) {
     // Bind Style Enums
@@ -267,4 +287,61 @@ void init_styles(py::module_& m) {
         .def("border", &XLDxf::border)
         .def("has_font", &XLDxf::hasFont)
         .def("summary", &XLDxf::summary);
+
+    py::enum_<NumberFormatCategory>(m, "XLNumberFormatCategory")
+        .value("General", NumberFormatCategory::General)
+        .value("Number", NumberFormatCategory::Number)
+        .value("Currency", NumberFormatCategory::Currency)
+        .value("Percent", NumberFormatCategory::Percent)
+        .value("Scientific", NumberFormatCategory::Scientific)
+        .value("Fraction", NumberFormatCategory::Fraction)
+        .value("Date", NumberFormatCategory::Date)
+        .value("Time", NumberFormatCategory::Time)
+        .value("DateTime", NumberFormatCategory::DateTime)
+        .value("Text", NumberFormatCategory::Text);
+
+    // Per-xf lookup vectors resolved once from XLStyles
+    py::class_<StyleTable>(m, "XLStyleTable")
+        .def(py::init<XLStyles&>(), py::arg("styles"))
+        .def("__len__", &StyleTable::size)
+        .def("number_format_id", &StyleTable::number_format_id, py::arg("xf"))
+        .def("font_index", &StyleTable::font_index, py::arg("xf"))
+        .def("fill_index", &StyleTable::fill_index, py::arg("xf"))
+        .def("border_index", &StyleTable::border_index, py::arg("xf"))
+        .def("category", &StyleTable::category, py::arg("xf"))
+        .def("is_date", &StyleTable::is_date, py::arg("xf"))
+        .def(
+            "format_code",
+            [](const StyleTable& t, uint32_t xf) { return std::string(t.format_code(xf)); },
+            py::arg("xf"))
+        .def_prop_ro(
+            "number_format_ids",
+            [](const StyleTable& t) { return to_numpy<uint32_t>(t.number_format_ids()); },
+            py::rv_policy::move)
+        .def_prop_ro(
+            "font_indices",
+            [](const StyleTable& t) { return to_numpy<uint32_t>(t.font_indices()); },
+            py::rv_policy::move)
+        .def_prop_ro(
+            "fill_indices",
+            [](const StyleTable& t) { return to_numpy<uint32_t>(t.fill_indices()); },
+            py::rv_policy::move)
+        .def_prop_ro(
+            "border_indices",
+            [](const StyleTable& t) { return to_numpy<uint32_t>(t.border_indices()); },
+            py::rv_policy::move)
+        .def_prop_ro(
+            "categories", [](const StyleTable& t) { return to_numpy<uint8_t>(t.categories()); },
+            py::rv_policy::move)
+        .def_prop_ro(
+            "date_mask",
+            [](const StyleTable& t) {
+                std::vector<bool> mask;
+                mask.reserve(t.size());
+                for (auto category : t.categories()) {
+                    mask.push_back(StyleTable::is_date_category(category));
+                }
+                return to_numpy<bool>(mask);
+            },
+            py::rv_policy::move);
 }
@@ -1,4 +1,6 @@
 #include "internal_access.hpp"
+#include "named_ranges.hpp"
+#include "sheet_import.hpp"
 
 void init_workbook(py::module_& m) {
     // Bind XLWorkbook
@@ -22,6 +24,42 @@ void init_workbook(py::module_& m) {
                  py::gil_scoped_release release;
                  self.cloneSheet(existingName, newName);
              })
+        .def(
+            "import_sheet",
+            [](XLWorkbook& self, XLWorksheet& source, const std::string& name) {
+                py::gil_scoped_release release;
+                return import_sheet(self, source, name);
+            },
+            py::arg("source"), py::arg("name"), py::keep_alive<0, 1>(),
+            "Copy a worksheet of any open workbook into this one as a new sheet, remapping "
+            "styles and shared strings")
+        .def(
+            "read_named_ranges",
+            [](XLWorkbook& self, const DefinedNameIndex& index,
+               const std::vector<std::string>& names) {
+                std::vector<NamedBlock> blocks;
+                {
+                    py::gil_scoped_release release;
+                    blocks = read_named_ranges(self, index, names);
+                }
+                py::dict result;
+                for (size_t i = 0; i < blocks.size(); ++i) {
+                    const NamedBlock& block = blocks[i];
+                    py::list rows;
+                    for (uint32_t r = 0; r < block.rows; ++r) {
+                        py::list row;
+                        const size_t base = static_cast<size_t>(r) * block.columns;
+                        for (uint16_t c = 0; c < block.columns; ++c) {
+                            row.append(block.cells[base + c].to_python());
+                        }
+                        rows.append(std::move(row));
+                    }
+                    result[names[i].c_str()] = std::move(rows);
+                }
+                return result;
+            },
+            py::arg("index"), py::arg("names"),
+            "Read the ranges of many defined names, one pass over each sheet they refer to")
         .def("sheet_count", &XLWorkbook::sheetCount)
         .def("worksheet_names", &XLWorkbook::worksheetNames)
         .def("sheet_exists", &XLWorkbook::sheetExists)
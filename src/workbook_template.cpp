@@ -0,0 +1,1339 @@
+#include "workbook_template.hpp"
+
+#include <zip.h>
+
+#include <XLException.hpp>
+#include <algorithm>
+#include <atomic>
+#include <charconv>
+#include <deque>
+#include <mutex>
+#include <thread>
+#include <unordered_map>
+#include <unordered_set>
+
+#include "ref_shift.hpp"
+#include "sheet_xml.hpp"
+
+using OpenXLSX::XLInternalError;
+using ref_shift_detail::RefPart;
+
+namespace {
+
+constexpr unsigned int kParseFlags = pugi_parse_settings | pugi::parse_declaration;
+
+struct StringWriter : pugi::xml_writer {
+    std::string out;
+    void write(const void* data, size_t size) override {
+        out.append(static_cast<const char*>(data), size);
+    }
+};
+
+std::string serialize(const pugi::xml_document& doc) {
+    StringWriter writer;
+    doc.save(writer, "", pugi::format_raw);
+    return std::move(writer.out);
+}
+
+bool ends_with(std::string_view text, std::string_view suffix) {
+    return text.size() >= suffix.size() && text.substr(text.size() - suffix.size()) == suffix;
+}
+
+// Package path of a relationship target, relative to the folder `dir` ("xl/")
+std::string resolve_target(const std::string& dir, std::string_view target) {
+    if (!target.empty() && target.front() == '/') return std::string(target.substr(1));
+    std::vector<std::string> parts;
+    std::string path = dir + std::string(target);
+    size_t pos = 0;
+    while (pos <= path.size()) {
+        size_t end = path.find('/', pos);
+        if (end == std::string::npos) end = path.size();
+        const std::string part = path.substr(pos, end - pos);
+        if (part == "..") {
+            if (!parts.empty()) parts.pop_back();
+        } else if (!part.empty() && part != ".") {
+            parts.push_back(part);
+        }
+        pos = end + 1;
+    }
+    std::string resolved;
+    for (const std::string& part : parts) {
+        if (!resolved.empty()) resolved += '/';
+        resolved += part;
+    }
+    return resolved;
+}
+
+std::string folder_of(const std::string& path) {
+    const size_t slash = path.find_last_of('/');
+    return slash == std::string::npos ? std::string() : path.substr(0, slash + 1);
+}
+
+// "xl/worksheets/sheet1.xml" -> "xl/worksheets/_rels/sheet1.xml.rels"
+std::string rels_path(const std::string& path) {
+    const size_t slash = path.find_last_of('/');
+    const std::string dir = slash == std::string::npos ? std::string() : path.substr(0, slash + 1);
+    return dir + "_rels/" + path.substr(slash + 1) + ".rels";
+}
+
+// ---------------------------------------------------------------------------------------
+// Zip access
+
+// A read-only zip archive over bytes that the caller keeps alive
+class ZipReader {
+   public:
+    explicit ZipReader(std::string_view data) {
+        zip_error_t error;
+        zip_error_init(&error);
+        zip_source_t* source =
+            data.empty() ? nullptr : zip_source_buffer_create(data.data(), data.size(), 0, &error);
+        if (source != nullptr) {
+            m_zip = zip_open_from_source(source, ZIP_RDONLY, &error);
+            if (m_zip == nullptr) zip_source_free(source);
+        }
+        if (m_zip == nullptr) {
+            std::string message = data.empty() ? "empty package" : zip_error_strerror(&error);
+            zip_error_fini(&error);
+            throw py::value_error(("Not a valid workbook package: " + message).c_str());
+        }
+        zip_error_fini(&error);
+    }
+    ~ZipReader() { zip_discard(m_zip); }
+    ZipReader(const ZipReader&) = delete;
+    ZipReader& operator=(const ZipReader&) = delete;
+
+    zip_t* get() const { return m_zip; }
+    zip_uint64_t size() const { return static_cast<zip_uint64_t>(zip_get_num_entries(m_zip, 0)); }
+    std::string name(zip_uint64_t index) const {
+        const char* name = zip_get_name(m_zip, index, ZIP_FL_ENC_RAW);
+        return name == nullptr ? std::string() : std::string(name);
+    }
+    bool has(const std::string& name) const { return zip_name_locate(m_zip, name.c_str(), 0) >= 0; }
+
+    std::string read(const std::string& name) const {
+        zip_stat_t stat;
+        zip_file_t* file = nullptr;
+        if (zip_stat(m_zip, name.c_str(), 0, &stat) == 0) file = zip_fopen(m_zip, name.c_str(), 0);
+        if (file == nullptr) throw py::value_error(("Missing package part: " + name).c_str());
+        std::string data(stat.size, '\0');
+        const zip_int64_t got = zip_fread(file, data.data(), stat.size);
+        zip_fclose(file);
+        if (got != static_cast<zip_int64_t>(stat.size)) {
+            throw py::value_error(("Cannot read package part: " + name).c_str());
+        }
+        return data;
+    }
+
+   private:
+    zip_t* m_zip = nullptr;
+};
+
+// A new zip package, written to a file or (with an empty path) into memory
+class PackageWriter {
+   public:
+    explicit PackageWriter(const std::string& path) {
+        zip_error_t error;
+        zip_error_init(&error);
+        if (path.empty()) {
+            m_buffer = zip_source_buffer_create(nullptr, 0, 0, &error);
+            if (m_buffer != nullptr) {
+                zip_source_keep(m_buffer);
+                m_zip = zip_open_from_source(m_buffer, ZIP_TRUNCATE, &error);
+                if (m_zip == nullptr) zip_source_free(m_buffer);
+            }
+        } else {
+            int code = 0;
+            m_zip = zip_open(path.c_str(), ZIP_CREATE | ZIP_TRUNCATE, &code);
+            if (m_zip == nullptr) zip_error_set(&error, code, errno);
+        }
+        if (m_zip == nullptr) {
+            std::string message = zip_error_strerror(&error);
+            zip_error_fini(&error);
+            if (m_buffer != nullptr) zip_source_free(m_buffer);
+            throw XLInternalError("Failed to create zip archive " + path + ": " + message);
+        }
+        zip_error_fini(&error);
+    }
+    ~PackageWriter() {
+        if (m_zip != nullptr) zip_discard(m_zip);
+        if (m_buffer != nullptr) zip_source_free(m_buffer);
+    }
+    PackageWriter(const PackageWriter&) = delete;
+    PackageWriter& operator=(const PackageWriter&) = delete;
+
+    // Copy an entry of `from` as it is stored, without decompressing it
+    void copy(const ZipReader& from, zip_uint64_t index) {
+        zip_stat_t stat;
+        if (zip_stat_index(from.get(), index, 0, &stat) < 0) fail();
+        zip_source_t* source =
+            zip_source_zip_file(m_zip, from.get(), index, ZIP_FL_COMPRESSED, 0, -1, nullptr);
+        if (source == nullptr) fail();
+        const zip_int64_t added = zip_file_add(m_zip, stat.name, source, ZIP_FL_ENC_UTF_8);
+        if (added < 0) {
+            zip_source_free(source);
+            fail();
+        }
+        zip_set_file_compression(m_zip, static_cast<zip_uint64_t>(added), stat.comp_method, 0);
+    }
+
+    void add(const std::string& name, std::string data) {
+        // The data has to stay put until the archive is closed
+        const std::string& kept = m_kept.emplace_back(std::move(data));
+        zip_source_t* source = zip_source_buffer(m_zip, kept.data(), kept.size(), 0);
+        if (source == nullptr) fail();
+        if (zip_file_add(m_zip, name.c_str(), source, ZIP_FL_ENC_UTF_8) < 0) {
+            zip_source_free(source);
+            fail();
+        }
+    }
+
+    // Write the archive; the package bytes when writing into memory, else an empty string
+    std::string finish() {
+        zip_t* zip = m_zip;
+        m_zip = nullptr;
+        if (zip_close(zip) < 0) {
+            std::string message = zip_strerror(zip);
+            zip_discard(zip);
+            throw XLInternalError("Failed to write zip archive: " + message);
+        }
+        m_kept.clear();
+        if (m_buffer == nullptr) return {};
+
+        std::string package;
+        zip_stat_t stat;
+        if (zip_source_stat(m_buffer, &stat) < 0 || zip_source_open(m_buffer) < 0) {
+            throw XLInternalError("Failed to read zip buffer");
+        }
+        package.resize(stat.size);
+        uint64_t done = 0;
+        while (done < stat.size) {
+            const zip_int64_t got =
+                zip_source_read(m_buffer, package.data() + done, stat.size - done);
+            if (got <= 0) break;
+            done += static_cast<uint64_t>(got);
+        }
+        zip_source_close(m_buffer);
+        if (done != stat.size) throw XLInternalError("Failed to read zip buffer");
+        return package;
+    }
+
+   private:
+    [[noreturn]] void fail() {
+        throw XLInternalError(std::string("Failed to write zip entry: ") + zip_strerror(m_zip));
+    }
+
+    zip_t* m_zip = nullptr;
+    zip_source_t* m_buffer = nullptr;
+    std::deque<std::string> m_kept;
+};
+
+void load_xml(pugi::xml_document& doc, const std::string& xml, const std::string& path) {
+    if (!doc.load_buffer(xml.data(), xml.size(), kParseFlags)) {
+        throw py::value_error(("Cannot parse package part: " + path).c_str());
+    }
+}
+
+// ---------------------------------------------------------------------------------------
+// Placeholders
+
+// A run of literal text, or one placeholder: a field (block < 0) or a field of a block item
+struct Piece {
+    std::string text;
+    int32_t block = -1;
+    int32_t field = -1;
+};
+
+struct Pattern {
+    std::vector<Piece> pieces;
+    bool whole() const { return pieces.size() == 1 && pieces.front().field >= 0; }
+};
+
+bool is_name_start(char ch) {
+    return (ch >= 'A' && ch <= 'Z') || (ch >= 'a' && ch <= 'z') || ch == '_';
+}
+
+bool is_name_char(char ch) { return is_name_start(ch) || (ch >= '0' && ch <= '9'); }
+
+bool valid_name(std::string_view name) {
+    if (name.empty() || !is_name_start(name.front())) return false;
+    return std::all_of(name.begin(), name.end(), is_name_char);
+}
+
+std::string_view trim(std::string_view text) {
+    while (!text.empty() && (text.front() == ' ' || text.front() == '\t')) text.remove_prefix(1);
+    while (!text.empty() && (text.back() == ' ' || text.back() == '\t')) text.remove_suffix(1);
+    return text;
+}
+
+std::string format_number(double value) {
+    char buffer[32];
+    const auto result = std::to_chars(buffer, buffer + sizeof(buffer), value);
+    return std::string(buffer, result.ptr);
+}
+
+// Text of a shared or inline string item: its <t>, or the <t> of its runs
+std::string item_text(const XMLNode& item) {
+    if (XMLNode t = item.child("t"); !t.empty()) return t.text().get();
+    std::string text;
+    for (XMLNode run = item.child("r"); !run.empty(); run = run.next_sibling("r")) {
+        text += run.child("t").text().get();
+    }
+    return text;
+}
+
+void set_attribute(XMLNode node, const char* name, const char* value) {
+    XMLAttribute attr = node.attribute(name);
+    if (attr.empty()) attr = node.append_attribute(name);
+    attr.set_value(value);
+}
+
+// ---------------------------------------------------------------------------------------
+// Row layout of a rendered sheet
+
+class RowLayout {
+   public:
+    struct Span {
+        uint32_t first;
+        uint32_t last;
+        size_t block;
+        uint32_t count;  // copies written
+        int64_t offset;  // rows added (or removed) by the blocks above
+        int64_t height() const { return static_cast<int64_t>(last - first) + 1; }
+        int64_t delta() const { return (static_cast<int64_t>(count) - 1) * height(); }
+    };
+
+    // `count` is at least 1: a block without items keeps one blank copy
+    void add(uint32_t first, uint32_t last, size_t block, uint32_t count) {
+        const int64_t offset = m_spans.empty() ? 0 : m_spans.back().offset + m_spans.back().delta();
+        m_spans.push_back({first, last, block, count, offset});
+        if (count != 1) m_shifted = true;
+    }
+
+    // Whether any row moves
+    bool shifted() const { return m_shifted; }
+
+    const Span* span_at(uint32_t row) const {
+        for (const Span& span : m_spans) {
+            if (row < span.first) break;
+            if (row <= span.last) return &span;
+        }
+        return nullptr;
+    }
+
+    // Row of copy `copy` of the template row `row` of `span`
+    static int64_t copy_row(const Span& span, uint32_t row, uint32_t copy) {
+        return span.first + span.offset + static_cast<int64_t>(copy) * span.height() +
+               (row - span.first);
+    }
+
+    // New number of a row outside the blocks
+    int64_t row(uint32_t row) const {
+        int64_t shift = 0;
+        for (const Span& span : m_spans) {
+            if (span.last >= row) break;
+            shift = span.offset + span.delta();
+        }
+        return row + shift;
+    }
+
+    /**
+     * Rewrite a reference as seen from copy `copy` of `span` (or from outside the blocks when
+     * `span` is null). Relative references to rows of `span` follow the copy; other rows of
+     * a block stand for its first copy, and an area spanning the rows of a block grows to
+     * span all of its copies. Returns false when the reference moved off the sheet.
+     */
+    bool shift(RefPart& a, RefPart& b, bool isArea, const Span* span = nullptr,
+               uint32_t copy = 0) const {
+        if (a.row == 0) return true;  // whole columns
+        const auto local = [&](const RefPart& part, int64_t& row) {
+            if (span == nullptr || part.row < span->first || part.row > span->last) return false;
+            row = copy_row(*span, part.row, part.rowAbs ? 0 : copy);
+            return true;
+        };
+        if (!isArea) {
+            int64_t row = 0;
+            if (!local(a, row)) row = start(a.row);
+            if (row < 1 || row > kExcelMaxRows) return false;
+            a.row = static_cast<uint32_t>(row);
+            b = a;
+            return true;
+        }
+        RefPart& top = a.row <= b.row ? a : b;
+        RefPart& bottom = a.row <= b.row ? b : a;
+        if (top.row == 1 && bottom.row == kExcelMaxRows) return true;
+        int64_t first = 0;
+        int64_t last = 0;
+        if (!local(top, first)) first = start(top.row);
+        if (!local(bottom, last)) last = end(bottom.row);
+        if (last < first || first > kExcelMaxRows) return false;
+        top.row = static_cast<uint32_t>(first);
+        bottom.row = static_cast<uint32_t>(std::min<int64_t>(last, kExcelMaxRows));
+        return true;
+    }
+
+   private:
+    // First and last new rows of an area starting or ending at `row`
+    int64_t start(uint32_t row) const {
+        const Span* span = span_at(row);
+        if (span == nullptr) return this->row(row);
+        return copy_row(*span, row, 0);
+    }
+    int64_t end(uint32_t row) const {
+        const Span* span = span_at(row);
+        if (span == nullptr) return this->row(row);
+        return copy_row(*span, row, span->count - 1);
+    }
+
+    std::vector<Span> m_spans;
+    bool m_shifted = false;
+};
+
+// The sheets whose rows move in one rendering, by name
+using ShiftedSheets = std::vector<std::pair<std::string, const RowLayout*>>;
+
+// Rewrite the references of formula `f` (on sheet `own`, with `layout`) to moved rows
+std::string shift_formula(std::string_view f, const ShiftedSheets& shifted, const std::string& own,
+                          const RowLayout* layout, const RowLayout::Span* span, uint32_t copy) {
+    std::string out(f);
+    for (const auto& [name, other] : shifted) {
+        if (name == own) continue;
+        out = rewrite_formula_refs(out, name, false, [&](RefPart& a, RefPart& b, bool isArea) {
+            return other->shift(a, b, isArea);
+        });
+    }
+    if (layout != nullptr && layout->shifted()) {
+        out = rewrite_formula_refs(out, own, true, [&](RefPart& a, RefPart& b, bool isArea) {
+            return layout->shift(a, b, isArea, span, copy);
+        });
+    }
+    return out;
+}
+
+// Rewrite the `attr` reference of every `child` of `parent`. References inside one block
+// are repeated for every copy; references that lose all their rows are removed.
+void shift_refs(XMLNode parent, const char* child, const char* attr, const RowLayout& layout) {
+    if (parent.empty()) return;
+    std::vector<XMLNode> nodes;
+    for (XMLNode node = parent.child(child); !node.empty(); node = node.next_sibling(child)) {
+        nodes.push_back(node);
+    }
+    std::string shifted;
+    for (XMLNode node : nodes) {
+        const std::string ref = node.attribute(attr).value();
+        uint32_t firstRow = 0;
+        uint32_t lastRow = 0;
+        uint16_t firstCol = 0;
+        uint16_t lastCol = 0;
+        const RowLayout::Span* span = nullptr;
+        if (parse_range_ref(ref, firstRow, firstCol, lastRow, lastCol)) {
+            span = layout.span_at(firstRow);
+            if (span != nullptr && lastRow > span->last) span = nullptr;
+        }
+        if (span != nullptr) {
+            for (uint32_t copy = 0; copy < span->count; ++copy) {
+                XMLNode clone = parent.insert_copy_before(node, node);
+                const auto row = [&](uint32_t r) {
+                    return static_cast<uint32_t>(RowLayout::copy_row(*span, r, copy));
+                };
+                std::string moved = make_cell_ref(row(firstRow), firstCol);
+                if (firstRow != lastRow || firstCol != lastCol) {
+                    moved += ':' + make_cell_ref(row(lastRow), lastCol);
+                }
+                clone.attribute(attr).set_value(moved.c_str());
+            }
+            parent.remove_child(node);
+        } else if (rewrite_range_ref(
+                       ref,
+                       [&](RefPart& a, RefPart& b, bool isArea) {
+                           return layout.shift(a, b, isArea);
+                       },
+                       shifted)) {
+            node.attribute(attr).set_value(shifted.c_str());
+        } else {
+            parent.remove_child(node);
+        }
+    }
+    if (XMLAttribute count = parent.attribute("count"); !count.empty()) {
+        size_t remaining = 0;
+        for (XMLNode node = parent.child(child); !node.empty(); node = node.next_sibling(child)) {
+            ++remaining;
+        }
+        count.set_value(remaining);
+    }
+}
+
+// Rewrite a single area attribute (dimension, auto filter, table range)
+void shift_area(XMLNode node, const char* attr, const RowLayout& layout) {
+    XMLAttribute ref = node.attribute(attr);
+    if (ref.empty()) return;
+    std::string shifted;
+    if (rewrite_range_ref(
+            ref.value(),
+            [&](RefPart& a, RefPart& b, bool isArea) { return layout.shift(a, b, isArea); },
+            shifted)) {
+        ref.set_value(shifted.c_str());
+    }
+}
+
+// Rewrite a sqref list; a single cell in a block grows over all copies like an area would
+std::string shift_sqref_list(std::string_view sqref, const RowLayout& layout) {
+    return rewrite_sqref(sqref, [&](RefPart& a, RefPart& b, bool& isArea) {
+        isArea = true;
+        return layout.shift(a, b, true);
+    });
+}
+
+void shift_formula_text(XMLNode node, const ShiftedSheets& shifted, const std::string& own,
+                        const RowLayout* layout) {
+    const std::string text = node.text().get();
+    node.text().set(shift_formula(text, shifted, own, layout, nullptr, 0).c_str());
+}
+
+struct BlockRows {
+    uint32_t first;
+    uint32_t last;
+    size_t block;
+};
+
+}  // namespace
+
+// ---------------------------------------------------------------------------------------
+
+struct SheetTemplate {
+    std::string name;
+    std::string path;
+    pugi::xml_document doc;
+    std::unordered_map<uint64_t, Pattern> cells;  // by row << 16 | column
+    std::vector<std::pair<std::string, Pattern>> headerFooter;
+    std::vector<BlockRows> blocks;
+};
+
+// A part whose references are rewritten when rows move
+struct DependentPart {
+    enum class Kind { Worksheet, Table, Workbook };
+    Kind kind;
+    std::string path;
+    std::string sheet;  // the worksheet itself, or the one holding the table
+    pugi::xml_document doc;
+};
+
+struct WorkbookTemplate::Impl {
+    std::string base;  // the template package, with calculation on load and no calc chain
+
+    std::vector<std::string> fields;
+    std::vector<bool> fieldInText;
+    std::vector<std::string> blocks;
+    std::vector<std::vector<std::string>> blockFields;
+    std::vector<std::vector<bool>> blockFieldInText;
+
+    std::deque<SheetTemplate> sheets;
+    std::deque<DependentPart> dependents;
+
+    explicit Impl(std::string_view package);
+
+    std::string render(const TemplateData& data, const std::string& path) const;
+
+   private:
+    bool parse_pattern(std::string_view text, Pattern& pattern);
+    int32_t field_id(std::string_view name, bool inText);
+    std::pair<int32_t, int32_t> block_field_id(std::string_view block, std::string_view field,
+                                               bool inText);
+    void compile_sheet(SheetTemplate& sheet, const std::vector<std::string>& sharedStrings);
+
+    std::string render_sheet(const SheetTemplate& sheet, const TemplateData& data,
+                             const RowLayout& layout, const ShiftedSheets& shifted) const;
+    std::string render_dependent(const DependentPart& part, const ShiftedSheets& shifted) const;
+};
+
+int32_t WorkbookTemplate::Impl::field_id(std::string_view name, bool inText) {
+    auto it = std::find(fields.begin(), fields.end(), name);
+    if (it == fields.end()) {
+        fields.emplace_back(name);
+        fieldInText.push_back(false);
+        it = fields.end() - 1;
+    }
+    const auto id = static_cast<size_t>(it - fields.begin());
+    if (inText) fieldInText[id] = true;
+    return static_cast<int32_t>(id);
+}
+
+std::pair<int32_t, int32_t> WorkbookTemplate::Impl::block_field_id(std::string_view block,
+                                                                   std::string_view field,
+                                                                   bool inText) {
+    auto it = std::find(blocks.begin(), blocks.end(), block);
+    if (it == blocks.end()) {
+        blocks.emplace_back(block);
+        blockFields.emplace_back();
+        blockFieldInText.emplace_back();
+        it = blocks.end() - 1;
+    }
+    const auto b = static_cast<size_t>(it - blocks.begin());
+    auto& names = blockFields[b];
+    auto f = std::find(names.begin(), names.end(), field);
+    if (f == names.end()) {
+        names.emplace_back(field);
+        blockFieldInText[b].push_back(false);
+        f = names.end() - 1;
+    }
+    const auto id = static_cast<size_t>(f - names.begin());
+    if (inText) blockFieldInText[b][id] = true;
+    return {static_cast<int32_t>(b), static_cast<int32_t>(id)};
+}
+
+// Split `text` into literal runs and placeholders; false when it has no placeholder
+bool WorkbookTemplate::Impl::parse_pattern(std::string_view text, Pattern& pattern) {
+    struct Found {
+        size_t open;
+        size_t close;
+        std::string_view name;
+    };
+    std::vector<Found> found;
+    size_t pos = 0;
+    while ((pos = text.find("{{", pos)) != std::string_view::npos) {
+        const size_t close = text.find("}}", pos + 2);
+        if (close == std::string_view::npos) break;
+        const std::string_view name = trim(text.substr(pos + 2, close - pos - 2));
+        const size_t dot = name.find('.');
+        const bool valid = dot == std::string_view::npos ? valid_name(name)
+                                                         : valid_name(name.substr(0, dot)) &&
+                                                               valid_name(name.substr(dot + 1));
+        if (valid) {
+            found.push_back({pos, close + 2, name});
+            pos = close + 2;
+        } else {
+            pos += 2;
+        }
+    }
+    if (found.empty()) return false;
+
+    const bool inText =
+        found.size() > 1 || found.front().open != 0 || found.front().close != text.size();
+    pattern.pieces.clear();
+    size_t last = 0;
+    for (const Found& placeholder : found) {
+        if (placeholder.open > last) {
+            pattern.pieces.push_back({std::string(text.substr(last, placeholder.open - last))});
+        }
+        Piece piece;
+        const size_t dot = placeholder.name.find('.');
+        if (dot == std::string_view::npos) {
+            piece.field = field_id(placeholder.name, inText);
+        } else {
+            std::tie(piece.block, piece.field) = block_field_id(
+                placeholder.name.substr(0, dot), placeholder.name.substr(dot + 1), inText);
+        }
+        pattern.pieces.push_back(std::move(piece));
+        last = placeholder.close;
+    }
+    if (last < text.size()) pattern.pieces.push_back({std::string(text.substr(last))});
+    return true;
+}
+
+void WorkbookTemplate::Impl::compile_sheet(SheetTemplate& sheet,
+                                           const std::vector<std::string>& sharedStrings) {
+    XMLNode root = sheet.doc.document_element();
+    XMLNode sheetData = root.child("sheetData");
+    const std::string where = "sheet '" + sheet.name + "'";
+
+    for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();
+         row = row.next_sibling_of_type(pugi::node_element)) {
+        const uint32_t r = row.attribute("r").as_uint();
+        int32_t rowBlock = -1;
+        bool sharedFormula = false;
+        for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+             cell = cell.next_sibling_of_type(pugi::node_element)) {
+            if (std::string_view(cell.child("f").attribute("t").value()) == "shared") {
+                sharedFormula = true;
+            }
+            const std::string_view type = cell.attribute("t").value();
+            std::string text;
+            if (type == "s") {
+                const size_t index = cell.child("v").text().as_uint();
+                if (index < sharedStrings.size()) text = sharedStrings[index];
+            } else if (type == "inlineStr") {
+                text = item_text(cell.child("is"));
+            }
+            Pattern pattern;
+            if (text.find("{{") == std::string::npos || !parse_pattern(text, pattern)) continue;
+
+            for (const Piece& piece : pattern.pieces) {
+                if (piece.block < 0) continue;
+                if (rowBlock >= 0 && rowBlock != piece.block) {
+                    throw py::value_error(("Row " + std::to_string(r) + " of " + where +
+                                           " uses the blocks '" + blocks[rowBlock] + "' and '" +
+                                           blocks[piece.block] + "'")
+                                              .c_str());
+                }
+                rowBlock = piece.block;
+            }
+            const uint16_t col = cell_ref_column(cell.attribute("r").value());
+            if (r == 0 || col == 0) {
+                throw py::value_error(("Cells without a reference in " + where).c_str());
+            }
+            sheet.cells[(static_cast<uint64_t>(r) << 16) | col] = std::move(pattern);
+        }
+        if (rowBlock < 0) continue;
+        if (sharedFormula) {
+            throw py::value_error(("Row " + std::to_string(r) + " of " + where +
+                                   " repeats with its block but holds shared formulas")
+                                      .c_str());
+        }
+        // Adjacent rows of one block repeat together
+        if (!sheet.blocks.empty() && sheet.blocks.back().last + 1 == r &&
+            sheet.blocks.back().block == static_cast<size_t>(rowBlock)) {
+            sheet.blocks.back().last = r;
+        } else {
+            sheet.blocks.push_back({r, r, static_cast<size_t>(rowBlock)});
+        }
+    }
+
+    XMLNode headerFooter = root.child("headerFooter");
+    for (XMLNode part = headerFooter.first_child_of_type(pugi::node_element); !part.empty();
+         part = part.next_sibling_of_type(pugi::node_element)) {
+        const std::string text = part.text().get();
+        Pattern pattern;
+        if (text.find("{{") == std::string::npos || !parse_pattern(text, pattern)) continue;
+        for (Piece& piece : pattern.pieces) {
+            if (piece.block >= 0) {
+                throw py::value_error(
+                    ("Block fields cannot be used in the header or footer of " + where).c_str());
+            }
+        }
+        // Header and footer text is always text
+        for (const Piece& piece : pattern.pieces) {
+            if (piece.field >= 0) fieldInText[piece.field] = true;
+        }
+        sheet.headerFooter.emplace_back(part.name(), std::move(pattern));
+    }
+}
+
+WorkbookTemplate::Impl::Impl(std::string_view package) {
+    ZipReader source(package);
+
+    // Workbook part, its relationships and the sheets
+    pugi::xml_document packageRels;
+    load_xml(packageRels, source.read("_rels/.rels"), "_rels/.rels");
+    std::string workbookPath;
+    for (XMLNode rel : packageRels.document_element().children("Relationship")) {
+        if (ends_with(rel.attribute("Type").value(), "/officeDocument")) {
+            workbookPath = resolve_target("", rel.attribute("Target").value());
+        }
+    }
+    if (workbookPath.empty()) throw py::value_error("Not a workbook package: no workbook part");
+    const std::string workbookDir = folder_of(workbookPath);
+    const std::string workbookRelsPath = rels_path(workbookPath);
+
+    pugi::xml_document workbook;
+    pugi::xml_document workbookRels;
+    load_xml(workbook, source.read(workbookPath), workbookPath);
+    load_xml(workbookRels, source.read(workbookRelsPath), workbookRelsPath);
+
+    std::unordered_map<std::string, std::string> worksheetTargets;  // by relationship id
+    std::string sharedStringsPath;
+    std::string calcChainPath;
+    for (XMLNode rel : workbookRels.document_element().children("Relationship")) {
+        const std::string_view type = rel.attribute("Type").value();
+        const std::string target = resolve_target(workbookDir, rel.attribute("Target").value());
+        if (ends_with(type, "/worksheet")) {
+            worksheetTargets.emplace(rel.attribute("Id").value(), target);
+        } else if (ends_with(type, "/sharedStrings")) {
+            sharedStringsPath = target;
+        } else if (ends_with(type, "/calcChain")) {
+            calcChainPath = target;
+        }
+    }
+
+    std::vector<std::string> sharedStrings;
+    if (!sharedStringsPath.empty() && source.has(sharedStringsPath)) {
+        pugi::xml_document sst;
+        load_xml(sst, source.read(sharedStringsPath), sharedStringsPath);
+        for (XMLNode item : sst.document_element().children("si")) {
+            sharedStrings.push_back(item_text(item));
+        }
+    }
+
+    // Worksheets with placeholders
+    std::vector<std::pair<std::string, std::string>> worksheets;  // (name, path)
+    for (XMLNode node : workbook.document_element().child("sheets").children("sheet")) {
+        auto target = worksheetTargets.find(node.attribute("r:id").value());
+        if (target != worksheetTargets.end()) {
+            worksheets.emplace_back(node.attribute("name").value(), target->second);
+        }
+    }
+    std::unordered_set<std::string> templated;
+    for (const auto& [name, path] : worksheets) {
+        SheetTemplate& sheet = sheets.emplace_back();
+        sheet.name = name;
+        sheet.path = path;
+        load_xml(sheet.doc, source.read(path), path);
+        compile_sheet(sheet, sharedStrings);
+        if (sheet.cells.empty() && sheet.headerFooter.empty()) {
+            sheets.pop_back();
+        } else {
+            templated.insert(path);
+        }
+    }
+
+    // Parts that refer to rows of sheets with blocks
+    std::vector<std::string> blockSheets;
+    for (const SheetTemplate& sheet : sheets) {
+        if (!sheet.blocks.empty()) blockSheets.push_back(sheet.name);
+    }
+    const auto mentions_block_sheet = [&](std::string_view text) {
+        return std::any_of(blockSheets.begin(), blockSheets.end(), [&](const std::string& name) {
+            return text.find(name) != std::string_view::npos;
+        });
+    };
+    bool workbookDependent = false;
+    if (!blockSheets.empty()) {
+        for (const auto& [name, path] : worksheets) {
+            if (templated.count(path) != 0) continue;
+            const std::string xml = source.read(path);
+            if (xml.find("<f") == std::string::npos || !mentions_block_sheet(xml)) continue;
+            DependentPart& part = dependents.emplace_back();
+            part.kind = DependentPart::Kind::Worksheet;
+            part.path = path;
+            part.sheet = name;
+            load_xml(part.doc, xml, path);
+        }
+        for (const SheetTemplate& sheet : sheets) {
+            const std::string sheetRels = rels_path(sheet.path);
+            if (sheet.blocks.empty() || !source.has(sheetRels)) continue;
+            pugi::xml_document rels;
+            load_xml(rels, source.read(sheetRels), sheetRels);
+            for (XMLNode rel : rels.document_element().children("Relationship")) {
+                if (!ends_with(rel.attribute("Type").value(), "/table")) continue;
+                DependentPart& part = dependents.emplace_back();
+                part.kind = DependentPart::Kind::Table;
+                part.path = resolve_target(folder_of(sheet.path), rel.attribute("Target").value());
+                part.sheet = sheet.name;
+                load_xml(part.doc, source.read(part.path), part.path);
+            }
+        }
+        XMLNode definedNames = workbook.document_element().child("definedNames");
+        for (XMLNode name : definedNames.children("definedName")) {
+            if (mentions_block_sheet(name.text().get())) workbookDependent = true;
+        }
+    }
+
+    if (sheets.empty()) {
+        base.assign(package);
+        return;
+    }
+
+    // Values change, so the cached results of formulas are stale: recalculate on load, and
+    // drop the calculation chain, which may list cells that move
+    XMLNode workbookRoot = workbook.document_element();
+    XMLNode calcPr = workbookRoot.child("calcPr");
+    if (calcPr.empty()) {
+        static const char* const kAfterCalcPr[] = {
+            "oleSize",        "customWorkbookViews", "pivotCaches",
+            "smartTagPr",     "smartTagTypes",       "webPublishing",
+            "fileRecoveryPr", "webPublishObjects",   "extLst"};
+        XMLNode before;
+        for (XMLNode child = workbookRoot.first_child_of_type(pugi::node_element);
+             !child.empty() && before.empty();
+             child = child.next_sibling_of_type(pugi::node_element)) {
+            for (const char* name : kAfterCalcPr) {
+                if (std::string_view(child.name()) == name) before = child;
+            }
+        }
+        calcPr = before.empty() ? workbookRoot.append_child("calcPr")
+                                : workbookRoot.insert_child_before("calcPr", before);
+    }
+    set_attribute(calcPr, "fullCalcOnLoad", "1");
+
+    std::unordered_map<std::string, std::string> replaced;
+    if (!calcChainPath.empty()) {
+        XMLNode relsRoot = workbookRels.document_element();
+        for (XMLNode rel = relsRoot.child("Relationship"); !rel.empty();) {
+            XMLNode next = rel.next_sibling("Relationship");
+            if (ends_with(rel.attribute("Type").value(), "/calcChain")) relsRoot.remove_child(rel);
+            rel = next;
+        }
+        replaced[workbookRelsPath] = serialize(workbookRels);
+
+        pugi::xml_document contentTypes;
+        load_xml(contentTypes, source.read("[Content_Types].xml"), "[Content_Types].xml");
+        XMLNode typesRoot = contentTypes.document_element();
+        const std::string partName = "/" + calcChainPath;
+        for (XMLNode over = typesRoot.child("Override"); !over.empty();) {
+            XMLNode next = over.next_sibling("Override");
+            if (partName == over.attribute("PartName").value()) typesRoot.remove_child(over);
+            over = next;
+        }
+        replaced["[Content_Types].xml"] = serialize(contentTypes);
+    }
+    if (workbookDependent) {
+        DependentPart& part = dependents.emplace_back();
+        part.kind = DependentPart::Kind::Workbook;
+        part.path = workbookPath;
+        part.doc.reset(workbook);
+    }
+    replaced[workbookPath] = serialize(workbook);
+
+    PackageWriter writer("");
+    for (zip_uint64_t i = 0; i < source.size(); ++i) {
+        const std::string name = source.name(i);
+        if (name == calcChainPath) continue;
+        auto it = replaced.find(name);
+        if (it != replaced.end()) {
+            writer.add(name, std::move(it->second));
+        } else {
+            writer.copy(source, i);
+        }
+    }
+    base = writer.finish();
+}
+
+std::string WorkbookTemplate::Impl::render_sheet(const SheetTemplate& sheet,
+                                                 const TemplateData& data, const RowLayout& layout,
+                                                 const ShiftedSheets& shifted) const {
+    pugi::xml_document doc;
+    doc.reset(sheet.doc);
+    XMLNode root = doc.document_element();
+    XMLNode sheetData = root.child("sheetData");
+    const bool rewrite = !shifted.empty();
+
+    const auto value_of = [&](const Piece& piece,
+                              const std::vector<TemplateValue>* item) -> const TemplateValue& {
+        return piece.block >= 0 ? (*item)[piece.field] : data.fields[piece.field];
+    };
+
+    const auto fill = [&](XMLNode cell, const Pattern& pattern,
+                          const std::vector<TemplateValue>* item) {
+        while (XMLNode child = cell.first_child()) cell.remove_child(child);
+        if (pattern.whole()) {
+            const CellData& value = value_of(pattern.pieces.front(), item).cell;
+            switch (value.type) {
+                case CellData::Type::Empty:
+                    cell.remove_attribute("t");
+                    return;
+                case CellData::Type::Boolean:
+                    set_attribute(cell, "t", "b");
+                    cell.append_child("v").text().set(value.boolVal ? "1" : "0");
+                    return;
+                case CellData::Type::Integer:
+                    cell.remove_attribute("t");
+                    cell.append_child("v").text().set(std::to_string(value.intVal).c_str());
+                    return;
+                case CellData::Type::Float:
+                    cell.remove_attribute("t");
+                    cell.append_child("v").text().set(format_number(value.floatVal).c_str());
+                    return;
+                default:
+                    break;
+            }
+        }
+        std::string text;
+        if (pattern.whole()) {
+            const CellData& value = value_of(pattern.pieces.front(), item).cell;
+            text = value.type == CellData::Type::RichText ? value.richTextVal.plainText()
+                                                          : value.strVal;
+        } else {
+            for (const Piece& piece : pattern.pieces) {
+                text += piece.field >= 0 ? value_of(piece, item).text : piece.text;
+            }
+        }
+        set_attribute(cell, "t", "inlineStr");
+        XMLNode t = cell.append_child("is").append_child("t");
+        if (!text.empty() &&
+            (text.front() == ' ' || text.back() == ' ' || text.find('\n') != std::string::npos)) {
+            t.append_attribute("xml:space").set_value("preserve");
+        }
+        t.text().set(text.c_str());
+    };
+
+    const auto fill_row = [&](XMLNode row, uint32_t templateRow, int64_t newRow,
+                              const RowLayout::Span* span, uint32_t copy,
+                              const std::vector<TemplateValue>* item) {
+        const bool moved = newRow != templateRow;
+        if (moved) row.attribute("r").set_value(newRow);
+        for (XMLNode cell = row.first_child_of_type(pugi::node_element); !cell.empty();
+             cell = cell.next_sibling_of_type(pugi::node_element)) {
+            const uint16_t col = cell_ref_column(cell.attribute("r").value());
+            if (moved && col != 0) {
+                cell.attribute("r").set_value(
+                    make_cell_ref(static_cast<uint32_t>(newRow), col).c_str());
+            }
+            if (span != nullptr && item == nullptr) {
+                // The blank copy of a block without items keeps only the cell styles
+                while (XMLNode child = cell.first_child()) cell.remove_child(child);
+                cell.remove_attribute("t");
+                continue;
+            }
+            auto pattern = sheet.cells.find((static_cast<uint64_t>(templateRow) << 16) | col);
+            if (pattern != sheet.cells.end()) {
+                fill(cell, pattern->second, item);
+                continue;
+            }
+            XMLNode f = cell.child("f");
+            if (f.empty() || !rewrite) continue;
+            const std::string formula = f.text().get();
+            if (!formula.empty()) {
+                f.text().set(
+                    shift_formula(formula, shifted, sheet.name, &layout, span, copy).c_str());
+            }
+            if (XMLAttribute ref = f.attribute("ref"); !ref.empty() && layout.shifted()) {
+                std::string area;
+                if (rewrite_range_ref(
+                        ref.value(),
+                        [&](RefPart& a, RefPart& b, bool isArea) {
+                            return layout.shift(a, b, isArea, span, copy);
+                        },
+                        area)) {
+                    ref.set_value(area.c_str());
+                }
+            }
+        }
+    };
+
+    for (XMLNode row = sheetData.first_child_of_type(pugi::node_element); !row.empty();) {
+        XMLNode next = row.next_sibling_of_type(pugi::node_element);
+        const uint32_t r = row.attribute("r").as_uint();
+        const RowLayout::Span* span = layout.span_at(r);
+        if (span == nullptr) {
+            fill_row(row, r, layout.row(r), nullptr, 0, nullptr);
+            row = next;
+            continue;
+        }
+        // Write the template rows of the block once per item, then drop them
+        std::vector<XMLNode> templateRows{row};
+        while (!next.empty() && next.attribute("r").as_uint() <= span->last) {
+            templateRows.push_back(next);
+            next = next.next_sibling_of_type(pugi::node_element);
+        }
+        const auto& items = data.items[span->block];
+        for (uint32_t copy = 0; copy < span->count; ++copy) {
+            for (XMLNode templateRow : templateRows) {
+                const uint32_t tr = templateRow.attribute("r").as_uint();
+                XMLNode clone = sheetData.insert_copy_before(templateRow, templateRows.front());
+                fill_row(clone, tr, RowLayout::copy_row(*span, tr, copy), span, copy,
+                         items.empty() ? nullptr : &items[copy]);
+            }
+        }
+        for (XMLNode templateRow : templateRows) sheetData.remove_child(templateRow);
+        row = next;
+    }
+
+    if (!sheet.headerFooter.empty()) {
+        XMLNode headerFooter = root.child("headerFooter");
+        for (const auto& [name, pattern] : sheet.headerFooter) {
+            std::string text;
+            for (const Piece& piece : pattern.pieces) {
+                text += piece.field >= 0 ? data.fields[piece.field].text : piece.text;
+            }
+            headerFooter.child(name.c_str()).text().set(text.c_str());
+        }
+    }
+
+    if (layout.shifted()) {
+        shift_area(root.child("dimension"), "ref", layout);
+        shift_area(root.child("autoFilter"), "ref", layout);
+        shift_refs(root.child("mergeCells"), "mergeCell", "ref", layout);
+        shift_refs(root.child("hyperlinks"), "hyperlink", "ref", layout);
+        for (XMLNode name : {root.child("mergeCells"), root.child("hyperlinks")}) {
+            if (!name.empty() && name.first_child_of_type(pugi::node_element).empty()) {
+                root.remove_child(name);
+            }
+        }
+
+        std::vector<XMLNode> emptied;
+        for (XMLNode format : root.children("conditionalFormatting")) {
+            const std::string sqref = shift_sqref_list(format.attribute("sqref").value(), layout);
+            if (sqref.empty()) emptied.push_back(format);
+            format.attribute("sqref").set_value(sqref.c_str());
+            for (XMLNode rule : format.children("cfRule")) {
+                for (XMLNode formula : rule.children("formula")) {
+                    shift_formula_text(formula, shifted, sheet.name, &layout);
+                }
+            }
+        }
+        XMLNode validations = root.child("dataValidations");
+        for (XMLNode validation : validations.children("dataValidation")) {
+            const std::string sqref =
+                shift_sqref_list(validation.attribute("sqref").value(), layout);
+            if (sqref.empty()) emptied.push_back(validation);
+            validation.attribute("sqref").set_value(sqref.c_str());
+            for (const char* name : {"formula1", "formula2"}) {
+                if (XMLNode formula = validation.child(name); !formula.empty()) {
+                    shift_formula_text(formula, shifted, sheet.name, &layout);
+                }
+            }
+        }
+        for (XMLNode node : emptied) node.parent().remove_child(node);
+        if (!validations.empty()) {
+            size_t count = 0;
+            for (XMLNode node [[maybe_unused]] : validations.children("dataValidation")) ++count;
+            if (count == 0) {
+                root.remove_child(validations);
+            } else if (XMLAttribute attr = validations.attribute("count"); !attr.empty()) {
+                attr.set_value(count);
+            }
+        }
+    }
+    return serialize(doc);
+}
+
+std::string WorkbookTemplate::Impl::render_dependent(const DependentPart& part,
+                                                     const ShiftedSheets& shifted) const {
+    pugi::xml_document doc;
+    doc.reset(part.doc);
+    XMLNode root = doc.document_element();
+    switch (part.kind) {
+        case DependentPart::Kind::Worksheet: {
+            XMLNode sheetData = root.child("sheetData");
+            for (XMLNode row : sheetData.children("row")) {
+                for (XMLNode cell : row.children("c")) {
+                    XMLNode f = cell.child("f");
+                    if (!f.empty() && !f.text().empty()) {
+                        shift_formula_text(f, shifted, part.sheet, nullptr);
+                    }
+                }
+            }
+            break;
+        }
+        case DependentPart::Kind::Table: {
+            auto layout = std::find_if(shifted.begin(), shifted.end(), [&](const auto& entry) {
+                return entry.first == part.sheet;
+            });
+            if (layout == shifted.end()) break;
+            shift_area(root, "ref", *layout->second);
+            shift_area(root.child("autoFilter"), "ref", *layout->second);
+            shift_area(root.child("sortState"), "ref", *layout->second);
+            break;
+        }
+        case DependentPart::Kind::Workbook:
+            for (XMLNode name : root.child("definedNames").children("definedName")) {
+                shift_formula_text(name, shifted, std::string(), nullptr);
+            }
+            break;
+    }
+    return serialize(doc);
+}
+
+std::string WorkbookTemplate::Impl::render(const TemplateData& data,
+                                           const std::string& path) const {
+    if (data.fields.size() != fields.size() || data.items.size() != blocks.size()) {
+        throw py::value_error("Template data does not match the template's fields");
+    }
+    for (size_t b = 0; b < blocks.size(); ++b) {
+        for (const auto& item : data.items[b]) {
+            if (item.size() != blockFields[b].size()) {
+                throw py::value_error(
+                    ("Items of block '" + blocks[b] + "' do not match its fields").c_str());
+            }
+        }
+    }
+
+    std::deque<RowLayout> layouts;
+    ShiftedSheets shifted;
+    for (const SheetTemplate& sheet : sheets) {
+        RowLayout& layout = layouts.emplace_back();
+        for (const BlockRows& rows : sheet.blocks) {
+            const size_t count = data.items[rows.block].size();
+            const int64_t height = rows.last - rows.first + 1;
+            if (static_cast<int64_t>(rows.last) + static_cast<int64_t>(count) * height >
+                kExcelMaxRows) {
+                throw py::value_error(("Too many items in block '" + blocks[rows.block] +
+                                       "' for sheet '" + sheet.name + "'")
+                                          .c_str());
+            }
+            // An empty block keeps one blank copy, so the formulas over it stay valid
+            layout.add(rows.first, rows.last, rows.block,
+                       static_cast<uint32_t>(std::max<size_t>(count, 1)));
+        }
+        if (layout.shifted()) shifted.emplace_back(sheet.name, &layout);
+    }
+
+    std::unordered_map<std::string, std::string> parts;
+    auto layout = layouts.begin();
+    for (const SheetTemplate& sheet : sheets) {
+        parts[sheet.path] = render_sheet(sheet, data, *layout++, shifted);
+    }
+    if (!shifted.empty()) {
+        for (const DependentPart& part : dependents) {
+            parts[part.path] = render_dependent(part, shifted);
+        }
+    }
+
+    ZipReader source(base);
+    PackageWriter writer(path);
+    for (zip_uint64_t i = 0; i < source.size(); ++i) {
+        auto it = parts.find(source.name(i));
+        if (it != parts.end()) {
+            writer.add(it->first, std::move(it->second));
+        } else {
+            writer.copy(source, i);
+        }
+    }
+    return writer.finish();
+}
+
+WorkbookTemplate::WorkbookTemplate(std::string_view package)
+    : m_impl(std::make_shared<const Impl>(package)) {}
+
+const std::vector<std::string>& WorkbookTemplate::fields() const { return m_impl->fields; }
+
+const std::vector<std::string>& WorkbookTemplate::blocks() const { return m_impl->blocks; }
+
+const std::vector<std::string>& WorkbookTemplate::block_fields(size_t block) const {
+    return m_impl->blockFields.at(block);
+}
+
+bool WorkbookTemplate::field_in_text(size_t field) const { return m_impl->fieldInText.at(field); }
+
+bool WorkbookTemplate::block_field_in_text(size_t block, size_t field) const {
+    return m_impl->blockFieldInText.at(block).at(field);
+}
+
+std::string WorkbookTemplate::render(const TemplateData& data) const {
+    return m_impl->render(data, std::string());
+}
+
+void WorkbookTemplate::render_to(const TemplateData& data, const std::string& path) const {
+    if (path.empty()) throw py::value_error("An output path is needed");
+    m_impl->render(data, path);
+}
+
+void render_templates(const WorkbookTemplate& tpl, const std::vector<TemplateData>& data,
+                      const std::vector<std::string>& paths, size_t workers) {
+    if (data.size() != paths.size()) {
+        throw py::value_error("Expected one output path per rendering");
+    }
+    if (workers == 0)
+        workers = std::min<size_t>(std::max(1u, std::thread::hardware_concurrency()), 8);
+    workers = std::max<size_t>(1, std::min(workers, data.size()));
+
+    std::atomic<size_t> next{0};
+    std::exception_ptr error;
+    std::mutex errorMutex;
+    auto run = [&] {
+        try {
+            for (size_t i = next++; i < data.size(); i = next++) tpl.render_to(data[i], paths[i]);
+        } catch (...) {
+            std::lock_guard<std::mutex> lock(errorMutex);
+            if (!error) error = std::current_exception();
+            next = data.size();
+        }
+    };
+    std::vector<std::thread> threads;
+    threads.reserve(workers - 1);
+    for (size_t t = 1; t < workers; ++t) threads.emplace_back(run);
+    run();
+    for (auto& thread : threads) thread.join();
+    if (error) std::rethrow_exception(error);
+}
+
+// ---------------------------------------------------------------------------------------
+// Bindings
+
+namespace {
+
+TemplateValue template_value(py::handle value, bool inText) {
+    TemplateValue converted;
+    try {
+        converted.cell = CellData::from_python(value);
+    } catch (const py::builtin_exception& e) {
+        // Any other object is written as its text
+        if (e.type() != py::exception_type::type_error) throw;
+        converted.cell.type = CellData::Type::String;
+        converted.cell.strVal = py::cast<std::string>(py::str(value));
+    }
+    if (inText && !value.is_none()) converted.text = py::cast<std::string>(py::str(value));
+    return converted;
+}
+
+// The values a mapping gives the placeholders of `tpl`. A block is a sequence of mappings,
+// one per item (a single mapping counts as one item).
+TemplateData template_data(const WorkbookTemplate& tpl, py::handle data) {
+    TemplateData converted;
+    const auto& fields = tpl.fields();
+    converted.fields.reserve(fields.size());
+    for (size_t f = 0; f < fields.size(); ++f) {
+        py::object value = data[fields[f].c_str()];
+        converted.fields.push_back(template_value(value, tpl.field_in_text(f)));
+    }
+    const auto& blocks = tpl.blocks();
+    converted.items.resize(blocks.size());
+    py::object mapping = py::module_::import_("collections.abc").attr("Mapping");
+    for (size_t b = 0; b < blocks.size(); ++b) {
+        py::object items = data[blocks[b].c_str()];
+        if (py::isinstance(items, mapping)) items = py::make_tuple(items);
+        const auto& names = tpl.block_fields(b);
+        for (py::handle item : items) {
+            auto& values = converted.items[b].emplace_back();
+            values.reserve(names.size());
+            for (size_t f = 0; f < names.size(); ++f) {
+                py::object value = item[names[f].c_str()];
+                values.push_back(template_value(value, tpl.block_field_in_text(b, f)));
+            }
+        }
+    }
+    return converted;
+}
+
+}  // namespace
+
+void init_workbook_template(py::module_& m) {
+    py::class_<WorkbookTemplate>(m, "XLWorkbookTemplate")
+        .def(
+            "__init__",
+            [](WorkbookTemplate* self, py::handle package) {
+                Py_buffer view;
+                if (PyObject_GetBuffer(package.ptr(), &view, PyBUF_SIMPLE) != 0) {
+                    throw py::python_error();
+                }
+                std::unique_ptr<Py_buffer, decltype(&PyBuffer_Release)> release(&view,
+                                                                                &PyBuffer_Release);
+                py::gil_scoped_release nogil;
+                new (self) WorkbookTemplate(std::string_view(static_cast<const char*>(view.buf),
+                                                             static_cast<size_t>(view.len)));
+            },
+            py::arg("package"), "Parse a template workbook from the bytes of its package")
+        .def_prop_ro("fields", &WorkbookTemplate::fields,
+                     "Names of the {{name}} placeholders, in order of first use")
+        .def_prop_ro(
+            "blocks",
+            [](const WorkbookTemplate& self) {
+                py::dict blocks;
+                for (size_t b = 0; b < self.blocks().size(); ++b) {
+                    blocks[self.blocks()[b].c_str()] = py::cast(self.block_fields(b));
+                }
+                return blocks;
+            },
+            "Repeating blocks and the fields of their items")
+        .def(
+            "render",
+            [](const WorkbookTemplate& self, py::handle data) {
+                const TemplateData converted = template_data(self, data);
+                std::string package;
+                {
+                    py::gil_scoped_release nogil;
+                    package = self.render(converted);
+                }
+                return py::bytes(package.data(), package.size());
+            },
+            py::arg("data"), "Render the template with `data` and return the package bytes")
+        .def(
+            "render_to",
+            [](const WorkbookTemplate& self, py::handle data, const std::string& path) {
+                const TemplateData converted = template_data(self, data);
+                py::gil_scoped_release nogil;
+                self.render_to(converted, path);
+            },
+            py::arg("data"), py::arg("path"),
+            "Render the template with `data` into the file `path`")
+        .def(
+            "render_many",
+            [](const WorkbookTemplate& self, py::handle datas,
+               const std::vector<std::string>& paths, size_t workers) {
+                std::vector<TemplateData> converted;
+                for (py::handle data : datas) converted.push_back(template_data(self, data));
+                py::gil_scoped_release nogil;
+                render_templates(self, converted, paths, workers);
+            },
+            py::arg("datas"), py::arg("paths"), py::arg("workers") = 0,
+            "Render `datas[i]` into `paths[i]` on up to `workers` threads (0 picks the core "
+            "count)");
+}
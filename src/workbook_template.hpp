@@ -0,0 +1,81 @@
+#ifndef PYOPENXLSX_WORKBOOK_TEMPLATE_HPP
+#define PYOPENXLSX_WORKBOOK_TEMPLATE_HPP
+
+/**
+ * @file workbook_template.hpp
+ * @brief Render a template workbook many times with different data.
+ *
+ * Loading a workbook, filling a few cells and saving it again parses every
+ * part of the package and recompresses all of it. A WorkbookTemplate parses
+ * the package once: the worksheets holding {{placeholders}} (and the parts
+ * that refer to their rows) are kept as XML trees, everything else stays as
+ * compressed entries of the original zip. Rendering copies the trees, fills
+ * them and writes a new package in which every untouched entry is copied
+ * byte for byte, without being decompressed.
+ *
+ * Placeholders are {{name}} in cell text (shared or inline strings) and in
+ * page headers and footers. A cell holding nothing but one placeholder takes
+ * the value with its type (number, boolean, text or blank); otherwise the
+ * values are substituted into the text. Rows with {{block.field}} placeholders
+ * form a repeating block: the rows of a block are written once per item of
+ * `block` and the rows below move down. References to the moved rows (in
+ * formulas, merged cells, conditional formats, data validations, hyperlinks,
+ * tables and defined names) are adjusted; ranges that span the template rows
+ * of a block grow to span all of its copies.
+ *
+ * A template is immutable once built, so any number of threads may render it
+ * at the same time.
+ */
+
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include "internal_access.hpp"
+
+// A value for one placeholder
+struct TemplateValue {
+    CellData cell;     // written to cells that hold nothing but the placeholder
+    std::string text;  // substituted into longer text
+};
+
+// The values of one rendering. `fields` follows WorkbookTemplate::fields(); `items[b]` holds
+// the items of block b, each with the values of WorkbookTemplate::block_fields(b) in order.
+struct TemplateData {
+    std::vector<TemplateValue> fields;
+    std::vector<std::vector<std::vector<TemplateValue>>> items;
+};
+
+class WorkbookTemplate {
+   public:
+    // Parse the zip package in `package`. Raises ValueError when it is not a workbook or a
+    // repeating block cannot be expanded.
+    explicit WorkbookTemplate(std::string_view package);
+
+    // Names of the {{name}} placeholders, in order of first use
+    const std::vector<std::string>& fields() const;
+    // Names of the repeating blocks and the fields of each
+    const std::vector<std::string>& blocks() const;
+    const std::vector<std::string>& block_fields(size_t block) const;
+    // Whether a field (or block field) appears inside longer text, so it needs TemplateValue::text
+    bool field_in_text(size_t field) const;
+    bool block_field_in_text(size_t block, size_t field) const;
+
+    // The rendered package. Safe to call from several threads at once.
+    std::string render(const TemplateData& data) const;
+    void render_to(const TemplateData& data, const std::string& path) const;
+
+    struct Impl;
+
+   private:
+    std::shared_ptr<const Impl> m_impl;
+};
+
+// Render `data[i]` into the file `paths[i]` on up to `workers` threads (0 picks the core count,
+// at most 8). Safe to call without the GIL.
+void render_templates(const WorkbookTemplate& tpl, const std::vector<TemplateData>& data,
+                      const std::vector<std::string>& paths, size_t workers);
+
+#endif  // PYOPENXLSX_WORKBOOK_TEMPLATE_HPP
@@ -1,9 +1,28 @@
 #include <nanobind/ndarray.h>
+#include <nanobind/stl/optional.h>
+#include <nanobind/stl/pair.h>
 
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <optional>
 #include <variant>
 #include <vector>
 
+#include "aggregation.hpp"
+#include "comment_batch.hpp"
+#include "conditional_formatting.hpp"
+#include "data_validation.hpp"
+#include "hyperlinks.hpp"
+#include "images.hpp"
 #include "internal_access.hpp"
+#include "merge_index.hpp"
+#include "number_format.hpp"
+#include "pivot_table.hpp"
+#include "sheet_dimensions.hpp"
+#include "sheet_shift.hpp"
+#include "sheet_xml.hpp"
+#include "style_table.hpp"
 
 void add_image_to_worksheet(XLWorksheet& ws, py::bytes imageData, const std::string& extension,
                             uint32_t row, uint16_t col, double width, double height) {
@@ -44,6 +63,78 @@ void add_image_to_worksheet(XLWorksheet& ws, py::bytes imageData, const std::str
     }
 }
 
+// Batch counterpart of add_image_to_worksheet. Each item is (source, row, col, width, height)
+// where source is the image bytes or a file path; a width or height of 0 is taken from the
+// image header. The bytes objects are only read while the caller's list keeps them alive.
+std::vector<std::string> add_images_to_worksheet(XLWorksheet& ws, py::list items) {
+    std::vector<ImageSource> images;
+    images.reserve(py::len(items));
+    for (auto item : items) {
+        py::tuple t = py::cast<py::tuple>(item);
+        if (py::len(t) != 5) {
+            throw py::value_error(
+                "Each image must be a tuple of (source, row, col, width, height)");
+        }
+        ImageSource image;
+        if (py::isinstance<py::bytes>(t[0])) {
+            py::bytes bytes = py::borrow<py::bytes>(t[0]);
+            image.data = std::string_view(static_cast<const char*>(bytes.data()), bytes.size());
+        } else {
+            image.path = py::cast<std::string>(t[0]);
+        }
+        image.row = py::cast<uint32_t>(t[1]);
+        image.col = py::cast<uint16_t>(t[2]);
+        image.width = py::cast<uint32_t>(t[3]);
+        image.height = py::cast<uint32_t>(t[4]);
+        if (image.row < 1 || image.row > kExcelMaxRows || image.col < 1 ||
+            image.col > kExcelMaxCols) {
+            throw py::value_error("Image anchor is outside the sheet");
+        }
+        images.push_back(std::move(image));
+    }
+    py::gil_scoped_release release;
+    return add_images(ws, images);
+}
+
+// Batch counterpart of XLComments::set. Each item is (ref, text, author); an empty author
+// means the first author of the sheet.
+size_t add_comments_to_worksheet(XLWorksheet& ws, py::list items, bool sharedShape) {
+    std::vector<CommentItem> comments;
+    comments.reserve(py::len(items));
+    for (auto item : items) {
+        py::tuple t = py::cast<py::tuple>(item);
+        if (py::len(t) != 3) {
+            throw py::value_error("Each comment must be a tuple of (ref, text, author)");
+        }
+        comments.push_back({py::cast<std::string>(t[0]), py::cast<std::string>(t[1]),
+                            py::cast<std::string>(t[2])});
+    }
+    py::gil_scoped_release release;
+    return add_comments(ws, comments, sharedShape);
+}
+
+// (ref, target, tooltip, internal) tuples of add_hyperlinks and XLHyperlinkIndex.update
+std::vector<HyperlinkItem> hyperlink_items(py::list items) {
+    std::vector<HyperlinkItem> links;
+    links.reserve(py::len(items));
+    for (auto item : items) {
+        py::tuple t = py::cast<py::tuple>(item);
+        if (py::len(t) != 4) {
+            throw py::value_error(
+                "Each hyperlink must be a tuple of (ref, target, tooltip, internal)");
+        }
+        links.push_back({py::cast<std::string>(t[0]), py::cast<std::string>(t[1]),
+                         py::cast<std::string>(t[2]), py::cast<bool>(t[3])});
+    }
+    return links;
+}
+
+size_t add_hyperlinks_to_worksheet(XLWorksheet& ws, py::list items) {
+    std::vector<HyperlinkItem> links = hyperlink_items(items);
+    py::gil_scoped_release release;
+    return add_hyperlinks(ws, links);
+}
+
 // Helper function to convert XLCellValue to py::object efficiently
 // Note: GIL must be held when calling this function
 inline py::object cell_value_to_pyobject(const XLCellValue& val) {
@@ -62,6 +153,88 @@ inline py::object cell_value_to_pyobject(const XLCellValue& val) {
     }
 }
 
+namespace {
+
+/**
+ * Number-format-aware conversion for the bulk readers.
+ *
+ * Inactive unless dates or formatted text were requested. Then every cell's style index
+ * is looked up in a StyleTable (the caller's cached one, or one built here): in formatted
+ * mode numbers and booleans are replaced by their display text while the GIL is released,
+ * otherwise date-formatted numbers become datetime objects when converted to Python, the
+ * same as Cell.value returns (time-only values fall on 1899-12-30).
+ */
+class ValueFormatter {
+   public:
+    ValueFormatter(XLWorksheet& ws, bool convertDates, bool formatted, const StyleTable* table)
+        : m_formatted(formatted) {
+        if (!convertDates && !formatted) return;
+        if (table == nullptr) table = &m_owned.emplace(get_parent_doc(ws).styles());
+        m_table = table;
+        if (!formatted) {
+            m_datetime = py::module_::import_("datetime").attr("datetime");
+        }
+    }
+
+    bool active() const { return m_table != nullptr; }
+
+    // No GIL needed
+    void prepare(CellData& data, uint32_t style) const {
+        if (!m_formatted) return;
+        switch (data.type) {
+            case CellData::Type::Boolean:
+                data.strVal = data.boolVal ? "TRUE" : "FALSE";
+                break;
+            case CellData::Type::Integer:
+                data.strVal =
+                    render_number(static_cast<double>(data.intVal), m_table->format_code(style));
+                break;
+            case CellData::Type::Float:
+                data.strVal = render_number(data.floatVal, m_table->format_code(style));
+                break;
+            default:
+                return;
+        }
+        data.type = CellData::Type::String;
+    }
+
+    // GIL must be held
+    py::object to_python(const CellData& data, uint32_t style) const {
+        if (m_formatted ||
+            (data.type != CellData::Type::Float && data.type != CellData::Type::Integer)) {
+            return data.to_python();
+        }
+        if (!StyleTable::is_date_category(m_table->category(style))) return data.to_python();
+
+        const double serial =
+            data.type == CellData::Type::Float ? data.floatVal : static_cast<double>(data.intVal);
+        SerialDateTime dt;
+        if (!serial_to_datetime(serial, dt)) return data.to_python();
+        return m_datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond);
+    }
+
+   private:
+    bool m_formatted;
+    std::optional<StyleTable> m_owned;
+    const StyleTable* m_table = nullptr;
+    py::object m_datetime;
+};
+
+// Style index of every cell in a block, row-major (0 where there is no cell)
+std::vector<uint32_t> read_block_styles(XLWorksheet& ws, uint32_t startRow, uint16_t startCol,
+                                        uint32_t endRow, uint16_t endCol) {
+    const size_t numCols = static_cast<size_t>(endCol - startCol + 1);
+    std::vector<uint32_t> styles(static_cast<size_t>(endRow - startRow + 1) * numCols, 0);
+    for_each_cell_node(ws, startRow, startCol, endRow, endCol,
+                       [&](uint32_t r, uint16_t c, const XMLNode& cellNode) {
+                           styles[static_cast<size_t>(r - startRow) * numCols + (c - startCol)] =
+                               cellNode.attribute("s").as_uint();
+                       });
+    return styles;
+}
+
+}  // namespace
+
 // Get a single cell's value directly without creating a Cell object
 py::object get_cell_value(XLWorksheet& ws, uint32_t row, uint16_t col) {
     Expects(row >= 1 && row <= kExcelMaxRows);
@@ -78,7 +251,8 @@ py::object get_cell_value(XLWorksheet& ws, uint32_t row, uint16_t col) {
 
 // Bulk read a specific range of cells - returns list[list[Any]]
 py::list get_range_data(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, uint32_t endRow,
-                        uint16_t endCol) {
+                        uint16_t endCol, bool convertDates, bool formatted,
+                        const StyleTable* styleTable) {
     Expects(startRow >= 1 && startRow <= kExcelMaxRows);
     Expects(endRow >= startRow && endRow <= kExcelMaxRows);
     Expects(startCol >= 1 && startCol <= kExcelMaxCols);
@@ -87,8 +261,11 @@ py::list get_range_data(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, u
     auto numRows = gsl::narrow<uint32_t>(endRow - startRow + 1);
     auto numCols = gsl::narrow<uint16_t>(endCol - startCol + 1);
 
+    const ValueFormatter formatter(ws, convertDates, formatted, styleTable);
+
     // First, read all data without GIL
     std::vector<CellData> data;
+    std::vector<uint32_t> styles;
 
     {
         py::gil_scoped_release release;
@@ -109,6 +286,11 @@ py::list get_range_data(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, u
                 }
             }
         }
+
+        if (formatter.active()) {
+            styles = read_block_styles(ws, startRow, startCol, endRow, endCol);
+            for (size_t i = 0; i < data.size(); ++i) formatter.prepare(data[i], styles[i]);
+        }
     }
 
     // Now convert to Python with GIL held
@@ -117,7 +299,9 @@ py::list get_range_data(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, u
         py::list pyRow;
         size_t baseIdx = static_cast<size_t>(r) * numCols;
         for (uint16_t c = 0; c < numCols; ++c) {
-            pyRow.append(data[baseIdx + c].to_python());
+            const size_t i = baseIdx + c;
+            pyRow.append(formatter.active() ? formatter.to_python(data[i], styles[i])
+                                            : data[i].to_python());
         }
         result.append(pyRow);
     }
@@ -126,9 +310,13 @@ py::list get_range_data(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, u
 }
 
 // Bulk read all rows data - returns list[list[Any]]
-py::list get_rows_data(XLWorksheet& ws) {
+py::list get_rows_data(XLWorksheet& ws, bool convertDates, bool formatted,
+                       const StyleTable* styleTable) {
+    const ValueFormatter formatter(ws, convertDates, formatted, styleTable);
+
     // First, read all data without GIL
     std::vector<CellData> data;
+    std::vector<uint32_t> styles;
     uint32_t rowCount = 0;
     uint16_t colCount = 0;
 
@@ -152,6 +340,11 @@ py::list get_rows_data(XLWorksheet& ws) {
                 }
             }
         }
+
+        if (formatter.active() && !data.empty()) {
+            styles = read_block_styles(ws, 1, 1, rowCount, colCount);
+            for (size_t i = 0; i < data.size(); ++i) formatter.prepare(data[i], styles[i]);
+        }
     }
 
     // Now convert to Python with GIL held
@@ -161,7 +354,9 @@ py::list get_rows_data(XLWorksheet& ws) {
         py::list pyRow;
         size_t baseIdx = static_cast<size_t>(r) * colCount;
         for (uint16_t c = 0; c < colCount; ++c) {
-            pyRow.append(data[baseIdx + c].to_python());
+            const size_t i = baseIdx + c;
+            pyRow.append(formatter.active() ? formatter.to_python(data[i], styles[i])
+                                            : data[i].to_python());
         }
         result.append(std::move(pyRow));
     }
@@ -170,11 +365,14 @@ py::list get_rows_data(XLWorksheet& ws) {
 }
 
 // Get a single row's data as list[Any] - more efficient for row iteration
-py::list get_row_values(XLWorksheet& ws, uint32_t rowNumber) {
+py::list get_row_values(XLWorksheet& ws, uint32_t rowNumber, bool convertDates, bool formatted,
+                        const StyleTable* styleTable) {
     Expects(rowNumber >= 1 && rowNumber <= kExcelMaxRows);
+    const ValueFormatter formatter(ws, convertDates, formatted, styleTable);
 
     // First, read data without GIL
     std::vector<CellData> rowData;
+    std::vector<uint32_t> styles;
     uint16_t colCount;
 
     {
@@ -195,12 +393,24 @@ py::list get_row_values(XLWorksheet& ws, uint32_t rowNumber) {
         while (rowData.size() < colCount) {
             rowData.emplace_back();
         }
+
+        if (formatter.active()) {
+            styles.assign(rowData.size(), 0);
+            XMLNode rowNode = find_row_node(sheet_data_node(ws), rowNumber);
+            for (XMLNode cellNode = rowNode.first_child_of_type(pugi::node_element);
+                 !cellNode.empty(); cellNode = cellNode.next_sibling_of_type(pugi::node_element)) {
+                const uint16_t c = cell_ref_column(cellNode.attribute("r").value());
+                if (c >= 1 && c <= styles.size()) styles[c - 1] = cellNode.attribute("s").as_uint();
+            }
+            for (size_t i = 0; i < rowData.size(); ++i) formatter.prepare(rowData[i], styles[i]);
+        }
     }
 
     // Convert to Python with GIL held
     py::list result;
-    for (const auto& cellData : rowData) {
-        result.append(cellData.to_python());
+    for (size_t i = 0; i < rowData.size(); ++i) {
+        result.append(formatter.active() ? formatter.to_python(rowData[i], styles[i])
+                                         : rowData[i].to_python());
     }
 
     return result;
@@ -287,6 +497,165 @@ py::ndarray<py::numpy, double, py::shape<-1, -1>> get_range_values(
     return py::ndarray<py::numpy, double, py::shape<-1, -1>>(ptr, 2, shape, owner);
 }
 
+// Read date-formatted cells of a range as milliseconds since the Unix epoch (numpy datetime64[ms])
+// Cells that are empty, non-numeric or not date/time formatted are NaT (INT64_MIN)
+py::ndarray<py::numpy, int64_t, py::shape<-1, -1>> get_range_datetimes(
+    XLWorksheet& ws, uint32_t startRow, uint16_t startCol, uint32_t endRow, uint16_t endCol,
+    const StyleTable* styleTable) {
+    Expects(startRow >= 1 && startRow <= kExcelMaxRows);
+    Expects(endRow >= startRow && endRow <= kExcelMaxRows);
+    Expects(startCol >= 1 && startCol <= kExcelMaxCols);
+    Expects(endCol >= startCol && endCol <= kExcelMaxCols);
+
+    auto numRows = gsl::narrow<size_t>(endRow - startRow + 1);
+    auto numCols = gsl::narrow<size_t>(endCol - startCol + 1);
+    constexpr int64_t kNaT = std::numeric_limits<int64_t>::min();
+    constexpr double kUnixEpochSerial = 25569.0;
+    constexpr double kMillisPerDay = 86400000.0;
+
+    std::optional<StyleTable> ownedTable;
+    if (styleTable == nullptr) styleTable = &ownedTable.emplace(get_parent_doc(ws).styles());
+
+    auto uptr = std::make_unique<int64_t[]>(numRows * numCols);
+    gsl::span<int64_t> buf(uptr.get(), numRows * numCols);
+    std::fill(buf.begin(), buf.end(), kNaT);
+
+    {
+        py::gil_scoped_release release;
+        const std::vector<uint32_t> styles =
+            read_block_styles(ws, startRow, startCol, endRow, endCol);
+        for (size_t r = 0; r < numRows; ++r) {
+            XLRow row = ws.row(gsl::narrow<uint32_t>(startRow + r));
+            if (row.empty()) continue;
+
+            std::vector<XLCellValue> values = row.values();
+            for (size_t c = 0; c < numCols; ++c) {
+                const size_t i = r * numCols + c;
+                auto colIdx = gsl::narrow<size_t>(startCol + c - 1);
+                if (colIdx >= values.size() || !styleTable->is_date(styles[i])) continue;
+                const auto& val = values[colIdx];
+                double serial;
+                if (val.type() == XLValueType::Float) {
+                    serial = val.get<double>();
+                } else if (val.type() == XLValueType::Integer) {
+                    serial = static_cast<double>(val.get<int64_t>());
+                } else {
+                    continue;
+                }
+                buf[i] =
+                    static_cast<int64_t>(std::llround((serial - kUnixEpochSerial) * kMillisPerDay));
+            }
+        }
+    }
+
+    int64_t* ptr = uptr.release();
+    py::capsule owner(ptr, [](void* p) noexcept { delete[] (int64_t*)p; });
+    size_t shape[2] = {numRows, numCols};
+    return py::ndarray<py::numpy, int64_t, py::shape<-1, -1>>(ptr, 2, shape, owner);
+}
+
+// Read the style (cell format) index of every cell in a range into a 2D numpy array
+// Walks <sheetData> once; cells without an explicit style report index 0
+py::ndarray<py::numpy, uint32_t, py::shape<-1, -1>> get_range_styles(
+    XLWorksheet& ws, uint32_t startRow, uint16_t startCol, uint32_t endRow, uint16_t endCol) {
+    Expects(startRow >= 1 && startRow <= kExcelMaxRows);
+    Expects(endRow >= startRow && endRow <= kExcelMaxRows);
+    Expects(startCol >= 1 && startCol <= kExcelMaxCols);
+    Expects(endCol >= startCol && endCol <= kExcelMaxCols);
+
+    auto numRows = gsl::narrow<size_t>(endRow - startRow + 1);
+    auto numCols = gsl::narrow<size_t>(endCol - startCol + 1);
+
+    auto uptr = std::make_unique<uint32_t[]>(numRows * numCols);
+    gsl::span<uint32_t> buf(uptr.get(), numRows * numCols);
+    std::fill(buf.begin(), buf.end(), 0u);
+
+    {
+        py::gil_scoped_release release;
+        for_each_cell_node(ws, startRow, startCol, endRow, endCol,
+                           [&](uint32_t r, uint16_t c, const XMLNode& cellNode) {
+                               buf[static_cast<size_t>(r - startRow) * numCols + (c - startCol)] =
+                                   cellNode.attribute("s").as_uint();
+                           });
+    }
+
+    uint32_t* ptr = uptr.release();
+    py::capsule owner(ptr, [](void* p) noexcept { delete[] (uint32_t*)p; });
+    size_t shape[2] = {numRows, numCols};
+    return py::ndarray<py::numpy, uint32_t, py::shape<-1, -1>>(ptr, 2, shape, owner);
+}
+
+// Set the style index of every cell in a block from a 2D uint32 array, walking <sheetData> once.
+// Any strides are accepted, so broadcast views (stride 0) are applied without being expanded.
+// Missing rows/cells are created only where the style is non-zero.
+void set_range_styles(XLWorksheet& ws, uint32_t startRow, uint16_t startCol,
+                      py::ndarray<const uint32_t, py::ndim<2>, py::device::cpu> styles) {
+    const size_t numRows = styles.shape(0);
+    const size_t numCols = styles.shape(1);
+    if (numRows == 0 || numCols == 0) return;
+    Expects(startRow >= 1 && startRow + numRows - 1 <= kExcelMaxRows);
+    Expects(startCol >= 1 && startCol + numCols - 1 <= kExcelMaxCols);
+
+    auto view = styles.view();
+    const size_t formatCount = get_parent_doc(ws).styles().cellFormats().count();
+
+    py::gil_scoped_release release;
+    for (size_t r = 0; r < numRows; ++r) {
+        for (size_t c = 0; c < numCols; ++c) {
+            if (view(r, c) >= formatCount) {
+                throw py::value_error(("Style index " + std::to_string(view(r, c)) +
+                                       " is out of range (the workbook has " +
+                                       std::to_string(formatCount) + " cell formats)")
+                                          .c_str());
+            }
+        }
+    }
+
+    std::vector<std::string> letters(numCols);
+    for (size_t c = 0; c < numCols; ++c) {
+        letters[c] = column_letters(static_cast<uint16_t>(startCol + c));
+    }
+
+    XMLNode sheetData = sheet_data_node(ws);
+    XMLNode rowNode = sheetData.first_child_of_type(pugi::node_element);
+    for (size_t r = 0; r < numRows; ++r) {
+        const auto rowNumber = static_cast<uint32_t>(startRow + r);
+        while (!rowNode.empty() && rowNode.attribute("r").as_uint() < rowNumber) {
+            rowNode = rowNode.next_sibling_of_type(pugi::node_element);
+        }
+        if (rowNode.empty() || rowNode.attribute("r").as_uint() != rowNumber) {
+            bool anyStyle = false;
+            for (size_t c = 0; c < numCols && !anyStyle; ++c) anyStyle = view(r, c) != 0;
+            if (!anyStyle) continue;
+            rowNode = rowNode.empty() ? sheetData.append_child("row")
+                                      : sheetData.insert_child_before("row", rowNode);
+            rowNode.append_attribute("r").set_value(rowNumber);
+        }
+
+        const std::string rowDigits = std::to_string(rowNumber);
+        XMLNode cellNode = rowNode.first_child_of_type(pugi::node_element);
+        uint16_t cellCol = cellNode.empty() ? 0 : cell_ref_column(cellNode.attribute("r").value());
+        for (size_t c = 0; c < numCols; ++c) {
+            const auto col = static_cast<uint16_t>(startCol + c);
+            while (!cellNode.empty() && cellCol < col) {
+                cellNode = cellNode.next_sibling_of_type(pugi::node_element);
+                cellCol = cellNode.empty() ? 0 : cell_ref_column(cellNode.attribute("r").value());
+            }
+            const uint32_t style = view(r, c);
+            XMLNode target = cellNode;
+            if (cellNode.empty() || cellCol != col) {
+                if (style == 0) continue;
+                target = cellNode.empty() ? rowNode.append_child("c")
+                                          : rowNode.insert_child_before("c", cellNode);
+                target.append_attribute("r").set_value((letters[c] + rowDigits).c_str());
+            }
+            auto attr = target.attribute("s");
+            if (attr.empty()) attr = target.append_attribute("s");
+            attr.set_value(style);
+        }
+    }
+}
+
 // Direct cell value setter - bypasses Python Cell object creation
 void set_cell_value(XLWorksheet& ws, uint32_t row, uint16_t col, py::object value) {
     Expects(row >= 1 && row <= kExcelMaxRows);
@@ -316,35 +685,55 @@ void set_cell_value(XLWorksheet& ws, uint32_t row, uint16_t col, py::object valu
     }
 }
 
+// Write one row of converted values starting at startCol (GIL must be released by the caller)
+// Rows starting at column A use OpenXLSX's row batch assignment; other offsets write cell by cell
+// so that cells to the left of startCol are left untouched
+inline void write_row_cells(XLWorksheet& ws, uint32_t row, uint16_t startCol,
+                            const std::vector<CellData>& values) {
+    Expects(values.size() <= static_cast<size_t>(kExcelMaxCols - startCol + 1));
+    if (startCol == 1) {
+        std::vector<XLCellValue> rowValues;
+        rowValues.reserve(values.size());
+        for (const auto& cd : values) {
+            rowValues.push_back(cd.to_xlcellvalue());
+        }
+        XLRow xlRow = ws.row(row);
+        xlRow.values() = rowValues;
+        return;
+    }
+    for (size_t c = 0; c < values.size(); ++c) {
+        XLCell cell = ws.cell(row, gsl::narrow<uint16_t>(startCol + c));
+        values[c].apply_to(cell);
+    }
+}
+
 // Write a 2D Python list to a worksheet range
 // Uses OpenXLSX's row batch assignment for better performance
 void write_rows_data(XLWorksheet& ws, uint32_t startRow, uint16_t startCol, py::list rows) {
     Expects(startRow >= 1 && startRow <= kExcelMaxRows);
     Expects(startCol >= 1 && startCol <= kExcelMaxCols);
 
-    // First pass: extract all data while holding GIL, convert to XLCellValue directly
-    std::vector<std::vector<XLCellValue>> data;
+    // First pass: extract all data while holding GIL
+    std::vector<std::vector<CellData>> data;
     data.reserve(py::len(rows));
 
     for (auto row : rows) {
-        std::vector<XLCellValue> rowData;
+        std::vector<CellData> rowData;
         py::list rowList = py::cast<py::list>(row);
         rowData.reserve(py::len(rowList));
 
         for (auto cell : rowList) {
-            CellData cd = CellData::from_python(cell);
-            rowData.push_back(cd.to_xlcellvalue());
+            rowData.push_back(CellData::from_python(cell));
         }
         data.push_back(std::move(rowData));
     }
 
-    // Second pass: write to worksheet without GIL using row-level batch assignment
+    // Second pass: write to worksheet without GIL
     {
         py::gil_scoped_release release;
 
         for (size_t r = 0; r < data.size(); ++r) {
-            XLRow xlRow = ws.row(gsl::narrow<uint32_t>(startRow + r));
-            xlRow.values() = data[r];
+            write_row_cells(ws, gsl::narrow<uint32_t>(startRow + r), startCol, data[r]);
         }
     }
 }
@@ -355,20 +744,17 @@ void write_row_data(XLWorksheet& ws, uint32_t row, uint16_t startCol, py::list v
     Expects(startCol >= 1 && startCol <= kExcelMaxCols);
 
     // Extract data while holding GIL
-    std::vector<XLCellValue> data;
+    std::vector<CellData> data;
     data.reserve(py::len(values));
 
     for (auto val : values) {
-        CellData cd = CellData::from_python(val);
-        data.push_back(cd.to_xlcellvalue());
+        data.push_back(CellData::from_python(val));
     }
 
-    // Write without GIL using row-level batch assignment
+    // Write without GIL
     {
         py::gil_scoped_release release;
-
-        XLRow xlRow = ws.row(row);
-        xlRow.values() = data;
+        write_row_cells(ws, row, startCol, data);
     }
 }
 
@@ -410,6 +796,179 @@ void set_cells_batch(XLWorksheet& ws, py::list cells) {
     }
 }
 
+CellData agg_value_cell(const AggValue& value) {
+    CellData cell;
+    switch (value.kind) {
+        case AggValue::Kind::Number:
+            if (value.integer) {
+                cell.type = CellData::Type::Integer;
+                cell.intVal = static_cast<int64_t>(value.number);
+            } else {
+                cell.type = CellData::Type::Float;
+                cell.floatVal = value.number;
+            }
+            break;
+        case AggValue::Kind::String:
+            cell.type = CellData::Type::String;
+            cell.strVal = value.text;
+            break;
+        case AggValue::Kind::Boolean:
+            cell.type = CellData::Type::Boolean;
+            cell.boolVal = value.number != 0.0;
+            break;
+        default:
+            break;
+    }
+    return cell;
+}
+
+// Group a block by key columns and aggregate value columns in one native pass.
+// Returns (keys as list[list], results as a (groups, len(funcs)) float array with NaN for
+// empty results); when `target` is given the grouped rows are also written there, after
+// `header` if it is not empty, without going through Python objects.
+std::pair<py::list, py::ndarray<py::numpy, double, py::shape<-1, -1>>> group_by_range(
+    XLWorksheet& ws, uint32_t startRow, uint16_t startCol, uint32_t endRow, uint16_t endCol,
+    const std::vector<uint16_t>& keyCols, const std::vector<uint16_t>& valueCols,
+    const std::vector<std::string>& funcs, py::list filters, bool sort, XLWorksheet* target,
+    uint32_t targetRow, uint16_t targetCol, const std::vector<std::string>& header) {
+    Expects(startRow >= 1 && startRow <= kExcelMaxRows);
+    Expects(endRow >= startRow && endRow <= kExcelMaxRows);
+    Expects(startCol >= 1 && startCol <= kExcelMaxCols);
+    Expects(endCol >= startCol && endCol <= kExcelMaxCols);
+    if (valueCols.size() != funcs.size()) {
+        throw py::value_error("value_cols and funcs must have the same length");
+    }
+    const auto check_column = [&](uint16_t col) {
+        if (col < startCol || col > endCol) {
+            throw py::value_error(
+                ("column " + std::to_string(col) + " is outside the range").c_str());
+        }
+    };
+    for (uint16_t col : keyCols) check_column(col);
+    for (uint16_t col : valueCols) check_column(col);
+
+    std::vector<AggFunc> parsedFuncs;
+    parsedFuncs.reserve(funcs.size());
+    for (const std::string& func : funcs) parsedFuncs.push_back(parse_agg_func(func));
+
+    std::vector<GroupFilter> parsedFilters;
+    for (auto item : filters) {
+        py::tuple f = py::cast<py::tuple>(item);
+        if (py::len(f) != 3)
+            throw py::value_error("Each filter must be a tuple of (col, op, value)");
+        GroupFilter filter{py::cast<uint16_t>(f[0]), py::cast<std::string>(f[1]),
+                           AggValue::from(CellData::from_python(f[2]).to_xlcellvalue())};
+        check_column(filter.col);
+        static const char* const ops[] = {"==", "!=", "<", "<=", ">", ">="};
+        if (std::none_of(std::begin(ops), std::end(ops),
+                         [&](const char* op) { return filter.op == op; })) {
+            throw py::value_error(("unknown filter operator: " + filter.op).c_str());
+        }
+        parsedFilters.push_back(std::move(filter));
+    }
+
+    const size_t keyCount = keyCols.size();
+    const size_t funcCount = funcs.size();
+    GroupedBlock grouped;
+    {
+        py::gil_scoped_release release;
+        grouped = group_by_block(ws, startRow, startCol, endRow, endCol, keyCols, valueCols,
+                                 parsedFuncs, parsedFilters, sort);
+        if (target != nullptr) {
+            const size_t rows = grouped.groups + (header.empty() ? 0 : 1);
+            if (targetRow < 1 || targetRow + rows - 1 > kExcelMaxRows || targetCol < 1 ||
+                targetCol + keyCount + funcCount - 1 > kExcelMaxCols) {
+                throw py::value_error("The grouped result does not fit on the target sheet");
+            }
+            uint32_t row = targetRow;
+            if (!header.empty()) {
+                std::vector<CellData> cells(header.size());
+                for (size_t i = 0; i < header.size(); ++i) {
+                    cells[i].type = CellData::Type::String;
+                    cells[i].strVal = header[i];
+                }
+                write_row_cells(*target, row++, targetCol, cells);
+            }
+            std::vector<CellData> cells(keyCount + funcCount);
+            for (size_t g = 0; g < grouped.groups; ++g) {
+                for (size_t k = 0; k < keyCount; ++k) {
+                    cells[k] = agg_value_cell(grouped.keys[g * keyCount + k]);
+                }
+                for (size_t i = 0; i < funcCount; ++i) {
+                    const double value = grouped.values[g * funcCount + i];
+                    CellData& cell = cells[keyCount + i];
+                    cell = CellData();
+                    if (std::isnan(value)) continue;
+                    const bool counted =
+                        parsedFuncs[i] == AggFunc::Count || parsedFuncs[i] == AggFunc::Distinct;
+                    cell.type = counted ? CellData::Type::Integer : CellData::Type::Float;
+                    cell.intVal = static_cast<int64_t>(value);
+                    cell.floatVal = value;
+                }
+                write_row_cells(*target, row++, targetCol, cells);
+            }
+        }
+    }
+
+    py::list keys;
+    for (size_t g = 0; g < grouped.groups; ++g) {
+        py::list key;
+        for (size_t k = 0; k < keyCount; ++k) {
+            key.append(agg_value_cell(grouped.keys[g * keyCount + k]).to_python());
+        }
+        keys.append(key);
+    }
+    auto uptr = std::make_unique<double[]>(grouped.values.size());
+    std::copy(grouped.values.begin(), grouped.values.end(), uptr.get());
+    double* ptr = uptr.release();
+    py::capsule owner(ptr, [](void* p) noexcept { delete[] (double*)p; });
+    size_t shape[2] = {grouped.groups, funcCount};
+    return {keys, py::ndarray<py::numpy, double, py::shape<-1, -1>>(ptr, 2, shape, owner)};
+}
+
+// Create several charts on `ws` in one pass. Each chart gets its anchor (1-based row, col,
+// width and height in pixels), optional title and (values_ref, title, categories_ref) series.
+// The sheet drawing is fetched once and the chart relationships are appended directly, since
+// every chart part is new.
+std::vector<XLChart> add_charts(
+    XLWorksheet& ws, const std::vector<XLChartType>& types, const std::vector<std::string>& names,
+    const std::vector<std::tuple<uint32_t, uint16_t, uint32_t, uint32_t>>& anchors,
+    const std::vector<std::string>& titles,
+    const std::vector<std::vector<std::tuple<std::string, std::string, std::string>>>& series) {
+    const size_t count = types.size();
+    if (names.size() != count || anchors.size() != count || titles.size() != count ||
+        series.size() != count) {
+        throw py::value_error("types, names, anchors, titles and series must have the same length");
+    }
+    for (const auto& [row, col, width, height] : anchors) {
+        if (row < 1 || row > kExcelMaxRows || col < 1 || col > kExcelMaxCols) {
+            throw py::value_error("Chart anchor is outside the sheet");
+        }
+    }
+
+    std::vector<XLChart> charts;
+    charts.reserve(count);
+    py::gil_scoped_release release;
+    XLDocument& doc = get_parent_doc(ws);
+    XLDrawing& drawing = ws.drawing();
+    XLRelationships& rels = drawing.relationships();
+    for (size_t i = 0; i < count; ++i) {
+        XLChart chart = doc.createChart(types[i]);
+        const std::string chartPath = get_xml_path(chart);
+        const std::string relPath =
+            "../charts/" + chartPath.substr(chartPath.find_last_of('/') + 1);
+        const std::string relId = rels.addRelationship(XLRelationshipType::Chart, relPath).id();
+        const auto& [row, col, width, height] = anchors[i];
+        drawing.addChartAnchor(relId, names[i], row - 1, col - 1, width, height);
+        for (const auto& [valuesRef, title, categoriesRef] : series[i]) {
+            chart.addSeries(valuesRef, title, categoriesRef);
+        }
+        if (!titles[i].empty()) chart.setTitle(titles[i]);
+        charts.push_back(chart);
+    }
+    return charts;
+}
+
 void init_worksheet(py::module_& m) {
     // Bind XLVectorShapeType
     py::enum_<XLVectorShapeType>(m, "XLVectorShapeType")
@@ -543,6 +1102,18 @@ void init_worksheet(py::module_& m) {
         .def_rw("select_unlocked_cells", &XLSheetProtectionOptions::selectUnlockedCells);
 
     // Bind XLWorksheet
+    py::class_<HyperlinkIndex>(m, "XLHyperlinkIndex")
+        .def(py::init<XLWorksheet&>(), py::arg("worksheet"))
+        .def("__len__", &HyperlinkIndex::size)
+        .def("__contains__", &HyperlinkIndex::contains, py::arg("ref"))
+        .def("get", &HyperlinkIndex::get, py::arg("ref"))
+        .def("set", &HyperlinkIndex::set, py::arg("ref"), py::arg("target"))
+        .def(
+            "update",
+            [](HyperlinkIndex& self, py::list items) { self.update(hyperlink_items(items)); },
+            py::arg("links"))
+        .def("remove", &HyperlinkIndex::remove, py::arg("ref"));
+
     py::class_<XLWorksheet>(m, "XLWorksheet")
         .def("name", &XLWorksheet::name)
         .def("set_name", &XLWorksheet::setName)
@@ -585,6 +1156,9 @@ void init_worksheet(py::module_& m) {
         .def("has_hyperlink", &XLWorksheet::hasHyperlink, py::arg("cellRef"))
         .def("get_hyperlink", &XLWorksheet::getHyperlink, py::arg("cellRef"))
         .def("remove_hyperlink", &XLWorksheet::removeHyperlink, py::arg("cellRef"))
+        .def("add_hyperlinks", &add_hyperlinks_to_worksheet, py::arg("links"),
+             "Add or replace (ref, target, tooltip, internal) hyperlinks in one pass; external "
+             "links to the same URL share one relationship. Returns the number written")
         .def("data_validations", &XLWorksheet::dataValidations, py::rv_policy::reference_internal)
         .def("page_setup", &XLWorksheet::pageSetup)
         .def("page_margins", &XLWorksheet::pageMargins)
@@ -639,6 +1213,11 @@ void init_worksheet(py::module_& m) {
              py::arg("count") = 1)
         .def("delete_column", &XLWorksheet::deleteColumn, py::arg("col_number"),
              py::arg("count") = 1)
+        .def("shift_rows", &shift_sheet_rows, py::arg("deleted"), py::arg("inserted"),
+             "Delete and insert rows in one pass, updating cells, formulas, merges, data "
+             "validations, conditional formatting, hyperlinks, tables and defined names")
+        .def("shift_columns", &shift_sheet_columns, py::arg("deleted"), py::arg("inserted"),
+             "Column counterpart of shift_rows")
         .def(
             "unmerge_cells",
             [](XLWorksheet& self, const std::string& rangeReference) {
@@ -649,6 +1228,8 @@ void init_worksheet(py::module_& m) {
         .def("column_format",
              py::overload_cast<const std::string&>(&XLWorksheet::getColumnFormat, py::const_))
         .def("merges", &XLWorksheet::merges, py::rv_policy::reference_internal)
+        .def("append_merges", &append_merges, py::arg("references"),
+             "Append many merged ranges with O(n log n) overlap checks")
         .def("set_column_format",
              py::overload_cast<const std::string&, XLStyleIndex>(&XLWorksheet::setColumnFormat),
              py::arg("column"), py::arg("cellFormatIndex"))
@@ -810,15 +1391,25 @@ void init_worksheet(py::module_& m) {
             },
             py::arg("set") = true)
         .def("comments", &XLWorksheet::comments, py::rv_policy::reference_internal)
+        .def("add_comments", &add_comments_to_worksheet, py::arg("comments"),
+             py::arg("shared_shape") = false,
+             "Add or replace (ref, text, author) comments in one pass. Returns the number "
+             "of comments written")
         .def("add_image", &add_image_to_worksheet, py::arg("image_data"), py::arg("extension"),
              py::arg("row") = 1, py::arg("col") = 1, py::arg("width") = 0, py::arg("height") = 0)
+        .def("add_images", &add_images_to_worksheet, py::arg("images"),
+             "Add (source, row, col, width, height) images in one pass; identical images "
+             "share one media part. Returns the media path of each image")
         // Bulk read APIs for performance optimization
-        .def("get_rows_data", &get_rows_data,
+        .def("get_rows_data", &get_rows_data, py::arg("convert_dates") = false,
+             py::arg("formatted") = false, py::arg("style_table") = py::none(),
              "Get all rows data as list[list[Any]] - optimized for bulk read")
-        .def("get_row_values", &get_row_values, py::arg("row"),
+        .def("get_row_values", &get_row_values, py::arg("row"), py::arg("convert_dates") = false,
+             py::arg("formatted") = false, py::arg("style_table") = py::none(),
              "Get a single row's values as list[Any]")
         .def("get_range_data", &get_range_data, py::arg("start_row"), py::arg("start_col"),
-             py::arg("end_row"), py::arg("end_col"),
+             py::arg("end_row"), py::arg("end_col"), py::arg("convert_dates") = false,
+             py::arg("formatted") = false, py::arg("style_table") = py::none(),
              "Get a range of cells as list[list[Any]] - optimized bulk read for specific range")
         .def("get_cell_value", &get_cell_value, py::arg("row"), py::arg("col"),
              "Get a single cell's value directly without creating a Cell object")
@@ -829,9 +1420,26 @@ void init_worksheet(py::module_& m) {
              py::arg("start_col"), py::arg("data"))
         .def("write_range_data", &write_range_typed<bool>, py::arg("start_row"),
              py::arg("start_col"), py::arg("data"))
+        .def("group_by", &group_by_range, py::arg("start_row"), py::arg("start_col"),
+             py::arg("end_row"), py::arg("end_col"), py::arg("key_cols"), py::arg("value_cols"),
+             py::arg("funcs"), py::arg("filters") = py::list(), py::arg("sort") = true,
+             py::arg("target") = py::none(), py::arg("target_row") = 1, py::arg("target_col") = 1,
+             py::arg("header") = std::vector<std::string>(),
+             "Group a range by key columns and aggregate value columns natively; returns "
+             "(keys, values) and optionally writes the result to a target worksheet")
         .def("get_range_values", &get_range_values, py::arg("start_row"), py::arg("start_col"),
              py::arg("end_row"), py::arg("end_col"),
              "Read a range of numeric cells into a 2D numpy array of doubles")
+        .def(
+            "get_range_datetimes", &get_range_datetimes, py::arg("start_row"), py::arg("start_col"),
+            py::arg("end_row"), py::arg("end_col"), py::arg("style_table") = py::none(),
+            "Read date-formatted cells of a range as int64 milliseconds since 1970 (NaT elsewhere)")
+        .def("get_range_styles", &get_range_styles, py::arg("start_row"), py::arg("start_col"),
+             py::arg("end_row"), py::arg("end_col"),
+             "Read the style index of each cell in a range into a 2D numpy array of uint32")
+        .def("set_range_styles", &set_range_styles, py::arg("start_row"), py::arg("start_col"),
+             py::arg("styles"),
+             "Set the style index of each cell in a range from a 2D uint32 array")
         // Performance-optimized write APIs - bypass Python Cell object creation
         .def("set_cell_value", &set_cell_value, py::arg("row"), py::arg("col"), py::arg("value"),
              "Set a cell's value directly without creating a Cell object. "
@@ -853,6 +1461,12 @@ void init_worksheet(py::module_& m) {
         .def("peek_cell", py::overload_cast<uint32_t, uint16_t>(&XLWorksheet::peekCell, py::const_),
              py::arg("row"), py::arg("col"))
         .def("auto_fit_column", &XLWorksheet::autoFitColumn, py::arg("column_number"))
+        .def("set_column_widths", &set_column_widths, py::arg("columns"), py::arg("widths"))
+        .def("set_row_heights", &set_row_heights, py::arg("rows"), py::arg("heights"))
+        .def("set_row_outline_levels", &set_row_outline_levels, py::arg("rows"), py::arg("levels"))
+        .def("set_rows_hidden", &set_rows_hidden, py::arg("rows"), py::arg("hidden") = true)
+        .def("auto_fit_columns", &auto_fit_columns, py::arg("columns"), py::arg("sample_rows") = 0,
+             py::arg("max_width") = 255.0)
         .def("add_sort_condition", &XLWorksheet::addSortCondition, py::arg("ref"),
              py::arg("col_id"), py::arg("descending") = false)
         .def("apply_auto_filter", &XLWorksheet::applyAutoFilter)
@@ -864,6 +1478,13 @@ void init_worksheet(py::module_& m) {
              py::overload_cast<const std::string&, const XLCfRule&, const XLDxf&>(
                  &XLWorksheet::addConditionalFormatting),
              py::arg("sqref"), py::arg("rule"), py::arg("dxf"))
+        .def("add_data_validations", &add_data_validations, py::arg("sqrefs"), py::arg("configs"),
+             "Add many data validations in one pass, grouping identical configs and "
+             "coalescing their ranges")
+        .def("add_conditional_formats", &add_conditional_formats, py::arg("sqrefs"),
+             py::arg("rules"), py::arg("dxfs"),
+             "Add many conditional formatting rules in one pass, merging identical rules "
+             "and pooling identical dxfs")
         .def("remove_conditional_formatting",
              py::overload_cast<const std::string&>(&XLWorksheet::removeConditionalFormatting),
              py::arg("sqref"))
@@ -897,14 +1518,27 @@ void init_worksheet(py::module_& m) {
         .def("add_chart_anchor",
              py::overload_cast<XLChartType, const XLChartAnchor&>(&XLWorksheet::addChart),
              py::arg("type"), py::arg("anchor"))
+        .def("add_charts", &add_charts, py::arg("types"), py::arg("names"), py::arg("anchors"),
+             py::arg("titles"), py::arg("series"),
+             "Create charts from (row, col, width, height) anchors and (values_ref, title, "
+             "categories_ref) series in one drawing pass")
         .def("add_pivot_table", &XLWorksheet::addPivotTable, py::arg("options"))
+        .def("compute_pivot_table", &compute_pivot_table, py::arg("pivot_table"),
+             py::arg("options"),
+             "Aggregate the source range of a new pivot table into its cache and render the "
+             "result; returns the reference of the rendered block")
+        .def("pivot_table_locations", &pivot_table_locations,
+             "List (name, ref, first_header_row, first_data_row, first_data_col) for each "
+             "pivot table on the sheet")
         .def("add_table_slicer", &XLWorksheet::addTableSlicer, py::arg("cell_reference"),
              py::arg("table"), py::arg("column_name"), py::arg("options") = XLSlicerOptions())
         .def("add_pivot_slicer", &XLWorksheet::addPivotSlicer, py::arg("cell_reference"),
              py::arg("pivot_table"), py::arg("column_name"), py::arg("options") = XLSlicerOptions())
         .def("add_comment", &XLWorksheet::addComment, py::arg("cell_ref"), py::arg("text"),
              py::arg("author") = "")
-        .def("add_threaded_comment", &XLWorksheet::addThreadedComment, py::arg("cell_ref"), py::arg("text"), py::arg("author") = "")
-        .def("add_threaded_reply", &XLWorksheet::addThreadedReply, py::arg("parent_id"), py::arg("text"), py::arg("author") = "")
+        .def("add_threaded_comment", &XLWorksheet::addThreadedComment, py::arg("cell_ref"),
+             py::arg("text"), py::arg("author") = "")
+        .def("add_threaded_reply", &XLWorksheet::addThreadedReply, py::arg("parent_id"),
+             py::arg("text"), py::arg("author") = "")
         .def("delete_threaded_comment", &XLWorksheet::deleteThreadedComment, py::arg("cell_ref"));
 }
@@ -0,0 +1,207 @@
+import re
+import zipfile
+
+import pytest
+from pyopenxlsx import Workbook, load_workbook
+
+
+@pytest.fixture
+def wb():
+    wb = Workbook()
+    yield wb
+    wb.close()
+
+
+def test_delete_rows_shifts_cells_and_formulas(wb):
+    ws = wb.active
+    ws.write_rows(1, [[i] for i in range(1, 11)])
+    ws.cell(12, 1).formula = "SUM(A1:A10)"
+    ws.cell(12, 2).formula = "A3*2"
+
+    ws.delete_rows([2, 3, 7])
+
+    assert [row[0] for row in ws.get_range_data(1, 1, 7, 1)] == [1, 4, 5, 6, 8, 9, 10]
+    assert ws.cell(9, 1).formula.text == "SUM(A1:A7)"
+    assert ws.cell(9, 2).formula.text == "#REF!*2"
+
+
+def test_insert_rows_mapping(wb):
+    ws = wb.active
+    ws.write_rows(1, [["a"], ["b"], ["c"]])
+
+    ws.insert_rows({2: 2, 3: 1})
+
+    assert [row[0] for row in ws.get_range_data(1, 1, 6, 1)] == [
+        "a",
+        None,
+        None,
+        "b",
+        None,
+        "c",
+    ]
+
+
+def test_delete_rows_updates_sheet_objects(wb):
+    ws = wb.active
+    ws.write_rows(1, [[i, i] for i in range(1, 21)])
+    ws.merge_cells("A5:B6")
+    ws.merge_cells("A10:B10")
+    ws.add_hyperlink("A15", "https://example.com")
+    ws.add_hyperlink("A3", "https://example.org")
+    wb.defined_names.append("Block", "Sheet1!$A$10:$B$12")
+
+    ws.delete_rows([3, 4, 10])
+
+    assert list(ws.merges) == ["A3:B4"]
+    assert ws.has_hyperlink("A12")
+    assert not ws.has_hyperlink("A3")
+    assert wb.defined_names.get("Block").refers_to() == "Sheet1!$A$8:$B$9"
+
+
+def test_delete_rows_drops_hyperlink_relationships(wb, tmp_path):
+    ws = wb.active
+    for row in range(1, 6):
+        ws.add_hyperlink(f"A{row}", f"https://example.com/{row}")
+    # Links to one URL share a relationship; it stays while one of them remains
+    ws.add_hyperlinks([("B2", "https://example.com/shared"), ("B4", "https://example.com/shared")])
+
+    ws.delete_rows([2, 3])
+
+    path = tmp_path / "links.xlsx"
+    wb.save(str(path))
+    with zipfile.ZipFile(path) as z:
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+        rels = z.read("xl/worksheets/_rels/sheet1.xml.rels").decode()
+    link_ids = set(re.findall(r'<hyperlink [^>]*r:id="([^"]+)"', sheet))
+    rel_targets = dict(re.findall(r'Id="([^"]+)"[^>]*Target="([^"]+)"', rels))
+    assert sheet.count("<hyperlink ") == 4
+    assert set(rel_targets) == link_ids
+    assert sorted(rel_targets.values()) == [
+        "https://example.com/1",
+        "https://example.com/4",
+        "https://example.com/5",
+        "https://example.com/shared",
+    ]
+
+
+def test_delete_columns_letters(wb, tmp_path):
+    ws = wb.active
+    ws.write_rows(1, [[1, 2, 3, 4], [5, 6, 7, 8]])
+    ws.cell(3, 4).formula = "SUM(A1:D2)"
+
+    ws.delete_columns(["B", 3])
+
+    assert ws.get_range_data(1, 1, 2, 2) == [[1, 4], [5, 8]]
+    assert ws.cell(3, 2).formula.text == "SUM(A1:B2)"
+
+    path = tmp_path / "shifted.xlsx"
+    wb.save(str(path))
+    wb2 = load_workbook(str(path))
+    assert wb2.active.get_range_data(1, 1, 1, 2) == [[1, 4]]
+    wb2.close()
+
+
+def test_shift_rejects_zero(wb):
+    with pytest.raises(ValueError):
+        wb.active.delete_rows([0, 1])
+    with pytest.raises(ValueError):
+        wb.active.insert_rows({0: 1})
+
+
+def test_delete_rows_promotes_shared_formula_master(tmp_path):
+    src = tmp_path / "shared.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.write_rows(1, [[i] for i in range(1, 6)])
+    for row in range(1, 6):
+        ws.cell(row, 2).formula = f"A{row}*2"
+    wb.save(str(src))
+    wb.close()
+
+    # Store B1:B5 as one shared formula, the way Excel writes a filled-down column
+    def share(match):
+        if match.group(1) == "1":
+            return '<f t="shared" ref="B1:B5" si="0">A1*2</f>'
+        return '<f t="shared" si="0"/>'
+
+    patched = tmp_path / "patched.xlsx"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(patched, "w") as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = re.sub(r"<f>A(\d)\*2</f>", share, data.decode()).encode()
+            zout.writestr(item, data)
+
+    wb = load_workbook(str(patched))
+    wb.active.delete_rows([1])
+    out = tmp_path / "out.xlsx"
+    wb.save(str(out))
+    wb.close()
+
+    with zipfile.ZipFile(out) as z:
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+    formulas = dict(re.findall(r'<c r="(B\d+)"[^>]*>\s*(<f [^>]*?(?:/>|>[^<]*</f>))', sheet))
+    assert sorted(formulas) == ["B1", "B2", "B3", "B4"]
+    assert re.fullmatch(r'<f t="shared" ref="B1:B4" si="0">A1\*2</f>', formulas["B1"])
+    assert all(re.fullmatch(r'<f t="shared" si="0"\s*/>', formulas[f"B{r}"]) for r in (2, 3, 4))
+
+
+def _table_parts(path):
+    with zipfile.ZipFile(path) as z:
+        names = z.namelist()
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+        rels_name = "xl/worksheets/_rels/sheet1.xml.rels"
+        rels = z.read(rels_name).decode() if rels_name in names else ""
+        types = z.read("[Content_Types].xml").decode()
+    return [n for n in names if n.startswith("xl/tables/")], sheet, rels, types
+
+
+@pytest.mark.parametrize("deleted", [[3, 4, 5], [3]], ids=["whole-table", "header-row"])
+def test_delete_rows_drops_table(tmp_path, deleted):
+    wb = Workbook()
+    ws = wb.active
+    ws.write_rows(3, [["a", "b"], [1, 2], [3, 4]])
+    ws.add_table("Data", "A3:B5")
+
+    ws.delete_rows(deleted)
+
+    assert len(ws.tables) == 0
+    path = tmp_path / "dropped.xlsx"
+    wb.save(str(path))
+    wb.close()
+    parts, sheet, rels, types = _table_parts(path)
+    assert parts == []
+    assert "tablePart" not in sheet
+    assert "/table" not in rels
+    assert "tables/" not in types
+    wb2 = load_workbook(str(path))
+    assert len(wb2.active.tables) == 0
+    wb2.close()
+
+
+def test_delete_columns_trims_table(wb, tmp_path):
+    ws = wb.active
+    ws.write_rows(1, [["a", "b", "c"], [1, 2, 3], [4, 5, 6]])
+    ws.add_table("Data", "A1:C3")
+
+    ws.delete_columns([2])
+
+    table = ws.tables[0]
+    assert table.range_reference() == "A1:B3"
+    path = tmp_path / "trimmed.xlsx"
+    wb.save(str(path))
+    with zipfile.ZipFile(path) as z:
+        xml = z.read("xl/tables/table1.xml").decode()
+    assert '<autoFilter ref="A1:B3"' in xml
+    assert '<tableColumns count="2">' in xml
+    assert re.findall(r'<tableColumn [^>]*name="([^"]+)"', xml) == ["a", "c"]
+
+    ws.insert_columns({2: 1})
+
+    assert ws.tables[0].range_reference() == "A1:C3"
+    assert ws["B1"].value == "Column1"
+    wb.save(str(path))
+    with zipfile.ZipFile(path) as z:
+        xml = z.read("xl/tables/table1.xml").decode()
+    assert '<tableColumns count="3">' in xml
+    assert re.findall(r'<tableColumn [^>]*name="([^"]+)"', xml) == ["a", "Column1", "c"]
@@ -480,3 +480,168 @@ class TestBulkReadLargeData:
         assert result[0][49] == "Col50"
         assert result[1][0] == 1
         assert result[1][49] == 50
+
+
+class TestBulkReadNumberFormats:
+    """Tests for the convert_dates / formatted options of the bulk readers."""
+
+    @staticmethod
+    def _formatted_sheet(wb):
+        ws = wb.active
+        for col, (value, fmt) in enumerate(
+            [
+                (45000.5, "yyyy-mm-dd"),
+                (0.75, "hh:mm:ss"),
+                (0.1234, "0.00%"),
+                (1234567, "#,##0"),
+            ],
+            start=1,
+        ):
+            ws.cell(1, col).value = value
+            ws.cell(1, col).style_index = wb.add_style(number_format=fmt)
+        ws.cell(1, 5).value = True
+        ws.cell(2, 1).value = "text"
+        return ws
+
+    def test_convert_dates(self):
+        """Date and time formatted numbers come back as datetime objects, like Cell.value."""
+        from datetime import datetime
+
+        wb = Workbook()
+        ws = self._formatted_sheet(wb)
+        expected = [datetime(2023, 3, 15, 12, 0), datetime(1899, 12, 30, 18, 0), 0.1234, 1234567, True]
+
+        assert ws.get_rows_data(convert_dates=True)[0] == expected
+        assert ws.get_row_values(1, convert_dates=True) == expected
+        assert ws.get_range_data(1, 1, 2, 5, convert_dates=True) == [
+            expected,
+            ["text", None, None, None, None],
+        ]
+        assert next(ws.iter_row_values(convert_dates=True)) == expected
+        # Unchanged by default
+        assert ws.get_rows_data()[0] == [45000.5, 0.75, 0.1234, 1234567, True]
+        assert [ws.cell(1, col).value for col in range(1, 6)] == expected
+        wb.close()
+
+    def test_formatted(self):
+        """Formatted mode returns the displayed text of numbers and booleans."""
+        wb = Workbook()
+        ws = self._formatted_sheet(wb)
+        expected = ["2023-03-15", "18:00:00", "12.34%", "1,234,567", "TRUE"]
+
+        assert ws.get_rows_data(formatted=True) == [
+            expected,
+            ["text", None, None, None, None],
+        ]
+        assert ws.get_row_values(1, formatted=True) == expected
+        assert ws.get_range_data(1, 3, 1, 4, formatted=True) == [expected[2:4]]
+        assert asyncio.run(ws.get_rows_data_async(formatted=True))[0] == expected
+        wb.close()
+
+    def test_formatted_rounds_ties_away_from_zero(self):
+        """Halfway values round up in magnitude, as Excel displays them."""
+        wb = Workbook()
+        ws = wb.active
+        cases = [
+            (2.5, "0", "3"),
+            (3.5, "0", "4"),
+            (-2.5, "0", "-3"),
+            (0.125, "0.00", "0.13"),
+            (1.005, "0.00", "1.01"),
+            (2.675, "0.00", "2.68"),
+            (9.995, "0.00", "10.00"),
+            (0.1234, "0.00", "0.12"),
+            (1.0000000005, "General", "1.000000001"),
+        ]
+        for col, (value, fmt, _) in enumerate(cases, start=1):
+            ws.cell(1, col).value = value
+            ws.cell(1, col).style_index = wb.add_style(number_format=fmt)
+        assert ws.get_row_values(1, formatted=True) == [text for _, _, text in cases]
+        wb.close()
+
+    def test_get_range_values_convert_dates(self):
+        """Array mode returns datetime64[ms] with NaT for non-date cells."""
+        np = pytest.importorskip("numpy")
+
+        wb = Workbook()
+        ws = self._formatted_sheet(wb)
+        result = ws.get_range_values(1, 1, 2, 3, convert_dates=True)
+
+        assert result.dtype == np.dtype("datetime64[ms]")
+        assert result[0, 0] == np.datetime64("2023-03-15T12:00")
+        assert result[0, 1] == np.datetime64("1899-12-30T18:00")
+        assert np.isnat(result[0, 2]) and np.isnat(result[1]).all()
+        wb.close()
+
+
+class TestGroupBy:
+    """Tests for the native group_by aggregation engine."""
+
+    @staticmethod
+    def _sales_sheet(wb):
+        ws = wb.active
+        ws.write_rows(
+            1,
+            [
+                ["Region", "Product", "Year", "Amount"],
+                ["West", "Pen", 2023, 10],
+                ["east", "Pen", 2022, 5.5],
+                ["West", "Ink", 2023, 4],
+                ["East", "Ink", 2023, "n/a"],
+                ["West", "Pen", 2021, 6],
+                [None, None, None, None],
+            ],
+        )
+        return ws
+
+    def test_group_by_agg(self):
+        """Groups come out in Excel's (case-insensitive) sort order of their keys."""
+        np = pytest.importorskip("numpy")
+
+        wb = Workbook()
+        ws = self._sales_sheet(wb)
+        result = ws.group_by("Region").agg(
+            ("Amount", "sum"),
+            rows=("Amount", "count"),
+            avg=("D", "mean"),
+            products=(2, "distinct"),
+        )
+
+        assert result.key_names == ["Region"]
+        assert result.names == ["Amount_sum", "rows", "avg", "products"]
+        assert result.keys == [("East",), ("east",), ("West",)]
+        np.testing.assert_allclose(
+            result.values,
+            [[0, 1, np.nan, 1], [5.5, 1, 5.5, 1], [20, 3, 20 / 3, 2]],
+        )
+        assert ws.group_by("Product", "Region").agg(("Amount", "max"), sort=False).keys == [
+            ("Pen", "West"),
+            ("Pen", "east"),
+            ("Ink", "West"),
+            ("Ink", "East"),
+        ]
+        wb.close()
+
+    def test_group_by_filters_and_target(self):
+        """Filters drop rows before grouping; the result can be written to a sheet."""
+        wb = Workbook()
+        ws = self._sales_sheet(wb)
+        out = wb.create_sheet("Summary")
+        result = (
+            ws.group_by("Region")
+            .where("Year", ">=", 2023)
+            .agg(total=("Amount", "sum"), target=out, target_cell="B2")
+        )
+
+        assert result.to_rows() == [["East", 0.0], ["West", 14.0]]
+        assert out.get_range_data(2, 2, 4, 3) == [
+            ["Region", "total"],
+            ["East", 0],
+            ["West", 14],
+        ]
+        assert ws.group_by(ref="A1:D6").agg(n=("A", "count")).to_rows() == [[5.0]]
+        with pytest.raises(ValueError):
+            ws.group_by("Region").agg(("Amount", "median"))
+        with pytest.raises(ValueError):
+            ws.group_by("Nope")
+        wb.close()
@@ -1,3 +1,4 @@
+import pytest
 from pyopenxlsx import Workbook
 from pyopenxlsx._openxlsx import (
     XLChartType,
@@ -96,6 +97,76 @@ def test_pivot_tables(tmp_path):
         ws = wb.active
         assert ws.cell(1, 1).value == "Region"
 
+
+def _pivot_field(name, subtotal=XLPivotSubtotal.Sum):
+    field = XLPivotField()
+    field.name = name
+    field.subtotal = subtotal
+    return field
+
+
+def test_computed_pivot_table(tmp_path):
+    file_path = tmp_path / "test_pivot_computed.xlsx"
+
+    with Workbook() as wb:
+        ws = wb.active
+        ws.title = "SalesData"
+        ws.write_row(1, ["Region", "Product", "Year", "Sales"])
+        ws.write_rows(
+            2,
+            [
+                ["North", "Apples", 2023, 100],
+                ["South", "Bananas", 2023, 300],
+                ["North", "Oranges", 2024, 150],
+                ["North", "Apples", 2024, 50],
+            ],
+        )
+
+        by_product = wb.create_sheet("ByProduct")
+        options = XLPivotTableOptions()
+        options.name = "ByProduct"
+        options.source_range = "SalesData!A1:D5"
+        options.target_cell = "A3"
+        options.rows = [_pivot_field("Region")]
+        options.columns = [_pivot_field("Product")]
+        options.data = [_pivot_field("Sales")]
+        by_product.add_pivot_table(options)
+
+        assert by_product.get_range_data(3, 1, 7, 5) == [
+            ["Sum of Sales", "Product", None, None, None],
+            ["Region", "Apples", "Bananas", "Oranges", "Grand Total"],
+            ["North", 150, None, 150, 300],
+            ["South", None, 300, None, 300],
+            ["Grand Total", 150, 300, 150, 600],
+        ]
+
+        by_year = wb.create_sheet("ByYear")
+        options = XLPivotTableOptions()
+        options.name = "ByYear"
+        options.source_range = "SalesData!A1:D5"
+        options.target_cell = "B2"
+        options.rows = [_pivot_field("Region"), _pivot_field("Year")]
+        options.data = [
+            _pivot_field("Sales", XLPivotSubtotal.Average),
+            _pivot_field("Sales", XLPivotSubtotal.Count),
+        ]
+        by_year.add_pivot_table(options)
+        wb.save(file_path)
+
+    with Workbook(file_path) as wb:
+        df = wb["ByYear"].read_pivot_table("ByYear")
+        assert list(df.columns) == ["Average of Sales", "Count of Sales"]
+        assert df.index.names == ["Region", "Year"]
+        assert df.loc[("North", 2024), "Average of Sales"] == 100
+        assert df.loc[("Grand Total", None), "Count of Sales"] == 4
+
+        df = wb["ByProduct"].read_pivot_table()
+        assert df.columns.name == "Product"
+        assert df.loc["North", "Grand Total"] == 300
+
+        with pytest.raises(KeyError):
+            wb["ByProduct"].read_pivot_table("Missing")
+
 def test_stock_and_surface_charts(tmp_path):
     """Test newly fixed StockOHLC and Surface3D charts in OpenXLSX."""
     file_path = tmp_path / "test_stock_surface.xlsx"
@@ -136,3 +207,63 @@ def test_stock_and_surface_charts(tmp_path):
         ws = wb.active
         assert ws.cell(1, 1).value == "Date"
         assert ws.cell(11, 2).value == 1
+
+
+def test_charts_from_arrays(tmp_path):
+    import zipfile
+
+    file_path = tmp_path / "test_chart_arrays.xlsx"
+
+    with Workbook() as wb:
+        ws = wb.active
+        chart = ws.add_chart_from_arrays(
+            "line", [[1, 2, 3], [4, 5, 6]], x=["a", "b", "c"], names=["One", "Two"],
+            anchor="E2", title="Trend",
+        )
+        assert chart is not None
+        charts = ws.add_charts_from_arrays(
+            [
+                {"chart_type": XLChartType.Column, "ys": [7, 8], "anchor": f"E{20 * i}"}
+                for i in range(1, 4)
+            ]
+        )
+        assert len(charts) == 3
+
+        data = wb["_chart_data"]
+        assert data.sheet_state == "hidden"
+        assert data.get_rows_data() == [
+            [None, "One", "Two", None, None, None],
+            ["a", 1, 4, 7, 7, 7],
+            ["b", 2, 5, 8, 8, 8],
+            ["c", 3, 6, None, None, None],
+        ]
+        with pytest.raises(ValueError):
+            ws.add_chart_from_arrays("nope", [1])
+        wb.save(file_path)
+
+    with zipfile.ZipFile(file_path) as z:
+        names = z.namelist()
+        assert sum(n.startswith("xl/charts/chart") for n in names) == 4
+        chart1 = z.read("xl/charts/chart1.xml").decode()
+        assert "<c:f>'_chart_data'!$B$2:$B$4</c:f>" in chart1
+        assert "<c:f>'_chart_data'!$A$2:$A$4</c:f>" in chart1
+        assert "<c:f>'_chart_data'!$C$1</c:f>" in chart1
+        drawing = z.read("xl/drawings/drawing1.xml").decode()
+        assert drawing.count("<xdr:graphicFrame") == 4
+        rels = z.read("xl/drawings/_rels/drawing1.xml.rels").decode()
+        assert rels.count("../charts/chart") == 4
+
+
+def test_charts_from_array_series():
+    np = pytest.importorskip("numpy")
+
+    with Workbook() as wb:
+        ws = wb.active
+        ws.add_chart_from_arrays("line", [np.arange(3), np.arange(3) * 2], names=["One", "Two"])
+        ws.add_chart_from_arrays("column", np.arange(2.0))
+        assert wb["_chart_data"].get_rows_data() == [
+            ["One", "Two", None],
+            [0, 0, 0],
+            [1, 2, 1],
+            [2, 4, None],
+        ]
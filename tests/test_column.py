@@ -48,3 +48,66 @@ def test_column_style(tmp_path):
     assert ws2.column(3).style_index == style_idx
     wb2.close()
     wb.close()
+
+
+def test_set_column_widths(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.column("C").hidden = True
+
+    ws.set_column_widths({1: 12, "B": 30.5, 3: 8})
+    ws.set_column_widths({c: 11 for c in range(10, 210)})
+    with pytest.raises(ValueError):
+        ws.set_column_widths({0: 10})
+
+    filename = tmp_path / "widths.xlsx"
+    wb.save(filename)
+    wb.close()
+
+    wb2 = load_workbook(str(filename))
+    ws2 = wb2.active
+    assert ws2.column("A").width == pytest.approx(12)
+    assert ws2.column("B").width == pytest.approx(30.5)
+    assert ws2.column("C").width == pytest.approx(8)
+    assert ws2.column("C").hidden is True
+    assert ws2.column(209).width == pytest.approx(11)
+    wb2.close()
+
+
+def test_auto_fit_columns(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    date_style = wb.add_style(number_format="yyyy-mm-dd")
+    ws.write_rows(
+        1,
+        [
+            ["Name", "Amount", "Date"],
+            ["A considerably longer name", 1234.5, 45000],
+            ["Bo", 3, 45001],
+        ],
+    )
+    ws.cell(2, 3).style = date_style
+    ws.cell(3, 3).style = date_style
+    ws.merge_cells("A5:B5")
+    ws.cell(5, 1).value = "merged text is ignored " * 10
+
+    widths = ws.auto_fit_columns()
+    assert set(widths) == {1, 2, 3}
+    assert 20 < widths[1] < 40
+    # Measured as "2023-03-15", not as the serial number 45000
+    assert widths[3] > 10
+    assert ws.auto_fit_columns(["A"], max_width=10) == {1: 10.0}
+    # Sampling a single row only sees the short header
+    assert ws.auto_fit_columns(["A"], sample_rows=1)[1] < widths[1]
+    with pytest.raises(ValueError):
+        ws.auto_fit_columns([0])
+
+    ws.auto_fit_columns([1, 3])
+    filename = tmp_path / "autofit.xlsx"
+    wb.save(filename)
+    wb.close()
+
+    wb2 = load_workbook(str(filename))
+    assert wb2.active.column("A").width == pytest.approx(widths[1])
+    assert wb2.active.column("C").width == pytest.approx(widths[3])
+    wb2.close()
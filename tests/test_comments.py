@@ -1,3 +1,4 @@
+import pytest
 import pyopenxlsx
 import re
 
@@ -112,3 +113,48 @@ def test_comment_auto_sizing(tmp_path):
             return parts[6] - parts[2]
 
         assert get_row_span(anchors[1]) > get_row_span(anchors[0])
+
+
+def test_add_comments_batch(tmp_path):
+    import zipfile
+
+    filename = tmp_path / "test_add_comments.xlsx"
+    wb = pyopenxlsx.Workbook()
+    ws = wb.active
+    ws["B2"].comment = "old"
+
+    written = ws.add_comments(
+        [(f"A{r}", f"Check row {r}", "Validator") for r in range(1, 1001)]
+        + [("B2", "replaced", "Reviewer"), ("$c$1", "no author"), ("A5", "last wins", "Validator")]
+    )
+    assert written == 1002
+    assert ws["A5"].comment == "last wins"
+    assert ws["B2"].comment == "replaced"
+    ws["D1"].comment = "set afterwards"
+    assert ws._sheet.comments().count() == 1003
+    with pytest.raises(ValueError, match="Invalid cell reference"):
+        ws.add_comments([("A0", "bad")])
+
+    ws2 = wb.create_sheet("Shared")
+    ws2.add_comments([(f"B{r}", "x" * 45 + "\nsecond line") for r in range(1, 11)], shared_shape=True)
+    wb.save(str(filename))
+    wb.close()
+
+    with zipfile.ZipFile(filename) as z:
+        comments = z.read("xl/comments1.xml").decode()
+        assert re.findall(r"<author>([^<]*)</author>", comments) == ["pyopenxlsx", "Validator", "Reviewer"]
+        refs = re.findall(r'<comment ref="([A-Z]+\d+)"', comments)
+        assert refs[:5] == ["A1", "C1", "D1", "A2", "B2"]
+        vml = z.read("xl/drawings/vmlDrawing1.vml").decode()
+        assert vml.count("<v:shape ") == 1003
+        shared = z.read("xl/drawings/vmlDrawing2.vml").decode()
+        assert shared.count('type="#pyopenxlsx_note"') == 10
+        assert shared.count("fillcolor") == 1
+        # 45 characters -> 5 columns wide, two lines -> 3 rows high
+        assert "<x:Anchor>2,10,1,5,7,10,4,5</x:Anchor>" in shared
+
+    wb2 = pyopenxlsx.load_workbook(str(filename))
+    first, shared = wb2["Sheet1"], wb2["Shared"]
+    assert first["A1000"].comment == "Check row 1000"
+    assert shared["B10"].comment == "x" * 45 + "\nsecond line"
+    wb2.close()
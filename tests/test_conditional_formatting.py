@@ -1,5 +1,15 @@
-from pyopenxlsx import Workbook
-from pyopenxlsx._openxlsx import XLColorScaleRule, XLColor, XLDataBarRule
+import re
+import zipfile
+
+from pyopenxlsx import ConditionalFormatBatch, Workbook
+from pyopenxlsx._openxlsx import (
+    XLCellIsRule,
+    XLColor,
+    XLColorScaleRule,
+    XLDataBarRule,
+    XLDxf,
+    XLFormulaRule,
+)
 
 
 def test_conditional_formatting(tmp_path):
@@ -27,3 +37,86 @@ def test_conditional_formatting(tmp_path):
         assert ws.cell(1, 1).value == 10
         assert ws.cell(1, 2).value == 20
         assert ws.cell(1, 3).value == 30
+
+
+def test_conditional_format_batch(tmp_path):
+    file_path = tmp_path / "test_cf_batch.xlsx"
+
+    def red():
+        dxf = XLDxf()
+        dxf.font().set_color(XLColor(255, 0, 0))
+        return dxf
+
+    with Workbook() as wb:
+        ws = wb.active
+        with ws.conditional_format_batch() as batch:
+            assert isinstance(batch, ConditionalFormatBatch)
+            for row in (1, 2, 3, 5):
+                # Separate but identical rule and dxf objects
+                batch.add(f"A{row}:C{row}", XLCellIsRule(">", "100"), red())
+                # Relative references that point at the same offsets merge too
+                batch.add(f"D{row}", XLFormulaRule(f"$A{row}>$B{row}"), red())
+            batch.add("A1:C1", XLCellIsRule(">", "100"), red())  # repeat
+            scale = XLColorScaleRule(XLColor(255, 0, 0), XLColor(0, 255, 0))
+            batch.add("E1:E5", scale).add("F1:F5", scale)
+            assert len(batch) == 11
+        assert len(batch) == 0
+        assert batch.commit() == 0
+        wb.save(file_path)
+
+    with zipfile.ZipFile(file_path) as z:
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+        styles = z.read("xl/styles.xml").decode()
+    assert sheet.count("<cfRule") == 4
+    assert 'sqref="A1:C3 A5:C5"' in sheet
+    assert 'sqref="D1:D3 D5"' in sheet
+    assert "$A1&gt;$B1" in sheet
+    # Range-aggregate rules are never merged
+    assert 'sqref="E1:E5"' in sheet and 'sqref="F1:F5"' in sheet
+    assert styles.count("<dxf>") == 1
+    priorities = sorted(int(p) for p in re.findall(r'priority="(\d+)"', sheet))
+    assert priorities == [1, 2, 3, 4]
+
+
+def test_conditional_format_batch_sorts_merged_ranges(tmp_path):
+    file_path = tmp_path / "test_cf_order.xlsx"
+    with Workbook() as wb:
+        ws = wb.active
+        with ws.conditional_format_batch() as batch:
+            for ref, row in (("A7", 7), ("A2:A3", 2), ("A9", 9), ("A8", 8)):
+                batch.add(ref, XLFormulaRule(f"A{row}>$B$1+B{row}"))
+            for ref, col in (("D1", "D"), ("C1", "C")):
+                batch.add(ref, XLFormulaRule(f"{col}1=1"))
+        wb.save(file_path)
+
+    with zipfile.ZipFile(file_path) as z:
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+    # The formula is relative to the top-left cell of the sorted ranges
+    assert re.search(r'sqref="A2:A3 A7:A9">\s*<cfRule[^>]*>\s*<formula>A2&gt;\$B\$1\+B2<', sheet)
+    assert re.search(r'sqref="C1:D1">\s*<cfRule[^>]*>\s*<formula>C1=1<', sheet)
+
+
+def test_conditional_format_batch_leaves_rule_unchanged(tmp_path):
+    file_path = tmp_path / "test_cf_reuse.xlsx"
+    rule = XLCellIsRule(">", "100")
+    before = rule.summary()
+
+    with Workbook() as wb:
+        ws = wb.active
+        red = XLDxf()
+        red.font().set_color(XLColor(255, 0, 0))
+        blue = XLDxf()
+        blue.font().set_color(XLColor(0, 0, 255))
+        with ws.conditional_format_batch() as batch:
+            batch.add("A1", rule, red)
+        assert rule.summary() == before
+        with ws.conditional_format_batch() as batch:
+            batch.add("B1", rule, blue).add("C1", rule)
+        assert rule.summary() == before
+        wb.save(file_path)
+
+    with zipfile.ZipFile(file_path) as z:
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+    dxf_ids = re.findall(r'<cfRule[^>]*dxfId="(\d+)"', sheet)
+    assert sorted(dxf_ids) == ["0", "1"]
+    assert sheet.count("<cfRule") == 3
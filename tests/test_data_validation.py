@@ -1,4 +1,5 @@
 from pyopenxlsx import Workbook, XLDataValidationType, XLDataValidationOperator
+from pyopenxlsx._openxlsx import XLDataValidationConfig
 
 
 def test_list_validation(tmp_path):
@@ -97,3 +98,42 @@ def test_reference_list(tmp_path):
     # OpenXLSX usually stores reference lists in formula1 with an '=' prefix and quotes if needed
     f1 = dv_read.formula1
     assert "Source" in f1 and "A1:A3" in f1
+
+
+def test_add_many(tmp_path):
+    path = tmp_path / "test_dv_many.xlsx"
+    wb = Workbook()
+    ws = wb.active
+
+    yes_no = {"items": ["Yes", "No"]}
+    names = {"items": [f"Employee number {i}" for i in range(50)]}
+    whole = XLDataValidationConfig()
+    whole.type = XLDataValidationType.Whole
+    whole.formula1 = "1"
+    whole.formula2 = "9"
+    entries = [(f"A{r}", yes_no) for r in range(2, 1001)]
+    entries += [(f"B{r}", yes_no) for r in range(2, 1001)]
+    entries += [("C1:C5", names), ("C6", names), ("E1", names), ("D1", whole), ("D3", whole)]
+    assert ws.data_validations.add_many(entries) == 3
+    assert ws.data_validations.add_many([]) == 0
+
+    by_sqref = {dv.sqref: dv for dv in ws.data_validations}
+    assert set(by_sqref) == {"A2:B1000", "C1:C6 E1", "D1 D3"}
+    assert by_sqref["A2:B1000"].type == XLDataValidationType.List
+    assert by_sqref["A2:B1000"].formula1 == '"Yes,No"'
+    # Too long for an inline list: stored on the hidden lookup sheet
+    assert by_sqref["C1:C6 E1"].formula1 == "'_lists'!$A$1:$A$50"
+    assert by_sqref["D1 D3"].formula2 == "9"
+    lists = wb["_lists"]
+    assert lists.sheet_state == "hidden"
+    assert lists.cell(50, 1).value == "Employee number 49"
+
+    # A later call appends its lists in the next column
+    ws.data_validations.add_many([("F1", {"items": ["a,b", "c"]})])
+    assert ws.data_validations["F1"].formula1 == "'_lists'!$B$1:$B$2"
+
+    wb.save(path)
+    wb2 = Workbook(path)
+    assert len(wb2.active.data_validations) == 4
+    wb2.close()
+    wb.close()
@@ -1,3 +1,5 @@
+import pytest
+
 from pyopenxlsx import Workbook
 
 
@@ -62,3 +64,42 @@ def test_defined_names_save_load(tmp_path):
     assert wb2.defined_names.exists("SavedName")
     assert wb2.defined_names.get("SavedName").refers_to() == "Sheet1!$C$1"
     wb2.close()
+
+
+def test_defined_names_index_and_read_named_ranges():
+    wb = Workbook()
+    ws = wb.active
+    other = wb.create_sheet("My Sheet")
+    for r in range(1, 4):
+        for c in range(1, 4):
+            ws.cell(r, c).value = r * 10 + c
+    other["B2"].value = "local"
+
+    dns = wb.defined_names
+    dns.append("Block", "Sheet1!$A$1:$C$2")
+    dns.append("Rate", "Sheet1!$C$3")
+    dns.append("Rate", "'My Sheet'!$B2", local_sheet_id=1)
+    dns.append("Formula", "SUM(Sheet1!$A$1:$A$3)")
+
+    # Names compare case-insensitively; resolve prefers the sheet's own name
+    assert "block" in dns
+    assert dns.get("RATE").refers_to() == "Sheet1!$C$3"
+    assert dns.resolve("Rate", 1).local_sheet_id() == 1
+    assert dns.resolve("Rate", 0).local_sheet_id() is None
+
+    values = wb.read_named_ranges(["Block", "Rate", "'My Sheet'!Rate", "Sheet1!Rate"])
+    assert values == {
+        "Block": [[11, 12, 13], [21, 22, 23]],
+        "Rate": [[33]],
+        "'My Sheet'!Rate": [["local"]],
+        "Sheet1!Rate": [[33]],
+    }
+
+    with pytest.raises(KeyError):
+        wb.read_named_ranges(["Missing"])
+    with pytest.raises(ValueError):
+        wb.read_named_ranges(["Formula"])
+
+    assert dns.remove("Rate", 1)
+    assert wb.read_named_ranges(["'My Sheet'!Rate"]) == {"'My Sheet'!Rate": [[33]]}
+    assert len(dns) == 3
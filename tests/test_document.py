@@ -1,3 +1,5 @@
+import io
+import pytest
 import pyopenxlsx
 import os
 
@@ -50,3 +52,96 @@ def test_document_properties(tmp_path):
     # but we can test if the basic document object works.
     assert doc.workbook() is not None
     doc.close()
+
+
+def test_archive_entry_streaming(tmp_path):
+    filename = tmp_path / "streamed.xlsx"
+    payload = [b"event %d\n" % i for i in range(20000)]
+
+    wb = pyopenxlsx.Workbook()
+    for i in range(1, 101):
+        wb.active.cell(i, 1).value = f"row {i}"
+    wb.write_archive_entry("customXml/diagnostics.txt", iter(payload))
+    with pytest.raises(ValueError):
+        wb.write_archive_entry("xl/workbook.xml", b"<workbook/>")
+    wb.save(str(filename))
+    assert not wb._spool_files
+    wb.close()
+
+    with pyopenxlsx.load_workbook(str(filename)) as wb:
+        with wb.open_archive_entry("customXml/diagnostics.txt", chunk_size=4096) as f:
+            chunks = list(f)
+            assert f.tell() == sum(map(len, payload))
+        assert all(0 < len(c) <= 4096 for c in chunks)
+        assert b"".join(chunks) == b"".join(payload)
+
+        sheet = wb.get_archive_entry("xl/worksheets/sheet1.xml")
+        f = wb.open_archive_entry("xl/worksheets/sheet1.xml")
+        head = bytearray(16)
+        assert f.readinto(head) == 16
+        assert bytes(head) + f.read(100) + f.read() == sheet
+        assert f.read(10) == b""
+        f.close()
+        with pytest.raises(ValueError):
+            f.read()
+        assert wb.active["A100"].value == "row 100"
+
+
+def test_archive_entry_reader_open_during_save(tmp_path):
+    """Open readers do not keep the workbook from being saved."""
+    png = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDAT\x08\xd7c\xf8\xff\xff?0\x00\x03\xff\x01\xfe\x8e\xfe\x1d\x00\x00\x00\x00IEND\xaeB`\x82"
+    filename = tmp_path / "open_reader.xlsx"
+    wb = pyopenxlsx.Workbook()
+    wb.active["A1"].value = "x" * 10000
+    wb.active.add_images([(png, "A1"), (png.replace(b"\xf8\xff\xff?", b"\xf8\x00\x00\x00"), "C1")])
+    wb.save(str(filename))
+    wb.close()
+
+    with pyopenxlsx.load_workbook(str(filename)) as wb:
+        sheet = wb.get_archive_entry("xl/worksheets/sheet1.xml")
+        f = wb.open_archive_entry("xl/worksheets/sheet1.xml", chunk_size=10)
+        head = f.read(10)
+        images = wb.iter_images(chunk_size=7)
+        next(images)
+        wb.write_archive_entry("customXml/extra.txt", b"extra")
+        wb.active.add_images([(png, "E1")])
+        wb.save()
+        assert head + f.read() == sheet
+        # Parts written since the last save are read from memory
+        with wb.open_archive_entry("customXml/extra.txt") as extra:
+            assert extra.read() == b"extra"
+        assert sum(len(chunk) for _, chunk in images) > 0
+        wb.save()
+        f.close()
+
+    with pyopenxlsx.load_workbook(str(filename)) as wb:
+        assert wb.get_archive_entry("customXml/extra.txt") == b"extra"
+        assert len(wb.get_embedded_images()) == 3
+
+
+def test_archive_entry_streaming_from_bytes():
+    """Entries of workbooks loaded from bytes are streamed, not inflated whole."""
+    psutil = pytest.importorskip("psutil")
+    size = 64 << 20
+    wb = pyopenxlsx.Workbook()
+    wb.write_archive_entry("customXml/big.txt", (b"x" * (1 << 20) for _ in range(size >> 20)))
+    data = wb.to_bytes()
+    wb.close()
+
+    with pyopenxlsx.load_workbook(io.BytesIO(data)) as wb:
+        process = psutil.Process()
+        before = process.memory_info().rss
+        with wb.open_archive_entry("customXml/big.txt", chunk_size=1 << 16) as f:
+            head = f.read(1 << 16)
+            grown = process.memory_info().rss - before
+            total = len(head) + sum(len(chunk) for chunk in f)
+        assert head == b"x" * (1 << 16)
+        assert total == size
+        assert grown < size // 4
+        # Saving the workbook does not disturb a reader of the previous package
+        f = wb.open_archive_entry("xl/workbook.xml", chunk_size=10)
+        first = f.read(10)
+        wb.active["A1"].value = "changed"
+        wb.save(io.BytesIO())
+        assert (first + f.read()).startswith(b"<?xml")
+        f.close()
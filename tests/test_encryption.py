@@ -1,3 +1,6 @@
+import io
+import os
+
 import pytest
 from pyopenxlsx import Workbook, load_workbook, load_workbook_async
 
@@ -36,3 +39,27 @@ async def test_workbook_encryption_async(tmp_path):
 
     wb2 = await load_workbook_async(str(file_path), password="async_password")
     assert wb2.active.cell(row=2, column=2).value == "Async Secret"
+
+
+def test_large_encrypted_roundtrip(tmp_path):
+    # Over 109 FAT sectors (~7 MB), so the container needs DIFAT sectors
+    blob = os.urandom(9_000_000)
+    wb = Workbook()
+    wb.active["A1"].value = "large"
+    wb.write_archive_entry("xl/blob.bin", [blob[i : i + (1 << 20)] for i in range(0, len(blob), 1 << 20)])
+    file_path = tmp_path / "large.xlsx"
+    wb.save(str(file_path), password="pässwört")
+    wb.close()
+
+    with pytest.raises(ValueError, match="Incorrect password"):
+        load_workbook(str(file_path), password="wrong")
+
+    wb2 = load_workbook(str(file_path), password="pässwört")
+    assert wb2.active["A1"].value == "large"
+    assert bytes(wb2.get_archive_entry("xl/blob.bin")) == blob
+    data = wb2.to_bytes(password="other")
+    wb2.close()
+
+    wb3 = load_workbook(io.BytesIO(data), password="other")
+    assert bytes(wb3.get_archive_entry("xl/blob.bin")) == blob
+    wb3.close()
@@ -1,6 +1,6 @@
 import pytest
 import os
-from pyopenxlsx import Workbook, ImageInfo
+from pyopenxlsx import Workbook, ImageInfo, load_workbook
 from pathlib import Path
 
 
@@ -171,3 +171,126 @@ def test_multiple_images(tmp_path):
     assert len(extracted) == 2
 
     wb2.close()
+
+
+def test_add_images_batch(tmp_path):
+    """Batch insertion dedups identical images and reads sizes natively."""
+    import zipfile
+
+    png = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDAT\x08\xd7c\xf8\xff\xff?0\x00\x03\xff\x01\xfe\x8e\xfe\x1d\x00\x00\x00\x00IEND\xaeB`\x82"
+    gif = b"GIF89a\x04\x00\x02\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x04\x00\x02\x00\x00\x02\x02\x84Q\x00;"
+    img_path = tmp_path / "thumb.png"
+    img_path.write_bytes(png)
+    xlsx_path = tmp_path / "test_batch_img.xlsx"
+
+    wb = Workbook()
+    ws = wb.active
+    ws.add_image(str(img_path), anchor="A1", width=10, height=10)
+    paths = ws.add_images(
+        [(img_path, f"B{row}", 20, 20) for row in range(1, 101)]
+        + [(png, "D1"), (gif, "E1", 40), img_path]
+    )
+    assert len(paths) == 103
+    assert set(paths) == {"xl/media/image2.png", "xl/media/image3.gif"}
+    with pytest.raises(FileNotFoundError):
+        ws.add_images([tmp_path / "missing.png"])
+    with pytest.raises(ValueError, match="Unsupported image format"):
+        ws.add_images([(b"not an image", "A1", 10, 10)])
+    wb.save(str(xlsx_path))
+    wb.close()
+
+    with zipfile.ZipFile(xlsx_path) as z:
+        media = [n for n in z.namelist() if n.startswith("xl/media/")]
+        assert sorted(media) == ["xl/media/image1.png", "xl/media/image2.png", "xl/media/image3.gif"]
+        assert 'Extension="gif"' in z.read("[Content_Types].xml").decode()
+        drawing = z.read("xl/drawings/drawing1.xml").decode()
+        assert drawing.count("<xdr:pic>") == 104
+        # 1x1 png at its own size, 4x2 gif scaled to a width of 40 px
+        assert 'cx="9525" cy="9525"' in drawing
+        assert 'cx="381000" cy="190500"' in drawing
+        rels = z.read("xl/drawings/_rels/drawing1.xml.rels").decode()
+        assert rels.count("../media/") == 3
+
+
+def test_iter_and_extract_images_parallel(tmp_path):
+    """Streaming iteration and parallel extraction with content dedup."""
+    png1 = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDAT\x08\xd7c\xf8\xff\xff?0\x00\x03\xff\x01\xfe\x8e\xfe\x1d\x00\x00\x00\x00IEND\xaeB`\x82"
+    png2 = png1.replace(b"\xf8\xff\xff?", b"\xf8\x00\x00\x00")
+    path1 = tmp_path / "a.png"
+    path2 = tmp_path / "b.png"
+    path1.write_bytes(png1)
+    path2.write_bytes(png2)
+
+    wb = Workbook()
+    ws = wb.active
+    for anchor, path in (("A1", path1), ("C1", path2), ("E1", path1), ("G1", path1)):
+        ws.add_image(str(path), anchor=anchor, width=10, height=10)
+
+    # Unsaved images are read from the open archive
+    assert len(wb.extract_images(str(tmp_path / "unsaved"), workers=2, dedup=True)) == 2
+
+    xlsx_path = tmp_path / "dups.xlsx"
+    wb.save(str(xlsx_path))
+    wb.close()
+
+    wb2 = Workbook(str(xlsx_path))
+    images = wb2.get_embedded_images()
+    assert len(images) == 4
+
+    whole = {img.path: data for img, data in wb2.iter_images()}
+    assert whole == {img.path: wb2.get_image_data(img.path) for img in images}
+    chunked = {}
+    for img, chunk in wb2.iter_images(chunk_size=7):
+        assert 0 < len(chunk) <= 7
+        chunked[img.path] = chunked.get(img.path, b"") + chunk
+    assert chunked == whole
+    with pytest.raises(ValueError):
+        next(wb2.iter_images(chunk_size=0))
+
+    extracted = wb2.extract_images(tmp_path / "out", workers=3, dedup=True)
+    assert len(extracted) == 2
+    assert sorted(Path(p).read_bytes() for p in extracted) == sorted([png1, png2])
+    names = sorted(os.path.basename(p) for p in extracted)
+    assert sorted(os.listdir(tmp_path / "out")) == names
+    # The first of the identical images is the one that is kept
+    assert os.path.basename(extracted[0]) == images[0].name
+
+    # By default every media part is written under its own name
+    everything = wb2.extract_images(str(tmp_path / "all"), workers=4)
+    assert len(everything) == 4
+    assert sorted(os.listdir(tmp_path / "all")) == sorted(img.name for img in images)
+    wb2.close()
+
+
+def test_mmap_stored_images(tmp_path):
+    """Stored media of a memory-mapped workbook is returned without copying."""
+    png = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDAT\x08\xd7c\xf8\xff\xff?0\x00\x03\xff\x01\xfe\x8e\xfe\x1d\x00\x00\x00\x00IEND\xaeB`\x82"
+    img_path = tmp_path / "a.png"
+    img_path.write_bytes(png)
+    wb = Workbook()
+    wb.active.add_image(str(img_path), anchor="B2", width=10, height=10)
+    wb.active["A1"].value = "mapped"
+    xlsx_path = tmp_path / "mapped.xlsx"
+    wb.save(str(xlsx_path))
+    wb.close()
+
+    wb2 = load_workbook(str(xlsx_path), mmap=True)
+    assert wb2.active["A1"].value == "mapped"
+    image = wb2.get_embedded_images()[0]
+    data = wb2.get_image_data(image.name)
+    assert isinstance(data, memoryview) and data.readonly
+    assert bytes(data) == png
+    assert wb2.get_archive_entry(image.path) == png
+    # Compressed parts are still inflated into bytes
+    assert isinstance(wb2.get_archive_entry("xl/workbook.xml"), bytes)
+
+    # Saving back over the mapped file leaves existing views intact
+    wb2.active["A1"].value = "changed"
+    wb2.save()
+    assert bytes(data) == png
+    wb2.close()
+
+    wb3 = load_workbook(str(xlsx_path), mmap=True)
+    assert wb3.active["A1"].value == "changed"
+    assert bytes(wb3.get_image_data(image.name)) == png
+    wb3.close()
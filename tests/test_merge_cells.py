@@ -42,3 +42,37 @@ def test_merge_cells_api(wb):
     ws.merges.delete(idx)
     assert len(ws.merges) == 1
     assert "A1:B2" not in ws.merges
+
+
+def test_merge_index_lookups(wb):
+    ws = wb.active
+    ws.merges.extend(f"A{r}:C{r + 1}" for r in range(1, 200, 2))
+    assert len(ws.merges) == 100
+
+    assert ws.merges.covering(4, 2) == "A3:C4"
+    assert ws.merges.covering(4, 4) is None
+    assert ws.merges.intersecting("B5:D8") == ["A5:C6", "A7:C8"]
+    assert ws.merges.intersecting(ws.range("E1:F10")) == []
+
+    # The index follows single appends and deletions
+    ws.merges.append("E1:F2")
+    assert ws.merges.covering(2, 6) == "E1:F2"
+    ws.merges.delete(ws.merges.find("A3:C4"))
+    assert ws.merges.covering(4, 2) is None
+
+    # ... and structural edits made through the worksheet
+    ws.merge_cells("H1:I1")
+    assert ws.merges.covering(1, 9) == "H1:I1"
+    ws.delete_rows([1])
+    assert ws.merges.covering(1, 1) == "A1:C1"
+
+
+def test_merge_extend_rejects_overlaps(wb):
+    ws = wb.active
+    ws.merges.append("A1:B2")
+
+    with pytest.raises(ValueError):
+        ws.merges.extend(["C1:D2", "B2:B3"])
+    with pytest.raises(ValueError):
+        ws.merges.extend(["F1:G2", "G2:H3"])
+    assert list(ws.merges) == ["A1:B2"]
@@ -101,3 +101,112 @@ async def test_range_clear_async(tmp_path):
     await rng.clear_async()
     assert ws["A1"].value is None
     await wb.close_async()
+
+
+def test_range_values_roundtrip():
+    wb = Workbook()
+    ws = wb.active
+
+    rng = ws.range("B2:D3")
+    assert rng.bounds == (2, 2, 3, 4)
+
+    rng.values = [[1, "a", True], [2.5, None, "z"]]
+    assert rng.values == [[1, "a", True], [2.5, None, "z"]]
+    assert ws.cell(2, 3).value == "a"
+    assert ws.cell(3, 2).value == 2.5
+
+    with pytest.raises(ValueError):
+        rng.values = [[1, 2, 3]]
+    wb.close()
+
+
+def test_range_assign_numpy_and_scalar():
+    np = pytest.importorskip("numpy")
+    wb = Workbook()
+    ws = wb.active
+
+    rng = ws.range("A1:C2")
+    rng.assign(np.arange(6, dtype=np.int32).reshape(2, 3))
+    assert ws.cell(2, 3).value == 5
+
+    arr = rng.to_numpy()
+    assert arr.dtype == np.float64
+    assert arr.tolist() == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+    assert rng.to_numpy(dtype=np.int64).sum() == 15
+
+    ws.range("E1:E3").assign(np.array([1.5, 2.5, 3.5]))
+    assert ws.range("E1:E3").values == [[1.5], [2.5], [3.5]]
+
+    ws.range("A5:B6").assign("x")
+    assert ws.range("A5:B6").to_numpy(dtype=object).tolist() == [["x", "x"], ["x", "x"]]
+
+    with pytest.raises(ValueError):
+        rng.assign(np.zeros((3, 3)))
+    wb.close()
+
+
+def test_range_styles():
+    np = pytest.importorskip("numpy")
+    wb = Workbook()
+    ws = wb.active
+    style = wb.add_style(number_format="0.00")
+
+    ws.cell(1, 1).value = 1
+    ws.cell(2, 2).value = 2
+    ws.cell(2, 2).style_index = style
+
+    styles = ws.range("A1:C2").styles
+    assert styles.dtype == np.uint32
+    assert styles.shape == (2, 3)
+    assert styles[1, 1] == style
+    assert styles[0, 2] == 0
+    wb.close()
+
+
+def test_set_range_styles(tmp_path):
+    np = pytest.importorskip("numpy")
+    wb = Workbook()
+    ws = wb.active
+    fixed = wb.add_style(number_format="0.00")
+    percent = wb.add_style(number_format="0%")
+
+    ws.write_rows(1, [["a", "b", "c"], [1, 2]], styles=[fixed, percent, fixed])
+    assert ws.get_range_styles(1, 1, 2, 3).tolist() == [[fixed, percent, fixed]] * 2
+
+    # Per-row broadcast; rows and cells that do not exist yet are created
+    ws.set_range_styles(4, 2, 6, 3, np.array([[percent], [0], [fixed]]))
+    assert ws.get_range_styles(4, 1, 6, 3).tolist() == [
+        [0, percent, percent],
+        [0, 0, 0],
+        [0, fixed, fixed],
+    ]
+
+    rng = ws.range("A1:B2")
+    rng.styles = 0
+    assert not rng.styles.any()
+
+    with pytest.raises(ValueError):
+        ws.set_range_styles(1, 1, 2, 2, [1, 2, 3])
+    with pytest.raises(ValueError):
+        ws.set_range_styles(1, 1, 1, 1, -1)
+    with pytest.raises(ValueError):
+        ws.set_range_styles(1, 1, 1, 1, 999)
+
+    filename = tmp_path / "range_styles.xlsx"
+    wb.save(filename)
+    wb.close()
+
+    from pyopenxlsx import load_workbook
+
+    wb2 = load_workbook(str(filename))
+    ws2 = wb2.active
+    assert ws2.get_range_styles(1, 1, 6, 3).tolist() == [
+        [0, 0, fixed],
+        [0, 0, fixed],
+        [0, 0, 0],
+        [0, percent, percent],
+        [0, 0, 0],
+        [0, fixed, fixed],
+    ]
+    assert ws2.cell(2, 3).value is None
+    wb2.close()
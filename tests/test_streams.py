@@ -1,4 +1,6 @@
-from pyopenxlsx import Workbook
+import pytest
+
+from pyopenxlsx import Workbook, concat_sheets
 from pyopenxlsx._openxlsx import XLFont
 
 
@@ -62,3 +64,33 @@ def test_stream_reader_index(tmp_path):
         assert reader.current_row_index == 3
         assert not reader.has_next()
 ()
+
+
+def test_concat_sheets(tmp_path):
+    paths = []
+    for f in range(5):
+        with Workbook() as wb:
+            ws = wb.active
+            ws.title = "Data"
+            # More rows than one batch, so readers wait on the writer
+            ws.write_rows(1, [["id", "name"]] + [[f * 10000 + i, f"row {i}"] for i in range(3000)])
+            path = tmp_path / f"in{f}.xlsx"
+            wb.save(path)
+            paths.append(path)
+
+    output = tmp_path / "out.xlsx"
+    assert concat_sheets(paths, "Data", output, source_column="file", workers=2) == 1 + 5 * 3000
+    with Workbook(output) as wb:
+        ws = wb["Data"]
+        assert [ws.cell(1, c).value for c in (1, 2, 3)] == ["file", "id", "name"]
+        assert [ws.cell(2, c).value for c in (1, 2, 3)] == [str(paths[0]), 0, "row 0"]
+        last = 1 + 5 * 3000
+        assert [ws.cell(last, c).value for c in (1, 2, 3)] == [str(paths[4]), 42999, "row 2999"]
+
+    assert concat_sheets(paths[:2], None, output, header=None) == 2 * 3001
+
+    with pytest.raises(ValueError, match="does not exist"):
+        concat_sheets(paths, "Missing", tmp_path / "none.xlsx")
+    assert not (tmp_path / "none.xlsx").exists()
+    with pytest.raises(FileNotFoundError):
+        concat_sheets([tmp_path / "missing.xlsx"], None, output)
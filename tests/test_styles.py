@@ -9,6 +9,7 @@ from pyopenxlsx import (
     XLPatternType,
     XLAlignmentStyle,
     XLLineStyle,
+    XLNumberFormatCategory,
 )
 
 
@@ -180,3 +181,38 @@ def test_complex_style_object(tmp_path):
         assert "<b" in styles_xml
         assert 'patternType="solid"' in styles_xml
         assert 'horizontal="right"' in styles_xml
+
+
+def test_style_table():
+    wb = Workbook()
+    ws = wb.active
+    date = wb.add_style(number_format="yyyy-mm-dd")
+    time = wb.add_style(number_format="h:mm")
+    money = wb.add_style(number_format='"$"#,##0.00', font=Font(bold=True))
+    percent = wb.add_style(number_format=10)
+
+    table = wb.style_table
+    assert table is wb.style_table
+    assert table.category(0) == XLNumberFormatCategory.General
+    assert table.category(date) == XLNumberFormatCategory.Date
+    assert table.category(time) == XLNumberFormatCategory.Time
+    assert table.category(money) == XLNumberFormatCategory.Currency
+    assert table.category(percent) == XLNumberFormatCategory.Percent
+    assert table.format_code(percent) == "0.00%"
+    assert table.date_mask.tolist() == [False, True, True, False, False]
+    assert table.number_format_ids[percent] == 10
+    assert table.font_index(money) != 0
+    assert not table.is_date(999)
+
+    # add_style() invalidates the table
+    stamp = wb.add_style(number_format=22)
+    assert wb.style_table is not table
+    assert wb.style_table.category(stamp) == XLNumberFormatCategory.DateTime
+
+    ws["A1"].value = 45000
+    ws["A1"].style = money
+    assert ws["A1"].is_date is False
+    assert ws["A1"].font.bold() is True
+    ws["A1"].style = date
+    assert ws["A1"].is_date is True
+    wb.close()
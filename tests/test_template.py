@@ -0,0 +1,90 @@
+import io
+import pickle
+
+import pytest
+
+from pyopenxlsx import Template, Workbook, load_workbook
+
+
+def _statement_template():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Statement"
+    ws["A1"].value = "Statement for {{name}}"
+    ws["B1"].value = "{{balance}}"
+    ws["A2"].value = "Item"
+    ws["A3"].value = "{{ line.desc }}"
+    ws["B3"].value = "{{line.amount}}"
+    ws["C3"].formula = "B3*2"
+    ws["A4"].value = "Total"
+    ws["B4"].formula = "SUM(B3:B3)"
+    ws.merge_cells("C3:D3")
+    other = wb.create_sheet("Other")
+    other["A1"].formula = "Statement!B4+1"
+    wb.defined_names.append("Total", "Statement!$B$4")
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+DATA = {
+    "name": "Ann",
+    "balance": 12.5,
+    "line": [{"desc": "a", "amount": 1}, {"desc": "b", "amount": 2}, {"desc": "c", "amount": True}],
+}
+
+
+def test_template_render_fills_fields_and_blocks():
+    template = Template(_statement_template())
+    assert template.fields == ["name", "balance"]
+    assert template.blocks == {"line": ["desc", "amount"]}
+
+    wb = load_workbook(io.BytesIO(template.render(DATA)))
+    ws = wb["Statement"]
+    assert ws["A1"].value == "Statement for Ann"
+    assert ws["B1"].value == 12.5
+    assert [ws.cell(r, 1).value for r in range(3, 7)] == ["a", "b", "c", "Total"]
+    assert [ws.cell(r, 2).value for r in range(3, 6)] == [1, 2, True]
+    assert ws["C4"].formula.text == "B4*2"
+    assert ws["B6"].formula.text == "SUM(B3:B5)"
+    assert wb["Other"]["A1"].formula.text == "Statement!B6+1"
+    assert wb.defined_names["Total"].refers_to() == "Statement!$B$6"
+    assert len(ws.merges) == 3
+    assert all(ref in ws.merges for ref in ("C3:D3", "C4:D4", "C5:D5"))
+
+
+def test_template_empty_block_and_errors():
+    template = Template(_statement_template())
+    ws = load_workbook(io.BytesIO(template.render({**DATA, "line": [], "balance": None}))).active
+    assert ws["B1"].value is None
+    # An empty block leaves one blank row, so the total still has a range to sum
+    assert ws["A3"].value is None and ws["B3"].value is None and ws["C3"].formula.text == ""
+    assert ws["A4"].value == "Total"
+    assert ws["B4"].formula.text == "SUM(B3:B3)"
+
+    with pytest.raises(KeyError):
+        template.render({"name": "x"})
+    with pytest.raises(ValueError):
+        Template(b"not a zip")
+
+    wb = Workbook()
+    wb.active["A1"].value = "{{a.x}}"
+    wb.active["B1"].value = "{{b.y}}"
+    buf = io.BytesIO()
+    wb.save(buf)
+    with pytest.raises(ValueError):
+        Template(buf.getvalue())
+
+
+def test_template_render_many_and_pickle(tmp_path):
+    template = pickle.loads(pickle.dumps(Template(_statement_template())))
+    outputs = [tmp_path / f"{i}.xlsx" for i in range(6)]
+    data = [{**DATA, "name": f"n{i}", "line": DATA["line"][: i % 3]} for i in range(6)]
+    template.render_many(data, outputs, workers=3)
+    for i, output in enumerate(outputs):
+        ws = load_workbook(str(output)).active
+        assert ws["A1"].value == f"Statement for n{i}"
+        assert ws.cell(3 + max(i % 3, 1), 1).value == "Total"
+
+    with pytest.raises(ValueError):
+        template.render_many(data, outputs[:1])
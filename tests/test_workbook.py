@@ -1,5 +1,8 @@
 import os
-from pyopenxlsx import Workbook, load_workbook
+import zipfile
+
+import pytest
+from pyopenxlsx import Fill, Font, Workbook, load_workbook
 
 
 def test_new_workbook():
@@ -38,3 +41,105 @@ def test_workbook_contains():
     wb = Workbook()
     assert "Sheet1" in wb
     assert "NonExistent" not in wb
+
+
+def test_workbook_in_memory_roundtrip(tmp_path):
+    import io
+
+    wb = Workbook()
+    wb["Sheet1"]["A1"].value = "In memory"
+    data = wb.to_bytes()
+    assert isinstance(data, bytes) and data[:2] == b"PK"
+
+    for source in (data, bytearray(data), memoryview(data), io.BytesIO(data)):
+        wb2 = load_workbook(source)
+        assert wb2["Sheet1"]["A1"].value == "In memory"
+        wb2.close()
+
+    # Edits after a first to_bytes() end up in the next one
+    wb["Sheet1"]["A2"].value = 42
+    out = io.BytesIO()
+    wb.save(out)
+    wb3 = load_workbook(io.BytesIO(out.getvalue()))
+    assert wb3["Sheet1"]["A2"].value == 42
+    wb3["Sheet1"]["B1"].value = "edited"
+    fn = tmp_path / "from_bytes.xlsx"
+    wb3.save(str(fn))
+    wb3.close()
+    wb.close()
+
+    # A workbook opened from a path can be serialized too, and still saves to its path
+    wb4 = load_workbook(str(fn))
+    assert load_workbook(wb4.to_bytes())["Sheet1"]["B1"].value == "edited"
+    wb4["Sheet1"]["C1"].value = "path"
+    wb4.save()
+    wb4.close()
+    assert load_workbook(str(fn))["Sheet1"]["C1"].value == "path"
+
+
+def test_workbook_in_memory_encrypted():
+    import pytest
+
+    wb = Workbook()
+    wb.active["A1"].value = "secret"
+    encrypted = wb.to_bytes(password="pw")
+    assert encrypted[:2] != b"PK"
+
+    with pytest.raises(ValueError):
+        load_workbook(encrypted)
+    wb2 = load_workbook(encrypted, password="pw")
+    assert wb2.active["A1"].value == "secret"
+    # Workbooks loaded with a password stay encrypted
+    assert load_workbook(wb2.to_bytes(), password="pw").active["A1"].value == "secret"
+    with pytest.raises(ValueError):
+        load_workbook(b"not a workbook")
+
+
+def test_import_sheet(tmp_path):
+    src_path = tmp_path / "source.xlsx"
+    with Workbook() as src:
+        ws = src.active
+        ws.title = "Data"
+        bold = src.add_style(font=Font(bold=True, color="FF0000"), number_format="0.000")
+        ws["A1"].value = "Header"
+        ws["A1"].style_index = bold
+        ws["B2"].value = 3.5
+        ws["B2"].style_index = bold
+        ws["C3"].value = "only in source"
+        ws.merge_cells("A5:C6")
+        ws.set_column_widths({2: 30})
+        ws.data_validations.add_validation("D1:D10", type="list", formula1='"a,b"')
+        ws.add_hyperlink("E1", "https://example.com")
+        src.save(src_path)
+
+    out = tmp_path / "target.xlsx"
+    with Workbook() as wb, load_workbook(src_path) as src:
+        wb.add_style(fill=Fill(pattern_type="solid", color="00FF00"))
+        same = wb.add_style(font=Font(bold=True, color="FF0000"), number_format="0.000")
+        wb.active["A1"].value = "target"
+        formats = wb.styles.cell_formats().count()
+
+        imported = wb.import_sheet(src["Data"])
+        wb.import_sheet(src["Data"], "Data2")
+        # The source format already exists in the target and is shared, not duplicated
+        assert wb.styles.cell_formats().count() == formats
+        assert imported["A1"].style_index == same
+        assert imported["C3"].value == "only in source"
+        assert "A5:C6" in imported.merges
+
+        with pytest.raises(ValueError, match="already exists"):
+            wb.import_sheet(src["Data"], "Data2")
+        wb.save(out)
+
+    with zipfile.ZipFile(out) as z:
+        sheet = z.read("xl/worksheets/sheet2.xml").decode()
+        rels = z.read("xl/worksheets/_rels/sheet2.xml.rels").decode()
+    assert 'width="30"' in sheet
+    assert "<dataValidation " in sheet
+    assert "https://example.com" in rels
+
+    with load_workbook(out) as wb:
+        assert wb.sheetnames == ["Sheet1", "Data", "Data2"]
+        assert wb["Data2"]["A1"].value == "Header"
+        assert wb["Data"]["B2"].value == 3.5
+        assert wb["Sheet1"]["A1"].value == "target"
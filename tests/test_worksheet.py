@@ -99,3 +99,29 @@ def test_sheet_index():
     assert ws2.index == 0
     assert wb.sheetnames == ["Sheet2", "Sheet1"]
     wb.close()
+
+
+def test_bulk_row_dimensions(tmp_path):
+    import openpyxl
+
+    wb = Workbook()
+    ws = wb.active
+    ws.write_rows(1, [[i] for i in range(1, 101)])
+
+    ws.set_row_heights([20.0] * 100)
+    ws.set_row_heights({150: 30})
+    ws.set_row_outline_levels({r: 1 for r in range(10, 20)})
+    ws.hide_rows(range(10, 20))
+    ws.hide_rows([15], hidden=False)
+
+    path = tmp_path / "rows.xlsx"
+    wb.save(str(path))
+    wb.close()
+
+    sheet = openpyxl.load_workbook(path).active
+    assert sheet.row_dimensions[1].height == 20
+    assert sheet.row_dimensions[150].height == 30
+    assert sheet.row_dimensions[12].outline_level == 1
+    assert sheet.row_dimensions[12].hidden
+    assert not sheet.row_dimensions[15].hidden
+    assert sheet.cell(12, 1).value == 12
@@ -40,3 +40,45 @@ def test_worksheet_extras(tmp_path):
         assert ws.cell(1, 1).value == "Data"
         # Check table
         assert len(ws.tables) >= 1
+
+
+def test_add_hyperlinks_batch(tmp_path):
+    import zipfile
+
+    import pytest
+
+    file_path = tmp_path / "test_hyperlinks.xlsx"
+
+    with Workbook() as wb:
+        ws = wb.active
+        ws.add_hyperlink("A1", "https://example.com/1", "existing")
+        assert ws.get_hyperlink("A1") == "https://example.com/1"  # builds the index
+
+        written = ws.add_hyperlinks(
+            [(f"B{r}", f"https://example.com/{r % 10}", "Open") for r in range(1, 1001)]
+            + [("$a$1", "https://example.com/2"), ("C1", "#Sheet1!Z9", "Jump"), ("B5", "https://other.example")]
+        )
+        assert written == 1002
+        assert ws.get_hyperlink("A1") == "https://example.com/2"
+        assert ws.get_hyperlink("B5") == "https://other.example"
+        assert ws.get_hyperlink("C1") == "Sheet1!Z9"
+        assert ws.has_hyperlink("B1000")
+
+        ws.remove_hyperlink("B1000")
+        assert not ws.has_hyperlink("B1000")
+        ws.add_internal_hyperlink("D1", "Sheet1!A1")
+        assert ws.get_hyperlink("D1") == "Sheet1!A1"
+        ws.delete_rows([1])  # shifts the links and drops the index
+        assert ws.get_hyperlink("B1") == "https://example.com/2"
+        assert not ws.has_hyperlink("D1")
+
+        with pytest.raises(ValueError, match="Invalid cell reference"):
+            ws.add_hyperlinks([("1A", "https://example.com")])
+        wb.save(str(file_path))
+
+    with zipfile.ZipFile(file_path) as z:
+        rels = z.read("xl/worksheets/_rels/sheet1.xml.rels").decode()
+        # One relationship per distinct URL, shared with the one add_hyperlink made
+        assert rels.count("<Relationship ") == 11
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+        assert sheet.count("<hyperlink ") == 998